@@ -0,0 +1,521 @@
+import asyncio
+import contextvars
+import http.client
+import json
+import ssl
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from config import DEFAULT_CONFIG
+from grpc_transport import (
+    BACKEND_GRPCIO, BACKEND_STUB, GRPC_TIMEOUT_SECONDS, channel_options, format_grpc_error, get_grpc_transport, message_to_dict,
+    refresh_stale_schema, resolve_backend, status_code_name,
+)
+from cassette import active_cassette
+from fault_proxy import AsyncFaultInjectingTransport, active_fault_profile
+from rpc_timing import mark
+from http_transport import (
+    HTTP_BACKEND_POOL, HTTP_TIMEOUT_SECONDS, build_headers, get_http_transport, parse_response_body, retry_on_fresh_connection,
+)
+from harness_log import Lazy, get_logger
+
+
+log = get_logger(__name__)
+
+
+class AsyncGrpcTransport:
+    """Асинхронный транспорт на grpc.aio: один канал на адрес в пределах event loop.
+
+    Дескрипторы методов берутся из синхронного транспорта того же адреса
+    (DescriptorCache), поэтому reflection выполняется не чаще, чем в
+    синхронном режиме.
+    """
+
+    def __init__(self, host: str, port: int, insecure: bool):
+        from grpc import aio, ssl_channel_credentials
+
+        self.host = host
+        self.port = port
+        self.insecure = insecure
+        self.descriptors = get_grpc_transport(host, port, insecure, BACKEND_GRPCIO).descriptors
+
+        if insecure:
+            self.channel = aio.insecure_channel(self.target, options=channel_options())
+        else:
+            self.channel = aio.secure_channel(self.target, ssl_channel_credentials(), options=channel_options())
+        self._callables: Dict[Tuple[str, Any], Any] = {}
+
+    @property
+    def target(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    async def _invoke(self, service_method: str, payload: Dict[str, Any]):
+        from google.protobuf import json_format
+
+        path, request_class, response_class = self.descriptors.resolve(service_method)
+        # Ключ включает класс запроса: после обновления схемы нужны новые сериализаторы
+        key = (path, request_class)
+        stub = self._callables.get(key)
+        if stub is None:
+            stub = self.channel.unary_unary(
+                path,
+                request_serializer=request_class.SerializeToString,
+                response_deserializer=response_class.FromString,
+            )
+            self._callables[key] = stub
+        mark("acquire")
+
+        request = json_format.ParseDict(payload, request_class())
+        mark("send")
+        response = await stub(request, timeout=GRPC_TIMEOUT_SECONDS)
+        mark("response")
+        return response
+
+    async def call(self, service_method: str, payload: Dict[str, Any], verbose: bool = True) -> Dict[str, Any]:
+        import grpc
+        from google.protobuf import json_format
+
+        if verbose:
+            log.debug("🚀 Выполняем async gRPC вызов: %s -> %s", service_method, self.target)
+
+        try:
+            try:
+                response = await self._invoke(service_method, payload)
+            except (grpc.RpcError, json_format.ParseError) as e:
+                # Схема на сервере могла измениться - обновляем кэш (reflection синхронный, в потоке) и повторяем один раз
+                if not await asyncio.to_thread(refresh_stale_schema, self.descriptors, e):
+                    raise
+                response = await self._invoke(service_method, payload)
+            response_data = message_to_dict(response)
+            raw_stdout = json.dumps(response_data, indent=2, ensure_ascii=False)
+            mark("decode")
+            return {
+                "success": True,
+                "response": response_data,
+                "raw_stdout": raw_stdout
+            }
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+                return {
+                    "success": False,
+                    "error": f"Timeout: запрос выполнялся более {GRPC_TIMEOUT_SECONDS} секунд"
+                }
+            error = format_grpc_error(status_code_name(e.code()), e.details() or "")
+            if verbose:
+                log.error("❌ Ошибка выполнения gRPC вызова:\n   STDERR: %s", error)
+            return {
+                "success": False,
+                "error": error,
+                "stdout": ""
+            }
+        except json_format.ParseError as e:
+            return {
+                "success": False,
+                "error": f"Error invoking method \"{service_method}\": {e}",
+                "stdout": ""
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Неожиданная ошибка: {e}"
+            }
+
+    def supports_server_streaming(self, service_method: str) -> bool:
+        """Есть ли на сервере server-streaming метод с таким именем"""
+        try:
+            method = self.descriptors.describe(service_method)
+        except Exception:
+            return False
+        return method is not None and method.server_streaming and not method.client_streaming
+
+    async def stream(self, service_method: str, payload: Dict[str, Any], timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Вызывает server-streaming метод и отдает сообщения как JSON-словари (ошибки - grpc.RpcError)"""
+        from google.protobuf import json_format
+
+        path, request_class, response_class = self.descriptors.resolve(service_method)
+        stub = self.channel.unary_stream(
+            path,
+            request_serializer=request_class.SerializeToString,
+            response_deserializer=response_class.FromString,
+        )
+        call = stub(json_format.ParseDict(payload, request_class()), timeout=timeout)
+        try:
+            async for message in call:
+                yield message_to_dict(message)
+        finally:
+            call.cancel()
+
+    async def close(self) -> None:
+        await self.channel.close()
+
+
+class _AsyncHttpConnection:
+    """Одно HTTP/1.1 соединение поверх asyncio streams"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, method: str, host: str, path: str, body: Optional[bytes], headers: Dict[str, str]) -> Tuple[int, bytes, bool]:
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {host}", "Connection: keep-alive"]
+        lines += [f"{key}: {value}" for key, value in headers.items()]
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await self.writer.drain()
+        mark("send")
+
+        while True:
+            status_line = await self.reader.readline()
+            if not status_line:
+                raise http.client.RemoteDisconnected("Соединение закрыто сервером")
+            mark("ttfb")
+            version, status = status_line.decode("latin-1").split(" ", 2)[:2]
+
+            response_headers: Dict[str, str] = {}
+            while True:
+                line = await self.reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                response_headers[name.strip().lower()] = value.strip()
+
+            # Промежуточные ответы (100 Continue, 103 Early Hints) пропускаем до окончательного, как http.client
+            if not 100 <= int(status) < 200 or int(status) == 101:
+                break
+
+        keep_alive = version == "HTTP/1.1" and response_headers.get("connection", "").lower() != "close"
+
+        if method.upper() == "HEAD" or int(status) in (101, 204, 304):
+            # Ответы без тела: Content-Length у них, если есть, описывает не отправленное тело
+            data = b""
+            keep_alive = keep_alive and int(status) != 101
+        elif response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0].strip(), 16)
+                if size == 0:
+                    # Пропускаем trailer-заголовки до пустой строки
+                    while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            data = b"".join(chunks)
+        elif "content-length" in response_headers:
+            data = await self.reader.readexactly(int(response_headers["content-length"]))
+        elif not keep_alive:
+            # Сервер закрывает соединение (Connection: close или HTTP/1.0): тело идет до EOF
+            data = await self.reader.read()
+        else:
+            # Без длины и chunked на keep-alive соединении границу тела не определить:
+            # не ждем EOF, которого может не быть, а считаем тело пустым и не переиспользуем соединение
+            data = b""
+            keep_alive = False
+        mark("response")
+
+        return int(status), data, keep_alive
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class AsyncHttpConnectionPool:
+    """Ограниченный пул keep-alive соединений к одному origin для asyncio"""
+
+    def __init__(self, scheme: str, host: str, port: int, max_size: int = DEFAULT_CONFIG.http_pool_size):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.max_size = max_size
+
+        self._idle = []
+        self._slots = asyncio.Semaphore(max_size)
+
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.connect_time_total = 0.0
+
+    @property
+    def host_header(self) -> str:
+        default_port = 443 if self.scheme == "https" else 80
+        return self.host if self.port == default_port else f"{self.host}:{self.port}"
+
+    async def _new_connection(self) -> _AsyncHttpConnection:
+        mark("acquire")
+        started = time.perf_counter()
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=ssl.create_default_context() if self.scheme == "https" else None
+        )
+        mark("connect")
+        self.connections_created += 1
+        self.connect_time_total += time.perf_counter() - started
+        return _AsyncHttpConnection(reader, writer)
+
+    async def request(self, method: str, path: str, body: Optional[bytes], headers: Dict[str, str]) -> Tuple[int, bytes]:
+        self.requests += 1
+        async with self._slots:
+            reused = bool(self._idle)
+            if reused:
+                self.connections_reused += 1
+                connection = self._idle.pop()
+            else:
+                connection = await self._new_connection()
+            mark("acquire")
+
+            try:
+                status, data, keep_alive = await connection.request(method, self.host_header, path, body, headers)
+            except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError, ValueError) as e:
+                connection.close()
+                if not reused or not retry_on_fresh_connection(method, e):
+                    raise
+                # Сервер закрыл простаивающее keep-alive соединение - повторяем на новом
+                connection = await self._new_connection()
+                try:
+                    status, data, keep_alive = await connection.request(method, self.host_header, path, body, headers)
+                except BaseException:
+                    connection.close()
+                    raise
+            except BaseException:
+                connection.close()
+                raise
+
+            if keep_alive:
+                self._idle.append(connection)
+            else:
+                connection.close()
+            return status, data
+
+    def stats(self) -> Dict[str, Any]:
+        acquisitions = self.connections_created + self.connections_reused
+        return {
+            "origin": f"{self.scheme}://{self.host}:{self.port}",
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": self.connections_reused / acquisitions if acquisitions else 0.0,
+            "connect_time_total_ms": self.connect_time_total * 1000,
+            "connect_time_avg_ms": self.connect_time_total * 1000 / self.connections_created if self.connections_created else 0.0,
+            "idle_connections": len(self._idle),
+            "max_size": self.max_size,
+        }
+
+    def close(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
+
+
+class AsyncHttpTransport:
+    """Асинхронный HTTP транспорт поверх пулов keep-alive соединений"""
+
+    def __init__(self, max_size: int = DEFAULT_CONFIG.http_pool_size):
+        self.max_size = max_size
+        self._pools: Dict[Tuple[str, str, int], AsyncHttpConnectionPool] = {}
+
+    def pool_for(self, url: str) -> Tuple[AsyncHttpConnectionPool, str]:
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = AsyncHttpConnectionPool(scheme, parts.hostname, port, self.max_size)
+            self._pools[key] = pool
+
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        return pool, path
+
+    async def call(self, method: str, url: str, payload: Dict[str, Any] = None, headers: Dict[str, str] = None, verbose: bool = True) -> Dict[str, Any]:
+        if verbose:
+            log.debug("🚀 Выполняем async HTTP запрос: %s %s", Lazy(method.upper), url)
+
+        body = json.dumps(payload).encode("utf-8") if payload else None
+
+        try:
+            pool, path = self.pool_for(url)
+            status, data = await asyncio.wait_for(
+                pool.request(method.upper(), path, body, build_headers(payload, headers)),
+                HTTP_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            return {
+                "success": False,
+                "error": f"Timeout: запрос выполнялся более {HTTP_TIMEOUT_SECONDS} секунд"
+            }
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            if verbose:
+                log.error("❌ Ошибка выполнения HTTP запроса:\n   %s", e)
+            return {
+                "success": False,
+                "error": f"HTTP request failed: {e}",
+                "stdout": ""
+            }
+
+        parsed = parse_response_body(data.decode("utf-8", errors="replace"), verbose)
+        mark("decode")
+        return parsed
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {}
+        for pool in self._pools.values():
+            pool_stats = pool.stats()
+            stats[pool_stats["origin"]] = pool_stats
+        return stats
+
+    async def close(self) -> None:
+        for pool in self._pools.values():
+            pool.close()
+
+
+class _ThreadedTransport:
+    """Асинхронная обертка над синхронным транспортом (grpcurl/curl): вызов уходит в поток"""
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    async def call(self, *args, **kwargs) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.transport.call, *args, **kwargs)
+
+    def supports_server_streaming(self, service_method: str) -> bool:
+        return False
+
+    async def close(self) -> None:
+        pass
+
+
+class AsyncRateLimiter:
+    """Ограничивает частоту операций: не более rate в секунду, 0 - без ограничения"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.perf_counter()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+
+# Асинхронные каналы и пулы привязаны к event loop, поэтому храним их отдельно для каждого цикла
+_loop_transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, Any]]" = weakref.WeakKeyDictionary()
+
+
+def _transports_for_loop() -> Dict[Tuple, Any]:
+    loop = asyncio.get_running_loop()
+    transports = _loop_transports.get(loop)
+    if transports is None:
+        transports = {}
+        _loop_transports[loop] = transports
+    return transports
+
+
+def get_async_grpc_transport(host: str, port: int, insecure: bool, backend: Optional[str] = None):
+    """Общий для адреса асинхронный gRPC транспорт текущего event loop"""
+    backend = resolve_backend(backend)
+    key = ("grpc", host, port, insecure, backend)
+    transports = _transports_for_loop()
+
+    transport = transports.get(key)
+    if transport is None:
+        # С кассетой все вызовы идут через общий синхронный транспорт, который пишет или читает кассету
+        if backend == BACKEND_GRPCIO and active_cassette() is None:
+            transport = AsyncGrpcTransport(host, port, insecure)
+        elif backend == BACKEND_STUB and active_cassette() is None:
+            from stub_gateway import AsyncStubGrpcTransport
+            transport = AsyncStubGrpcTransport(host, port, insecure)
+        else:
+            # Синхронный транспорт уже обернут кассетой и правилами прокси сбоев
+            transport = _ThreadedTransport(get_grpc_transport(host, port, insecure, backend))
+        profile = active_fault_profile()
+        if profile is not None and profile.rules and not isinstance(transport, _ThreadedTransport):
+            transport = AsyncFaultInjectingTransport(transport, profile)
+        transports[key] = transport
+    return transport
+
+
+def get_async_http_transport(base_url: str, backend: Optional[str] = None):
+    """Общий для базового URL асинхронный HTTP транспорт текущего event loop"""
+    backend = backend or DEFAULT_CONFIG.http_backend
+    key = ("http", base_url, backend)
+    transports = _transports_for_loop()
+
+    transport = transports.get(key)
+    if transport is None:
+        if backend == HTTP_BACKEND_POOL and active_cassette() is None:
+            transport = AsyncHttpTransport()
+        else:
+            transport = _ThreadedTransport(get_http_transport(base_url, backend))
+        transports[key] = transport
+    return transport
+
+
+async def close_async_transports() -> None:
+    """Закрывает каналы и пулы текущего event loop"""
+    transports = _transports_for_loop()
+    for transport in transports.values():
+        await transport.close()
+    transports.clear()
+
+
+# Общий для сессии event loop в отдельном потоке: синхронный код тестов и пулов запускает в нем
+# корутины через run_in_session_loop, и каналы grpc.aio и пулы соединений живут до close_session
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+_session_thread: Optional[threading.Thread] = None
+_session_lock = threading.Lock()
+
+
+def _session_event_loop() -> asyncio.AbstractEventLoop:
+    global _session_loop, _session_thread
+    with _session_lock:
+        if _session_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="session-event-loop", daemon=True)
+            thread.start()
+            _session_loop, _session_thread = loop, thread
+        return _session_loop
+
+
+async def _run_in_context(context: contextvars.Context, coro: Awaitable[Any]) -> Any:
+    # Задача получает контекст вызывающего потока (область теста в rpc_timing), как при asyncio.run
+    return await context.run(asyncio.get_running_loop().create_task, coro)
+
+
+def run_in_session_loop(coro: Awaitable[Any]) -> Any:
+    """Выполняет корутину в общем для сессии event loop и возвращает ее результат (блокирует вызывающий поток)"""
+    loop = _session_event_loop()
+    if threading.current_thread() is _session_thread:
+        raise RuntimeError("run_in_session_loop вызван из самого event loop сессии")
+    future = asyncio.run_coroutine_threadsafe(_run_in_context(contextvars.copy_context(), coro), loop)
+    try:
+        return future.result()
+    except BaseException:
+        # Ctrl+C и прочие прерывания ожидания не должны оставлять корутину работать в фоне
+        future.cancel()
+        raise
+
+
+def close_session_loop() -> None:
+    """Закрывает каналы и пулы event loop сессии и останавливает его (см. session_stats.SESSION_RESOURCES)"""
+    global _session_loop, _session_thread
+    with _session_lock:
+        loop, thread = _session_loop, _session_thread
+        _session_loop = _session_thread = None
+    if loop is None:
+        return
+    asyncio.run_coroutine_threadsafe(close_async_transports(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
@@ -1,8 +1,18 @@
-import json
-import subprocess
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 from dataclasses import dataclass
+from urllib.parse import urlsplit
 from config import DEFAULT_CONFIG, ApiConfig
+from grpc_transport import get_grpc_transport
+from suite_registry import register_tester_class
+from rpc_timing import TestResults, aggregate, print_timing_table, track
+from harness_log import get_logger
+
+if TYPE_CHECKING:
+    from pagination import AsyncPageIterator, PageIterator
+    from reference_data import ReferenceDictionary
+
+
+log = get_logger(__name__)
 
 
 @dataclass
@@ -11,6 +21,7 @@ class GrpcTestConfig:
     host: str = DEFAULT_CONFIG.grpc_host
     port: int = DEFAULT_CONFIG.grpc_port
     insecure: bool = DEFAULT_CONFIG.grpc_insecure
+    backend: str = DEFAULT_CONFIG.grpc_backend
 
 
 @dataclass
@@ -18,6 +29,7 @@ class HttpTestConfig:
     """Конфигурация для HTTP тестов"""
     host: str = DEFAULT_CONFIG.http_host
     port: int = DEFAULT_CONFIG.http_port
+    backend: str = DEFAULT_CONFIG.http_backend
     
     @property
     def base_url(self) -> str:
@@ -27,159 +39,112 @@ class HttpTestConfig:
 
 class BaseGrpcTester:
     
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Тесты, помеченные @register_test, попадают в реестр при объявлении класса
+        register_tester_class(cls)
+    
     def __init__(self, config: GrpcTestConfig):
         self.config = config
-        self.test_results = []
-        self.http_config = HttpTestConfig(host=DEFAULT_CONFIG.http_host, port=DEFAULT_CONFIG.http_port)
+        # Записи забирают разбивку по фазам вызовов, сделанных с предыдущей записи (см. rpc_timing)
+        self.test_results = TestResults()
+        self.http_config = HttpTestConfig(host=DEFAULT_CONFIG.http_host, port=DEFAULT_CONFIG.http_port, backend=DEFAULT_CONFIG.http_backend)
+    
+    @property
+    def grpc_transport(self):
+        """Общий для конфигурации gRPC транспорт (канал переиспользуется между тестерами)"""
+        return get_grpc_transport(self.config.host, self.config.port, self.config.insecure, self.config.backend)
     
     def run_grpcurl(self, service_method: str, payload: Dict[str, Any], verbose: bool = True) -> Dict[str, Any]:
-        
-        cmd = [
-            "grpcurl",
-            "-emit-defaults",
-            "-plaintext" if self.config.insecure else "",
-            "-d", json.dumps(payload),
-            f"{self.config.host}:{self.config.port}",
-            service_method
-        ]
-        
-        cmd = [arg for arg in cmd if arg]
-        
-        if verbose:
-            print(f"🚀 Выполняем команду: {' '.join(cmd)}")
-        
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode != 0:
-                if verbose:
-                    print(f"❌ Ошибка выполнения grpcurl:")
-                    print(f"   STDERR: {result.stderr}")
-                return {
-                    "success": False,
-                    "error": result.stderr,
-                    "stdout": result.stdout
-                }
-            
-            try:
-                response_data = json.loads(result.stdout)
-                return {
-                    "success": True,
-                    "response": response_data,
-                    "raw_stdout": result.stdout
-                }
-            except json.JSONDecodeError as e:
-                if verbose:
-                    print(f"❌ Ошибка парсинга JSON: {e}")
-                    print(f"   Сырой ответ: {result.stdout}")
-                return {
-                    "success": False,
-                    "error": f"JSON parse error: {e}",
-                    "raw_stdout": result.stdout
-                }
-                
-        except subprocess.TimeoutExpired:
-            return {
-                "success": False,
-                "error": "Timeout: запрос выполнялся более 30 секунд"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Неожиданная ошибка: {e}"
-            }
+        """Выполняет gRPC вызов через выбранный бэкенд (grpcio или grpcurl)"""
+        with track(service_method, self.config.backend) as timing:
+            result = self.grpc_transport.call(service_method, payload, verbose=verbose)
+            timing.success = result.get("success", False)
+        return result
+    
+    # HTTP, async транспорты, пагинация и справочники импортируются при первом обращении:
+    # тесту одного gRPC метода они не нужны, а asyncio и http.client заметно удлиняют запуск CLI
+
+    @property
+    def http_transport(self):
+        """Общий для базового URL HTTP транспорт (keep-alive соединения переиспользуются)"""
+        from http_transport import get_http_transport
+        return get_http_transport(self.http_config.base_url, self.http_config.backend)
     
     def run_curl(self, method: str, url: str, payload: Dict[str, Any] = None, headers: Dict[str, str] = None, verbose: bool = True) -> Dict[str, Any]:
-        """Выполняет HTTP запрос с помощью curl"""
-        
-        cmd = ["curl", "-s", "-X", method.upper()]
-        
-        # Добавляем заголовки
-        if headers:
-            for key, value in headers.items():
-                cmd.extend(["-H", f"{key}: {value}"])
-        
-        # Добавляем Content-Type для JSON по умолчанию
-        if payload and not (headers and any("content-type" in h.lower() for h in headers.keys())):
-            cmd.extend(["-H", "Content-Type: application/json"])
-        
-        # Добавляем тело запроса
-        if payload:
-            cmd.extend(["-d", json.dumps(payload)])
-        
-        # Добавляем URL
-        cmd.append(url)
-        
-        if verbose:
-            print(f"🚀 Выполняем HTTP запрос: {' '.join(cmd)}")
-        
+        """Выполняет HTTP запрос через выбранный бэкенд (пул соединений или curl)"""
+        with track(f"{method.upper()} {urlsplit(url).path}", self.http_config.backend) as timing:
+            result = self.http_transport.call(method, url, payload, headers, verbose=verbose)
+            timing.success = result.get("success", False)
+        return result
+    
+    async def arun_grpc(self, service_method: str, payload: Dict[str, Any], verbose: bool = False) -> Dict[str, Any]:
+        """Асинхронный вариант run_grpcurl (grpc.aio канал; для grpcurl - вызов в отдельном потоке)"""
+        from async_transport import get_async_grpc_transport
+        transport = get_async_grpc_transport(self.config.host, self.config.port, self.config.insecure, self.config.backend)
+        with track(service_method, self.config.backend) as timing:
+            result = await transport.call(service_method, payload, verbose=verbose)
+            timing.success = result.get("success", False)
+        return result
+    
+    async def arun_http(self, method: str, url: str, payload: Dict[str, Any] = None, headers: Dict[str, str] = None, verbose: bool = False) -> Dict[str, Any]:
+        """Асинхронный вариант run_curl поверх asyncio пула keep-alive соединений"""
+        from async_transport import get_async_http_transport
+        transport = get_async_http_transport(self.http_config.base_url, self.http_config.backend)
+        with track(f"{method.upper()} {urlsplit(url).path}", self.http_config.backend) as timing:
+            result = await transport.call(method, url, payload, headers, verbose=verbose)
+            timing.success = result.get("success", False)
+        return result
+    
+    def iter_pages(self, service_method: str, payload: Dict[str, Any] = None, page_size: int = 50, concurrency: Optional[int] = None) -> "PageIterator":
+        """Лениво отдает все элементы списка (GetOffers, GetTraders, ...), загружая страницы заранее и параллельно"""
+        from pagination import PageIterator
+        return PageIterator(self, service_method, payload, page_size, concurrency)
+    
+    def aiter_pages(self, service_method: str, payload: Dict[str, Any] = None, page_size: int = 50, concurrency: Optional[int] = None) -> "AsyncPageIterator":
+        """Асинхронный вариант iter_pages для async for"""
+        from pagination import AsyncPageIterator
+        return AsyncPageIterator(self, service_method, payload, page_size, concurrency)
+    
+    def reference_data(self, name: str) -> "ReferenceDictionary":
+        """Справочник gwconfig из кэша сессии (currencies, regions, issuers, payment_method_types, payment_methods)"""
+        from reference_data import REFERENCE_DATA
+        return REFERENCE_DATA.get(self, name)
+    
+    def missing_reference_id(self, name: str, preferred: int) -> int:
+        """Id для негативного теста: preferred, если его нет в справочнике, иначе следующий за максимальным"""
+        from pagination import PageFetchError
+        try:
+            dictionary = self.reference_data(name)
+        except PageFetchError as e:
+            log.warning("⚠️ Справочник %s не загружен, используем id %s: %s", name, preferred, e.error)
+            return preferred
+        if dictionary.get(preferred) is None:
+            return preferred
+        return (dictionary.max_id or 0) + 1
+    
+    def assert_matches_reference(self, name: str, item: Dict[str, Any], message: str) -> bool:
+        """Сверяет элемент из ответа Get* с элементом того же id в справочнике из кэша сессии"""
+        from pagination import PageFetchError
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode != 0:
-                if verbose:
-                    print(f"❌ Ошибка выполнения curl:")
-                    print(f"   STDERR: {result.stderr}")
-                return {
-                    "success": False,
-                    "error": result.stderr,
-                    "stdout": result.stdout
-                }
-            
-            # Проверяем, что ответ не пустой
-            if not result.stdout.strip():
-                if verbose:
-                    print(f"❌ Пустой ответ от сервера")
-                return {
-                    "success": False,
-                    "error": "Empty response from server",
-                    "stdout": ""
-                }
-            
-            try:
-                response_data = json.loads(result.stdout)
-                return {
-                    "success": True,
-                    "response": response_data,
-                    "raw_stdout": result.stdout
-                }
-            except json.JSONDecodeError as e:
-                if verbose:
-                    print(f"❌ Ошибка парсинга JSON: {e}")
-                    print(f"   Сырой ответ: {result.stdout}")
-                return {
-                    "success": False,
-                    "error": f"JSON parse error: {e}",
-                    "raw_stdout": result.stdout
-                }
-                
-        except subprocess.TimeoutExpired:
-            return {
-                "success": False,
-                "error": "Timeout: запрос выполнялся более 30 секунд"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Неожиданная ошибка: {e}"
-            }
+            expected = self.reference_data(name).get(item.get("id"))
+        except PageFetchError as e:
+            log.warning("⚠️ Справочник %s не загружен, сверка пропущена: %s", name, e.error)
+            return True
+        if expected is None:
+            log.error("❌ %s: id %s отсутствует в справочнике %s", message, item.get("id"), name)
+            return False
+        tests_passed = True
+        for field, value in expected.items():
+            tests_passed &= self.assert_equal(item.get(field), value, f"{message}: {field}")
+        return tests_passed
     
     def assert_equal(self, actual: Any, expected: Any, message: str) -> bool:
         """Проверяет равенство значений"""
         if actual == expected:
             return True
         else:
-            print(f"❌ {message}: {actual} != {expected}")
+            log.error("❌ %s: %s != %s", message, actual, expected)
             self.test_results.append({
                 "test": message, 
                 "status": "FAIL", 
@@ -191,7 +156,7 @@ class BaseGrpcTester:
         if prop in obj:
             return True
         else:
-            print(f"❌ {message}: свойство '{prop}' отсутствует")
+            log.error("❌ %s: свойство '%s' отсутствует", message, prop)
             self.test_results.append({
                 "test": message, 
                 "status": "FAIL", 
@@ -203,7 +168,7 @@ class BaseGrpcTester:
         if value and str(value).strip():
             return True
         else:
-            print(f"❌ {message}: значение пустое")
+            log.error("❌ %s: значение пустое", message)
             self.test_results.append({
                 "test": message, 
                 "status": "FAIL", 
@@ -217,7 +182,7 @@ class BaseGrpcTester:
         if uuid_pattern.match(value):
             return True
         else:
-            print(f"❌ {message}: {value} не является UUID")
+            log.error("❌ %s: %s не является UUID", message, value)
             self.test_results.append({
                 "test": message, 
                 "status": "FAIL", 
@@ -243,11 +208,16 @@ class BaseGrpcTester:
             print(f"🎯 Процент успеха: {success_rate:.1f}%")
         
         if failed > 0:
-            print(f"\n❌ Провалившиеся тесты:")
+            print("\n❌ Провалившиеся тесты:")
             for test in self.test_results:
                 if test["status"] == "FAIL":
                     print(f"   • {test['test']}: {test['details']}")
         
+        timings = aggregate(timing for test in self.test_results for timing in test.get("timings", ()))
+        if timings:
+            print("\n⏱️  Время RPC по методам (обвязка - acquire, decode и other):")
+            print_timing_table(timings)
+        
         return failed == 0
 
 
@@ -0,0 +1,353 @@
+import hashlib
+import json
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
+
+CASSETTE_RECORD = "record"
+CASSETTE_REPLAY = "replay"
+
+# Заголовок записи: sha256 ключа запроса и длина сжатого тела
+_FRAME = struct.Struct(">32sI")
+
+# Поля, значения которых меняются от запуска к запуску и не участвуют в сопоставлении
+VOLATILE_FIELDS = frozenset({
+    "external_order_id", "externalOrderId",
+    "external_client_id", "externalClientId",
+    "correlation_id", "correlationId",
+    "created_at", "createdAt",
+    "updated_at", "updatedAt",
+    "email",
+})
+
+# Изменчивые фрагменты внутри любых строк: заменяются на метку
+VOLATILE_PATTERNS: Tuple[Tuple[str, "re.Pattern[str]"], ...] = (
+    ("<uuid>", re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)),
+    ("<timestamp>", re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?")),
+    ("offer_<hex>", re.compile(r"\boffer_[0-9a-f]{8}\b")),
+    ("external_id_<hex>", re.compile(r"\bexternal_id_[0-9a-f]{8}\b")),
+)
+
+
+class CassetteError(Exception):
+    """Кассету невозможно открыть или прочитать"""
+
+
+class CassetteMatcher:
+    """Сопоставление запросов с записями кассеты.
+
+    Ключ записи - вид вызова, метод (или HTTP метод и путь) и payload, в
+    котором значения VOLATILE_FIELDS и фрагменты VOLATILE_PATTERNS заменены
+    метками. При воспроизведении изменчивые значения записанного запроса
+    подменяются в ответе текущими, поэтому проверки вида "в ответе тот же
+    trader_id, что в запросе" проходят и на записанных данных.
+    Подстановки копятся за всю сессию (см. Cassette.replay): значение,
+    сгенерированное в одном запросе (email в createTrader), заменяется
+    и в ответах следующих вызовов (RegisterTrader), где в запросе его нет.
+    """
+
+    def __init__(self, volatile_fields=VOLATILE_FIELDS, volatile_patterns=VOLATILE_PATTERNS):
+        self.volatile_fields = frozenset(volatile_fields)
+        self.volatile_patterns = tuple(volatile_patterns)
+
+    def normalize(self, value: Any, field: Optional[str] = None) -> Any:
+        if isinstance(value, dict):
+            return {key: self.normalize(item, key) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.normalize(item, field) for item in value]
+        if field in self.volatile_fields:
+            return "<volatile>"
+        if isinstance(value, str):
+            for placeholder, pattern in self.volatile_patterns:
+                value = pattern.sub(placeholder, value)
+        return value
+
+    def key(self, kind: str, target: str, payload: Any) -> str:
+        normalized = json.dumps(self.normalize(payload), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return f"{kind} {target} {normalized}"
+
+    def volatile_values(self, value: Any, field: Optional[str] = None) -> List[str]:
+        """Изменчивые строки значения: поля VOLATILE_FIELDS и фрагменты VOLATILE_PATTERNS"""
+        if isinstance(value, dict):
+            return [found for key, item in value.items() for found in self.volatile_values(item, key)]
+        if isinstance(value, list):
+            return [found for item in value for found in self.volatile_values(item, field)]
+        if not isinstance(value, str):
+            return []
+        if field in self.volatile_fields:
+            return [value]
+        return [found for _, pattern in self.volatile_patterns for found in pattern.findall(value)]
+
+    def substitutions(self, recorded: Any, current: Any, field: Optional[str] = None) -> Dict[str, str]:
+        """Пары "записанное значение -> текущее" для изменчивых строк запроса"""
+        pairs: Dict[str, str] = {}
+        if isinstance(recorded, dict) and isinstance(current, dict):
+            for key in recorded.keys() & current.keys():
+                pairs.update(self.substitutions(recorded[key], current[key], key))
+        elif isinstance(recorded, list) and isinstance(current, list):
+            for recorded_item, current_item in zip(recorded, current):
+                pairs.update(self.substitutions(recorded_item, current_item, field))
+        elif isinstance(recorded, str) and isinstance(current, str) and recorded != current:
+            if field in self.volatile_fields:
+                # Пустую строку подменять нечем: replace("") вставил бы значение между всеми символами
+                if recorded:
+                    pairs[recorded] = current
+            else:
+                for _, pattern in self.volatile_patterns:
+                    for old, new in zip(pattern.findall(recorded), pattern.findall(current)):
+                        if old != new:
+                            pairs[old] = new
+        return pairs
+
+
+def _substitute(value: Any, pairs: Dict[str, str]) -> Any:
+    if isinstance(value, dict):
+        return {key: _substitute(item, pairs) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_substitute(item, pairs) for item in value]
+    if isinstance(value, str):
+        for old, new in pairs.items():
+            value = value.replace(old, new)
+    return value
+
+
+class Cassette:
+    """Кассета с парами запрос/ответ gRPC и HTTP вызовов.
+
+    Файл состоит только из добавляемых записей: заголовок _FRAME и JSON,
+    сжатый zlib. При записи (--record) каждая пара дописывается сразу после
+    вызова, поэтому прерванный прогон оставляет корректный префикс. При
+    воспроизведении (--replay) индекс строится по одним заголовкам, а тело
+    записи читается и распаковывается только при обращении. Если один ключ
+    встречался несколько раз, ответы отдаются в порядке записи (раньше
+    других - запись, чей запрос после подстановок совпадает с текущим
+    точно), а после последнего повторяется последний.
+    """
+
+    def __init__(self, path: str, mode: str, matcher: Optional[CassetteMatcher] = None):
+        if mode not in (CASSETTE_RECORD, CASSETTE_REPLAY):
+            raise ValueError(f"Неизвестный режим кассеты: {mode}")
+        self.path = path
+        self.mode = mode
+        self.matcher = matcher or CassetteMatcher()
+        self._lock = threading.Lock()
+        self._index: Dict[bytes, List[Tuple[int, int]]] = {}
+        # Уже отданные записи каждого ключа
+        self._used: Dict[bytes, Set[int]] = {}
+        # Записанное изменчивое значение -> текущее, по всем воспроизведенным запросам сессии
+        self._substitutions: Dict[str, str] = {}
+        # Какой текущий запрос получил запись (ключ, номер) и с какой записи пришло текущее значение
+        self._owners: Dict[Tuple[bytes, int], Any] = {}
+        self._sources: Dict[str, Tuple[bytes, int]] = {}
+        self.recorded = 0
+        self.hits = 0
+        self.misses = 0
+
+        try:
+            if mode == CASSETTE_RECORD:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # Новая запись начинает кассету заново
+                self._file = open(path, "wb")
+            else:
+                self._file = open(path, "rb")
+                self._load_index()
+        except OSError as e:
+            raise CassetteError(f"Не удалось открыть кассету {path}: {e}") from e
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == CASSETTE_REPLAY
+
+    def _load_index(self) -> None:
+        offset = 0
+        while True:
+            header = self._file.read(_FRAME.size)
+            if len(header) < _FRAME.size:
+                break
+            digest, length = _FRAME.unpack(header)
+            body_offset = offset + _FRAME.size
+            self._file.seek(length, os.SEEK_CUR)
+            if self._file.tell() > os.fstat(self._file.fileno()).st_size:
+                # Оборванная последняя запись (прогон прерван во время записи)
+                break
+            self._index.setdefault(digest, []).append((body_offset, length))
+            offset = body_offset + length
+
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        return hashlib.sha256(key.encode("utf-8")).digest()
+
+    def record(self, kind: str, target: str, payload: Any, result: Dict[str, Any], elapsed: float = 0.0) -> None:
+        key = self.matcher.key(kind, target, payload)
+        body = zlib.compress(json.dumps({"key": key, "request": payload, "result": result, "elapsed": elapsed}, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            self._file.write(_FRAME.pack(self._digest(key), len(body)))
+            self._file.write(body)
+            self._file.flush()
+            self.recorded += 1
+
+    def _read_entry(self, position: Tuple[int, int]) -> Dict[str, Any]:
+        offset, length = position
+        self._file.seek(offset)
+        return json.loads(zlib.decompress(self._file.read(length)))
+
+    def _pair(self, digest: bytes, index: int, recorded_request: Any, payload: Any) -> None:
+        """Связывает запись с текущим запросом: ее изменчивые значения дальше подменяются значениями запроса"""
+        self._owners[(digest, index)] = payload
+        for recorded, current in self.matcher.substitutions(recorded_request, payload).items():
+            self._substitutions[recorded] = current
+            self._sources[current] = (digest, index)
+
+    def _realias(self, source: Tuple[bytes, int], recorded: str) -> None:
+        """Текущее значение оказалось записанным recorded, а не тем, с чьей записью его связали.
+
+        Так бывает, когда при записи и при воспроизведении объекты создавались
+        в разном порядке (createTrader из пула в фоне): запрос с новым email
+        получил запись про другого трейдера. Переставляем связи: текущий
+        запрос получает запись, где встречается recorded, а ее прежний
+        владелец (если был) - освободившуюся запись.
+        """
+        digest, index = source
+        payload = self._owners.get(source)
+        positions = self._index[digest]
+        for other, position in enumerate(positions):
+            if other == index:
+                continue
+            candidate = self._read_entry(position)
+            if recorded not in self.matcher.volatile_values(candidate["request"]):
+                continue
+            stale = self._read_entry(positions[index])["request"]
+            for old in self.matcher.substitutions(stale, payload):
+                self._substitutions.pop(old, None)
+            previous = self._owners.pop((digest, other), None)
+            self._pair(digest, other, candidate["request"], payload)
+            if previous is not None:
+                self._pair(digest, index, stale, previous)
+            else:
+                del self._owners[source]
+                self._used[digest].discard(index)
+                self._used[digest].add(other)
+            return
+
+    def replay(self, kind: str, target: str, payload: Any, verbose: bool = True) -> Dict[str, Any]:
+        key = self.matcher.key(kind, target, payload)
+        digest = self._digest(key)
+        with self._lock:
+            entries = self._index.get(digest)
+            if not entries:
+                self.misses += 1
+                entry = None
+            else:
+                used = self._used.setdefault(digest, set())
+                candidates = [index for index in range(len(entries)) if index not in used] or [len(entries) - 1]
+                chosen, entry = candidates[0], None
+                # Изменчивые значения в запросе (trader_id из ответа createTrader) выбирают запись про
+                # тот же объект, даже если при записи вызовы шли в другом порядке (пул трейдеров, --workers)
+                if len(entries) > 1 and self.matcher.normalize(payload) != payload:
+                    for index in candidates:
+                        candidate = self._read_entry(entries[index])
+                        if _substitute(candidate["request"], self._substitutions) == payload:
+                            chosen, entry = index, candidate
+                            break
+                if entry is None:
+                    entry = self._read_entry(entries[chosen])
+                used.add(chosen)
+                self.hits += 1
+                for recorded, current in self.matcher.substitutions(entry["request"], payload).items():
+                    source = self._sources.get(current)
+                    if source is not None and self._substitutions.get(recorded) != current:
+                        self._realias(source, recorded)
+                self._pair(digest, chosen, entry["request"], payload)
+                pairs = dict(self._substitutions)
+
+        if entry is None:
+            error = f"Нет записи в кассете {self.path} для {kind} {target}"
+            if verbose:
+                log.error("❌ %s", error)
+            return {
+                "success": False,
+                "error": error
+            }
+
+        return _substitute(entry["result"], pairs) if pairs else entry["result"]
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def _grpc_request(service_method: str, payload: Dict[str, Any], *args, **kwargs) -> Tuple[str, Any]:
+    return service_method, payload
+
+
+def _http_request(method: str, url: str, payload: Dict[str, Any] = None, *args, **kwargs) -> Tuple[str, Any]:
+    # Хост в ключ не входит: кассету, записанную на стенде, можно воспроизводить с любым адресом
+    return f"{method} {urlsplit(url).path}", payload
+
+
+_REQUEST_TARGETS = {"grpc": _grpc_request, "http": _http_request}
+
+
+class CassetteTransport:
+    """Транспорт поверх кассеты: записывает ответы inner или отвечает из кассеты без сети"""
+
+    def __init__(self, cassette: Cassette, kind: str, inner=None):
+        self.cassette = cassette
+        self.kind = kind
+        self.inner = inner
+
+    def call(self, *args, verbose: bool = True, **kwargs) -> Dict[str, Any]:
+        target, payload = _REQUEST_TARGETS[self.kind](*args, **kwargs)
+        if self.cassette.replaying:
+            return self.cassette.replay(self.kind, target, payload, verbose)
+
+        started = time.perf_counter()
+        result = self.inner.call(*args, verbose=verbose, **kwargs)
+        self.cassette.record(self.kind, target, payload, result, time.perf_counter() - started)
+        return result
+
+    def close(self) -> None:
+        if self.inner is not None:
+            self.inner.close()
+
+
+_active: Optional[Cassette] = None
+
+
+def use_cassette(path: str, mode: str) -> Cassette:
+    """Включает запись или воспроизведение для всех транспортов, создаваемых после вызова"""
+    global _active
+    _active = Cassette(path, mode)
+    return _active
+
+
+def active_cassette() -> Optional[Cassette]:
+    return _active
+
+
+def print_cassette_stats() -> None:
+    if _active is None:
+        return
+    if _active.replaying:
+        print(f"📼 Кассета {_active.path}: воспроизведено {_active.hits}, не найдено {_active.misses}")
+    else:
+        print(f"📼 Кассета {_active.path}: записано {_active.recorded} вызовов")
+
+
+def close_cassette() -> None:
+    global _active
+    if _active is not None:
+        _active.close()
+        _active = None
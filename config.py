@@ -8,11 +8,90 @@ class ApiConfig:
     grpc_host: str = "testHost"
     grpc_port: int = 443
     grpc_insecure: bool = False
+    # Транспорт gRPC: "grpcio" (in-process канал), "grpcurl" (процесс на вызов) или "auto"
+    grpc_backend: str = "auto"
+    # Кэш дескрипторов gRPC (server reflection) на диске; TTL в секундах, 0 - без ограничения
+    grpc_descriptor_cache_dir: str = ".grpc_descriptor_cache"
+    grpc_descriptor_cache_ttl: int = 24 * 60 * 60
+    # При загрузке кэша с диска сверять с сервером файлы с сервисами (один короткий обход reflection)
+    grpc_descriptor_startup_check: bool = True
+    # Результат проверки "grpcurl --version" (ключ - путь, размер и mtime бинарника), чтобы не запускать его при каждом старте
+    tool_preflight_cache_path: str = ".grpc_descriptor_cache/preflight.json"
+    # Кэш справочников gwconfig (валюты, регионы, эмитенты, методы оплаты): TTL в секундах, 0 - на всю сессию
+    reference_data_ttl: int = 0
+    # Постраничный обход списков (iter_pages): сколько страниц запрашивается параллельно/заранее
+    pagination_concurrency: int = 4
+    # Массовая отмена офферов при подготовке тестов: одновременных CancelOffer и лимит в секунду (0 - без лимита)
+    offer_cleanup_concurrency: int = 16
+    offer_cleanup_rate: float = 100.0
+    # Ожидание статуса заказа: server-streaming RPC, если сервер его предоставляет (только grpcio), иначе опрос GetOrderById
+    order_status_watch_method: str = "WatchOrder"
+    # Пул подготовленных офферов по статусам: размер пачки и одновременных RPC при подготовке
+    offer_pool_batch_size: int = 4
+    offer_pool_concurrency: int = 8
+    # Локальный стаб шлюза (--stub): задержка ответа и ее разброс в мс, доля и код внедряемых ошибок,
+    # через сколько мс заказ с найденным оффером переходит в PROCESSING
+    stub_latency_ms: float = 0.0
+    stub_latency_jitter_ms: float = 0.0
+    stub_error_rate: float = 0.0
+    stub_error_code: str = "Unavailable"
+    stub_order_processing_ms: int = 200
+    # Прокси сбоев перед grpc_address и http_base_url (--fault-proxy), правило по умолчанию:
+    # распределение задержки в мс (50, uniform/10/50, normal/50/10, exp/30, pareto/20/1.5),
+    # полоса в кбит/с (0 - без ограничения), доли сброшенных соединений и ответов UNAVAILABLE
+    fault_proxy_enabled: bool = False
+    fault_proxy_latency: str = "0"
+    fault_proxy_bandwidth_kbps: float = 0.0
+    fault_proxy_reset_rate: float = 0.0
+    fault_proxy_unavailable_rate: float = 0.0
+    # Имя сервера для TLS и :authority, если канал идет не напрямую (например, через прокси сбоев)
+    grpc_authority: str = ""
     
     # HTTP REST API настройки
     http_host: str = "localhost"
     http_port: int = 10090
+    # Транспорт HTTP: "pool" (in-process keep-alive пул) или "curl" (процесс на запрос)
+    http_backend: str = "pool"
+    http_pool_size: int = 10
+    # Пул заранее созданных трейдеров (HTTP createTrader): размер, порог дозаполнения и параллельность создания
+    trader_pool_size: int = 10
+    trader_pool_low_watermark: int = 3
+    trader_pool_concurrency: int = 8
     
+    # Кассета вызовов для --record/--replay (путь по умолчанию)
+    cassette_path: str = "cassettes/session.cassette"
+    
+    # История прогонов (SQLite): каждый прогон дописывается, "compare" ищет регрессии задержек
+    # относительно regression_baseline_runs предыдущих прогонов на тот же адрес тем же транспортом:
+    # устойчивый z-score выше regression_threshold и рост не меньше regression_min_increase
+    results_history_enabled: bool = True
+    results_history_path: str = "results/history.sqlite"
+    regression_baseline_runs: int = 10
+    regression_threshold: float = 3.0
+    regression_min_increase: float = 0.1
+
+    # Soak-прогон (soak_runner.py): смесь операций с весами и окно замеров в секундах.
+    # Дрейф - медиана последних soak_recent_windows окон против базовой линии из soak_baseline_windows
+    # окон после soak_warmup_windows разогревочных: задержка - устойчивый z выше soak_drift_threshold
+    # и рост не меньше soak_drift_min_increase (методы с меньше чем soak_min_calls вызовов в окне не
+    # сравниваются), ошибки - рост доли на soak_error_rate_drift, RSS - рост на долю soak_rss_drift, FD - на soak_fd_drift
+    soak_mix: str = "create-order=2,offer-churn=2,get-offers=3,get-traders=2,gwconfig=3"
+    soak_sample_interval: float = 60.0
+    soak_warmup_windows: int = 1
+    soak_baseline_windows: int = 5
+    soak_recent_windows: int = 5
+    soak_drift_threshold: float = 3.0
+    soak_drift_min_increase: float = 0.2
+    soak_min_calls: int = 20
+    soak_error_rate_drift: float = 0.01
+    soak_rss_drift: float = 0.2
+    soak_fd_drift: int = 16
+
+    # Вывод тестов и транспортов (harness_log): уровень debug/info/warning/error/quiet
+    # (debug добавляет команды grpcurl/curl) и формат console (эмодзи), plain или json
+    log_level: str = "info"
+    log_format: str = "console"
+
     @property
     def grpc_address(self) -> str:
         """Полный адрес gRPC сервера"""
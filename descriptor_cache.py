@@ -0,0 +1,263 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import DEFAULT_CONFIG
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
+
+
+class DescriptorCache:
+    """Кэш дескрипторов gRPC сервисов с сохранением FileDescriptorSet на диск.
+
+    Кэш привязан к адресу host:port и отпечатку схемы (sha256 от
+    FileDescriptorSet). При старте дескрипторы читаются с диска, а с сервером
+    сверяется только отпечаток файлов с сервисами (список сервисов и их
+    .proto через reflection, без обхода зависимостей): если он изменился,
+    схема загружается заново. Изменения только в зависимых файлах (общие
+    типы) такая проверка не видит - их ловят UNIMPLEMENTED, ParseError
+    запроса и TTL. Если метод не найден в кэше, сервер ответил UNIMPLEMENTED
+    или истек TTL, схема заново загружается через reflection, и при
+    изменившемся отпечатке кэш перезаписывается.
+    """
+
+    def __init__(self, channel, host: str, port: int, cache_dir: Optional[str] = None, ttl_seconds: Optional[int] = None):
+        self.channel = channel
+        self.host = host
+        self.port = port
+        self.cache_dir = cache_dir or DEFAULT_CONFIG.grpc_descriptor_cache_dir
+        self.ttl_seconds = DEFAULT_CONFIG.grpc_descriptor_cache_ttl if ttl_seconds is None else ttl_seconds
+
+        self.fingerprint: Optional[str] = None
+        self.reflection_fetches = 0
+        self.reflection_probes = 0
+
+        self._lock = threading.Lock()
+        self._pool = None
+        self._services: Dict[str, str] = {}
+        self._resolved: Dict[str, Tuple[str, Any, Any]] = {}
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, f"{self.host}_{self.port}.json")
+
+    def _descriptor_set_path(self, fingerprint: str) -> str:
+        return os.path.join(self.cache_dir, f"{self.host}_{self.port}-{fingerprint[:16]}.pb")
+
+    def resolve(self, service_method: str) -> Tuple[str, Any, Any]:
+        """Возвращает (полный путь метода, класс запроса, класс ответа)"""
+        resolved = self._resolved.get(service_method)
+        if resolved is not None:
+            return resolved
+
+        with self._lock:
+            resolved = self._resolved.get(service_method)
+            if resolved is not None:
+                return resolved
+
+            if self._pool is None:
+                self._load()
+
+            method = self._find_method(service_method)
+            if method is None:
+                # Метода нет в сохраненной схеме - возможно, сервер обновился
+                self._fetch_from_reflection()
+                method = self._find_method(service_method)
+            if method is None:
+                raise LookupError(f"Метод {service_method} не найден через server reflection")
+
+            resolved = (
+                f"/{method.containing_service.full_name}/{method.name}",
+                _message_class(method.input_type),
+                _message_class(method.output_type),
+            )
+            self._resolved[service_method] = resolved
+            return resolved
+
+    def describe(self, service_method: str):
+        """Дескриптор метода из текущей схемы или None; reflection повторно не запрашивается"""
+        with self._lock:
+            if self._pool is None:
+                self._load()
+            return self._find_method(service_method)
+
+    def refresh(self) -> bool:
+        """Перечитывает схему через reflection. Возвращает True, если отпечаток изменился"""
+        with self._lock:
+            previous = self.fingerprint
+            self._fetch_from_reflection()
+            return self.fingerprint != previous
+
+    def _find_method(self, service_method: str):
+        normalized = service_method.replace("/", ".")
+
+        if "." in normalized:
+            service_name, method_name = normalized.rsplit(".", 1)
+        else:
+            service_name, method_name = self._services.get(normalized), normalized
+            if service_name is None:
+                return None
+
+        try:
+            service = self._pool.FindServiceByName(service_name)
+        except KeyError:
+            return None
+        return service.methods_by_name.get(method_name)
+
+    def _load(self) -> None:
+        """Загружает схему с диска, а при отсутствии, устаревании или изменении на сервере - через reflection"""
+        database = service_files = None
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            expired = self.ttl_seconds > 0 and time.time() - index["created_at"] > self.ttl_seconds
+            if not expired:
+                with open(self._descriptor_set_path(index["fingerprint"]), "rb") as f:
+                    data = f.read()
+                if hashlib.sha256(data).hexdigest() == index["fingerprint"]:
+                    database, service_files = self._probe()
+                    if service_files is None or _service_files_fingerprint(service_files) == index.get("services_fingerprint"):
+                        self._install(data, index["fingerprint"])
+                        return
+                    log.info("🔄 Схема gRPC сервера %s:%s изменилась - обновляем кэш дескрипторов", self.host, self.port)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        self._fetch_from_reflection(database, service_files)
+
+    def _probe(self) -> Tuple[Any, Optional[List[Any]]]:
+        """Файлы с сервисами сервера для сверки с диском; (None, None), если сверка выключена или не удалась"""
+        if not DEFAULT_CONFIG.grpc_descriptor_startup_check:
+            return None, None
+        from grpc_reflection.v1alpha.proto_reflection_descriptor_database import ProtoReflectionDescriptorDatabase
+
+        self.reflection_probes += 1
+        database = ProtoReflectionDescriptorDatabase(self.channel)
+        try:
+            return database, _service_files(database)
+        except Exception as e:
+            # Сервер недоступен: работаем по схеме с диска, ошибка проявится в самом вызове
+            log.debug("Сверка схемы gRPC через reflection не удалась: %s", e)
+            return None, None
+
+    def _fetch_from_reflection(self, database=None, service_files: Optional[List[Any]] = None) -> None:
+        from google.protobuf import descriptor_pb2
+        from grpc_reflection.v1alpha.proto_reflection_descriptor_database import ProtoReflectionDescriptorDatabase
+
+        self.reflection_fetches += 1
+        if database is None or service_files is None:
+            database = ProtoReflectionDescriptorDatabase(self.channel)
+            service_files = _service_files(database)
+
+        files: Dict[str, Any] = {}
+        pending: List[Any] = list(service_files)
+        while pending:
+            file_proto = pending.pop()
+            if file_proto.name in files:
+                continue
+            files[file_proto.name] = file_proto
+            for dependency in file_proto.dependency:
+                if dependency not in files:
+                    pending.append(database.FindFileByName(dependency))
+
+        descriptor_set = descriptor_pb2.FileDescriptorSet()
+        for name in sorted(files):
+            descriptor_set.file.add().CopyFrom(files[name])
+        data = descriptor_set.SerializeToString(deterministic=True)
+        fingerprint = hashlib.sha256(data).hexdigest()
+
+        self._install(data, fingerprint)
+        self._save(data, fingerprint, _service_files_fingerprint(service_files))
+
+    def _install(self, data: bytes, fingerprint: str) -> None:
+        from google.protobuf import descriptor_pb2, descriptor_pool
+
+        descriptor_set = descriptor_pb2.FileDescriptorSet.FromString(data)
+        by_name = {file_proto.name: file_proto for file_proto in descriptor_set.file}
+        pool = descriptor_pool.DescriptorPool()
+        added = set()
+
+        def add(name: str) -> None:
+            if name in added:
+                return
+            added.add(name)
+            file_proto = by_name.get(name)
+            if file_proto is None:
+                # Стандартные файлы (google/protobuf/*.proto) берем из встроенного пула
+                pool.AddSerializedFile(descriptor_pool.Default().FindFileByName(name).serialized_pb)
+                return
+            for dependency in file_proto.dependency:
+                add(dependency)
+            pool.AddSerializedFile(file_proto.SerializeToString())
+
+        for name in sorted(by_name):
+            add(name)
+
+        services: Dict[str, str] = {}
+        for file_proto in descriptor_set.file:
+            for service in file_proto.service:
+                full_name = f"{file_proto.package}.{service.name}" if file_proto.package else service.name
+                for method in service.method:
+                    services.setdefault(method.name, full_name)
+
+        self._pool = pool
+        self._services = services
+        self._resolved = {}
+        self.fingerprint = fingerprint
+
+    def _save(self, data: bytes, fingerprint: str, services_fingerprint: str) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _atomic_write(self._descriptor_set_path(fingerprint), data)
+            index = {
+                "target": f"{self.host}:{self.port}",
+                "fingerprint": fingerprint,
+                "services_fingerprint": services_fingerprint,
+                "created_at": time.time(),
+            }
+            _atomic_write(self._index_path, json.dumps(index, indent=2).encode("utf-8"))
+
+            # Удаляем наборы дескрипторов с устаревшими отпечатками
+            current = os.path.basename(self._descriptor_set_path(fingerprint))
+            prefix = f"{self.host}_{self.port}-"
+            for name in os.listdir(self.cache_dir):
+                if name.startswith(prefix) and name.endswith(".pb") and name != current:
+                    os.remove(os.path.join(self.cache_dir, name))
+        except OSError as e:
+            log.warning("⚠️ Не удалось сохранить кэш дескрипторов: %s", e)
+
+
+def _service_files(database) -> List[Any]:
+    """FileDescriptorProto файлов, объявляющих сервисы сервера (без зависимостей)"""
+    return [
+        database.FindFileContainingSymbol(service_name)
+        for service_name in database.get_services()
+        if not service_name.startswith("grpc.reflection.")
+    ]
+
+
+def _service_files_fingerprint(service_files: List[Any]) -> str:
+    digest = hashlib.sha256()
+    for file_proto in sorted(service_files, key=lambda file_proto: file_proto.name):
+        digest.update(file_proto.SerializeToString(deterministic=True))
+    return digest.hexdigest()
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _message_class(descriptor):
+    from google.protobuf import message_factory
+
+    if hasattr(message_factory, "GetMessageClass"):
+        return message_factory.GetMessageClass(descriptor)
+    return message_factory.MessageFactory(descriptor.file.pool).GetPrototype(descriptor)
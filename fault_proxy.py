@@ -0,0 +1,436 @@
+import asyncio
+import random
+import re
+import socket
+import struct
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import DEFAULT_CONFIG
+
+
+PROXY_GRPC = "grpc"
+PROXY_HTTP = "http"
+
+_CHUNK_SIZE = 64 * 1024
+# Строка запроса HTTP/1.1 в начале блока: имя метода - последний сегмент пути (createTrader)
+_REQUEST_LINE = re.compile(rb"^(?:GET|POST|PUT|PATCH|DELETE|HEAD|OPTIONS) (\S+) HTTP/1\.[01]\r\n")
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """Распределение задержки в мс: 50, uniform/10/50, normal/50/10, exp/30, pareto/20/1.5"""
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    KINDS = ("fixed", "uniform", "normal", "exp", "pareto")
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        kind, *args = str(spec).strip().split("/")
+        if not args:
+            kind, args = "fixed", [kind]
+        if kind not in cls.KINDS or len(args) > 2:
+            raise ValueError(f"Некорректное распределение задержки: {spec}")
+        try:
+            values = [float(arg) for arg in args] + [0.0]
+        except ValueError:
+            raise ValueError(f"Некорректное распределение задержки: {spec}")
+        return cls(kind, values[0], values[1])
+
+    def sample(self, rng: random.Random) -> float:
+        """Задержка в секундах"""
+        if self.kind == "uniform":
+            ms = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            ms = rng.gauss(self.a, self.b)
+        elif self.kind == "exp":
+            ms = rng.expovariate(1 / self.a) if self.a > 0 else 0.0
+        elif self.kind == "pareto":
+            ms = self.a * rng.paretovariate(self.b or 1.0)
+        else:
+            ms = self.a
+        return max(0.0, ms) / 1000
+
+    def __str__(self) -> str:
+        if self.kind == "fixed":
+            return f"{self.a:g}"
+        return "/".join([self.kind, f"{self.a:g}"] + ([f"{self.b:g}"] if self.kind in ("uniform", "normal", "pareto") else []))
+
+
+@dataclass(frozen=True)
+class FaultRule:
+    """Сбои для соединения или метода: задержка перед отправкой запроса, полоса, сбросы и UNAVAILABLE"""
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    # Ограничение полосы в килобитах в секунду в каждую сторону, 0 - без ограничения
+    bandwidth_kbps: float = 0.0
+    reset_rate: float = 0.0
+    unavailable_rate: float = 0.0
+
+
+def parse_fault_rule(spec: str) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Разбирает "Метод:latency=normal/50/10,reset_rate=0.01" ("*" или без метода - правило по умолчанию)"""
+    method, _, options = spec.rpartition(":")
+    overrides: Dict[str, Any] = {}
+    for option in filter(None, options.split(",")):
+        name, sep, value = option.partition("=")
+        name = name.strip()
+        if not sep or name not in FaultRule.__dataclass_fields__:
+            raise ValueError(f"Некорректное правило сбоев: {option}")
+        if name == "latency":
+            overrides[name] = LatencyDistribution.parse(value)
+        else:
+            try:
+                overrides[name] = float(value)
+            except ValueError:
+                raise ValueError(f"Некорректное правило сбоев: {option}")
+    method = method.strip()
+    return (method if method not in ("", "*") else None), overrides
+
+
+class FaultProfile:
+    """Правило по умолчанию и правила по методам (gRPC метод или последний сегмент HTTP пути).
+
+    Генератор случайных чисел и счетчики общие для всех прокси и оберток
+    транспорта профиля; seed делает последовательность сбоев воспроизводимой.
+    """
+
+    def __init__(self, default: Optional[FaultRule] = None, rules: Optional[Dict[str, FaultRule]] = None, seed: Optional[int] = None):
+        self.default = default or FaultRule()
+        self.rules: Dict[str, FaultRule] = dict(rules or {})
+        self.counters: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_specs(cls, specs: Iterable[str] = (), seed: Optional[int] = None) -> "FaultProfile":
+        """Профиль из настроек fault_proxy_* в config.py и правил вида parse_fault_rule. ValueError при ошибке"""
+        default = FaultRule(
+            LatencyDistribution.parse(DEFAULT_CONFIG.fault_proxy_latency),
+            DEFAULT_CONFIG.fault_proxy_bandwidth_kbps,
+            DEFAULT_CONFIG.fault_proxy_reset_rate,
+            DEFAULT_CONFIG.fault_proxy_unavailable_rate,
+        )
+        parsed = [parse_fault_rule(spec) for spec in specs]
+        for method, overrides in parsed:
+            if method is None:
+                default = replace(default, **overrides)
+        rules: Dict[str, FaultRule] = {}
+        for method, overrides in parsed:
+            if method is not None:
+                rules[method] = replace(rules.get(method, default), **overrides)
+        return cls(default, rules, seed)
+
+    def method_rule(self, method: str) -> Optional[FaultRule]:
+        """Собственное правило метода (None - метод идет по правилу по умолчанию)"""
+        return self.rules.get(method.rsplit("/", 1)[-1].rsplit(".", 1)[-1])
+
+    def rule_for(self, method: str) -> FaultRule:
+        return self.method_rule(method) or self.default
+
+    def chance(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+
+    def sample_latency(self, rule: FaultRule) -> float:
+        with self._lock:
+            return rule.latency.sample(self._random)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+
+def _reset(writer: asyncio.StreamWriter) -> None:
+    """Закрывает соединение с RST вместо FIN, как при обрыве на стороне сервера"""
+    sock = writer.get_extra_info("socket")
+    if sock is not None:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        except OSError:
+            pass
+    writer.transport.abort()
+
+
+def _http_method(data: bytes) -> Optional[str]:
+    match = _REQUEST_LINE.match(data)
+    if match is None:
+        return None
+    return match.group(1).split(b"?", 1)[0].rstrip(b"/").rsplit(b"/", 1)[-1].decode("latin-1")
+
+
+_UNAVAILABLE_BODY = b"fault proxy: upstream unavailable"
+_UNAVAILABLE_RESPONSE = (
+    b"HTTP/1.1 503 Service Unavailable\r\n"
+    b"Content-Type: text/plain; charset=utf-8\r\n"
+    b"Content-Length: %d\r\n"
+    b"Connection: close\r\n"
+    b"\r\n" % len(_UNAVAILABLE_BODY)
+) + _UNAVAILABLE_BODY
+
+
+class FaultProxy:
+    """TCP прокси перед gRPC сервером или HTTP API с внедрением сбоев.
+
+    Работает на уровне байтов, поэтому прозрачен для HTTP/2 и TLS: клиент
+    подключается к listen адресу, прокси открывает свое соединение к
+    upstream и перекачивает данные в обе стороны в отдельном event loop в
+    фоновом потоке. Перед отправкой каждого блока запроса выдерживается
+    задержка из распределения, блоки в обе стороны ограничиваются по
+    полосе, с вероятностью reset_rate оба соединения обрываются RST.
+    UNAVAILABLE для gRPC - отказ в соединении (клиент получает Unavailable),
+    для HTTP - ответ 503. Для HTTP правило выбирается по пути каждого
+    запроса; методы gRPC в заголовках HTTP/2 сжаты HPACK, поэтому их
+    собственные правила применяет FaultInjectingTransport на стороне клиента.
+    """
+
+    def __init__(self, kind: str, upstream_host: str, upstream_port: int, profile: FaultProfile, listen_host: str = "127.0.0.1", listen_port: int = 0):
+        if kind not in (PROXY_GRPC, PROXY_HTTP):
+            raise ValueError(f"Неизвестный вид прокси: {kind}")
+        self.kind = kind
+        self.upstream_host = upstream_host
+        self.upstream_port = upstream_port
+        self.profile = profile
+        self.host = listen_host
+        self.port = listen_port
+        self.counters: Counter = Counter()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name=f"fault-proxy-{kind}", daemon=True)
+
+    @property
+    def upstream(self) -> str:
+        return f"{self.upstream_host}:{self.upstream_port}"
+
+    def start(self) -> None:
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._server = self._loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+            self.port = self._server.sockets[0].getsockname()[1]
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            self._loop.close()
+            return
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    def stop(self) -> None:
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        # Счетчики меняются только в потоке event loop прокси
+        self.counters[name] += amount
+
+    async def _handle(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter) -> None:
+        self._count("connections")
+        rule = self.profile.default
+        if self.kind == PROXY_GRPC and self.profile.chance(rule.unavailable_rate):
+            self._count("unavailable")
+            _reset(client_writer)
+            return
+
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(self.upstream_host, self.upstream_port)
+        except OSError:
+            self._count("upstream_errors")
+            _reset(client_writer)
+            return
+
+        state = {"rule": rule, "closed": False}
+        await asyncio.gather(
+            self._pipe(client_reader, upstream_writer, client_writer, state, outbound=True),
+            self._pipe(upstream_reader, client_writer, upstream_writer, state, outbound=False),
+            return_exceptions=True,
+        )
+        for writer in (client_writer, upstream_writer):
+            if not writer.is_closing():
+                writer.close()
+
+    async def _pipe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, other: asyncio.StreamWriter, state: Dict[str, Any], outbound: bool) -> None:
+        client, upstream = (other, writer) if outbound else (writer, other)
+        try:
+            while not state["closed"]:
+                data = await reader.read(_CHUNK_SIZE)
+                if not data:
+                    break
+
+                if outbound and self.kind == PROXY_HTTP:
+                    method = _http_method(data)
+                    if method is not None:
+                        self._count("requests")
+                        state["rule"] = self.profile.rule_for(method)
+                        if self.profile.chance(state["rule"].unavailable_rate):
+                            self._count("unavailable")
+                            state["closed"] = True
+                            client.write(_UNAVAILABLE_RESPONSE)
+                            await client.drain()
+                            client.close()
+                            upstream.close()
+                            return
+
+                rule: FaultRule = state["rule"]
+                if self.profile.chance(rule.reset_rate):
+                    self._count("resets")
+                    state["closed"] = True
+                    _reset(client)
+                    _reset(upstream)
+                    return
+
+                delay = self.profile.sample_latency(rule) if outbound else 0.0
+                if rule.bandwidth_kbps > 0:
+                    delay += len(data) * 8 / (rule.bandwidth_kbps * 1000)
+                if delay > 0:
+                    self._count("delayed")
+                    await asyncio.sleep(delay)
+
+                self._count("bytes_out" if outbound else "bytes_in", len(data))
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            if not state["closed"] and writer.can_write_eof() and not writer.is_closing():
+                try:
+                    writer.write_eof()
+                except OSError:
+                    pass
+
+
+class FaultInjectingTransport:
+    """Обертка gRPC транспорта: собственные правила методов профиля (задержка, сброс, UNAVAILABLE).
+
+    Прокси не видит имен gRPC методов, поэтому правила вида "CreateOrder:..."
+    применяются здесь, до отправки вызова; правило по умолчанию действует
+    на соединения в FaultProxy.
+    """
+
+    def __init__(self, inner, profile: FaultProfile):
+        self.inner = inner
+        self.profile = profile
+
+    def _inject(self, service_method: str) -> Tuple[float, Optional[Dict[str, Any]]]:
+        from grpc_transport import format_grpc_error
+
+        rule = self.profile.method_rule(service_method)
+        if rule is None:
+            return 0.0, None
+
+        delay = self.profile.sample_latency(rule)
+        if self.profile.chance(rule.reset_rate):
+            self.profile.count("resets")
+            message = "connection reset by peer (fault proxy)"
+        elif self.profile.chance(rule.unavailable_rate):
+            self.profile.count("unavailable")
+            message = f"fault proxy: injected UNAVAILABLE for {service_method}"
+        else:
+            return delay, None
+        return delay, {
+            "success": False,
+            "error": format_grpc_error("Unavailable", message),
+            "stdout": ""
+        }
+
+    def call(self, service_method: str, payload: Dict[str, Any], verbose: bool = True) -> Dict[str, Any]:
+        delay, failure = self._inject(service_method)
+        if delay:
+            time.sleep(delay)
+        if failure is not None:
+            if verbose:
+                print("❌ Ошибка выполнения gRPC вызова (прокси сбоев):")
+                print(f"   STDERR: {failure['error']}")
+            return failure
+        return self.inner.call(service_method, payload, verbose=verbose)
+
+    def __getattr__(self, name: str) -> Any:
+        # descriptors, stream, supports_server_streaming, close и т.д. - у обернутого транспорта
+        return getattr(self.inner, name)
+
+
+class AsyncFaultInjectingTransport(FaultInjectingTransport):
+    """Асинхронный вариант FaultInjectingTransport"""
+
+    async def call(self, service_method: str, payload: Dict[str, Any], verbose: bool = True) -> Dict[str, Any]:
+        delay, failure = self._inject(service_method)
+        if delay:
+            await asyncio.sleep(delay)
+        if failure is not None:
+            return failure
+        return await self.inner.call(service_method, payload, verbose=verbose)
+
+
+_profile: Optional[FaultProfile] = None
+_proxies: List[FaultProxy] = []
+
+
+def active_fault_profile() -> Optional[FaultProfile]:
+    return _profile
+
+
+def start_fault_proxies(grpc_host: str, grpc_port: int, specs: Iterable[str] = ()) -> Tuple[str, int]:
+    """Поднимает прокси перед gRPC сервером и HTTP API и включает профиль сбоев.
+
+    HTTP конфигурация (DEFAULT_CONFIG.http_host/http_port) перенаправляется
+    на свой прокси; возвращается адрес gRPC прокси. TLS проверяется по
+    имени исходного сервера (DEFAULT_CONFIG.grpc_authority). ValueError при
+    неверных правилах, OSError если порт не удалось занять.
+    """
+    global _profile
+    profile = FaultProfile.from_specs(specs)
+
+    grpc_proxy = FaultProxy(PROXY_GRPC, grpc_host, grpc_port, profile)
+    http_proxy = FaultProxy(PROXY_HTTP, DEFAULT_CONFIG.http_host, DEFAULT_CONFIG.http_port, profile)
+    for proxy in (grpc_proxy, http_proxy):
+        proxy.start()
+        _proxies.append(proxy)
+
+    _profile = profile
+    DEFAULT_CONFIG.grpc_authority = DEFAULT_CONFIG.grpc_authority or grpc_host
+    DEFAULT_CONFIG.http_host = http_proxy.host
+    DEFAULT_CONFIG.http_port = http_proxy.port
+    return grpc_proxy.host, grpc_proxy.port
+
+
+def print_fault_proxy_stats() -> None:
+    if _profile is None:
+        return
+    default = _profile.default
+    print(f"🌩️  Прокси сбоев: задержка {default.latency} мс, полоса {default.bandwidth_kbps:g} кбит/с (0 - без ограничения), "
+          f"сбросы {default.reset_rate:g}, UNAVAILABLE {default.unavailable_rate:g}, правил по методам {len(_profile.rules)}")
+    for proxy in _proxies:
+        counters = proxy.counters
+        print(f"   {proxy.kind} {proxy.host}:{proxy.port} -> {proxy.upstream}: соединений {counters['connections']}, "
+              f"задержано блоков {counters['delayed']}, сбросов {counters['resets']}, UNAVAILABLE {counters['unavailable']}, "
+              f"ошибок upstream {counters['upstream_errors']}, {counters['bytes_out']} / {counters['bytes_in']} байт")
+    if _profile.counters:
+        print(f"   gRPC методы: сбросов {_profile.counters['resets']}, UNAVAILABLE {_profile.counters['unavailable']}")
+
+
+def stop_fault_proxies() -> None:
+    global _profile
+    for proxy in _proxies:
+        proxy.stop()
+    _proxies.clear()
+    _profile = None
@@ -0,0 +1,360 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import DEFAULT_CONFIG
+from cassette import CassetteTransport, active_cassette
+from rpc_timing import mark, run_process
+from harness_log import Lazy, get_logger
+
+
+log = get_logger(__name__)
+
+
+# Имена бэкендов транспорта gRPC
+BACKEND_AUTO = "auto"
+BACKEND_GRPCIO = "grpcio"
+BACKEND_GRPCURL = "grpcurl"
+# Локальный стаб шлюза в этом же процессе, без сети (см. stub_gateway)
+BACKEND_STUB = "stub"
+
+GRPC_TIMEOUT_SECONDS = 30
+
+
+def grpcio_available() -> bool:
+    """Проверяет, установлены ли grpcio, grpcio-reflection и protobuf"""
+    try:
+        import grpc  # noqa: F401
+        import grpc_reflection  # noqa: F401
+        import google.protobuf  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def grpcurl_available() -> bool:
+    """Проверяет, что grpcurl установлен и запускается. Успешный запуск "grpcurl --version" запоминается
+    на диске для этого бинарника, поэтому повторные запуски CLI не порождают лишний процесс"""
+    path = shutil.which("grpcurl")
+    if path is None:
+        return False
+    stat = os.stat(path)
+    fingerprint = f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+    cache_path = DEFAULT_CONFIG.tool_preflight_cache_path
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = {}
+    if cached.get("grpcurl") == fingerprint:
+        return True
+
+    try:
+        subprocess.run([path, "--version"], capture_output=True, check=True, timeout=GRPC_TIMEOUT_SECONDS)
+    except (subprocess.SubprocessError, OSError):
+        return False
+
+    cached["grpcurl"] = fingerprint
+    try:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(cached, f)
+    except OSError:
+        pass
+    return True
+
+
+def resolve_backend(backend: Optional[str]) -> str:
+    """Определяет фактический бэкенд: 'auto' выбирает grpcio, если он установлен"""
+    backend = backend or DEFAULT_CONFIG.grpc_backend
+    if backend == BACKEND_AUTO:
+        return BACKEND_GRPCIO if grpcio_available() else BACKEND_GRPCURL
+    if backend not in (BACKEND_GRPCIO, BACKEND_GRPCURL, BACKEND_STUB):
+        raise ValueError(f"Неизвестный gRPC бэкенд: {backend}")
+    return backend
+
+
+def channel_options() -> List[Tuple[str, str]]:
+    """Опции канала grpcio: через прокси TLS и :authority остаются от исходного сервера (grpc_authority)"""
+    authority = DEFAULT_CONFIG.grpc_authority
+    if not authority:
+        return []
+    return [("grpc.ssl_target_name_override", authority), ("grpc.default_authority", authority)]
+
+
+def status_code_name(code) -> str:
+    """Имя статуса в формате grpcurl (NotFound, InvalidArgument, ...)"""
+    if code.name == "CANCELLED":
+        return "Canceled"
+    return "".join(part.capitalize() for part in code.name.split("_"))
+
+
+def format_grpc_error(code_name: str, message: str) -> str:
+    """Формирует текст ошибки так же, как его печатает grpcurl в stderr"""
+    return f"ERROR:\n  Code: {code_name}\n  Message: {message}\n"
+
+
+def refresh_stale_schema(descriptors, error: Exception) -> bool:
+    """Обновляет кэш дескрипторов, если ошибка указывает на устаревшую схему. True - вызов стоит повторить.
+
+    UNIMPLEMENTED означает, что метода нет на сервере под закэшированным путем, ParseError -
+    что поле запроса неизвестно закэшированной схеме. Повтор имеет смысл, только если
+    отпечаток схемы после reflection изменился
+    """
+    import grpc
+    from google.protobuf import json_format
+
+    if isinstance(error, grpc.RpcError):
+        if error.code() != grpc.StatusCode.UNIMPLEMENTED:
+            return False
+    elif not isinstance(error, json_format.ParseError):
+        return False
+    return descriptors.refresh()
+
+
+def result_status(result: Dict[str, Any]) -> str:
+    """Код статуса вызова по результату транспорта: OK, NotFound, Unavailable, Timeout, ..."""
+    if result.get("success"):
+        return "OK"
+    error = result.get("error") or ""
+    if error.startswith("Timeout"):
+        return "Timeout"
+    for line in error.splitlines():
+        line = line.strip()
+        if line.startswith("Code:"):
+            return line[len("Code:"):].strip()
+    return "Unknown"
+
+
+class GrpcurlTransport:
+    """Транспорт, запускающий grpcurl отдельным процессом на каждый вызов"""
+
+    name = BACKEND_GRPCURL
+
+    def __init__(self, host: str, port: int, insecure: bool):
+        self.host = host
+        self.port = port
+        self.insecure = insecure
+
+    @property
+    def target(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def call(self, service_method: str, payload: Dict[str, Any], verbose: bool = True) -> Dict[str, Any]:
+        cmd = [
+            "grpcurl",
+            "-emit-defaults",
+            "-plaintext" if self.insecure else "",
+            *(["-authority", DEFAULT_CONFIG.grpc_authority] if DEFAULT_CONFIG.grpc_authority else []),
+            "-d", json.dumps(payload),
+            self.target,
+            service_method
+        ]
+
+        cmd = [arg for arg in cmd if arg]
+
+        if verbose:
+            log.debug("🚀 Выполняем команду: %s", Lazy(" ".join, cmd))
+
+        try:
+            result = run_process(cmd, GRPC_TIMEOUT_SECONDS)
+
+            if result.returncode != 0:
+                if verbose:
+                    log.error("❌ Ошибка выполнения grpcurl:\n   STDERR: %s", result.stderr)
+                return {
+                    "success": False,
+                    "error": result.stderr,
+                    "stdout": result.stdout
+                }
+
+            try:
+                response_data = json.loads(result.stdout)
+                mark("decode")
+                return {
+                    "success": True,
+                    "response": response_data,
+                    "raw_stdout": result.stdout
+                }
+            except json.JSONDecodeError as e:
+                if verbose:
+                    log.error("❌ Ошибка парсинга JSON: %s\n   Сырой ответ: %s", e, result.stdout)
+                return {
+                    "success": False,
+                    "error": f"JSON parse error: {e}",
+                    "raw_stdout": result.stdout
+                }
+
+        except subprocess.TimeoutExpired:
+            return {
+                "success": False,
+                "error": f"Timeout: запрос выполнялся более {GRPC_TIMEOUT_SECONDS} секунд"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Неожиданная ошибка: {e}"
+            }
+
+    def close(self) -> None:
+        pass
+
+
+class GrpcioTransport:
+    """Транспорт на grpcio: один долгоживущий канал и кэш дескрипторов методов"""
+
+    name = BACKEND_GRPCIO
+
+    def __init__(self, host: str, port: int, insecure: bool):
+        import grpc
+
+        self.host = host
+        self.port = port
+        self.insecure = insecure
+
+        if insecure:
+            self.channel = grpc.insecure_channel(self.target, options=channel_options())
+        else:
+            self.channel = grpc.secure_channel(self.target, grpc.ssl_channel_credentials(), options=channel_options())
+
+        from descriptor_cache import DescriptorCache
+
+        self.descriptors = DescriptorCache(self.channel, host, port)
+        self._callables: Dict[Tuple[str, Any], Any] = {}
+
+    @property
+    def target(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def _unary_callable(self, path: str, request_class, response_class):
+        # Ключ включает класс запроса: после обновления схемы нужны новые сериализаторы
+        key = (path, request_class)
+        stub = self._callables.get(key)
+        if stub is None:
+            stub = self.channel.unary_unary(
+                path,
+                request_serializer=request_class.SerializeToString,
+                response_deserializer=response_class.FromString,
+            )
+            self._callables[key] = stub
+        return stub
+
+    def _invoke(self, service_method: str, payload: Dict[str, Any]):
+        from google.protobuf import json_format
+
+        path, request_class, response_class = self.descriptors.resolve(service_method)
+        stub = self._unary_callable(path, request_class, response_class)
+        mark("acquire")
+        request = json_format.ParseDict(payload, request_class())
+        mark("send")
+        # Подключение канала (при первом вызове), отправка и ожидание ответа неразделимы для unary вызова
+        response = stub(request, timeout=GRPC_TIMEOUT_SECONDS)
+        mark("response")
+        return response
+
+    def call(self, service_method: str, payload: Dict[str, Any], verbose: bool = True) -> Dict[str, Any]:
+        import grpc
+        from google.protobuf import json_format
+
+        if verbose:
+            log.debug("🚀 Выполняем gRPC вызов: %s -> %s (%s)", service_method, self.target, self.name)
+
+        try:
+            try:
+                response = self._invoke(service_method, payload)
+            except (grpc.RpcError, json_format.ParseError) as e:
+                # Схема на сервере могла измениться - обновляем кэш и повторяем один раз
+                if not refresh_stale_schema(self.descriptors, e):
+                    raise
+                response = self._invoke(service_method, payload)
+            response_data = message_to_dict(response)
+            raw_stdout = json.dumps(response_data, indent=2, ensure_ascii=False)
+            mark("decode")
+            return {
+                "success": True,
+                "response": response_data,
+                "raw_stdout": raw_stdout
+            }
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+                return {
+                    "success": False,
+                    "error": f"Timeout: запрос выполнялся более {GRPC_TIMEOUT_SECONDS} секунд"
+                }
+            error = format_grpc_error(status_code_name(e.code()), e.details() or "")
+            if verbose:
+                log.error("❌ Ошибка выполнения gRPC вызова:\n   STDERR: %s", error)
+            return {
+                "success": False,
+                "error": error,
+                "stdout": ""
+            }
+        except json_format.ParseError as e:
+            return {
+                "success": False,
+                "error": f"Error invoking method \"{service_method}\": {e}",
+                "stdout": ""
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Неожиданная ошибка: {e}"
+            }
+
+    def close(self) -> None:
+        self.channel.close()
+
+
+def message_to_dict(message) -> Dict[str, Any]:
+    """Сериализует ответ в JSON-словарь так же, как grpcurl -emit-defaults"""
+    from google.protobuf import json_format
+
+    try:
+        return json_format.MessageToDict(message, always_print_fields_with_no_presence=True)
+    except TypeError:
+        return json_format.MessageToDict(message, including_default_value_fields=True)
+
+
+_transports: Dict[Tuple[str, int, bool, str], Any] = {}
+_transports_lock = threading.Lock()
+
+
+def get_grpc_transport(host: str, port: int, insecure: bool, backend: Optional[str] = None):
+    """Возвращает общий транспорт для адреса, создавая его при первом обращении"""
+    backend = resolve_backend(backend)
+    key = (host, port, insecure, backend)
+
+    transport = _transports.get(key)
+    if transport is None:
+        with _transports_lock:
+            transport = _transports.get(key)
+            if transport is None:
+                if backend == BACKEND_STUB:
+                    from stub_gateway import StubGrpcTransport as transport_class
+                else:
+                    transport_class = GrpcioTransport if backend == BACKEND_GRPCIO else GrpcurlTransport
+                cassette = active_cassette()
+                if cassette is None:
+                    transport = transport_class(host, port, insecure)
+                else:
+                    transport = CassetteTransport(cassette, "grpc", None if cassette.replaying else transport_class(host, port, insecure))
+                # Собственные правила gRPC методов прокси сбоев (сам прокси видит только соединения).
+                # Прокси запускает раннер, импортируя fault_proxy; без него модуль (и asyncio) не грузим
+                fault_proxy = sys.modules.get("fault_proxy")
+                profile = fault_proxy.active_fault_profile() if fault_proxy else None
+                if profile is not None and profile.rules:
+                    transport = fault_proxy.FaultInjectingTransport(transport, profile)
+                _transports[key] = transport
+    return transport
+
+
+def close_grpc_transports() -> None:
+    """Закрывает все открытые каналы"""
+    with _transports_lock:
+        for transport in _transports.values():
+            transport.close()
+        _transports.clear()
@@ -1,4 +1,10 @@
 from base_tester import BaseGrpcTester
+from suite_registry import register_test
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
+
 
 class CurrencyTester(BaseGrpcTester):
     
@@ -62,17 +68,19 @@ class CurrencyTester(BaseGrpcTester):
         
         return tests_passed
     
+    @register_test("currency", "currencies", "USD Currency (ID=1)", tags=("grpc", "read"), cli_overrides=("currency_id",), currency_id=1)
+    @register_test("currency", "currencies", "ETH Currency (ID=15)", tags=("grpc", "read"), cli_overrides=("currency_id",), currency_id=15)
     def test_get_currency(self, currency_id: int = 1) -> bool:
         
-        print(f"\n🧪 Тестируем GetCurrency с ID = {currency_id}")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetCurrency с ID = %s", currency_id)
+        log.info("=" * 50)
         
         payload = {"id": currency_id}
         
         result = self.run_grpcurl("GetCurrency", payload)
         
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -83,7 +91,7 @@ class CurrencyTester(BaseGrpcTester):
         response = result["response"]
         
         if "getCurrencyResponse" not in response:
-            print("❌ Ответ не содержит getCurrencyResponse")
+            log.error("❌ Ответ не содержит getCurrencyResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -95,7 +103,7 @@ class CurrencyTester(BaseGrpcTester):
         currency = currency_response.get("currency")
         
         if not currency:
-            print("❌ Ответ не содержит currency")
+            log.error("❌ Ответ не содержит currency")
             self.test_results.append({
                 "test": "Наличие currency", 
                 "status": "FAIL", 
@@ -123,6 +131,8 @@ class CurrencyTester(BaseGrpcTester):
         
         # Валидируем свойства валюты
         tests_passed = self._validate_currency_properties(currency, f"GetCurrency ID={currency_id}", expected_values)
+        # Элемент должен совпадать с тем же id в справочнике GetCurrencies (из кэша сессии, без RPC)
+        tests_passed &= self.assert_matches_reference("currencies", currency, f"GetCurrency ID={currency_id}")
         
         # Записываем результат
         self.test_results.append({
@@ -133,17 +143,20 @@ class CurrencyTester(BaseGrpcTester):
         
         return tests_passed
     
+    @register_test("currency_error", "currencies", "Currency Error (ID=100)", tags=("grpc", "read", "negative"), currency_id=100)
     def test_get_currency_error(self, currency_id: int = 100) -> bool:
+        # Если такая валюта все же есть в справочнике, берем заведомо отсутствующий id
+        currency_id = self.missing_reference_id("currencies", currency_id)
         
-        print(f"\n🧪 Тестируем GetCurrency с несуществующим ID = {currency_id}")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetCurrency с несуществующим ID = %s", currency_id)
+        log.info("=" * 50)
         
         payload = {"id": currency_id}
         
         result = self.run_grpcurl("GetCurrency", payload)
         
         if result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
                 "test": f"GetCurrency Error ID={currency_id}",
                 "status": "FAIL",
@@ -153,7 +166,7 @@ class CurrencyTester(BaseGrpcTester):
         
         error_msg = result.get("error", "").lower()
         if "currency not found" in error_msg:
-            print("✅ Получена ожидаемая ошибка")
+            log.info("✅ Получена ожидаемая ошибка")
             self.test_results.append({
                 "test": f"GetCurrency Error ID={currency_id}",
                 "status": "PASS",
@@ -161,7 +174,7 @@ class CurrencyTester(BaseGrpcTester):
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {result.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", result.get('error'))
             self.test_results.append({
                 "test": f"GetCurrency Error ID={currency_id}",
                 "status": "FAIL",
@@ -169,9 +182,10 @@ class CurrencyTester(BaseGrpcTester):
             })
             return False
     
+    @register_test("currencies_default", "currencies", "GetCurrencies Default", tags=("grpc", "read"))
     def test_get_currencies_default(self) -> bool:
         try:
-            print("🔍 Тестируем GetCurrencies без параметров...")
+            log.info("🔍 Тестируем GetCurrencies без параметров...")
             
             payload = {}
             result = self.run_grpcurl("GetCurrencies", payload)
@@ -219,7 +233,7 @@ class CurrencyTester(BaseGrpcTester):
             return tests_passed
             
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetCurrencies Default",
                 "status": "FAIL",
@@ -227,9 +241,10 @@ class CurrencyTester(BaseGrpcTester):
             })
             return False
     
+    @register_test("currencies_order_code", "currencies", "GetCurrencies Order by Code DESC", tags=("grpc", "read"))
     def test_get_currencies_order_code_desc(self) -> bool:
         try:
-            print("🔍 Тестируем GetCurrencies с сортировкой по code DESC...")
+            log.info("🔍 Тестируем GetCurrencies с сортировкой по code DESC...")
             
             payload = {
                 "order": {
@@ -274,7 +289,7 @@ class CurrencyTester(BaseGrpcTester):
             return tests_passed
             
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetCurrencies Order Code DESC",
                 "status": "FAIL",
@@ -282,9 +297,10 @@ class CurrencyTester(BaseGrpcTester):
             })
             return False
     
+    @register_test("currencies_order_decimal", "currencies", "GetCurrencies Order by Decimal ASC", tags=("grpc", "read"))
     def test_get_currencies_order_decimal_asc(self) -> bool:
         try:
-            print("🔍 Тестируем GetCurrencies с сортировкой по decimal ASC...")
+            log.info("🔍 Тестируем GetCurrencies с сортировкой по decimal ASC...")
             
             payload = {
                 "order": {
@@ -329,7 +345,7 @@ class CurrencyTester(BaseGrpcTester):
             return tests_passed
             
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetCurrencies Order Decimal ASC",
                 "status": "FAIL",
@@ -337,9 +353,10 @@ class CurrencyTester(BaseGrpcTester):
             })
             return False
     
+    @register_test("currencies_pagination", "currencies", "GetCurrencies Pagination", tags=("grpc", "read"))
     def test_get_currencies_pagination(self) -> bool:
         try:
-            print("🔍 Тестируем GetCurrencies с пагинацией...")
+            log.info("🔍 Тестируем GetCurrencies с пагинацией...")
             
             payload = {
                 "pagination": {
@@ -395,7 +412,7 @@ class CurrencyTester(BaseGrpcTester):
             return tests_passed
             
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetCurrencies Pagination",
                 "status": "FAIL",
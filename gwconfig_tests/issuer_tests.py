@@ -1,17 +1,25 @@
 from base_tester import BaseGrpcTester
+from suite_registry import register_test
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
+
 
 class IssuerTester(BaseGrpcTester):
 
+    @register_test("issuer", "issuers", "Any Issuer (ID=1)", tags=("grpc", "read"), cli_overrides=("issuer_id",), issuer_id=1)
+    @register_test("issuer", "issuers", "VK Pay Issuer (ID=216)", tags=("grpc", "read"), cli_overrides=("issuer_id",), issuer_id=216)
     def test_get_issuer(self, issuer_id: int = 1) -> bool:
-        print(f"\n🧪 Тестируем GetIssuer с ID = {issuer_id}")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetIssuer с ID = %s", issuer_id)
+        log.info("=" * 50)
 
         payload = {"id": issuer_id}
 
         result = self.run_grpcurl("GetIssuer", payload)
 
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -20,7 +28,7 @@ class IssuerTester(BaseGrpcTester):
             return False
         response = result["response"]
         if "getIssuerResponse" not in response:
-            print("❌ Ответ не содержит getIssuerResponse")
+            log.error("❌ Ответ не содержит getIssuerResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -30,7 +38,7 @@ class IssuerTester(BaseGrpcTester):
         issuer_response = response["getIssuerResponse"]
         issuer = issuer_response.get("issuer")
         if not issuer:
-            print("❌ Ответ не содержит issuer")
+            log.error("❌ Ответ не содержит issuer")
             self.test_results.append({
                 "test": "Наличие issuer", 
                 "status": "FAIL", 
@@ -52,20 +60,25 @@ class IssuerTester(BaseGrpcTester):
             tests_passed &= self.assert_equal(issuer.get("issuerName"), "VK Pay", "Issuer name = VK Pay")
             tests_passed &= self.assert_equal(issuer.get("issuerType"), "bank", "Issuer type = bank")
             tests_passed &= self.assert_equal(issuer.get("issuerCode"), "", "Issuer code = empty")
+        # Элемент должен совпадать с тем же id в справочнике GetIssuers (из кэша сессии, без RPC)
+        tests_passed &= self.assert_matches_reference("issuers", issuer, f"GetIssuer ID={issuer_id}")
         self.test_results.append({
             "test": f"GetIssuer ID={issuer_id}",
             "status": "PASS" if tests_passed else "FAIL",
             "details": "Тест пройден успешно" if tests_passed else "Один или несколько тестов провалились"
         })
         return tests_passed
+    @register_test("issuer_error", "issuers", "Issuer Error (ID=217)", tags=("grpc", "read", "negative"), issuer_id=217)
     def test_get_issuer_error(self, issuer_id: int = 217) -> bool:
+        # Если такой эмитент все же есть в справочнике, берем заведомо отсутствующий id
+        issuer_id = self.missing_reference_id("issuers", issuer_id)
 
-        print(f"\n🧪 Тестируем GetIssuer с несуществующим ID = {issuer_id}")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetIssuer с несуществующим ID = %s", issuer_id)
+        log.info("=" * 50)
         payload = {"id": issuer_id}
         result = self.run_grpcurl("GetIssuer", payload)
         if result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
                 "test": f"GetIssuer Error ID={issuer_id}",
                 "status": "FAIL",
@@ -74,7 +87,7 @@ class IssuerTester(BaseGrpcTester):
             return False
         error_msg = result.get("error", "").lower()
         if "issuer not found" in error_msg:
-            print("✅ Получена ожидаемая ошибка")
+            log.info("✅ Получена ожидаемая ошибка")
             self.test_results.append({
                 "test": f"GetIssuer Error ID={issuer_id}",
                 "status": "PASS",
@@ -82,7 +95,7 @@ class IssuerTester(BaseGrpcTester):
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {result.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", result.get('error'))
             self.test_results.append({
                 "test": f"GetIssuer Error ID={issuer_id}",
                 "status": "FAIL",
@@ -90,10 +103,11 @@ class IssuerTester(BaseGrpcTester):
             })
             return False
 
+    @register_test("issuers_default", "issuers", "GetIssuers Default", tags=("grpc", "read"))
     def test_get_issuers_default(self) -> bool:
 
         try:
-            print("🔍 Тестируем GetIssuers без параметров...")
+            log.info("🔍 Тестируем GetIssuers без параметров...")
             payload = {}
             result = self.run_grpcurl("GetIssuers", payload)
             if result is None:
@@ -151,16 +165,17 @@ class IssuerTester(BaseGrpcTester):
             })
             return tests_passed
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetIssuers Default",
                 "status": "FAIL",
                 "details": f"Ошибка: {e}"
             })
             return False
+    @register_test("issuers_order_name", "issuers", "GetIssuers Order by Name DESC", tags=("grpc", "read"))
     def test_get_issuers_order_name_desc(self) -> bool:
         try:
-            print("🔍 Тестируем GetIssuers с сортировкой по issuer_name DESC...")
+            log.info("🔍 Тестируем GetIssuers с сортировкой по issuer_name DESC...")
             payload = {
                 "order": {
                     "order_by": "issuer_name",
@@ -220,16 +235,17 @@ class IssuerTester(BaseGrpcTester):
             })
             return tests_passed
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetIssuers Order Name DESC",
                 "status": "FAIL",
                 "details": f"Ошибка: {e}"
             })
             return False
+    @register_test("issuers_pagination", "issuers", "GetIssuers Pagination", tags=("grpc", "read"))
     def test_get_issuers_pagination(self) -> bool:
         try:
-            print("🔍 Тестируем GetIssuers с пагинацией...")
+            log.info("🔍 Тестируем GetIssuers с пагинацией...")
             payload = {
                 "pagination": {
                     "limit": "5",
@@ -294,7 +310,7 @@ class IssuerTester(BaseGrpcTester):
             })
             return tests_passed
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetIssuers Pagination",
                 "status": "FAIL",
@@ -1,14 +1,25 @@
 from base_tester import BaseGrpcTester
+from pagination import PageFetchError
+from reference_data import REFERENCE_DATA
+from suite_registry import register_test
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
+
+
 class PaymentMethodTester(BaseGrpcTester):
     
+    @register_test("payment_method", "payment-methods", "Card Number Method (ID=1)", tags=("grpc", "read"), cli_overrides=("payment_method_id",), payment_method_id=1)
+    @register_test("payment_method", "payment-methods", "Phone Number Method (ID=26)", tags=("grpc", "read"), cli_overrides=("payment_method_id",), payment_method_id=26)
     def test_get_payment_method(self, payment_method_id: int = 1) -> bool:
 
-        print(f"\n🧪 Тестируем GetPaymentMethod с ID = {payment_method_id}")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetPaymentMethod с ID = %s", payment_method_id)
+        log.info("=" * 50)
         payload = {"id": payment_method_id}
         result = self.run_grpcurl("GetPaymentMethod", payload)
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -17,7 +28,7 @@ class PaymentMethodTester(BaseGrpcTester):
             return False
         response = result["response"]
         if "getPaymentMethodResponse" not in response:
-            print("❌ Ответ не содержит getPaymentMethodResponse")
+            log.error("❌ Ответ не содержит getPaymentMethodResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -27,7 +38,7 @@ class PaymentMethodTester(BaseGrpcTester):
         payment_method_response = response["getPaymentMethodResponse"]
         payment_method = payment_method_response.get("paymentMethod")
         if not payment_method:
-            print("❌ Ответ не содержит paymentMethod")
+            log.error("❌ Ответ не содержит paymentMethod")
             self.test_results.append({
                 "test": "Наличие paymentMethod", 
                 "status": "FAIL", 
@@ -76,14 +87,15 @@ class PaymentMethodTester(BaseGrpcTester):
             "details": "Тест пройден успешно" if tests_passed else "Один или несколько тестов провалились"
         })
         return tests_passed
+    @register_test("payment_method_error", "payment-methods", "PaymentMethod Error (ID=1000)", tags=("grpc", "read", "negative"), payment_method_id=1000)
     def test_get_payment_method_error(self, payment_method_id: int = 1000) -> bool:
 
-        print(f"\n🧪 Тестируем GetPaymentMethod с несуществующим ID = {payment_method_id}")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetPaymentMethod с несуществующим ID = %s", payment_method_id)
+        log.info("=" * 50)
         payload = {"id": payment_method_id}
         result = self.run_grpcurl("GetPaymentMethod", payload)
         if result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
                 "test": f"GetPaymentMethod Error ID={payment_method_id}",
                 "status": "FAIL",
@@ -92,7 +104,7 @@ class PaymentMethodTester(BaseGrpcTester):
             return False
         error_msg = result.get("error", "").lower()
         if "payment method not found" in error_msg or "not found" in error_msg:
-            print("✅ Получена ожидаемая ошибка")
+            log.info("✅ Получена ожидаемая ошибка")
             self.test_results.append({
                 "test": f"GetPaymentMethod Error ID={payment_method_id}",
                 "status": "PASS",
@@ -100,17 +112,18 @@ class PaymentMethodTester(BaseGrpcTester):
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {result.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", result.get('error'))
             self.test_results.append({
                 "test": f"GetPaymentMethod Error ID={payment_method_id}",
                 "status": "FAIL",
                 "details": f"Неожиданная ошибка: {result.get('error')}"
             })
             return False
+    @register_test("payment_methods_default", "payment-methods", "GetPaymentMethods Default", tags=("grpc", "read"))
     def test_get_payment_methods_default(self) -> bool:
 
         try:
-            print("🔍 Тестируем GetPaymentMethods без параметров...")
+            log.info("🔍 Тестируем GetPaymentMethods без параметров...")
             payload = {}
             result = self.run_grpcurl("GetPaymentMethods", payload)
             if result is None:
@@ -171,17 +184,18 @@ class PaymentMethodTester(BaseGrpcTester):
             })
             return tests_passed
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetPaymentMethods Default",
                 "status": "FAIL",
                 "details": f"Ошибка: {e}"
             })
             return False
+    @register_test("payment_methods_order_id", "payment-methods", "GetPaymentMethods Order by ID DESC", tags=("grpc", "read"))
     def test_get_payment_methods_order_id_desc(self) -> bool:
 
         try:
-            print("🔍 Тестируем GetPaymentMethods с сортировкой по id DESC...")
+            log.info("🔍 Тестируем GetPaymentMethods с сортировкой по id DESC...")
             payload = {
                 "order": {
                     "order_by": "id",
@@ -255,19 +269,20 @@ class PaymentMethodTester(BaseGrpcTester):
             })
             return tests_passed
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetPaymentMethods Order ID DESC",
                 "status": "FAIL",
                 "details": f"Ошибка: {e}"
             })
             return False
+    @register_test("payment_methods_pagination", "payment-methods", "GetPaymentMethods Pagination", tags=("grpc", "read"))
     def test_get_payment_methods_pagination(self) -> bool:
         try:
-            print("🔍 Тестируем GetPaymentMethods с пагинацией...")
+            log.info("🔍 Тестируем GetPaymentMethods с пагинацией...")
             
             # Шаг 1: Получаем все методы платежей без пагинации
-            print("📋 Получаем все методы платежей...")
+            log.info("📋 Получаем все методы платежей...")
             result_all = self.run_grpcurl("GetPaymentMethods", {})
             if result_all is None or not result_all.get("success", False):
                 self.test_results.append({
@@ -301,7 +316,7 @@ class PaymentMethodTester(BaseGrpcTester):
             element_5 = payment_methods_all[5] if len(payment_methods_all) > 5 else None
             
             # Шаг 2: Получаем методы с пагинацией (offset=5, limit=5)
-            print("📄 Получаем методы с пагинацией (offset=5, limit=5)...")
+            log.info("📄 Получаем методы с пагинацией (offset=5, limit=5)...")
             payload = {
                 "pagination": {
                     "limit": "5",
@@ -359,21 +374,22 @@ class PaymentMethodTester(BaseGrpcTester):
             })
             return tests_passed
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetPaymentMethods Pagination",
                 "status": "FAIL",
                 "details": f"Ошибка: {e}"
             })
             return False
+    @register_test("payment_methods_filter", "payment-methods", "GetPaymentMethods Filter", tags=("grpc", "read"))
     def test_get_payment_methods_filter(self) -> bool:
-        print(f"\n🧪 Тестируем GetPaymentMethods с различными фильтрами")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetPaymentMethods с различными фильтрами")
+        log.info("=" * 50)
         
         tests_passed = True
         
         # Тест 1: Фильтр по currency_id = 3
-        print("\n🔍 Тест 1: Фильтр по currency_id = 3")
+        log.info("\n🔍 Тест 1: Фильтр по currency_id = 3")
         payload1 = {"filter": {"currency_id": 3}}
         result1 = self.run_grpcurl("GetPaymentMethods", payload1)
         
@@ -382,33 +398,33 @@ class PaymentMethodTester(BaseGrpcTester):
             if "getPaymentMethodsResponse" in response1:
                 payment_methods1 = response1["getPaymentMethodsResponse"].get("paymentMethods", [])
                 total_count1 = response1["getPaymentMethodsResponse"].get("totalCount", 0)
-                print(f"📊 Найдено {len(payment_methods1)} методов платежей с currency_id = 3")
-                print(f"📊 total_count = {total_count1}")
+                log.info("📊 Найдено %s методов платежей с currency_id = 3", len(payment_methods1))
+                log.info("📊 total_count = %s", total_count1)
                 
                 # Проверяем, что total_count равен количеству элементов
                 if int(total_count1) != len(payment_methods1):
-                    print(f"❌ total_count ({total_count1}) не равен количеству элементов ({len(payment_methods1)})")
+                    log.error("❌ total_count (%s) не равен количеству элементов (%s)", total_count1, len(payment_methods1))
                     tests_passed = False
                 else:
-                    print(f"✅ total_count соответствует количеству элементов")
+                    log.info("✅ total_count соответствует количеству элементов")
                 
                 # Проверяем, что все методы имеют currency_id = 3
                 for i, method in enumerate(payment_methods1):
                     currency_id = method.get("currencyId")
                     if currency_id != 3:
-                        print(f"❌ Метод {i+1} имеет currency_id = {currency_id}, ожидался 3")
+                        log.error("❌ Метод %s имеет currency_id = %s, ожидался 3", i + 1, currency_id)
                         tests_passed = False
                     else:
-                        print(f"✅ Метод {i+1} ({method.get('name', 'unknown')}) currency_id = 3")
+                        log.info("✅ Метод %s (%s) currency_id = 3", i + 1, method.get('name', 'unknown'))
             else:
-                print("❌ Неправильная структура ответа для currency_id фильтра")
+                log.error("❌ Неправильная структура ответа для currency_id фильтра")
                 tests_passed = False
         else:
-            print(f"❌ Ошибка запроса с currency_id фильтром: {result1['error']}")
+            log.error("❌ Ошибка запроса с currency_id фильтром: %s", result1['error'])
             tests_passed = False
         
         # Тест 2: Фильтр по direction = "PAYIN"
-        print("\n🔍 Тест 2: Фильтр по direction = 'PAYIN'")
+        log.info("\n🔍 Тест 2: Фильтр по direction = 'PAYIN'")
         payload2 = {"filter": {"direction": "PAYIN"}}
         result2 = self.run_grpcurl("GetPaymentMethods", payload2)
         
@@ -417,33 +433,33 @@ class PaymentMethodTester(BaseGrpcTester):
             if "getPaymentMethodsResponse" in response2:
                 payment_methods2 = response2["getPaymentMethodsResponse"].get("paymentMethods", [])
                 total_count2 = response2["getPaymentMethodsResponse"].get("totalCount", 0)
-                print(f"📊 Найдено {len(payment_methods2)} методов платежей с direction = 'PAYIN'")
-                print(f"📊 total_count = {total_count2}")
+                log.info("📊 Найдено %s методов платежей с direction = 'PAYIN'", len(payment_methods2))
+                log.info("📊 total_count = %s", total_count2)
                 
                 # Проверяем, что total_count равен количеству элементов
                 if int(total_count2) != len(payment_methods2):
-                    print(f"❌ total_count ({total_count2}) не равен количеству элементов ({len(payment_methods2)})")
+                    log.error("❌ total_count (%s) не равен количеству элементов (%s)", total_count2, len(payment_methods2))
                     tests_passed = False
                 else:
-                    print(f"✅ total_count соответствует количеству элементов")
+                    log.info("✅ total_count соответствует количеству элементов")
                 
                 # Проверяем, что все методы имеют direction = "PAYIN"
                 for i, method in enumerate(payment_methods2):
                     direction = method.get("direction")
                     if direction != "PAYIN":
-                        print(f"❌ Метод {i+1} имеет direction = {direction}, ожидался PAYIN")
+                        log.error("❌ Метод %s имеет direction = %s, ожидался PAYIN", i + 1, direction)
                         tests_passed = False
                     else:
-                        print(f"✅ Метод {i+1} ({method.get('name', 'unknown')}) direction = PAYIN")
+                        log.info("✅ Метод %s (%s) direction = PAYIN", i + 1, method.get('name', 'unknown'))
             else:
-                print("❌ Неправильная структура ответа для direction фильтра")
+                log.error("❌ Неправильная структура ответа для direction фильтра")
                 tests_passed = False
         else:
-            print(f"❌ Ошибка запроса с direction фильтром: {result2['error']}")
+            log.error("❌ Ошибка запроса с direction фильтром: %s", result2['error'])
             tests_passed = False
         
         # Тест 3: Фильтр по is_active = true
-        print("\n🔍 Тест 3: Фильтр по is_active = true")
+        log.info("\n🔍 Тест 3: Фильтр по is_active = true")
         payload3 = {"filter": {"is_active": True}}
         result3 = self.run_grpcurl("GetPaymentMethods", payload3)
         
@@ -452,33 +468,33 @@ class PaymentMethodTester(BaseGrpcTester):
             if "getPaymentMethodsResponse" in response3:
                 payment_methods3 = response3["getPaymentMethodsResponse"].get("paymentMethods", [])
                 total_count3 = response3["getPaymentMethodsResponse"].get("totalCount", 0)
-                print(f"📊 Найдено {len(payment_methods3)} активных методов платежей")
-                print(f"📊 total_count = {total_count3}")
+                log.info("📊 Найдено %s активных методов платежей", len(payment_methods3))
+                log.info("📊 total_count = %s", total_count3)
                 
                 # Проверяем, что total_count равен количеству элементов
                 if int(total_count3) != len(payment_methods3):
-                    print(f"❌ total_count ({total_count3}) не равен количеству элементов ({len(payment_methods3)})")
+                    log.error("❌ total_count (%s) не равен количеству элементов (%s)", total_count3, len(payment_methods3))
                     tests_passed = False
                 else:
-                    print(f"✅ total_count соответствует количеству элементов")
+                    log.info("✅ total_count соответствует количеству элементов")
                 
                 # Проверяем, что все методы активны
                 for i, method in enumerate(payment_methods3):
                     is_active = method.get("isActive")
                     if is_active != True:
-                        print(f"❌ Метод {i+1} имеет is_active = {is_active}, ожидался true")
+                        log.error("❌ Метод %s имеет is_active = %s, ожидался true", i + 1, is_active)
                         tests_passed = False
                     else:
-                        print(f"✅ Метод {i+1} ({method.get('name', 'unknown')}) is_active = true")
+                        log.info("✅ Метод %s (%s) is_active = true", i + 1, method.get('name', 'unknown'))
             else:
-                print("❌ Неправильная структура ответа для is_active фильтра")
+                log.error("❌ Неправильная структура ответа для is_active фильтра")
                 tests_passed = False
         else:
-            print(f"❌ Ошибка запроса с is_active фильтром: {result3['error']}")
+            log.error("❌ Ошибка запроса с is_active фильтром: %s", result3['error'])
             tests_passed = False
         
         # Тест 4: Фильтр по payment_method_type_id = 1
-        print("\n🔍 Тест 4: Фильтр по payment_method_type_id = 1")
+        log.info("\n🔍 Тест 4: Фильтр по payment_method_type_id = 1")
         payload4 = {"filter": {"payment_method_type_id": 1}}
         result4 = self.run_grpcurl("GetPaymentMethods", payload4)
         
@@ -487,33 +503,33 @@ class PaymentMethodTester(BaseGrpcTester):
             if "getPaymentMethodsResponse" in response4:
                 payment_methods4 = response4["getPaymentMethodsResponse"].get("paymentMethods", [])
                 total_count4 = response4["getPaymentMethodsResponse"].get("totalCount", 0)
-                print(f"📊 Найдено {len(payment_methods4)} методов платежей с payment_method_type_id = 1")
-                print(f"📊 total_count = {total_count4}")
+                log.info("📊 Найдено %s методов платежей с payment_method_type_id = 1", len(payment_methods4))
+                log.info("📊 total_count = %s", total_count4)
                 
                 # Проверяем, что total_count равен количеству элементов
                 if int(total_count4) != len(payment_methods4):
-                    print(f"❌ total_count ({total_count4}) не равен количеству элементов ({len(payment_methods4)})")
+                    log.error("❌ total_count (%s) не равен количеству элементов (%s)", total_count4, len(payment_methods4))
                     tests_passed = False
                 else:
-                    print(f"✅ total_count соответствует количеству элементов")
+                    log.info("✅ total_count соответствует количеству элементов")
                 
                 # Проверяем, что все методы имеют payment_method_type_id = 1
                 for i, method in enumerate(payment_methods4):
                     type_id = method.get("paymentMethodTypeId")
                     if type_id != 1:
-                        print(f"❌ Метод {i+1} имеет payment_method_type_id = {type_id}, ожидался 1")
+                        log.error("❌ Метод %s имеет payment_method_type_id = %s, ожидался 1", i + 1, type_id)
                         tests_passed = False
                     else:
-                        print(f"✅ Метод {i+1} ({method.get('name', 'unknown')}) payment_method_type_id = 1")
+                        log.info("✅ Метод %s (%s) payment_method_type_id = 1", i + 1, method.get('name', 'unknown'))
             else:
-                print("❌ Неправильная структура ответа для payment_method_type_id фильтра")
+                log.error("❌ Неправильная структура ответа для payment_method_type_id фильтра")
                 tests_passed = False
         else:
-            print(f"❌ Ошибка запроса с payment_method_type_id фильтром: {result4['error']}")
+            log.error("❌ Ошибка запроса с payment_method_type_id фильтром: %s", result4['error'])
             tests_passed = False
         
         # Тест 5: Фильтр по region_id = 8
-        print("\n🔍 Тест 5: Фильтр по region_id = 8")
+        log.info("\n🔍 Тест 5: Фильтр по region_id = 8")
         payload5 = {"filter": {"region_id": 8}}
         result5 = self.run_grpcurl("GetPaymentMethods", payload5)
         
@@ -522,29 +538,29 @@ class PaymentMethodTester(BaseGrpcTester):
             if "getPaymentMethodsResponse" in response5:
                 payment_methods5 = response5["getPaymentMethodsResponse"].get("paymentMethods", [])
                 total_count5 = response5["getPaymentMethodsResponse"].get("totalCount", 0)
-                print(f"📊 Найдено {len(payment_methods5)} методов платежей с region_id = 8")
-                print(f"📊 total_count = {total_count5}")
+                log.info("📊 Найдено %s методов платежей с region_id = 8", len(payment_methods5))
+                log.info("📊 total_count = %s", total_count5)
                 
                 # Проверяем, что total_count равен количеству элементов
                 if int(total_count5) != len(payment_methods5):
-                    print(f"❌ total_count ({total_count5}) не равен количеству элементов ({len(payment_methods5)})")
+                    log.error("❌ total_count (%s) не равен количеству элементов (%s)", total_count5, len(payment_methods5))
                     tests_passed = False
                 else:
-                    print(f"✅ total_count соответствует количеству элементов")
+                    log.info("✅ total_count соответствует количеству элементов")
                 
                 # Проверяем, что все методы имеют region_id = 8
                 for i, method in enumerate(payment_methods5):
                     region_id = method.get("regionId")
                     if region_id != 8:
-                        print(f"❌ Метод {i+1} имеет region_id = {region_id}, ожидался 8")
+                        log.error("❌ Метод %s имеет region_id = %s, ожидался 8", i + 1, region_id)
                         tests_passed = False
                     else:
-                        print(f"✅ Метод {i+1} ({method.get('name', 'unknown')}) region_id = 8")
+                        log.info("✅ Метод %s (%s) region_id = 8", i + 1, method.get('name', 'unknown'))
             else:
-                print("❌ Неправильная структура ответа для region_id фильтра")
+                log.error("❌ Неправильная структура ответа для region_id фильтра")
                 tests_passed = False
         else:
-            print(f"❌ Ошибка запроса с region_id фильтром: {result5['error']}")
+            log.error("❌ Ошибка запроса с region_id фильтром: %s", result5['error'])
             tests_passed = False
 
         self.test_results.append({
@@ -554,14 +570,22 @@ class PaymentMethodTester(BaseGrpcTester):
         })
         return tests_passed
 
+    @register_test("create_payment_method_default", "payment-methods", "CreatePaymentMethod Default", tags=("grpc", "write"), exclusive=("payment-methods",))
     def test_create_payment_method_default(self) -> bool:
-        print(f"\n🧪 Тестируем создание PaymentMethod - базовый тест")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем создание PaymentMethod - базовый тест")
+        log.info("=" * 50)
 
-        payload1 = {}
-        last_id = self.run_grpcurl("GetPaymentMethods", payload1)
-        last_id = last_id.get("response", {}).get("getPaymentMethodsResponse", {}).get("paymentMethods", [{}])[0].get("id")
-        print(f"🔍 Последний ID: {last_id}")
+        try:
+            last_id = self.reference_data("payment_methods").max_id
+        except PageFetchError as e:
+            log.error("❌ Не удалось получить методы оплаты: %s", e.error)
+            self.test_results.append({
+                "test": "Получение методов оплаты", 
+                "status": "FAIL", 
+                "details": f"Ошибка: {e.error}"
+            })
+            return False
+        log.info("🔍 Последний ID: %s", last_id)
         
         payload = {
                 "currency_id": 3,
@@ -577,9 +601,11 @@ class PaymentMethodTester(BaseGrpcTester):
         }
         
         result = self.run_grpcurl("CreatePaymentMethod", payload)
+        # Список методов оплаты изменился - кэшированный справочник больше не актуален
+        REFERENCE_DATA.invalidate_after("CreatePaymentMethod")
         
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -590,7 +616,7 @@ class PaymentMethodTester(BaseGrpcTester):
         response = result["response"]
         
         if "createPaymentMethodResponse" not in response:
-            print("❌ Ответ не содержит createPaymentMethodResponse")
+            log.error("❌ Ответ не содержит createPaymentMethodResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -602,7 +628,7 @@ class PaymentMethodTester(BaseGrpcTester):
         payment_method = create_payment_method_response.get("paymentMethod")
         
         if not payment_method:
-            print("❌ Ответ не содержит paymentMethod")
+            log.error("❌ Ответ не содержит paymentMethod")
             self.test_results.append({
                 "test": "Наличие paymentMethod", 
                 "status": "FAIL", 
@@ -623,7 +649,10 @@ class PaymentMethodTester(BaseGrpcTester):
         tests_passed &= self.assert_has_property(payment_method, "paymentMethodLogoId", "paymentMethod имеет поле paymentMethodLogoId")
         tests_passed &= self.assert_has_property(payment_method, "paymentMethodCode", "paymentMethod имеет поле paymentMethodCode")
         
-        tests_passed &= self.assert_equal(payment_method.get("id"), last_id+1, f"id = {last_id+1}")
+        if last_id is None:
+            log.warning("⚠️ Справочник методов оплаты был пуст - id нового метода не проверяется")
+        else:
+            tests_passed &= self.assert_equal(payment_method.get("id"), last_id + 1, f"id = {last_id + 1}")
         tests_passed &= self.assert_equal(payment_method.get("isActive"), False, "isActive = false")
         tests_passed &= self.assert_equal(payment_method.get("direction"), "PAYIN", "direction = PAYIN")
         tests_passed &= self.assert_equal(payment_method.get("name"), "test_new_pm1", "name = test_new_pm1")
@@ -1,18 +1,25 @@
 from base_tester import BaseGrpcTester
+from suite_registry import register_test
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
 
 
 class PaymentMethodTypeTester(BaseGrpcTester):
     
+    @register_test("payment_method_type", "payment-types", "Credit Card Type (ID=1)", tags=("grpc", "read"), cli_overrides=("payment_method_type_id",), payment_method_type_id=1)
+    @register_test("payment_method_type", "payment-types", "Instant Payment Type (ID=2)", tags=("grpc", "read"), cli_overrides=("payment_method_type_id",), payment_method_type_id=2)
     def test_get_payment_method_type(self, payment_method_type_id: int = 1) -> bool:
-        print(f"\n🧪 Тестируем GetPaymentMethodType с ID = {payment_method_type_id}")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetPaymentMethodType с ID = %s", payment_method_type_id)
+        log.info("=" * 50)
         
         payload = {"id": payment_method_type_id}
         
         result = self.run_grpcurl("GetPaymentMethodType", payload)
         
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -23,7 +30,7 @@ class PaymentMethodTypeTester(BaseGrpcTester):
         response = result["response"]
         
         if "getPaymentMethodTypeResponse" not in response:
-            print("❌ Ответ не содержит getPaymentMethodTypeResponse")
+            log.error("❌ Ответ не содержит getPaymentMethodTypeResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -35,7 +42,7 @@ class PaymentMethodTypeTester(BaseGrpcTester):
         payment_method_type = payment_method_type_response.get("paymentMethodType")
         
         if not payment_method_type:
-            print("❌ Ответ не содержит paymentMethodType")
+            log.error("❌ Ответ не содержит paymentMethodType")
             self.test_results.append({
                 "test": "Наличие paymentMethodType", 
                 "status": "FAIL", 
@@ -66,16 +73,17 @@ class PaymentMethodTypeTester(BaseGrpcTester):
         
         return tests_passed
     
+    @register_test("payment_method_type_error", "payment-types", "PaymentMethodType Error (ID=3)", tags=("grpc", "read", "negative"), payment_method_type_id=3)
     def test_get_payment_method_type_error(self, payment_method_type_id: int = 3) -> bool:
-        print(f"\n🧪 Тестируем GetPaymentMethodType с несуществующим ID = {payment_method_type_id}")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetPaymentMethodType с несуществующим ID = %s", payment_method_type_id)
+        log.info("=" * 50)
         
         payload = {"id": payment_method_type_id}
         
         result = self.run_grpcurl("GetPaymentMethodType", payload)
         
         if result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
                 "test": f"GetPaymentMethodType Error ID={payment_method_type_id}",
                 "status": "FAIL",
@@ -85,7 +93,7 @@ class PaymentMethodTypeTester(BaseGrpcTester):
         
         error_msg = result.get("error", "").lower()
         if "payment method type not found" in error_msg:
-            print("✅ Получена ожидаемая ошибка")
+            log.info("✅ Получена ожидаемая ошибка")
             self.test_results.append({
                 "test": f"GetPaymentMethodType Error ID={payment_method_type_id}",
                 "status": "PASS",
@@ -93,7 +101,7 @@ class PaymentMethodTypeTester(BaseGrpcTester):
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {result.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", result.get('error'))
             self.test_results.append({
                 "test": f"GetPaymentMethodType Error ID={payment_method_type_id}",
                 "status": "FAIL",
@@ -101,9 +109,10 @@ class PaymentMethodTypeTester(BaseGrpcTester):
             })
             return False
     
+    @register_test("payment_method_types_default", "payment-types", "GetPaymentMethodTypes Default", tags=("grpc", "read"))
     def test_get_payment_method_types_default(self) -> bool:
         try:
-            print("🔍 Тестируем GetPaymentMethodTypes без параметров...")
+            log.info("🔍 Тестируем GetPaymentMethodTypes без параметров...")
             
             payload = {}
             
@@ -174,7 +183,7 @@ class PaymentMethodTypeTester(BaseGrpcTester):
             return tests_passed
             
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetPaymentMethodTypes Default",
                 "status": "FAIL",
@@ -182,9 +191,10 @@ class PaymentMethodTypeTester(BaseGrpcTester):
             })
             return False
     
+    @register_test("payment_method_types_order_name", "payment-types", "GetPaymentMethodTypes Order by Name ASC", tags=("grpc", "read"))
     def test_get_payment_method_types_order_name_asc(self) -> bool:
         try:
-            print("🔍 Тестируем GetPaymentMethodTypes с сортировкой по name ASC...")
+            log.info("🔍 Тестируем GetPaymentMethodTypes с сортировкой по name ASC...")
             
             payload = {
                 "order": {
@@ -256,7 +266,7 @@ class PaymentMethodTypeTester(BaseGrpcTester):
             return tests_passed
             
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetPaymentMethodTypes Order Name ASC",
                 "status": "FAIL",
@@ -264,9 +274,10 @@ class PaymentMethodTypeTester(BaseGrpcTester):
             })
             return False
     
+    @register_test("payment_method_types_pagination", "payment-types", "GetPaymentMethodTypes Pagination", tags=("grpc", "read"))
     def test_get_payment_method_types_pagination(self) -> bool:
         try:
-            print("🔍 Тестируем GetPaymentMethodTypes с пагинацией...")
+            log.info("🔍 Тестируем GetPaymentMethodTypes с пагинацией...")
             
             payload = {
                 "pagination": {
@@ -343,7 +354,7 @@ class PaymentMethodTypeTester(BaseGrpcTester):
             return tests_passed
             
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetPaymentMethodTypes Pagination",
                 "status": "FAIL",
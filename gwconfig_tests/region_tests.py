@@ -1,18 +1,24 @@
 from base_tester import BaseGrpcTester
+from suite_registry import register_test
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
 
 
 class RegionTester(BaseGrpcTester):
     
+    @register_test("region", "regions", "UA Region (ID=1)", tags=("grpc", "read"), cli_overrides=("region_id",), region_id=1)
     def test_get_region(self, region_id: int = 1) -> bool:
-        print(f"\n🧪 Тестируем GetRegion с ID = {region_id}")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetRegion с ID = %s", region_id)
+        log.info("=" * 50)
         
         payload = {"id": region_id}
         
         result = self.run_grpcurl("GetRegion", payload)
         
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -23,7 +29,7 @@ class RegionTester(BaseGrpcTester):
         response = result["response"]
         
         if "getRegionResponse" not in response:
-            print("❌ Ответ не содержит getRegionResponse")
+            log.error("❌ Ответ не содержит getRegionResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -35,7 +41,7 @@ class RegionTester(BaseGrpcTester):
         region = region_response.get("region")
         
         if not region:
-            print("❌ Ответ не содержит region")
+            log.error("❌ Ответ не содержит region")
             self.test_results.append({
                 "test": "Наличие region", 
                 "status": "FAIL", 
@@ -51,6 +57,8 @@ class RegionTester(BaseGrpcTester):
         if region_id == 1:
             tests_passed &= self.assert_equal(region.get("id"), 1, "Region id = 1")
             tests_passed &= self.assert_equal(region.get("title"), "UA", "Region title = UA")
+        # Элемент должен совпадать с тем же id в справочнике GetRegions (из кэша сессии, без RPC)
+        tests_passed &= self.assert_matches_reference("regions", region, f"GetRegion ID={region_id}")
         
         self.test_results.append({
             "test": f"GetRegion ID={region_id}",
@@ -60,16 +68,19 @@ class RegionTester(BaseGrpcTester):
         
         return tests_passed
     
+    @register_test("region_error", "regions", "Region Error (ID=100)", tags=("grpc", "read", "negative"), region_id=100)
     def test_get_region_error(self, region_id: int = 100) -> bool:
-        print(f"\n🧪 Тестируем GetRegion с несуществующим ID = {region_id}")
-        print("=" * 50)
+        # Если такой регион все же есть в справочнике, берем заведомо отсутствующий id
+        region_id = self.missing_reference_id("regions", region_id)
+        log.info("\n🧪 Тестируем GetRegion с несуществующим ID = %s", region_id)
+        log.info("=" * 50)
         
         payload = {"id": region_id}
         
         result = self.run_grpcurl("GetRegion", payload)
         
         if result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
                 "test": f"GetRegion Error ID={region_id}",
                 "status": "FAIL",
@@ -79,7 +90,7 @@ class RegionTester(BaseGrpcTester):
         
         error_msg = result.get("error", "").lower()
         if "region not found" in error_msg:
-            print("✅ Получена ожидаемая ошибка")
+            log.info("✅ Получена ожидаемая ошибка")
             self.test_results.append({
                 "test": f"GetRegion Error ID={region_id}",
                 "status": "PASS",
@@ -87,7 +98,7 @@ class RegionTester(BaseGrpcTester):
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {result.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", result.get('error'))
             self.test_results.append({
                 "test": f"GetRegion Error ID={region_id}",
                 "status": "FAIL",
@@ -95,9 +106,10 @@ class RegionTester(BaseGrpcTester):
             })
             return False
     
+    @register_test("regions_default", "regions", "GetRegions Default", tags=("grpc", "read"))
     def test_get_regions_default(self) -> bool:
         try:
-            print("🔍 Тестируем GetRegions без параметров...")
+            log.info("🔍 Тестируем GetRegions без параметров...")
             
             payload = {}
             
@@ -166,7 +178,7 @@ class RegionTester(BaseGrpcTester):
             return tests_passed
             
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetRegions Default",
                 "status": "FAIL",
@@ -174,9 +186,10 @@ class RegionTester(BaseGrpcTester):
             })
             return False
     
+    @register_test("regions_order", "regions", "GetRegions Order by ID ASC", tags=("grpc", "read"))
     def test_get_regions_order_code_desc(self) -> bool:
         try:
-            print("🔍 Тестируем GetRegions с сортировкой по id DESC...")
+            log.info("🔍 Тестируем GetRegions с сортировкой по id DESC...")
             
             payload = {
                 "order": {
@@ -246,7 +259,7 @@ class RegionTester(BaseGrpcTester):
             return tests_passed
             
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetRegions Order ID DESC",
                 "status": "FAIL",
@@ -254,9 +267,10 @@ class RegionTester(BaseGrpcTester):
             })
             return False
     
+    @register_test("regions_order_title", "regions", "GetRegions Order by Title ASC", tags=("grpc", "read"))
     def test_get_regions_order_title_asc(self) -> bool:
         try:
-            print("🔍 Тестируем GetRegions с сортировкой по title ASC...")
+            log.info("🔍 Тестируем GetRegions с сортировкой по title ASC...")
             
             payload = {
                 "order": {
@@ -326,7 +340,7 @@ class RegionTester(BaseGrpcTester):
             return tests_passed
             
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetRegions Order Title ASC",
                 "status": "FAIL",
@@ -334,9 +348,10 @@ class RegionTester(BaseGrpcTester):
             })
             return False
     
+    @register_test("regions_pagination", "regions", "GetRegions Pagination", tags=("grpc", "read"))
     def test_get_regions_pagination(self) -> bool:
         try:
-            print("🔍 Тестируем GetRegions с пагинацией...")
+            log.info("🔍 Тестируем GetRegions с пагинацией...")
             
             payload = {
                 "pagination": {
@@ -411,7 +426,7 @@ class RegionTester(BaseGrpcTester):
             return tests_passed
             
         except Exception as e:
-            print(f"❌ Ошибка при выполнении теста: {e}")
+            log.error("❌ Ошибка при выполнении теста: %s", e)
             self.test_results.append({
                 "test": "GetRegions Pagination",
                 "status": "FAIL",
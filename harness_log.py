@@ -0,0 +1,126 @@
+import json
+import logging
+import re
+import sys
+import time
+from typing import Any, Callable, Dict
+
+from config import DEFAULT_CONFIG
+
+
+# Все логгеры обвязки - потомки "harness"; вывод настраивается одним configure_logging
+ROOT_LOGGER = "harness"
+
+# --quiet: выше любого уровня, вызовы log.* сразу возвращаются без форматирования
+QUIET = logging.CRITICAL + 10
+logging.addLevelName(QUIET, "QUIET")
+
+LOG_LEVELS: Dict[str, int] = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "quiet": QUIET,
+}
+
+# Эмодзи консольного вывода (форматы plain и json их убирают)
+_PICTOGRAPHS = re.compile("[\u2300-\u23ff\u2600-\u27bf\u2b00-\u2bff\ufe0f\u200d\U0001f000-\U0001faff]")
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Вывод как раньше через print: сообщение без префиксов, с эмодзи"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return record.getMessage()
+
+
+class PlainFormatter(logging.Formatter):
+    """Строка для логов CI: время, уровень, модуль и сообщение без эмодзи и пустых строк"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = _PICTOGRAPHS.sub("", record.getMessage()).strip()
+        timestamp = time.strftime("%H:%M:%S", time.localtime(record.created))
+        return f"{timestamp}.{int(record.msecs):03d} {record.levelname:<7} {_short_name(record.name)}: {message}"
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна JSON-строка на запись (для сборщиков логов)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": _short_name(record.name),
+            "thread": record.threadName,
+            "message": _PICTOGRAPHS.sub("", record.getMessage()).strip(),
+        }, ensure_ascii=False)
+
+
+LOG_FORMATS: Dict[str, Callable[[], logging.Formatter]] = {
+    "console": ConsoleFormatter,
+    "plain": PlainFormatter,
+    "json": JsonFormatter,
+}
+
+
+def _short_name(name: str) -> str:
+    return name[len(ROOT_LOGGER) + 1:] if name.startswith(ROOT_LOGGER + ".") else name
+
+
+class StdoutHandler(logging.Handler):
+    """Пишет в текущий sys.stdout, а не в захваченный при создании: параллельный раннер
+    подменяет sys.stdout, чтобы собрать вывод каждого теста отдельно"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            sys.stdout.write(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+
+class Lazy:
+    """Аргумент лога, вычисляемый только при форматировании записи:
+    log.debug("🚀 Команда: %s", Lazy(" ".join, cmd))"""
+
+    __slots__ = ("func", "args", "kwargs")
+
+    def __init__(self, func: Callable[..., Any], *args: Any, **kwargs: Any):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self) -> str:
+        return str(self.func(*self.args, **self.kwargs))
+
+
+_root = logging.getLogger(ROOT_LOGGER)
+_handler = StdoutHandler()
+_handler.setFormatter(ConsoleFormatter())
+_root.addHandler(_handler)
+_root.setLevel(logging.INFO)
+_root.propagate = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Логгер модуля: get_logger(__name__). Сообщения - %-шаблоны, аргументы форматируются
+    только если уровень включен"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def configure_logging(level: str = "info", fmt: str = "console") -> None:
+    """Уровень (debug, info, warning, error, quiet) и формат (console, plain, json) вывода обвязки"""
+    if level not in LOG_LEVELS:
+        raise ValueError(f"Неизвестный уровень логов: {level}")
+    if fmt not in LOG_FORMATS:
+        raise ValueError(f"Неизвестный формат логов: {fmt}")
+    _root.setLevel(LOG_LEVELS[level])
+    _handler.setFormatter(LOG_FORMATS[fmt]())
+
+
+def add_logging_arguments(parser) -> None:
+    """Общие для раннеров флаги --log-level/--quiet/--verbose и --log-format"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--log-level", choices=list(LOG_LEVELS), default=DEFAULT_CONFIG.log_level, help=f"Подробность вывода тестов (по умолчанию: {DEFAULT_CONFIG.log_level})")
+    group.add_argument("-q", "--quiet", dest="log_level", action="store_const", const="quiet", help="Без вывода шагов тестов и команд транспорта, только итоги")
+    group.add_argument("-v", "--verbose", dest="log_level", action="store_const", const="debug", help="Печатать и команды/вызовы транспорта")
+    parser.add_argument("--log-format", choices=list(LOG_FORMATS), default=DEFAULT_CONFIG.log_format, help=f"Формат вывода тестов (по умолчанию: {DEFAULT_CONFIG.log_format})")
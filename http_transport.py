@@ -0,0 +1,375 @@
+import http.client
+import json
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from config import DEFAULT_CONFIG
+from cassette import CassetteTransport, active_cassette
+from rpc_timing import mark, run_process
+from harness_log import Lazy, get_logger
+
+
+log = get_logger(__name__)
+
+
+# Имена бэкендов HTTP транспорта
+HTTP_BACKEND_POOL = "pool"
+HTTP_BACKEND_CURL = "curl"
+
+HTTP_TIMEOUT_SECONDS = 30
+
+# Методы, которые можно безопасно повторить, если соединение оборвалось после отправки запроса
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+
+def retry_on_fresh_connection(method: str, error: BaseException) -> bool:
+    """Можно ли повторить запрос, упавший на переиспользованном keep-alive соединении.
+
+    RemoteDisconnected - сервер закрыл соединение, не прислав ни байта ответа (обычный
+    признак простаивавшего соединения). Сброс в середине обмена повторяется только для
+    идемпотентных методов: POST (createTrader) мог уже выполниться на сервере
+    """
+    return isinstance(error, http.client.RemoteDisconnected) or method.upper() in IDEMPOTENT_METHODS
+
+
+def parse_response_body(body: str, verbose: bool) -> Dict[str, Any]:
+    """Разбирает тело ответа так же, как это делалось для вывода curl"""
+    # Проверяем, что ответ не пустой
+    if not body.strip():
+        if verbose:
+            log.error("❌ Пустой ответ от сервера")
+        return {
+            "success": False,
+            "error": "Empty response from server",
+            "stdout": ""
+        }
+
+    try:
+        response_data = json.loads(body)
+        return {
+            "success": True,
+            "response": response_data,
+            "raw_stdout": body
+        }
+    except json.JSONDecodeError as e:
+        if verbose:
+            log.error("❌ Ошибка парсинга JSON: %s\n   Сырой ответ: %s", e, body)
+        return {
+            "success": False,
+            "error": f"JSON parse error: {e}",
+            "raw_stdout": body
+        }
+
+
+def build_headers(payload: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+    request_headers = dict(headers or {})
+    # Добавляем Content-Type для JSON по умолчанию
+    if payload and not any("content-type" in h.lower() for h in request_headers.keys()):
+        request_headers["Content-Type"] = "application/json"
+    return request_headers
+
+
+class CurlHttpTransport:
+    """HTTP транспорт, запускающий curl отдельным процессом на каждый запрос"""
+
+    name = HTTP_BACKEND_CURL
+
+    def call(self, method: str, url: str, payload: Dict[str, Any] = None, headers: Dict[str, str] = None, verbose: bool = True) -> Dict[str, Any]:
+        cmd = ["curl", "-s", "-X", method.upper()]
+
+        for key, value in build_headers(payload, headers).items():
+            cmd.extend(["-H", f"{key}: {value}"])
+
+        # Добавляем тело запроса
+        if payload:
+            cmd.extend(["-d", json.dumps(payload)])
+
+        cmd.append(url)
+
+        if verbose:
+            log.debug("🚀 Выполняем HTTP запрос: %s", Lazy(" ".join, cmd))
+
+        try:
+            result = run_process(cmd, HTTP_TIMEOUT_SECONDS)
+
+            if result.returncode != 0:
+                if verbose:
+                    log.error("❌ Ошибка выполнения curl:\n   STDERR: %s", result.stderr)
+                return {
+                    "success": False,
+                    "error": result.stderr,
+                    "stdout": result.stdout
+                }
+
+            parsed = parse_response_body(result.stdout, verbose)
+            mark("decode")
+            return parsed
+
+        except subprocess.TimeoutExpired:
+            return {
+                "success": False,
+                "error": f"Timeout: запрос выполнялся более {HTTP_TIMEOUT_SECONDS} секунд"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Неожиданная ошибка: {e}"
+            }
+
+    def close(self) -> None:
+        pass
+
+
+class HttpConnectionPool:
+    """Ограниченный пул keep-alive соединений к одному origin (scheme://host:port)"""
+
+    def __init__(self, scheme: str, host: str, port: int, max_size: int = DEFAULT_CONFIG.http_pool_size):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.max_size = max_size
+
+        self._idle = deque()
+        self._open = 0
+        self._condition = threading.Condition()
+
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.connect_time_total = 0.0
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(self.host, self.port, timeout=HTTP_TIMEOUT_SECONDS)
+        mark("acquire")
+        started = time.perf_counter()
+        connection.connect()
+        elapsed = time.perf_counter() - started
+        mark("connect")
+        with self._condition:
+            self.connections_created += 1
+            self.connect_time_total += elapsed
+        return connection
+
+    def acquire(self, fresh: bool = False) -> Tuple[http.client.HTTPConnection, bool]:
+        """Возвращает (соединение, переиспользовано ли оно). Блокируется, если пул исчерпан"""
+        with self._condition:
+            while not self._idle and self._open >= self.max_size:
+                self._condition.wait()
+            if self._idle:
+                if not fresh:
+                    self.connections_reused += 1
+                    return self._idle.pop(), True
+                # Нужно новое соединение: освобождаем слот, закрывая простаивающее
+                self._idle.popleft().close()
+            else:
+                self._open += 1
+
+        try:
+            return self._new_connection(), False
+        except Exception:
+            self._discard_slot()
+            raise
+
+    def release(self, connection: http.client.HTTPConnection, reusable: bool) -> None:
+        if not reusable:
+            connection.close()
+            self._discard_slot()
+            return
+        with self._condition:
+            self._idle.append(connection)
+            self._condition.notify()
+
+    def _discard_slot(self) -> None:
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    def _exchange(self, connection: http.client.HTTPConnection, method: str, path: str, body: Optional[bytes], headers: Dict[str, str]) -> Tuple[http.client.HTTPResponse, bytes]:
+        mark("acquire")
+        connection.request(method, path, body=body, headers=headers)
+        mark("send")
+        response = connection.getresponse()
+        mark("ttfb")
+        data = response.read()
+        mark("response")
+        return response, data
+
+    def request(self, method: str, path: str, body: Optional[bytes], headers: Dict[str, str]) -> Tuple[int, bytes]:
+        with self._condition:
+            self.requests += 1
+
+        connection, reused = self.acquire()
+        try:
+            response, data = self._exchange(connection, method, path, body, headers)
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+            self.release(connection, reusable=False)
+            if not reused or not retry_on_fresh_connection(method, e):
+                raise
+            # Сервер закрыл простаивающее keep-alive соединение - повторяем на новом
+            connection, _ = self.acquire(fresh=True)
+            try:
+                response, data = self._exchange(connection, method, path, body, headers)
+            except Exception:
+                self.release(connection, reusable=False)
+                raise
+        except Exception:
+            self.release(connection, reusable=False)
+            raise
+
+        self.release(connection, reusable=not response.will_close)
+        return response.status, data
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика пула: число запросов, доля переиспользованных соединений, время подключения"""
+        with self._condition:
+            acquisitions = self.connections_created + self.connections_reused
+            return {
+                "origin": f"{self.scheme}://{self.host}:{self.port}",
+                "requests": self.requests,
+                "connections_created": self.connections_created,
+                "connections_reused": self.connections_reused,
+                "reuse_ratio": self.connections_reused / acquisitions if acquisitions else 0.0,
+                "connect_time_total_ms": self.connect_time_total * 1000,
+                "connect_time_avg_ms": self.connect_time_total * 1000 / self.connections_created if self.connections_created else 0.0,
+                "open_connections": self._open,
+                "idle_connections": len(self._idle),
+                "max_size": self.max_size,
+            }
+
+    def close(self) -> None:
+        with self._condition:
+            while self._idle:
+                self._idle.pop().close()
+                self._open -= 1
+
+
+class PooledHttpTransport:
+    """In-process HTTP транспорт поверх пулов keep-alive соединений"""
+
+    name = HTTP_BACKEND_POOL
+
+    def __init__(self, max_size: int = DEFAULT_CONFIG.http_pool_size):
+        self.max_size = max_size
+        self._pools: Dict[Tuple[str, str, int], HttpConnectionPool] = {}
+        self._lock = threading.Lock()
+
+    def pool_for(self, url: str) -> Tuple[HttpConnectionPool, str]:
+        """Возвращает пул для origin URL и путь запроса"""
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    pool = HttpConnectionPool(scheme, parts.hostname, port, self.max_size)
+                    self._pools[key] = pool
+
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        return pool, path
+
+    def call(self, method: str, url: str, payload: Dict[str, Any] = None, headers: Dict[str, str] = None, verbose: bool = True) -> Dict[str, Any]:
+        if verbose:
+            log.debug("🚀 Выполняем HTTP запрос: %s %s", Lazy(method.upper), url)
+
+        body = json.dumps(payload).encode("utf-8") if payload else None
+
+        try:
+            pool, path = self.pool_for(url)
+            status, data = pool.request(method.upper(), path, body, build_headers(payload, headers))
+        except TimeoutError:
+            return {
+                "success": False,
+                "error": f"Timeout: запрос выполнялся более {HTTP_TIMEOUT_SECONDS} секунд"
+            }
+        except (OSError, http.client.HTTPException) as e:
+            if verbose:
+                log.error("❌ Ошибка выполнения HTTP запроса:\n   %s", e)
+            return {
+                "success": False,
+                "error": f"HTTP request failed: {e}",
+                "stdout": ""
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Неожиданная ошибка: {e}"
+            }
+
+        parsed = parse_response_body(data.decode("utf-8", errors="replace"), verbose)
+        mark("decode")
+        return parsed
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {}
+        for pool in list(self._pools.values()):
+            pool_stats = pool.stats()
+            stats[pool_stats["origin"]] = pool_stats
+        return stats
+
+    def close(self) -> None:
+        for pool in list(self._pools.values()):
+            pool.close()
+
+
+_transports: Dict[Tuple[str, str], Any] = {}
+_transports_lock = threading.Lock()
+
+
+def get_http_transport(base_url: str, backend: Optional[str] = None):
+    """Возвращает общий HTTP транспорт для базового URL, создавая его при первом обращении"""
+    backend = backend or DEFAULT_CONFIG.http_backend
+    if backend not in (HTTP_BACKEND_POOL, HTTP_BACKEND_CURL):
+        raise ValueError(f"Неизвестный HTTP бэкенд: {backend}")
+    key = (base_url, backend)
+
+    transport = _transports.get(key)
+    if transport is None:
+        with _transports_lock:
+            transport = _transports.get(key)
+            if transport is None:
+                cassette = active_cassette()
+                if cassette is not None and cassette.replaying:
+                    transport = CassetteTransport(cassette, "http")
+                else:
+                    transport = PooledHttpTransport() if backend == HTTP_BACKEND_POOL else CurlHttpTransport()
+                    if cassette is not None:
+                        transport = CassetteTransport(cassette, "http", transport)
+                _transports[key] = transport
+    return transport
+
+
+def http_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Статистика всех пулов соединений, открытых в процессе"""
+    stats = {}
+    for transport in list(_transports.values()):
+        transport = getattr(transport, "inner", transport)
+        if isinstance(transport, PooledHttpTransport):
+            stats.update(transport.stats())
+    return stats
+
+
+def print_http_pool_stats() -> None:
+    for origin, stats in http_pool_stats().items():
+        if stats["requests"]:
+            print(f"🔌 HTTP пул {origin}: запросов {stats['requests']}, "
+                  f"соединений {stats['connections_created']}, "
+                  f"переиспользование {stats['reuse_ratio'] * 100:.0f}%, "
+                  f"среднее время подключения {stats['connect_time_avg_ms']:.1f} мс")
+
+
+def close_http_transports() -> None:
+    with _transports_lock:
+        for transport in _transports.values():
+            transport.close()
+        _transports.clear()
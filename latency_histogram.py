@@ -0,0 +1,94 @@
+import math
+from typing import Dict, Iterable, Optional
+
+
+class LatencyHistogram:
+    """Гистограмма задержек в стиле HdrHistogram.
+
+    Значения хранятся в микросекундах в логарифмических корзинах, каждая из
+    которых разбита на линейные подкорзины. Относительная погрешность любого
+    перцентиля не превышает 10^-significant_digits, а память не зависит от
+    числа записанных значений, поэтому гистограмму можно держать открытой на
+    весь длительный прогон и объединять гистограммы разных потоков.
+    """
+
+    def __init__(self, significant_digits: int = 3):
+        if not 1 <= significant_digits <= 5:
+            raise ValueError("significant_digits должен быть от 1 до 5")
+        self.significant_digits = significant_digits
+        # Число линейных подкорзин - степень двойки, достаточная для заданной точности
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count >> 1
+
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    def _index(self, value_us: int) -> int:
+        shift = max(0, value_us.bit_length() - self.sub_bucket_bits)
+        return shift * self.sub_bucket_half + (value_us >> shift)
+
+    def _highest_equivalent(self, index: int) -> int:
+        """Верхняя граница значений, попадающих в корзину index"""
+        if index < self.sub_bucket_count:
+            return index
+        shift = (index - self.sub_bucket_half) // self.sub_bucket_half
+        sub_bucket = index - shift * self.sub_bucket_half
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record_us(self, value_us: int, count: int = 1) -> None:
+        value_us = max(0, int(value_us))
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total_us += value_us * count
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def record(self, seconds: float, count: int = 1) -> None:
+        self.record_us(round(seconds * 1_000_000), count)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Нельзя объединить гистограммы с разной точностью")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile_us(self, percent: float) -> int:
+        if not self.count:
+            return 0
+        target = max(1, math.ceil(percent / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max_us)
+        return self.max_us
+
+    def percentile(self, percent: float) -> float:
+        """Перцентиль в секундах"""
+        return self.percentile_us(percent) / 1_000_000
+
+    def percentiles_ms(self, percents: Iterable[float] = (50, 90, 99, 99.9)) -> Dict[str, float]:
+        return {f"p{percent:g}": self.percentile_us(percent) / 1000 for percent in percents}
+
+    @property
+    def mean(self) -> float:
+        """Среднее в секундах"""
+        return self.total_us / self.count / 1_000_000 if self.count else 0.0
+
+    @property
+    def max(self) -> float:
+        return self.max_us / 1_000_000
+
+    @property
+    def min(self) -> float:
+        return (self.min_us or 0) / 1_000_000
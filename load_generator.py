@@ -0,0 +1,372 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config import DEFAULT_CONFIG
+from base_tester import BaseGrpcTester, GrpcTestConfig
+from grpc_transport import BACKEND_AUTO, BACKEND_GRPCIO, BACKEND_GRPCURL, BACKEND_STUB, resolve_backend, grpcio_available, result_status
+from async_transport import close_async_transports
+from latency_histogram import LatencyHistogram
+from reference_data import REFERENCE_DICTIONARIES, preload_reference_ids
+from rpc_timing import print_rpc_timing_stats
+from results_history import ResultsHistory
+from result_reporters import open_reporters
+from stub_gateway import start_stub_gateway, print_stub_gateway_stats, stop_stub_gateway
+from fault_proxy import start_fault_proxies, print_fault_proxy_stats, stop_fault_proxies
+from harness_log import add_logging_arguments, configure_logging
+
+
+@dataclass
+class LoadScenario:
+    """Сценарий нагрузки: gRPC метод и фабрика payload для каждого запроса"""
+    name: str
+    method: str
+    description: str
+    build_payload: Callable[[Any], Dict[str, Any]]
+    tester_class: Callable[[], type]
+    # Подготовка перед стартом: (тестер, число запросов) - например, создание фикстур
+    prepare: Optional[Callable[[Any, int], None]] = None
+
+
+def _create_order_tester() -> type:
+    from orders_api_tests import CreateOrderTester
+    return CreateOrderTester
+
+
+def _create_offer_tester() -> type:
+    from offers_api_tests import CreateOfferTester
+    return CreateOfferTester
+
+
+def _register_trader_tester() -> type:
+    from traders_api_tests import RegisterTraderTester
+    return RegisterTraderTester
+
+
+def _provision_traders(tester, total: int) -> None:
+    """Создает всех трейдеров для нагрузки на RegisterTrader до старта, чтобы генератор сразу шел на полной частоте"""
+    from trader_pool import TraderFixturePool
+
+    print(f"👥 Заранее создаем {total} трейдеров через HTTP...")
+    started = time.perf_counter()
+    tester.load_traders = TraderFixturePool(tester, size=total, low_watermark=0)
+    created = tester.load_traders.fill(total)
+    print(f"   создано {created}/{total} за {time.perf_counter() - started:.1f} с")
+
+
+def _register_trader_payload(tester) -> Dict[str, Any]:
+    # Payload собирается в цикле событий открытой модели: синхронный createTrader при пустом пуле остановил бы его
+    trader = tester.load_traders.acquire("load", block=False)
+    # Трейдеры кончились или не создались - запрос все равно уходит и попадает в статистику ошибок
+    return tester.build_register_payload(trader.user_id if trader else str(uuid.uuid4()))
+
+
+def _reference_lookup(name: str) -> LoadScenario:
+    """Get* по случайному существующему id справочника; id берутся из кэша справочников, загруженного до старта"""
+    method = REFERENCE_DICTIONARIES[name].get_method
+
+    def prepare(tester, total: int) -> None:
+        tester.reference_ids = preload_reference_ids(tester, (name,))[name]
+        print(f"📚 Справочник {name}: {len(tester.reference_ids)} id для запросов {method}")
+
+    def build_payload(tester) -> Dict[str, Any]:
+        # Справочник не загрузился - запрос с id 0 попадет в статистику ошибок
+        return {"id": random.choice(tester.reference_ids) if tester.reference_ids else 0}
+
+    return LoadScenario(f"get-{name.replace('_', '-')}-by-id", method, f"{method} по случайному id из справочника {name}",
+                        build_payload, lambda: BaseGrpcTester, prepare)
+
+
+SCENARIOS: Dict[str, LoadScenario] = {
+    "create-order": LoadScenario(
+        "create-order",
+        "CreateOrder",
+        "PayIn CreateOrder как в test_create_order_basic, со свежими external_*_id",
+        lambda tester: tester.build_payin_order_payload(),
+        _create_order_tester,
+    ),
+    "publish-offer": LoadScenario(
+        "publish-offer",
+        "PublishNewOffer",
+        "PayIn PublishNewOffer как в test_create_offer_payin_default, с уникальным именем",
+        lambda tester: tester.build_payin_offer_payload(),
+        _create_offer_tester,
+    ),
+    "register-trader": LoadScenario(
+        "register-trader",
+        "RegisterTrader",
+        "RegisterTrader как в test_register_trader_enabled, трейдеры созданы заранее",
+        _register_trader_payload,
+        _register_trader_tester,
+        _provision_traders,
+    ),
+    "get-offers": LoadScenario("get-offers", "GetOffers", "GetOffers без фильтров", lambda tester: {}, lambda: BaseGrpcTester),
+    "get-traders": LoadScenario("get-traders", "GetTraders", "GetTraders без фильтров", lambda tester: {}, lambda: BaseGrpcTester),
+    **{scenario.name: scenario for scenario in map(_reference_lookup, REFERENCE_DICTIONARIES)},
+}
+
+
+def rpc_scenario(method: str, payload: Dict[str, Any]) -> LoadScenario:
+    """Сценарий для произвольного RPC с фиксированным payload"""
+    return LoadScenario(method, method, f"{method} с payload {json.dumps(payload, ensure_ascii=False)}", lambda tester: dict(payload), lambda: BaseGrpcTester)
+
+
+class LoadStats:
+    """Счетчики и гистограммы задержек прогона нагрузки.
+
+    latency отсчитывается от запланированного момента отправки и включает
+    ожидание в очереди генератора; service_time - от фактической отправки.
+    Разница между ними показывает, сколько задержки скрыл бы закрытый цикл.
+    """
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.statuses: Counter = Counter()
+        self.sent = 0
+        self.max_in_flight = 0
+        self.max_send_lag = 0.0
+        self.started = 0.0
+        self.finished = 0.0
+
+    def record(self, status: str, latency: float, service_time: float) -> None:
+        self.statuses[status] += 1
+        self.latency.record(latency)
+        self.service_time.record(service_time)
+
+    @property
+    def completed(self) -> int:
+        return sum(self.statuses.values())
+
+    @property
+    def errors(self) -> int:
+        return self.completed - self.statuses.get("OK", 0)
+
+    @property
+    def elapsed(self) -> float:
+        return max(self.finished - self.started, 1e-9)
+
+    def print_report(self, title: str) -> None:
+        print()
+        print("=" * 80)
+        print(f"📈 РЕЗУЛЬТАТЫ НАГРУЗКИ: {title}")
+        print("=" * 80)
+        print(f"📤 Отправлено запросов: {self.sent}")
+        print(f"📥 Завершено: {self.completed}")
+        print(f"⏱️  Длительность: {self.elapsed:.1f} с")
+        print(f"🚀 Пропускная способность: {self.completed / self.elapsed:.1f} req/s")
+        print(f"🔀 Максимум запросов в полете: {self.max_in_flight}")
+        print(f"🐢 Максимальное отставание отправки от расписания: {self.max_send_lag * 1000:.1f} мс")
+        print(f"❌ Ошибок: {self.errors} ({self.errors * 100 / self.completed if self.completed else 0:.2f}%)")
+        if self.errors:
+            print("📋 Ошибки по gRPC статусам:")
+            for status, count in self.statuses.most_common():
+                if status != "OK":
+                    print(f"   • {status}: {count}")
+        print("⏳ Задержка (мс):      от расписания   от отправки")
+        for percent in (50, 90, 99, 99.9):
+            print(f"   p{percent:<5}          {self.latency.percentile(percent) * 1000:10.1f}    {self.service_time.percentile(percent) * 1000:10.1f}")
+        print(f"   max             {self.latency.max * 1000:10.1f}    {self.service_time.max * 1000:10.1f}")
+        print("=" * 80)
+
+
+class OpenLoopScheduler:
+    """Открытый цикл нагрузки: запросы отправляются по фиксированному расписанию.
+
+    i-й запрос запланирован на t0 + i / rps независимо от того, завершились ли
+    предыдущие. Если генератор не успевает (лимит max_in_flight, занятый event
+    loop), запрос уходит позже, но его задержка все равно считается от
+    запланированного момента - это исключает coordinated omission, при котором
+    медленный ответ откладывает следующие отправки и прячет хвост задержек.
+    """
+
+    def __init__(self, rps: float, duration: float, max_in_flight: int = 1000, on_sample: Optional[Callable[[float, str, float, float], None]] = None,
+                 should_stop: Optional[Callable[[], bool]] = None):
+        self.rps = rps
+        self.duration = duration
+        self.max_in_flight = max_in_flight
+        # Каждый замер (смещение от старта, статус, задержка, время обслуживания; секунды) - в потоковый отчет
+        self.on_sample = on_sample
+        # Досрочная остановка (например, Ctrl+C в soak-прогоне): новые запросы не отправляются, отправленные дожидаются
+        self.should_stop = should_stop
+
+    async def run(self, send: Callable[[], Awaitable[str]]) -> LoadStats:
+        """send выполняет один запрос и возвращает его статус (см. result_status)"""
+        stats = LoadStats()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        in_flight = set()
+        interval = 1.0 / self.rps
+        total = int(self.rps * self.duration)
+
+        async def issue(intended: float) -> None:
+            try:
+                started = time.perf_counter()
+                stats.max_send_lag = max(stats.max_send_lag, started - intended)
+                status = await send()
+                finished = time.perf_counter()
+                stats.record(status, finished - intended, finished - started)
+                if self.on_sample:
+                    self.on_sample(intended - stats.started, status, finished - intended, finished - started)
+            finally:
+                slots.release()
+
+        stats.started = time.perf_counter()
+        for index in range(total):
+            intended = stats.started + index * interval
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.should_stop and self.should_stop():
+                break
+
+            await slots.acquire()
+            task = asyncio.create_task(issue(intended))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            stats.sent += 1
+            stats.max_in_flight = max(stats.max_in_flight, len(in_flight))
+
+        if in_flight:
+            await asyncio.gather(*in_flight)
+        stats.finished = time.perf_counter()
+        return stats
+
+
+async def run_scenario(tester, scenario: LoadScenario, rps: float, duration: float, max_in_flight: int,
+                       on_sample: Optional[Callable[[float, str, float, float], None]] = None) -> LoadStats:
+    async def send() -> str:
+        result = await tester.arun_grpc(scenario.method, scenario.build_payload(tester))
+        return result_status(result)
+
+    return await OpenLoopScheduler(rps, duration, max_in_flight, on_sample).run(send)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Генерация нагрузки на Payment Gateway с постоянной частотой запросов (открытый цикл)")
+    parser.add_argument("scenario", nargs="?", default="create-order", choices=list(SCENARIOS), help="Сценарий нагрузки (по умолчанию: create-order)")
+    parser.add_argument("--method", help="Произвольный gRPC метод вместо сценария (например, GetCurrencies)")
+    parser.add_argument("--payload", default="{}", help="JSON payload для --method (по умолчанию: {})")
+    parser.add_argument("--rps", type=float, default=10, help="Целевая частота запросов в секунду (по умолчанию: 10)")
+    parser.add_argument("--duration", type=float, default=30, help="Длительность в секундах (по умолчанию: 30)")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Максимум одновременных запросов (по умолчанию: 1000)")
+    parser.add_argument("--host", default=DEFAULT_CONFIG.grpc_host, help=f"Хост сервера (по умолчанию: {DEFAULT_CONFIG.grpc_host})")
+    parser.add_argument("--port", type=int, default=DEFAULT_CONFIG.grpc_port, help=f"Порт сервера (по умолчанию: {DEFAULT_CONFIG.grpc_port})")
+    parser.add_argument("--backend", choices=[BACKEND_AUTO, BACKEND_GRPCIO, BACKEND_GRPCURL, BACKEND_STUB], default=DEFAULT_CONFIG.grpc_backend, help=f"gRPC транспорт (по умолчанию: {DEFAULT_CONFIG.grpc_backend})")
+    parser.add_argument("--stub", action="store_true", help="Нагрузка на локальный стаб шлюза, без сети")
+    parser.add_argument("--stub-fault", action="append", default=[], metavar="[МЕТОД:]ПАРАМЕТРЫ", help="Задержка и ошибки стаба, например CreateOrder:latency_ms=20,jitter_ms=5,error_rate=0.01")
+    parser.add_argument("--fault-proxy", action="store_true", default=DEFAULT_CONFIG.fault_proxy_enabled, help="Пустить нагрузку через локальный прокси сбоев")
+    parser.add_argument("--fault", action="append", default=[], metavar="[МЕТОД:]ПРАВИЛО", help="Правило прокси сбоев (включает --fault-proxy), например CreateOrder:latency=pareto/20/1.5,unavailable_rate=0.01")
+    parser.add_argument("--history", default=DEFAULT_CONFIG.results_history_path, metavar="PATH", help=f"Файл истории прогонов (по умолчанию: {DEFAULT_CONFIG.results_history_path})")
+    parser.add_argument("--no-history", dest="save_history", action="store_false", default=DEFAULT_CONFIG.results_history_enabled, help="Не записывать прогон в историю")
+    parser.add_argument("--jsonl", metavar="PATH", help="Писать каждый запрос (задержка, статус) в JSON Lines по ходу нагрузки")
+    parser.add_argument("--junit", metavar="PATH", help="Записать итог нагрузки как тест JUnit XML (провал при ошибках)")
+    add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_logging(args.log_level, args.log_format)
+
+    if args.rps <= 0 or args.duration <= 0 or args.max_in_flight <= 0:
+        print("❌ --rps, --duration и --max-in-flight должны быть положительными")
+        return 1
+
+    if args.method:
+        try:
+            scenario = rpc_scenario(args.method, json.loads(args.payload))
+        except json.JSONDecodeError as e:
+            print(f"❌ Некорректный JSON в --payload: {e}")
+            return 1
+    else:
+        scenario = SCENARIOS[args.scenario]
+
+    backend = resolve_backend(BACKEND_STUB if args.stub else args.backend)
+    if args.stub:
+        try:
+            start_stub_gateway(tuple(args.stub_fault))
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+    host, port = args.host, args.port
+    if args.fault_proxy or args.fault:
+        try:
+            host, port = start_fault_proxies(args.host, args.port, args.fault)
+        except (ValueError, OSError) as e:
+            print(f"❌ {e}")
+            return 1
+    if backend == BACKEND_GRPCIO and not grpcio_available():
+        print("❌ grpcio не найден. Установите grpcio, grpcio-reflection и protobuf или используйте --backend grpcurl")
+        return 1
+    config = GrpcTestConfig(host=host, port=port, insecure=DEFAULT_CONFIG.grpc_insecure, backend=backend)
+    tester = scenario.tester_class()(config)
+    if scenario.prepare:
+        scenario.prepare(tester, int(args.rps * args.duration))
+
+    print(f"🔥 Нагрузка: {scenario.name} ({scenario.method}) на {config.host}:{config.port}")
+    print(f"   {scenario.description}")
+    print(f"   {args.rps:g} req/s в течение {args.duration:g} с, транспорт: {backend}")
+
+    label = f"{scenario.name} @ {args.rps:g} req/s"
+    try:
+        reporters = open_reporters(args.jsonl, args.junit)
+    except OSError as e:
+        print(f"❌ Не удалось открыть файл отчета: {e}")
+        return 1
+    reporters.start_run({"target": f"{args.host}:{args.port}", "backend": backend, "scenario": label})
+
+    def on_sample(offset: float, status: str, latency: float, service_time: float) -> None:
+        reporters.sample({
+            "method": scenario.method,
+            "offset_ms": round(offset * 1000, 3),
+            "status": status,
+            "latency_ms": round(latency * 1000, 3),
+            "service_time_ms": round(service_time * 1000, 3),
+        })
+
+    async def run() -> LoadStats:
+        try:
+            return await run_scenario(tester, scenario, args.rps, args.duration, args.max_in_flight, on_sample if reporters else None)
+        finally:
+            await close_async_transports()
+
+    try:
+        stats = asyncio.run(run())
+        percentiles = stats.latency.percentiles_ms()
+        reporters.test_finished({
+            "test": label,
+            "test_id": f"load/{scenario.name}",
+            "category": "load",
+            "status": "PASS" if stats.errors == 0 else "FAIL",
+            "duration_ms": stats.elapsed * 1000,
+            "details": [{"test": f"{scenario.method} {status}", "status": "PASS" if status == "OK" else "FAIL", "details": f"{count} запросов"}
+                        for status, count in stats.statuses.most_common()],
+        })
+        reporters.finish({"sent": stats.sent, "completed": stats.completed, "errors": stats.errors, **{f"{name}_ms": value for name, value in percentiles.items()}})
+    finally:
+        reporters.close()
+    stats.print_report(label)
+    if args.save_history:
+        # Задержка зависит от частоты, поэтому метод в истории - вместе с ней
+        history = ResultsHistory(args.history)
+        try:
+            history_backend = f"{backend}+fault-proxy" if (host, port) != (args.host, args.port) else backend
+            run_id = history.start_run(f"{args.host}:{args.port}", history_backend, f"load {label}")
+            history.add_test(run_id, f"load/{scenario.name}", label, "PASS" if stats.errors == 0 else "FAIL", stats.elapsed * 1000)
+            history.add_run_latency(run_id, f"{scenario.method} @ {args.rps:g} req/s", stats.latency, stats.errors)
+        finally:
+            history.close()
+        print(f"🗄️  Прогон #{run_id} записан в историю {args.history}")
+    print_rpc_timing_stats()
+    print_stub_gateway_stats()
+    print_fault_proxy_stats()
+    stop_stub_gateway()
+    stop_fault_proxies()
+    return 0 if stats.errors == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
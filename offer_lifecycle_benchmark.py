@@ -0,0 +1,217 @@
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from config import DEFAULT_CONFIG
+from base_tester import GrpcTestConfig
+from grpc_transport import BACKEND_AUTO, BACKEND_GRPCIO, BACKEND_GRPCURL, BACKEND_STUB, resolve_backend, grpcio_available, result_status
+from async_transport import close_async_transports
+from latency_histogram import LatencyHistogram
+from offers_api_tests import CreateOfferTester
+from harness_log import add_logging_arguments, configure_logging
+
+
+# Переходы жизненного цикла оффера и статус, ожидаемый после каждого из них
+OFFER_LIFECYCLE: Tuple[Tuple[str, str], ...] = (
+    ("PublishNewOffer", "OFFER_ACTIVE"),
+    ("PauseOffer", "OFFER_ON_HOLD"),
+    ("ReactivateOffer", "OFFER_ACTIVE"),
+    ("CancelOffer", "OFFER_CANCELED"),
+)
+FINAL_OFFER_STATUS = OFFER_LIFECYCLE[-1][1]
+
+DEFAULT_TRADER = ("550e8400-e29b-41d4-a716-446655440001", "550e8400-e29b-41d4-a716-446655440021")
+
+
+def offer_from_result(result) -> Optional[dict]:
+    """Оффер из ответа PublishNewOffer/PauseOffer/ReactivateOffer/CancelOffer/GetOffer"""
+    if not result["success"]:
+        return None
+    return result["response"].get("getOfferResponse", {}).get("offer")
+
+
+class LifecycleStats:
+    """Задержки и ошибки по каждому переходу, а также итоговая проверка статусов"""
+
+    def __init__(self):
+        self.latency: Dict[str, LatencyHistogram] = {method: LatencyHistogram() for method, _ in OFFER_LIFECYCLE}
+        self.errors: Dict[str, Counter] = {method: Counter() for method, _ in OFFER_LIFECYCLE}
+        self.transitions = 0
+        self.lifecycles_completed = 0
+        self.lifecycles_failed = 0
+        self.offer_ids: List[str] = []
+        self.final_statuses: Counter = Counter()
+        self.started = 0.0
+        self.finished = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return max(self.finished - self.started, 1e-9)
+
+    @property
+    def verified(self) -> bool:
+        return self.final_statuses.get(FINAL_OFFER_STATUS, 0) == len(self.offer_ids) and self.lifecycles_failed == 0
+
+    def print_report(self, traders: int) -> None:
+        print()
+        print("=" * 80)
+        print(f"📈 БЕНЧМАРК ЖИЗНЕННОГО ЦИКЛА ОФФЕРА: {traders} виртуальных трейдеров")
+        print("=" * 80)
+        print(f"⏱️  Длительность: {self.elapsed:.1f} с")
+        print(f"🔄 Успешных переходов: {self.transitions} ({self.transitions / self.elapsed:.1f} переходов/с)")
+        print(f"✅ Завершенных циклов: {self.lifecycles_completed} ({self.lifecycles_completed / self.elapsed:.2f} циклов/с)")
+        print(f"❌ Прерванных циклов: {self.lifecycles_failed}")
+        print()
+        print(f"   {'Переход':<18}{'вызовов':>9}{'ошибок':>8}{'p50 мс':>10}{'p90 мс':>10}{'p99 мс':>10}{'max мс':>10}")
+        for method, _ in OFFER_LIFECYCLE:
+            histogram = self.latency[method]
+            errors = sum(self.errors[method].values())
+            print(f"   {method:<18}{histogram.count:>9}{errors:>8}"
+                  f"{histogram.percentile(50) * 1000:>10.1f}{histogram.percentile(90) * 1000:>10.1f}"
+                  f"{histogram.percentile(99) * 1000:>10.1f}{histogram.max * 1000:>10.1f}")
+
+        for method, _ in OFFER_LIFECYCLE:
+            for status, count in self.errors[method].most_common():
+                print(f"   • {method}: {status} - {count}")
+
+        print()
+        print(f"🔍 Проверка итоговых статусов ({len(self.offer_ids)} офферов):")
+        for status, count in self.final_statuses.most_common():
+            icon = "✅" if status == FINAL_OFFER_STATUS else "❌"
+            print(f"   {icon} {status}: {count}")
+        print("=" * 80)
+
+
+class OfferLifecycleBenchmark:
+    """Прогоняет виртуальных трейдеров через полный цикл Publish → Pause → Reactivate → Cancel.
+
+    Каждый виртуальный трейдер последовательно выполняет циклы над своими
+    офферами, трейдеры работают конкурентно. Задержка измеряется для каждого
+    перехода отдельно; статус в ответе сверяется с ожидаемым, а после прогона
+    все созданные офферы перечитываются через GetOffer.
+    """
+
+    def __init__(self, tester: CreateOfferTester, traders: List[Tuple[str, str]], virtual_traders: int):
+        self.tester = tester
+        self.traders = traders
+        self.virtual_traders = virtual_traders
+        self.stats = LifecycleStats()
+
+    async def _transition(self, method: str, payload: dict, expected_status: str) -> Optional[dict]:
+        started = time.perf_counter()
+        result = await self.tester.arun_grpc(method, payload)
+        self.stats.latency[method].record(time.perf_counter() - started)
+
+        offer = offer_from_result(result)
+        if offer is None:
+            self.stats.errors[method][result_status(result) if not result["success"] else "NoOffer"] += 1
+            return None
+        if offer.get("status") != expected_status:
+            self.stats.errors[method][f"UnexpectedStatus {offer.get('status')}"] += 1
+            return None
+        self.stats.transitions += 1
+        return offer
+
+    async def run_lifecycle(self, trader: Tuple[str, str]) -> bool:
+        trader_id, payment_details_id = trader
+        method, expected_status = OFFER_LIFECYCLE[0]
+        offer = await self._transition(method, self.tester.build_payin_offer_payload(trader_id, payment_details_id), expected_status)
+        if offer is None:
+            return False
+
+        offer_id = offer["id"]
+        self.stats.offer_ids.append(offer_id)
+        for method, expected_status in OFFER_LIFECYCLE[1:]:
+            if await self._transition(method, {"offer_id": offer_id}, expected_status) is None:
+                # Не оставляем активный оффер после прерванного цикла
+                if method != "CancelOffer":
+                    await self.tester.arun_grpc("CancelOffer", {"offer_id": offer_id})
+                return False
+        return True
+
+    async def _virtual_trader(self, index: int, lifecycles: Optional[int], deadline: Optional[float]) -> None:
+        trader = self.traders[index % len(self.traders)]
+        done = 0
+        while (lifecycles is None or done < lifecycles) and (deadline is None or time.perf_counter() < deadline):
+            if await self.run_lifecycle(trader):
+                self.stats.lifecycles_completed += 1
+            else:
+                self.stats.lifecycles_failed += 1
+            done += 1
+
+    async def verify_final_states(self, concurrency: int) -> None:
+        slots = asyncio.Semaphore(concurrency)
+
+        async def verify(offer_id: str) -> None:
+            async with slots:
+                result = await self.tester.arun_grpc("GetOffer", {"offer_id": offer_id})
+            offer = offer_from_result(result)
+            self.stats.final_statuses[offer.get("status", "UNKNOWN") if offer else f"GetOffer {result_status(result)}"] += 1
+
+        await asyncio.gather(*(verify(offer_id) for offer_id in self.stats.offer_ids))
+
+    async def run(self, lifecycles: Optional[int] = None, duration: Optional[float] = None) -> LifecycleStats:
+        self.stats.started = time.perf_counter()
+        deadline = self.stats.started + duration if duration else None
+        await asyncio.gather(*(self._virtual_trader(index, lifecycles, deadline) for index in range(self.virtual_traders)))
+        self.stats.finished = time.perf_counter()
+
+        await self.verify_final_states(self.virtual_traders)
+        return self.stats
+
+
+def parse_trader(value: str) -> Tuple[str, str]:
+    trader_id, _, payment_details_id = value.partition(":")
+    if not trader_id or not payment_details_id:
+        raise argparse.ArgumentTypeError("ожидается TRADER_ID:TRADER_PAYMENT_DETAILS_ID")
+    return trader_id, payment_details_id
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк жизненного цикла оффера: PublishNewOffer → PauseOffer → ReactivateOffer → CancelOffer")
+    parser.add_argument("--traders", type=int, default=10, help="Число конкурентных виртуальных трейдеров (по умолчанию: 10)")
+    parser.add_argument("--lifecycles", type=int, default=10, help="Число циклов на виртуального трейдера (по умолчанию: 10)")
+    parser.add_argument("--duration", type=float, help="Вместо --lifecycles: длительность прогона в секундах")
+    parser.add_argument("--trader", action="append", type=parse_trader, dest="trader_accounts", metavar="TRADER_ID:PAYMENT_DETAILS_ID",
+                        help="Трейдер для офферов (можно указать несколько, распределяются по кругу; по умолчанию тестовый трейдер)")
+    parser.add_argument("--host", default=DEFAULT_CONFIG.grpc_host, help=f"Хост сервера (по умолчанию: {DEFAULT_CONFIG.grpc_host})")
+    parser.add_argument("--port", type=int, default=DEFAULT_CONFIG.grpc_port, help=f"Порт сервера (по умолчанию: {DEFAULT_CONFIG.grpc_port})")
+    parser.add_argument("--backend", choices=[BACKEND_AUTO, BACKEND_GRPCIO, BACKEND_GRPCURL, BACKEND_STUB], default=DEFAULT_CONFIG.grpc_backend, help=f"gRPC транспорт (по умолчанию: {DEFAULT_CONFIG.grpc_backend})")
+    add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_logging(args.log_level, args.log_format)
+
+    if args.traders <= 0 or args.lifecycles <= 0 or (args.duration is not None and args.duration <= 0):
+        print("❌ --traders, --lifecycles и --duration должны быть положительными")
+        return 1
+
+    backend = resolve_backend(args.backend)
+    if backend == BACKEND_GRPCIO and not grpcio_available():
+        print("❌ grpcio не найден. Установите grpcio, grpcio-reflection и protobuf или используйте --backend grpcurl")
+        return 1
+    config = GrpcTestConfig(host=args.host, port=args.port, insecure=DEFAULT_CONFIG.grpc_insecure, backend=backend)
+    benchmark = OfferLifecycleBenchmark(CreateOfferTester(config), args.trader_accounts or [DEFAULT_TRADER], args.traders)
+
+    print(f"🔥 Бенчмарк жизненного цикла оффера на {config.host}:{config.port}")
+    print(f"   {' → '.join(method for method, _ in OFFER_LIFECYCLE)}")
+    limit = f"{args.duration:g} с" if args.duration else f"{args.lifecycles} циклов на трейдера"
+    print(f"   {args.traders} виртуальных трейдеров, {limit}, транспорт: {backend}")
+
+    async def run() -> LifecycleStats:
+        try:
+            if args.duration:
+                return await benchmark.run(duration=args.duration)
+            return await benchmark.run(lifecycles=args.lifecycles)
+        finally:
+            await close_async_transports()
+
+    stats = asyncio.run(run())
+    stats.print_report(args.traders)
+    return 0 if stats.verified else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
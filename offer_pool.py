@@ -0,0 +1,397 @@
+import asyncio
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+from config import DEFAULT_CONFIG
+from grpc_transport import BACKEND_STUB, result_status
+from async_transport import run_in_session_loop
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
+
+
+DEFAULT_OFFER_TRADER_ID = "550e8400-e29b-41d4-a716-446655440001"
+DEFAULT_OFFER_PAYMENT_DETAILS_ID = "550e8400-e29b-41d4-a716-446655440021"
+
+# Переходы от только что опубликованного (OFFER_ACTIVE) оффера до состояния пула
+OFFER_STATE_TRANSITIONS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "OFFER_ACTIVE": (),
+    "OFFER_ON_HOLD": (("PauseOffer", "OFFER_ON_HOLD"),),
+    "OFFER_CANCELED": (("CancelOffer", "OFFER_CANCELED"),),
+}
+
+
+def payin_offer_payload(trader_id: str = DEFAULT_OFFER_TRADER_ID, trader_payment_details_id: str = DEFAULT_OFFER_PAYMENT_DETAILS_ID) -> Dict[str, Any]:
+    """Payload PublishNewOffer для PayIn оффера с уникальным именем"""
+    return {
+        "pay_in_offer": {
+            "allow_no_issuer_pools": True,
+            "allow_same_amount_orders": True,
+            "amount": "1000000",
+            "max_order_size": "1000000",
+            "min_order_size": "20000",
+            "name": f"offer_{uuid.uuid4().hex[:8]}",
+            "trader_id": trader_id,
+            "trader_payment_details_id": trader_payment_details_id
+        }
+    }
+
+
+@dataclass
+class OfferFixture:
+    """Оффер, заранее опубликованный и переведенный в нужный статус"""
+    offer_id: str
+    status: str
+    offer: Dict[str, Any]
+    created_at: float
+
+
+class OfferFixtureError(Exception):
+    """Не удалось подготовить оффер в нужном статусе"""
+
+
+class OfferFixturePool:
+    """Пулы заранее подготовленных офферов по статусам (OFFER_STATE_TRANSITIONS).
+
+    PublishNewOffer и переходы до нужного статуса идут параллельно
+    (concurrency одновременных RPC), статус в каждом ответе сверяется с
+    ожидаемым. После start() фоновый поток готовит офферы каждого статуса
+    заранее, но не больше batch_size и не больше, чем еще понадобится:
+    demand - сколько офферов каждого статуса возьмут выбранные тесты
+    (None - неизвестно, заранее ничего не готовится). Пока идет тест,
+    отменяющий все активные офферы, фоновая подготовка приостановлена
+    (см. prefetch_paused). acquire() ждет оффер, который уже готовится;
+    если готовить некому, пачка готовится в вызывающем потоке. После
+    массовой отмены активных офферов пул OFFER_ACTIVE сбрасывается через
+    invalidate().
+    """
+
+    def __init__(self, tester, batch_size: Optional[int] = None, concurrency: Optional[int] = None,
+                 demand: Optional[Dict[str, int]] = None):
+        self.tester = tester
+        self.batch_size = max(1, DEFAULT_CONFIG.offer_pool_batch_size if batch_size is None else batch_size)
+        self.concurrency = max(1, DEFAULT_CONFIG.offer_pool_concurrency if concurrency is None else concurrency)
+
+        self._available: Dict[str, Deque[OfferFixture]] = {state: deque() for state in OFFER_STATE_TRANSITIONS}
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._refiller: Optional[threading.Thread] = None
+        self.demand = dict(demand) if demand is not None else None
+        # Офферы, которые сейчас готовятся, по статусам
+        self._pending: Counter = Counter()
+        # Статусы, для которых фоновая подготовка ничего не дала: их готовит acquire()
+        self._prefetch_failed: Set[str] = set()
+
+        self.consumed: List[Tuple[OfferFixture, str]] = []
+        self.created: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.last_error: Optional[str] = None
+        self.canceled = 0
+        # Офферы, которые не удалось отменить после неудачной подготовки
+        self.leaked: List[str] = []
+        self._closed = False
+
+    async def _prepare_one(self, state: str, slots: asyncio.Semaphore) -> Optional[OfferFixture]:
+        steps = (("PublishNewOffer", "OFFER_ACTIVE"),) + OFFER_STATE_TRANSITIONS[state]
+        offer_id = None
+        offer = None
+        for method, expected_status in steps:
+            payload = payin_offer_payload() if offer_id is None else {"offer_id": offer_id}
+            async with slots:
+                result = await self.tester.arun_grpc(method, payload)
+
+            offer = result["response"].get("getOfferResponse", {}).get("offer") if result["success"] else None
+            if offer is None or offer.get("status") != expected_status:
+                with self._lock:
+                    if offer is None:
+                        self.errors[f"{method}: {result_status(result) if not result['success'] else 'NoOffer'}"] += 1
+                        self.last_error = result.get("error", "Отсутствует getOfferResponse.offer")
+                    else:
+                        self.errors[f"{method}: {offer.get('status')}"] += 1
+                        self.last_error = f"{method}: статус {offer.get('status')}, ожидался {expected_status}"
+                # Уже опубликованный оффер не оставляем активным на стенде. Если не удалась сама отмена,
+                # это ее единственный повтор
+                if offer_id is not None:
+                    async with slots:
+                        cancel = await self.tester.arun_grpc("CancelOffer", {"offer_id": offer_id})
+                    if not cancel["success"]:
+                        with self._lock:
+                            self.leaked.append(offer_id)
+                        log.warning("⚠️ Оффер %s не отменен после неудачной подготовки %s, он остается на стенде: %s",
+                                    offer_id, state, cancel.get("error"))
+                return None
+            offer_id = offer["id"]
+
+        with self._lock:
+            self.created[state] += 1
+        return OfferFixture(offer_id, state, offer, time.time())
+
+    def _prepare(self, counts: Dict[str, int]) -> Counter:
+        """Готовит офферы по статусам (counts уже учтены в _pending) и сразу отдает их ожидающим acquire().
+        Возвращает число подготовленных по статусам"""
+        added: Counter = Counter()
+        late: List[OfferFixture] = []
+
+        async def prepare_one(state: str, slots: asyncio.Semaphore) -> None:
+            fixture = None
+            try:
+                fixture = await self._prepare_one(state, slots)
+            finally:
+                with self._condition:
+                    self._pending[state] -= 1
+                    if fixture is not None:
+                        if self._closed:
+                            late.append(fixture)
+                        else:
+                            self._available[state].append(fixture)
+                            added[state] += 1
+                    self._condition.notify_all()
+
+        async def run() -> None:
+            slots = asyncio.Semaphore(self.concurrency)
+            await asyncio.gather(*(prepare_one(state, slots) for state, count in counts.items() for _ in range(count)))
+
+        run_in_session_loop(run())
+        # Офферы дошли после close(): их уже никто не заберет
+        self._cancel(late)
+        return added
+
+    def prepare(self, state: str, count: Optional[int] = None) -> int:
+        """Готовит count офферов (по умолчанию batch_size) в статусе state. Возвращает число подготовленных"""
+        count = self.batch_size if count is None else count
+        with self._condition:
+            if self._closed:
+                return 0
+            self._pending[state] += count
+        return self._prepare({state: count})[state]
+
+    def _wanted(self, state: str) -> int:
+        """Сколько офферов статуса подготовить заранее сейчас (вызывается под _condition)"""
+        if self.demand is None or self._closed or state in self._prefetch_failed:
+            return 0
+        return max(0, min(self.batch_size, self.demand.get(state, 0)) - len(self._available[state]) - self._pending[state])
+
+    def fill(self) -> int:
+        """Готовит офферы всех статусов, сколько еще понадобится (не больше batch_size каждого), в одном
+        цикле событий. Возвращает число подготовленных"""
+        with self._condition:
+            counts = {state: self._wanted(state) for state in OFFER_STATE_TRANSITIONS}
+            counts = {state: count for state, count in counts.items() if count > 0}
+            for state, count in counts.items():
+                self._pending[state] += count
+        if not counts:
+            return 0
+
+        added = self._prepare(counts)
+        with self._condition:
+            # Если сервер не готовит офферы статуса, не повторяем впустую: их подготовит acquire()
+            self._prefetch_failed.update(state for state in counts if not added[state])
+        return sum(added.values())
+
+    def start(self) -> "OfferFixturePool":
+        """Запускает фоновую подготовку офферов"""
+        with self._condition:
+            if self._refiller is None:
+                self._refiller = threading.Thread(target=self._refill_loop, name="offer-pool-refill", daemon=True)
+                self._refiller.start()
+        return self
+
+    def _refill_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and not any(self._wanted(state) for state in OFFER_STATE_TRANSITIONS):
+                    self._condition.wait()
+                if self._closed:
+                    return
+            with _prefetch_slot(self):
+                self.fill()
+
+    def acquire(self, state: str, consumer: str = "") -> OfferFixture:
+        """Выдает оффер в статусе state; если пул пуст и никто его не готовит, сначала готовит пачку.
+        OfferFixtureError при неудаче"""
+        if state not in OFFER_STATE_TRANSITIONS:
+            raise ValueError(f"Неизвестный статус оффера для пула: {state}")
+
+        with self._condition:
+            if self.demand and self.demand.get(state):
+                self.demand[state] -= 1
+        while True:
+            with self._condition:
+                # Оффер уже готовится (в фоне или для параллельного теста) - ждем его, а не готовим лишний
+                while not self._available[state] and self._pending[state] and not self._closed:
+                    self._condition.wait()
+                if self._available[state]:
+                    fixture = self._available[state].popleft()
+                    self.consumed.append((fixture, consumer))
+                    self._condition.notify_all()
+                    return fixture
+            # При известном спросе не готовим больше, чем еще возьмут тесты (считая этот)
+            count = None if self.demand is None else max(1, min(self.batch_size, self.demand.get(state, 0) + 1))
+            if not self.prepare(state, count):
+                raise OfferFixtureError(f"Не удалось подготовить оффер {state}: {self.last_error}")
+
+    def available(self, state: str) -> int:
+        with self._lock:
+            return len(self._available[state])
+
+    def invalidate(self, *states: str) -> None:
+        """Забывает подготовленные офферы указанных статусов (без аргументов - всех)"""
+        with self._condition:
+            for state, fixtures in self._available.items():
+                if not states or state in states:
+                    fixtures.clear()
+            self._condition.notify_all()
+
+    def _cancel(self, fixtures: List[OfferFixture]) -> None:
+        """Отменяет еще не отмененные офферы"""
+        offer_ids = [fixture.offer_id for fixture in fixtures if fixture.status != "OFFER_CANCELED"]
+        if not offer_ids:
+            return
+
+        async def run() -> List[Dict[str, Any]]:
+            slots = asyncio.Semaphore(self.concurrency)
+
+            async def cancel(offer_id: str) -> Dict[str, Any]:
+                async with slots:
+                    return await self.tester.arun_grpc("CancelOffer", {"offer_id": offer_id})
+
+            return await asyncio.gather(*(cancel(offer_id) for offer_id in offer_ids))
+
+        canceled = sum(1 for result in run_in_session_loop(run()) if result["success"])
+        with self._lock:
+            self.canceled += canceled
+
+    def close(self) -> None:
+        """Останавливает фоновую подготовку и отменяет подготовленные, но не выданные тестам офферы;
+        новые пачки больше не попадают в пул"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            refiller = self._refiller
+        if refiller is not None and refiller is not threading.current_thread():
+            refiller.join()
+        with self._lock:
+            leftovers = [fixture for fixtures in self._available.values() for fixture in fixtures]
+            for fixtures in self._available.values():
+                fixtures.clear()
+        self._cancel(leftovers)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "created": sum(self.created.values()),
+                "consumed": len(self.consumed),
+                "available": sum(len(fixtures) for fixtures in self._available.values()),
+                "errors": sum(self.errors.values()),
+                "canceled": self.canceled,
+                "leaked": len(self.leaked),
+            }
+
+
+# Фоновая подготовка публикует активные офферы, а тесты, исключающие группу offers-global,
+# отменяют все активные офферы на стенде: пока такой тест идет, новые пачки не начинаются
+_prefetch_gate = threading.Condition()
+_prefetch_paused = 0
+_prefetch_running = 0
+
+
+@contextmanager
+def prefetch_paused() -> Iterator[None]:
+    """Дожидается уже начатой фоновой подготовки офферов и не начинает новую до выхода из блока"""
+    global _prefetch_paused
+    with _prefetch_gate:
+        _prefetch_paused += 1
+        while _prefetch_running:
+            _prefetch_gate.wait()
+    try:
+        yield
+    finally:
+        with _prefetch_gate:
+            _prefetch_paused -= 1
+            _prefetch_gate.notify_all()
+
+
+@contextmanager
+def _prefetch_slot(pool: OfferFixturePool) -> Iterator[None]:
+    global _prefetch_running
+    with _prefetch_gate:
+        # close() не ждет конца теста: закрытый пул все равно ничего не готовит
+        while _prefetch_paused and not pool._closed:
+            _prefetch_gate.wait(1)
+        _prefetch_running += 1
+    try:
+        yield
+    finally:
+        with _prefetch_gate:
+            _prefetch_running -= 1
+            _prefetch_gate.notify_all()
+
+
+_pools: Dict[Tuple[str, int, str], OfferFixturePool] = {}
+_pools_lock = threading.Lock()
+# Сколько офферов каждого статуса возьмут выбранные тесты (см. plan_offer_fixtures); None - неизвестно
+_planned_demand: Optional[Dict[str, int]] = None
+
+
+def plan_offer_fixtures(demand: Dict[str, int]) -> None:
+    """Раннер сообщает, сколько офферов каждого статуса понадобится: пул готовит их заранее, но не больше этого"""
+    global _planned_demand
+    with _pools_lock:
+        _planned_demand = dict(demand)
+        for pool in _pools.values():
+            with pool._condition:
+                pool.demand = dict(demand)
+                pool._condition.notify_all()
+            if any(demand.values()):
+                pool.start()
+
+
+def get_offer_pool(tester) -> OfferFixturePool:
+    """Общий для адреса gRPC сервера пул офферов. Если раннер запланировал офферы, при первом обращении
+    запускается фоновая подготовка; иначе пачка готовится, когда пул статуса пуст"""
+    key = (tester.config.host, tester.config.port, tester.config.backend)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = OfferFixturePool(tester, demand=_planned_demand)
+            if _planned_demand and any(_planned_demand.values()):
+                pool.start()
+            _pools[key] = pool
+    return pool
+
+
+def invalidate_offer_pools(*states: str) -> None:
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.invalidate(*states)
+
+
+def print_offer_pool_stats() -> None:
+    for (host, port, backend), pool in list(_pools.items()):
+        stats = pool.stats()
+        if stats["consumed"]:
+            # Под --stub адрес из конфигурации никуда не подключается
+            target = "локального стаба" if backend == BACKEND_STUB else f"{host}:{port}"
+            print(f"📦 Пул офферов {target}: подготовлено {stats['created']}, использовано {stats['consumed']}, "
+                  f"осталось {stats['available']}, ошибок подготовки {stats['errors']}")
+            if pool.leaked:
+                print(f"⚠️  Не отменены после неудачной подготовки: {', '.join(pool.leaked)}")
+
+
+def close_offer_pools() -> None:
+    """Отменяет невыданные офферы до закрытия транспортов и кассеты (см. session_stats.SESSION_RESOURCES)"""
+    global _planned_demand
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+        _planned_demand = None
+    for pool in pools:
+        pool.close()
+        if pool.canceled:
+            print(f"📦 Пул офферов: отменено невыданных офферов {pool.canceled}")
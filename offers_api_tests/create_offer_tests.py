@@ -1,29 +1,30 @@
 import uuid
 from base_tester import BaseOffersApiTester
+from offer_pool import DEFAULT_OFFER_TRADER_ID, DEFAULT_OFFER_PAYMENT_DETAILS_ID, payin_offer_payload
+from suite_registry import register_test
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
+
 
 class CreateOfferTester(BaseOffersApiTester):
     
+    def build_payin_offer_payload(self, trader_id: str = DEFAULT_OFFER_TRADER_ID, trader_payment_details_id: str = DEFAULT_OFFER_PAYMENT_DETAILS_ID) -> dict:
+        """Payload PublishNewOffer для PayIn оффера с уникальным именем"""
+        return payin_offer_payload(trader_id, trader_payment_details_id)
+    
+    @register_test("create_offer_payin_default", "offers", "CreateOffer PayIn Default", tags=("grpc", "write"))
     def test_create_offer_payin_default(self) -> bool:
-        print(f"\n🧪 Тестируем создание PayIn Offer - базовый тест")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем создание PayIn Offer - базовый тест")
+        log.info("=" * 50)
         
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
+        payload = self.build_payin_offer_payload()
         
         result = self.run_grpcurl("PublishNewOffer", payload)
         
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -34,7 +35,7 @@ class CreateOfferTester(BaseOffersApiTester):
         response = result["response"]
         
         if "getOfferResponse" not in response:
-            print("❌ Ответ не содержит getOfferResponse")
+            log.error("❌ Ответ не содержит getOfferResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -46,7 +47,7 @@ class CreateOfferTester(BaseOffersApiTester):
         offer = get_offer_response.get("offer")
         
         if not offer:
-            print("❌ Ответ не содержит offer")
+            log.error("❌ Ответ не содержит offer")
             self.test_results.append({
                 "test": "Наличие offer", 
                 "status": "FAIL", 
@@ -106,9 +107,10 @@ class CreateOfferTester(BaseOffersApiTester):
         
         return tests_passed
 
+    @register_test("create_offer_payout_default", "offers", "CreateOffer PayOut Default", tags=("grpc", "write"))
     def test_create_offer_payout_default(self) -> bool:
-        print(f"\n🧪 Тестируем создание PayOut Offer - базовый тест")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем создание PayOut Offer - базовый тест")
+        log.info("=" * 50)
         
         payload = {
             "pay_out_offer": {
@@ -128,7 +130,7 @@ class CreateOfferTester(BaseOffersApiTester):
         result = self.run_grpcurl("PublishNewOffer", payload)
         
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -139,7 +141,7 @@ class CreateOfferTester(BaseOffersApiTester):
         response = result["response"]
         
         if "getOfferResponse" not in response:
-            print("❌ Ответ не содержит getOfferResponse")
+            log.error("❌ Ответ не содержит getOfferResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -151,7 +153,7 @@ class CreateOfferTester(BaseOffersApiTester):
         offer = get_offer_response.get("offer")
         
         if not offer:
-            print("❌ Ответ не содержит offer")
+            log.error("❌ Ответ не содержит offer")
             self.test_results.append({
                 "test": "Наличие offer", 
                 "status": "FAIL", 
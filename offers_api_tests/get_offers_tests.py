@@ -1,17 +1,24 @@
 from base_tester import BaseOffersApiTester
+from suite_registry import register_test
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
+
 
 class GetOffersTester(BaseOffersApiTester):
     
+    @register_test("get_offers_default", "offers", "GetOffers Default", tags=("grpc", "read"))
     def test_get_offers_default(self) -> bool:
-        print(f"\n🧪 Тестируем GetOffers - базовый тест")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetOffers - базовый тест")
+        log.info("=" * 50)
         
         payload = {}
         
         result = self.run_grpcurl("GetOffers", payload)
         
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -22,7 +29,7 @@ class GetOffersTester(BaseOffersApiTester):
         response = result["response"]
         
         if "getOffersResponse" not in response:
-            print("❌ Ответ не содержит getOffersResponse")
+            log.error("❌ Ответ не содержит getOffersResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -34,7 +41,7 @@ class GetOffersTester(BaseOffersApiTester):
         offers = get_offers_response.get("offers", [])
         
         if not offers:
-            print("❌ Ответ не содержит offers")
+            log.error("❌ Ответ не содержит offers")
             self.test_results.append({
                 "test": "Наличие offers", 
                 "status": "FAIL", 
@@ -43,7 +50,7 @@ class GetOffersTester(BaseOffersApiTester):
             return False
         
         if len(offers) == 0:
-            print("⚠️ Массив offers пуст")
+            log.warning("⚠️ Массив offers пуст")
             self.test_results.append({
                 "test": "Наличие offers", 
                 "status": "WARN", 
@@ -97,13 +104,14 @@ class GetOffersTester(BaseOffersApiTester):
         
         return tests_passed
 
+    @register_test("get_offer_default", "offers", "GetOffer Default", tags=("grpc", "read"))
     def test_get_offer_default(self) -> bool:
-        print(f"\n🧪 Тестируем GetOffer - базовый тест")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetOffer - базовый тест")
+        log.info("=" * 50)
         
         result_for_compare = self.run_grpcurl("GetOffers", {})
         last_offer_id = result_for_compare.get("response", {}).get("getOffersResponse", {}).get("offers", [{}])[0].get("id")
-        print(f"🔍 Последний ID: {last_offer_id}")
+        log.info("🔍 Последний ID: %s", last_offer_id)
 
         payload = {
             "offer_id": last_offer_id
@@ -112,7 +120,7 @@ class GetOffersTester(BaseOffersApiTester):
         result = self.run_grpcurl("GetOffer", payload)
         
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -123,7 +131,7 @@ class GetOffersTester(BaseOffersApiTester):
         response = result["response"]
         
         if "getOfferResponse" not in response:
-            print("❌ Ответ не содержит getOfferResponse")
+            log.error("❌ Ответ не содержит getOfferResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -135,7 +143,7 @@ class GetOffersTester(BaseOffersApiTester):
         offer = get_offer_response.get("offer")
         
         if not offer:
-            print("❌ Ответ не содержит offer")
+            log.error("❌ Ответ не содержит offer")
             self.test_results.append({
                 "test": "Наличие offer", 
                 "status": "FAIL", 
@@ -1,192 +1,161 @@
+import asyncio
 import uuid
 import time
+from collections import Counter
+from typing import Optional
+from config import DEFAULT_CONFIG
 from base_tester import BaseOffersApiTester
+from grpc_transport import result_status
+from async_transport import AsyncRateLimiter, run_in_session_loop
+from order_waiter import OrderStatusWaiter
+from offer_pool import OfferFixtureError, get_offer_pool, invalidate_offer_pools, payin_offer_payload
+from pagination import PageFetchError
+from suite_registry import OFFER_FIXTURE, register_test
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
+
 
 class UpdateOfferTester(BaseOffersApiTester):
     
     
     def _cancel_all_offers(self, test_name: str = "Unknown Test", verbose: bool = True) -> tuple[bool, int, int]:
         if verbose:
-            print(f"🚫 Отмена всех существующих офферов для теста: {test_name}")
-        
-        # Этап 1: Собираем все офферы через пагинацию
-        all_offers = []
-        offset = 0
-        limit = 50  # Максимальный лимит
-        total_count = None
+            log.info("🚫 Отмена всех существующих офферов для теста: %s", test_name)
         
-        if verbose:
-            print("📋 Собираем все офферы через пагинацию...")
-        
-        while True:
-            payload = {
-                "pagination": {
-                    "limit": str(limit),
-                    "offset": str(offset)
-                }
-            }
-            
-            result = self.run_grpcurl("GetOffers", payload, verbose=False)
-            
-            if not result["success"]:
-                print(f"❌ Ошибка получения офферов: {result['error']}")
-                return False, 0, 0
-            
-            response = result["response"]
-            if "getOffersResponse" not in response:
-                print("❌ Неправильная структура ответа - отсутствует getOffersResponse")
-                return False, 0, 0
-            
-            offers_response = response["getOffersResponse"]
-            offers_batch = offers_response.get("offers", [])
-            
-            # Получаем total_count из первого запроса
-            if total_count is None:
-                total_count = int(offers_response.get("totalCount", 0))
-                if verbose:
-                    print(f"📊 Всего офферов в системе: {total_count}")
-            
-            all_offers.extend(offers_batch)
+        # Подготовленные активные офферы тоже будут отменены
+        invalidate_offer_pools("OFFER_ACTIVE")
+        return run_in_session_loop(self._cancel_all_offers_async(verbose))
+    
+    async def _cancel_all_offers_async(self, verbose: bool) -> tuple[bool, int, int]:
+        """Страницы GetOffers потоком идут в очередь, из которой активные офферы отменяют
+        offer_cleanup_concurrency воркеров с общим лимитом offer_cleanup_rate вызовов в секунду"""
+        concurrency = max(1, DEFAULT_CONFIG.offer_cleanup_concurrency)
+        rate_limiter = AsyncRateLimiter(DEFAULT_CONFIG.offer_cleanup_rate)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        cancel_errors = Counter()
+        counters = {"active": 0, "cancelled": 0, "failed": 0}
+        started = time.perf_counter()
+        
+        async def produce() -> bool:
+            # Этап 1: Обходим офферы постранично, передавая активные на отмену по мере получения
+            pages = self.aiter_pages("GetOffers", page_size=50)
+            seen_ids = set()
             
             if verbose:
-                print(f"📄 Получено {len(offers_batch)} офферов (offset: {offset}, всего собрано: {len(all_offers)})")
+                log.info("📋 Собираем офферы через пагинацию и отменяем активные...")
             
-            # Если получили меньше офферов чем лимит, значит это последняя страница
-            if len(offers_batch) < limit:
-                break
-            
-            offset += limit
+            try:
+                async for offer in pages:
+                    # Этап 2: Активные офферы сразу уходят на отмену
+                    if offer.get("status") == "OFFER_ACTIVE" and offer.get("id") not in seen_ids:
+                        seen_ids.add(offer.get("id"))
+                        counters["active"] += 1
+                        await queue.put(offer)
+            except PageFetchError as e:
+                log.error("❌ Ошибка получения офферов: %s", e.error)
+                return False
             
-            # Защита от бесконечного цикла
-            if len(all_offers) >= total_count:
-                break
-        
-        if verbose:
-            print(f"✅ Собрано {len(all_offers)} офферов из {total_count}")
-        
-        # Этап 2: Фильтруем только активные офферы
-        active_offers = [offer for offer in all_offers if offer.get("status") == "OFFER_ACTIVE"]
-        
-        if not active_offers:
             if verbose:
-                print("📋 Нет активных офферов для отмены")
-            return True, 0, 0
-        
-        if verbose:
-            print(f"🎯 Найдено {len(active_offers)} активных офферов для отмены")
-        
-        # Этап 3: Отменяем все активные офферы
-        cancelled_count = 0
-        failed_cancellations = 0
+                log.info("✅ Собрано %s офферов из %s (%s страниц)", pages.items_seen, pages.total_count, pages.pages_fetched)
+            return True
         
-        for i, offer in enumerate(active_offers, 1):
-            offer_id = offer.get("id")
-            offer_name = offer.get("name", "Unknown")
-            offer_status = offer.get("status", "Unknown")
-            
-            if verbose:
-                print(f"  {i}/{len(active_offers)}: Отменяем оффер {offer_name} (ID: {offer_id}, статус: {offer_status})")
-            
-            # Вызываем CancelOffer для каждого оффера в тихом режиме
-            cancel_payload = {"offer_id": offer_id}
-            cancel_result = self.run_grpcurl("CancelOffer", cancel_payload, verbose=False)
-            
-            if cancel_result["success"]:
-                cancelled_count += 1
-                if verbose:
-                    print(f"    ✅ Оффер {offer_name} успешно отменен")
-            else:
-                failed_cancellations += 1
-                if verbose:
-                    print(f"    ❌ Не удалось отменить оффер {offer_name}: {cancel_result['error']}")
+        async def cancel_worker() -> None:
+            # Этап 3: Отменяем активные офферы
+            while True:
+                offer = await queue.get()
+                if offer is None:
+                    return
+                
+                offer_id = offer.get("id")
+                offer_name = offer.get("name", "Unknown")
+                
+                await rate_limiter.wait()
+                cancel_result = await self.arun_grpc("CancelOffer", {"offer_id": offer_id})
+                
+                if cancel_result["success"]:
+                    counters["cancelled"] += 1
+                    if verbose:
+                        log.info("    ✅ Оффер %s (ID: %s) успешно отменен", offer_name, offer_id)
+                else:
+                    counters["failed"] += 1
+                    cancel_errors[result_status(cancel_result)] += 1
+                    if verbose:
+                        log.error("    ❌ Не удалось отменить оффер %s (ID: %s): %s", offer_name, offer_id, cancel_result['error'])
+        
+        workers = [asyncio.create_task(cancel_worker()) for _ in range(concurrency)]
+        try:
+            listed = await produce()
+        finally:
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        
+        elapsed = time.perf_counter() - started
+        cancelled_count = counters["cancelled"]
+        failed_cancellations = counters["failed"]
+        throughput = (cancelled_count + failed_cancellations) / elapsed if elapsed > 0 else 0.0
+        
+        if not counters["active"]:
+            if verbose and listed:
+                log.info("📋 Нет активных офферов для отмены")
+            return listed, 0, 0
         
         if verbose:
-            print(f"\n📊 Результаты отмены офферов:")
-            print(f"   ✅ Успешно отменено: {cancelled_count}")
-            print(f"   ❌ Ошибок отмены: {failed_cancellations}")
-            print(f"   📋 Всего активных офферов: {len(active_offers)}")
+            log.info("\n📊 Результаты отмены офферов:")
+            log.info("   ✅ Успешно отменено: %s", cancelled_count)
+            log.info("   ❌ Ошибок отмены: %s", failed_cancellations)
+            for status, count in cancel_errors.most_common():
+                log.info("      • %s: %s", status, count)
+            log.info("   📋 Всего активных офферов: %s", counters['active'])
+            log.info("   ⚡ %.1f офферов/с за %.1f с (%s потоков)", throughput, elapsed, concurrency)
         else:
-            print(f"🚫 Отменено {cancelled_count}/{len(active_offers)} активных офферов")
+            log.info("🚫 Отменено %s/%s активных офферов за %.1f с (%.1f/с)", cancelled_count, counters['active'], elapsed, throughput)
+        
+        return listed, cancelled_count, failed_cancellations
+    
+    def _acquire_offer(self, state: str) -> Optional[str]:
+        """ID заранее подготовленного оффера в статусе state из общего пула (см. offer_pool)"""
+        try:
+            fixture = get_offer_pool(self).acquire(state, consumer=type(self).__name__)
+        except OfferFixtureError as e:
+            log.error("❌ %s", e)
+            self.test_results.append({
+                "test": f"Подготовка оффера {state}",
+                "status": "FAIL",
+                "details": str(e)
+            })
+            return None
         
-        return True, cancelled_count, failed_cancellations
+        log.info("✅ Оффер %s из пула: %s", state, fixture.offer_id)
+        return fixture.offer_id
     
     def awaiting_for_processing(self, order_id: str) -> bool:
-        print(f"⏳ Ждем изменения статуса заказа {order_id} на 'PROCESSING' (таймаут: 10 сек)")
-
-        payload = {
-            "order_id": order_id
-        }
-
-        start_time = time.time()
-        check_interval = 1  # Проверяем каждую секунду
+        log.info("⏳ Ждем изменения статуса заказа %s на 'PROCESSING' (таймаут: 10 сек)", order_id)
         
-        while time.time() - start_time < 10:
-            result = self.run_grpcurl("GetOrderById", payload, verbose=False)
-            
-            if not result["success"]:
-                print(f"❌ Не удалось получить ордер: {result['error']}")
-                return False
-            
-            response = result["response"]
-            
-            # Извлекаем статус заказа из ответа
-            if "getOrderByIdResponse" in response:
-                order_data = response["getOrderByIdResponse"]
-                
-                # Получаем статус заказа из order.status
-                current_status = "unknown"
-                if "order" in order_data and "status" in order_data["order"]:
-                    current_status = order_data["order"].get("status")
-                
-                print(f"📊 Текущий статус заказа: '{current_status}'")
-                
-                if current_status == "PROCESSING":
-                    elapsed_time = time.time() - start_time
-                    print(f"✅ Статус заказа изменился на 'PROCESSING' за {elapsed_time:.1f} секунд")
-                    return True
-                
-                # Если статус не PROCESSING, ждем и повторяем
-                time.sleep(check_interval)
-            else:
-                print("❌ Неправильная структура ответа - отсутствует getOrderByIdResponse")
-                return False
+        result = OrderStatusWaiter(self).wait(order_id, "PROCESSING", timeout=10)
+        
+        if result.error:
+            log.error("❌ Не удалось получить ордер: %s", result.error)
+            return False
+        
+        if result.reached:
+            log.info("✅ Статус заказа изменился на 'PROCESSING' за %.1f секунд (%s запросов)", result.elapsed, result.polls)
+            return True
         
         # Если таймаут истек
-        elapsed_time = time.time() - start_time
-        print(f"❌ Таймаут 10 секунд истек. Статус заказа так и не изменился на 'PROCESSING'")
+        log.error("❌ Таймаут 10 секунд истек. Статус заказа так и не изменился на 'PROCESSING'")
         return False
 
+    @register_test("pause_offer", "offers", "Pause Offer", tags=("grpc", "write", OFFER_FIXTURE + "OFFER_ACTIVE"))
     def test_pause_offer(self) -> bool:
-        print(f"\n🧪 Тестируем паузу Offer - базовый тест")
-        print("=" * 50)
-        
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
+        log.info("\n🧪 Тестируем паузу Offer - базовый тест")
+        log.info("=" * 50)
         
-        result = self.run_grpcurl("PublishNewOffer", payload)
-        
-        if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
-            self.test_results.append({
-                "test": "gRPC запрос выполнен", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {result['error']}"
-            })
+        offer_id = self._acquire_offer("OFFER_ACTIVE")
+        if offer_id is None:
             return False
-        
-        response = result["response"]
-
-        offer_id = response["getOfferResponse"]["offer"]["id"]
 
         payload = {
             "offer_id": offer_id
@@ -195,7 +164,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         pause_result = self.run_grpcurl("PauseOffer", payload)
         
         if not pause_result["success"]:
-            print(f"❌ Не удалось поставить оффер на паузу: {pause_result['error']}")
+            log.error("❌ Не удалось поставить оффер на паузу: %s", pause_result['error'])
             self.test_results.append({
                 "test": "Постановка оффера на паузу", 
                 "status": "FAIL", 
@@ -203,13 +172,13 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        print("✅ Оффер успешно поставлен на паузу")
+        log.info("✅ Оффер успешно поставлен на паузу")
         
         # Проверяем ответ от PauseOffer
         response = pause_result["response"]
         
         if "getOfferResponse" not in response:
-            print("❌ Ответ не содержит getOfferResponse")
+            log.error("❌ Ответ не содержит getOfferResponse")
             self.test_results.append({
                 "test": "Структура ответа PauseOffer", 
                 "status": "FAIL", 
@@ -221,7 +190,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         offer = get_offer_response.get("offer")
         
         if not offer:
-            print("❌ Ответ не содержит offer")
+            log.error("❌ Ответ не содержит offer")
             self.test_results.append({
                 "test": "Наличие offer в PauseOffer", 
                 "status": "FAIL", 
@@ -241,37 +210,14 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         return tests_passed
 
+    @register_test("cancel_offer_without_orders", "offers", "Cancel Offer Without Orders", tags=("grpc", "write", OFFER_FIXTURE + "OFFER_ACTIVE"))
     def test_cancel_offer_without_orders(self) -> bool:
-        print(f"\n🧪 Тестируем отмену Offer без ордеров - базовый тест")
-        print("=" * 50)
-        
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
+        log.info("\n🧪 Тестируем отмену Offer без ордеров - базовый тест")
+        log.info("=" * 50)
         
-        result = self.run_grpcurl("PublishNewOffer", payload)
-        
-        if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
-            self.test_results.append({
-                "test": "gRPC запрос выполнен", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {result['error']}"
-            })
+        offer_id = self._acquire_offer("OFFER_ACTIVE")
+        if offer_id is None:
             return False
-        
-        response = result["response"]
-
-        offer_id = response["getOfferResponse"]["offer"]["id"]
 
         payload = {
             "offer_id": offer_id
@@ -280,7 +226,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         cancel_result = self.run_grpcurl("CancelOffer", payload)
         
         if not cancel_result["success"]:
-            print(f"❌ Не удалось отменить оффер: {cancel_result['error']}")
+            log.error("❌ Не удалось отменить оффер: %s", cancel_result['error'])
             self.test_results.append({
                 "test": "Отмена оффера", 
                 "status": "FAIL", 
@@ -288,13 +234,13 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        print("✅ Оффер успешно отменен")
+        log.info("✅ Оффер успешно отменен")
         
         # Проверяем ответ от CancelOffer
         response = cancel_result["response"]
         
         if "getOfferResponse" not in response:
-            print("❌ Ответ не содержит getOfferResponse")
+            log.error("❌ Ответ не содержит getOfferResponse")
             self.test_results.append({
                 "test": "Структура ответа CancelOffer", 
                 "status": "FAIL", 
@@ -306,7 +252,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         offer = get_offer_response.get("offer")
         
         if not offer:
-            print("❌ Ответ не содержит offer")
+            log.error("❌ Ответ не содержит offer")
             self.test_results.append({
                 "test": "Наличие offer в CancelOffer", 
                 "status": "FAIL", 
@@ -327,37 +273,14 @@ class UpdateOfferTester(BaseOffersApiTester):
         return tests_passed
 
 
+    @register_test("error_reactivate_active_offer", "offers", "Error Reactivate Active Offer", tags=("grpc", "write", "negative", OFFER_FIXTURE + "OFFER_ACTIVE"))
     def test_error_reactivate_active_offer(self) -> bool:
-        print(f"\n🧪 Тестируем ошибку при активации уже активного Offer")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем ошибку при активации уже активного Offer")
+        log.info("=" * 50)
         
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
-        
-        result = self.run_grpcurl("PublishNewOffer", payload)
-        
-        if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
-            self.test_results.append({
-                "test": "gRPC запрос выполнен", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {result['error']}"
-            })
+        offer_id = self._acquire_offer("OFFER_ACTIVE")
+        if offer_id is None:
             return False
-        
-        response = result["response"]
-
-        offer_id = response["getOfferResponse"]["offer"]["id"]
 
         payload = {
             "offer_id": offer_id
@@ -366,9 +289,9 @@ class UpdateOfferTester(BaseOffersApiTester):
         result = self.run_grpcurl("ReactivateOffer", payload)
         
         if result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
-                "test": f"Error Reactivate Active Offer",
+                "test": "Error Reactivate Active Offer",
                 "status": "FAIL",
                 "details": "Ожидалась ошибка, но запрос прошел успешно"
             })
@@ -376,28 +299,29 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         error_msg = result.get("error", "").lower()
         if "invalid offer status transition" in error_msg:
-            print("✅ Получена ожидаемая ошибка")
+            log.info("✅ Получена ожидаемая ошибка")
             self.test_results.append({
-                "test": f"Error Reactivate Active Offer",
+                "test": "Error Reactivate Active Offer",
                 "status": "PASS",
                 "details": "Получена ожидаемая ошибка 'invalid offer status transition'"
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {result.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", result.get('error'))
             self.test_results.append({
-                "test": f"Error Reactivate Active Offer",
+                "test": "Error Reactivate Active Offer",
                 "status": "FAIL",
                 "details": f"Неожиданная ошибка: {result.get('error')}"
             })
             return False
 
+    @register_test("cancel_active_offer_with_orders", "offers", "Cancel Active Offer With Orders", tags=("grpc", "write"), exclusive=("offers-global",))
     def test_cancel_active_offer_with_orders(self) -> bool:
-        print(f"\n🧪 Тестируем отмену активного Offer с ордерами")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем отмену активного Offer с ордерами")
+        log.info("=" * 50)
         
         # Этап 1: Отменяем все существующие офферы
-        print("🔍 Этап 1: Отмена всех существующих офферов...")
+        log.info("🔍 Этап 1: Отмена всех существующих офферов...")
         is_success, cancelled_count, failed_cancellations = self._cancel_all_offers("Cancel Active Offer With Orders")
         
         if not is_success:
@@ -409,24 +333,13 @@ class UpdateOfferTester(BaseOffersApiTester):
             return False
         
         # Этап 2: Создаем новый оффер для тестирования
-        print("\n🆕 Этап 2: Создание нового оффера для тестирования...")
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
+        log.info("\n🆕 Этап 2: Создание нового оффера для тестирования...")
+        payload = payin_offer_payload()
         
         create_result = self.run_grpcurl("PublishNewOffer", payload)
 
         if not create_result["success"]:
-            print(f"❌ Не удалось создать новый оффер: {create_result['error']}")
+            log.error("❌ Не удалось создать новый оффер: %s", create_result['error'])
             self.test_results.append({
                 "test": "Создание нового оффера", 
                 "status": "FAIL", 
@@ -436,10 +349,10 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         create_response = create_result["response"]
         offer_id = create_response["getOfferResponse"]["offer"]["id"]
-        print(f"✅ Новый оффер создан с ID: {offer_id}")
+        log.info("✅ Новый оффер создан с ID: %s", offer_id)
 
         # Этап 3: Создаем ордер для нового оффера
-        print("\n📦 Этап 3: Создание ордера для нового оффера...")
+        log.info("\n📦 Этап 3: Создание ордера для нового оффера...")
         payload = {
             "company_id": 1,
             "external_client_id": str(uuid.uuid4()),
@@ -455,7 +368,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         order_result = self.run_grpcurl("CreateOrder", payload)
         
         if not order_result["success"]:
-            print(f"❌ Не удалось создать ордер: {order_result['error']}")
+            log.error("❌ Не удалось создать ордер: %s", order_result['error'])
             self.test_results.append({
                 "test": "Создание ордера", 
                 "status": "FAIL", 
@@ -463,13 +376,13 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        print("✅ Ордер успешно создан")
+        log.info("✅ Ордер успешно создан")
         
         # Даем сервису время на обработку пары ордер-оффер
         self.awaiting_for_processing(order_result["response"]["createOrderResponse"]["order"]["orderId"])
 
         # Этап 4: Отменяем оффер с ордером
-        print("\n🚫 Этап 4: Отмена оффера с ордером...")
+        log.info("\n🚫 Этап 4: Отмена оффера с ордером...")
         payload = {
             "offer_id": offer_id
         }
@@ -477,7 +390,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         cancel_result = self.run_grpcurl("CancelOffer", payload)
         
         if not cancel_result["success"]:
-            print(f"❌ Не удалось отменить оффер с ордером: {cancel_result['error']}")
+            log.error("❌ Не удалось отменить оффер с ордером: %s", cancel_result['error'])
             self.test_results.append({
                 "test": "Отмена оффера с ордером", 
                 "status": "FAIL", 
@@ -486,7 +399,7 @@ class UpdateOfferTester(BaseOffersApiTester):
             return False
         
         if not cancel_result["success"]:
-            print(f"❌ Не удалось получить информацию об оффере: {cancel_result['error']}")
+            log.error("❌ Не удалось получить информацию об оффере: %s", cancel_result['error'])
             self.test_results.append({
                 "test": "Получение информации об оффере", 
                 "status": "FAIL", 
@@ -497,7 +410,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         get_offer_response = cancel_result["response"]
         
         if "getOfferResponse" not in get_offer_response:
-            print("❌ Ответ не содержит getOfferResponse")
+            log.error("❌ Ответ не содержит getOfferResponse")
             self.test_results.append({
                 "test": "Структура ответа GetOffer", 
                 "status": "FAIL", 
@@ -508,7 +421,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         offer = get_offer_response["getOfferResponse"].get("offer")
         
         if not offer:
-            print("❌ Ответ не содержит offer")
+            log.error("❌ Ответ не содержит offer")
             self.test_results.append({
                 "test": "Наличие offer в GetOffer", 
                 "status": "FAIL", 
@@ -526,62 +439,26 @@ class UpdateOfferTester(BaseOffersApiTester):
             "details": "Тест пройден успешно" if tests_passed else "Один или несколько тестов провалились"
         })
         
-        print("\n🎉 Тест успешно завершен!")
+        log.info("\n🎉 Тест успешно завершен!")
         return tests_passed
         
+    @register_test("activate_paused_offer", "offers", "Activate Paused Offer", tags=("grpc", "write", OFFER_FIXTURE + "OFFER_ON_HOLD"))
     def test_activate_paused_offer(self) -> bool:
-        print(f"\n🧪 Тестируем активацию остановленного Offer")
-        print("=" * 50)
-        
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
-        
-        result = self.run_grpcurl("PublishNewOffer", payload)
+        log.info("\n🧪 Тестируем активацию остановленного Offer")
+        log.info("=" * 50)
         
-        if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
-            self.test_results.append({
-                "test": "gRPC запрос выполнен", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {result['error']}"
-            })
+        offer_id = self._acquire_offer("OFFER_ON_HOLD")
+        if offer_id is None:
             return False
-        
-        response = result["response"]
-
-        offer_id = response["getOfferResponse"]["offer"]["id"]
 
         payload = {
             "offer_id": offer_id
         }
 
-        pause_result = self.run_grpcurl("PauseOffer", payload)
-        
-        if not pause_result["success"]:
-            print(f"❌ Не удалось остановить оффер: {pause_result['error']}")
-            self.test_results.append({
-                "test": "Остановка оффера", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {pause_result['error']}"
-            })
-            return False
-        
-        print("✅ Оффер успешно остановлен")
-
         reactivate_result = self.run_grpcurl("ReactivateOffer", payload)
         
         if not reactivate_result["success"]:
-            print(f"❌ Не удалось активировать оффер: {reactivate_result['error']}")
+            log.error("❌ Не удалось активировать оффер: %s", reactivate_result['error'])
             self.test_results.append({
                 "test": "Активация оффера", 
                 "status": "FAIL", 
@@ -589,13 +466,13 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        print("✅ Оффер успешно активирован")
+        log.info("✅ Оффер успешно активирован")
         
         # Проверяем ответ от ReactivateOffer
         response = reactivate_result["response"]
         
         if "getOfferResponse" not in response:
-            print("❌ Ответ не содержит getOfferResponse")
+            log.error("❌ Ответ не содержит getOfferResponse")
             self.test_results.append({
                 "test": "Структура ответа ReactivateOffer", 
                 "status": "FAIL", 
@@ -607,7 +484,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         offer = get_offer_response.get("offer")
         
         if not offer:
-            print("❌ Ответ не содержит offer")
+            log.error("❌ Ответ не содержит offer")
             self.test_results.append({
                 "test": "Наличие offer в ReactivateOffer", 
                 "status": "FAIL", 
@@ -627,12 +504,13 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         return tests_passed
         
+    @register_test("transition_offer_on_hold_to_inactive", "offers", "Transition Offer On Hold To Inactive", tags=("grpc", "write"), exclusive=("offers-global",))
     def test_transition_offer_on_hold_to_inactive(self) -> bool:
-        print(f"\n🧪 Тестируем переход Offer из ON_HOLD в INACTIVE")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем переход Offer из ON_HOLD в INACTIVE")
+        log.info("=" * 50)
         
         # Этап 1: Отменяем все существующие офферы
-        print("🔍 Этап 1: Отмена всех существующих офферов...")
+        log.info("🔍 Этап 1: Отмена всех существующих офферов...")
         is_success, cancelled_count, failed_cancellations = self._cancel_all_offers("Transition Offer ON_HOLD to INACTIVE")
         
         if not is_success:
@@ -644,24 +522,13 @@ class UpdateOfferTester(BaseOffersApiTester):
             return False
         
         # Этап 2: Создаем новый оффер
-        print("\n🆕 Этап 2: Создание нового оффера...")
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
+        log.info("\n🆕 Этап 2: Создание нового оффера...")
+        payload = payin_offer_payload()
         
         create_result = self.run_grpcurl("PublishNewOffer", payload)
         
         if not create_result["success"]:
-            print(f"❌ Не удалось создать новый оффер: {create_result['error']}")
+            log.error("❌ Не удалось создать новый оффер: %s", create_result['error'])
             self.test_results.append({
                 "test": "Создание нового оффера", 
                 "status": "FAIL", 
@@ -671,10 +538,10 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         create_response = create_result["response"]
         offer_id = create_response["getOfferResponse"]["offer"]["id"]
-        print(f"✅ Новый оффер создан с ID: {offer_id}")
+        log.info("✅ Новый оффер создан с ID: %s", offer_id)
         
         # Этап 3: Создаем ордер
-        print("\n📦 Этап 3: Создание ордера...")
+        log.info("\n📦 Этап 3: Создание ордера...")
         payload = {
             "company_id": 1,
             "external_client_id": str(uuid.uuid4()),
@@ -690,7 +557,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         order_result = self.run_grpcurl("CreateOrder", payload)
         
         if not order_result["success"]:
-            print(f"❌ Не удалось создать ордер: {order_result['error']}")
+            log.error("❌ Не удалось создать ордер: %s", order_result['error'])
             self.test_results.append({
                 "test": "Создание ордера", 
                 "status": "FAIL", 
@@ -698,20 +565,20 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        print("✅ Ордер успешно создан")
+        log.info("✅ Ордер успешно создан")
         
         # Этап 4: Ждем для обработки сервисом
         self.awaiting_for_processing(order_result["response"]["createOrderResponse"]["order"]["orderId"])
-        print("✅ Время ожидания завершено")
+        log.info("✅ Время ожидания завершено")
         
         # Этап 5: Ставим оффер на паузу
-        print("\n⏸️ Этап 5: Ставим оффер на паузу...")
+        log.info("\n⏸️ Этап 5: Ставим оффер на паузу...")
         payload = {"offer_id": offer_id}
         
         pause_result = self.run_grpcurl("PauseOffer", payload)
         
         if not pause_result["success"]:
-            print(f"❌ Не удалось поставить оффер на паузу: {pause_result['error']}")
+            log.error("❌ Не удалось поставить оффер на паузу: %s", pause_result['error'])
             self.test_results.append({
                 "test": "Постановка оффера на паузу", 
                 "status": "FAIL", 
@@ -719,16 +586,16 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        print("✅ Оффер успешно поставлен на паузу")
+        log.info("✅ Оффер успешно поставлен на паузу")
         
         # Этап 6: Отменяем оффер и проверяем статус INACTIVE
-        print("\n🚫 Этап 6: Отмена оффера и проверка статуса INACTIVE...")
+        log.info("\n🚫 Этап 6: Отмена оффера и проверка статуса INACTIVE...")
         payload = {"offer_id": offer_id}
         
         cancel_result = self.run_grpcurl("CancelOffer", payload)
         
         if not cancel_result["success"]:
-            print(f"❌ Не удалось отменить оффер: {cancel_result['error']}")
+            log.error("❌ Не удалось отменить оффер: %s", cancel_result['error'])
             self.test_results.append({
                 "test": "Отмена оффера", 
                 "status": "FAIL", 
@@ -736,13 +603,13 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        print("✅ Оффер успешно отменен")
+        log.info("✅ Оффер успешно отменен")
         
         # Проверяем статус в ответе от CancelOffer
         response = cancel_result["response"]
         
         if "getOfferResponse" not in response:
-            print("❌ Ответ не содержит getOfferResponse")
+            log.error("❌ Ответ не содержит getOfferResponse")
             self.test_results.append({
                 "test": "Структура ответа CancelOffer", 
                 "status": "FAIL", 
@@ -754,7 +621,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         offer = get_offer_response.get("offer")
         
         if not offer:
-            print("❌ Ответ не содержит offer")
+            log.error("❌ Ответ не содержит offer")
             self.test_results.append({
                 "test": "Наличие offer в CancelOffer", 
                 "status": "FAIL", 
@@ -772,68 +639,28 @@ class UpdateOfferTester(BaseOffersApiTester):
             "details": "Тест пройден успешно" if tests_passed else "Один или несколько тестов провалились"
         })
         
-        print("\n🎉 Тест успешно завершен!")
+        log.info("\n🎉 Тест успешно завершен!")
         return tests_passed
         
+    @register_test("transition_offer_on_hold_to_canceled", "offers", "Transition Offer On Hold To Canceled", tags=("grpc", "write", OFFER_FIXTURE + "OFFER_ON_HOLD"))
     def test_transition_offer_on_hold_to_canceled(self) -> bool:
-        print(f"\n🧪 Тестируем переход Offer из ON_HOLD в CANCELED")
-        print("=" * 50)
-        
-        # Этап 1: Создаем новый оффер
-        print("🆕 Этап 1: Создание нового оффера...")
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
-        
-        create_result = self.run_grpcurl("PublishNewOffer", payload)
-        
-        if not create_result["success"]:
-            print(f"❌ Не удалось создать новый оффер: {create_result['error']}")
-            self.test_results.append({
-                "test": "Создание нового оффера", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {create_result['error']}"
-            })
-            return False
-        
-        create_response = create_result["response"]
-        offer_id = create_response["getOfferResponse"]["offer"]["id"]
-        print(f"✅ Новый оффер создан с ID: {offer_id}")
-        
-        # Этап 2: Ставим оффер на паузу
-        print("\n⏸️ Этап 2: Ставим оффер на паузу...")
-        payload = {"offer_id": offer_id}
-        
-        pause_result = self.run_grpcurl("PauseOffer", payload)
+        log.info("\n🧪 Тестируем переход Offer из ON_HOLD в CANCELED")
+        log.info("=" * 50)
         
-        if not pause_result["success"]:
-            print(f"❌ Не удалось поставить оффер на паузу: {pause_result['error']}")
-            self.test_results.append({
-                "test": "Постановка оффера на паузу", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {pause_result['error']}"
-            })
+        # Этап 1: Берем из пула оффер в статусе ON_HOLD
+        log.info("🆕 Этап 1: Берем оффер ON_HOLD из пула...")
+        offer_id = self._acquire_offer("OFFER_ON_HOLD")
+        if offer_id is None:
             return False
         
-        print("✅ Оффер успешно поставлен на паузу")
-        
-        # Этап 3: Отменяем оффер и проверяем статус CANCELED
-        print("\n🚫 Этап 3: Отмена оффера и проверка статуса CANCELED...")
+        # Этап 2: Отменяем оффер и проверяем статус CANCELED
+        log.info("\n🚫 Этап 2: Отмена оффера и проверка статуса CANCELED...")
         payload = {"offer_id": offer_id}
         
         cancel_result = self.run_grpcurl("CancelOffer", payload)
         
         if not cancel_result["success"]:
-            print(f"❌ Не удалось отменить оффер: {cancel_result['error']}")
+            log.error("❌ Не удалось отменить оффер: %s", cancel_result['error'])
             self.test_results.append({
                 "test": "Отмена оффера", 
                 "status": "FAIL", 
@@ -841,13 +668,13 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        print("✅ Оффер успешно отменен")
+        log.info("✅ Оффер успешно отменен")
         
         # Проверяем статус в ответе от CancelOffer
         response = cancel_result["response"]
         
         if "getOfferResponse" not in response:
-            print("❌ Ответ не содержит getOfferResponse")
+            log.error("❌ Ответ не содержит getOfferResponse")
             self.test_results.append({
                 "test": "Структура ответа CancelOffer", 
                 "status": "FAIL", 
@@ -859,7 +686,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         offer = get_offer_response.get("offer")
         
         if not offer:
-            print("❌ Ответ не содержит offer")
+            log.error("❌ Ответ не содержит offer")
             self.test_results.append({
                 "test": "Наличие offer в CancelOffer", 
                 "status": "FAIL", 
@@ -877,68 +704,28 @@ class UpdateOfferTester(BaseOffersApiTester):
             "details": "Тест пройден успешно" if tests_passed else "Один или несколько тестов провалились"
         })
         
-        print("\n🎉 Тест успешно завершен!")
+        log.info("\n🎉 Тест успешно завершен!")
         return tests_passed
         
+    @register_test("error_pause_already_paused_offer", "offers", "Error Pause Already Paused Offer", tags=("grpc", "write", "negative", OFFER_FIXTURE + "OFFER_ON_HOLD"))
     def test_error_pause_already_paused_offer(self) -> bool:
-        print(f"\n🧪 Тестируем ошибку при попытке поставить уже остановленный оффер на паузу")
-        print("=" * 50)
-        
-        # Этап 1: Создаем новый оффер
-        print("🆕 Этап 1: Создание нового оффера...")
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
-        
-        create_result = self.run_grpcurl("PublishNewOffer", payload)
-        
-        if not create_result["success"]:
-            print(f"❌ Не удалось создать новый оффер: {create_result['error']}")
-            self.test_results.append({
-                "test": "Создание нового оффера", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {create_result['error']}"
-            })
-            return False
+        log.info("\n🧪 Тестируем ошибку при попытке поставить уже остановленный оффер на паузу")
+        log.info("=" * 50)
         
-        create_response = create_result["response"]
-        offer_id = create_response["getOfferResponse"]["offer"]["id"]
-        print(f"✅ Новый оффер создан с ID: {offer_id}")
-        
-        # Этап 2: Ставим оффер на паузу первый раз
-        print("\n⏸️ Этап 2: Ставим оффер на паузу первый раз...")
-        payload = {"offer_id": offer_id}
-        
-        pause_result = self.run_grpcurl("PauseOffer", payload)
-        
-        if not pause_result["success"]:
-            print(f"❌ Не удалось поставить оффер на паузу первый раз: {pause_result['error']}")
-            self.test_results.append({
-                "test": "Постановка оффера на паузу первый раз", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {pause_result['error']}"
-            })
+        # Этап 1: Берем из пула оффер в статусе ON_HOLD
+        log.info("🆕 Этап 1: Берем оффер ON_HOLD из пула...")
+        offer_id = self._acquire_offer("OFFER_ON_HOLD")
+        if offer_id is None:
             return False
         
-        print("✅ Оффер успешно поставлен на паузу первый раз")
-        
-        # Этап 3: Пытаемся поставить оффер на паузу второй раз (ожидаем ошибку)
-        print("\n⏸️ Этап 3: Пытаемся поставить оффер на паузу второй раз (ожидаем ошибку)...")
+        # Этап 2: Пытаемся повторно поставить оффер на паузу (ожидаем ошибку)
+        log.info("\n⏸️ Этап 2: Пытаемся повторно поставить оффер на паузу (ожидаем ошибку)...")
         payload = {"offer_id": offer_id}
         
         pause_result_second = self.run_grpcurl("PauseOffer", payload)
         
         if pause_result_second["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
                 "test": "Error Pause Already Paused Offer",
                 "status": "FAIL",
@@ -948,7 +735,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         error_msg = pause_result_second.get("error", "").lower()
         if "invalid offer status transition" in error_msg:
-            print("✅ Получена ожидаемая ошибка 'invalid offer status transition'")
+            log.info("✅ Получена ожидаемая ошибка 'invalid offer status transition'")
             self.test_results.append({
                 "test": "Error Pause Already Paused Offer",
                 "status": "PASS",
@@ -956,7 +743,7 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {pause_result_second.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", pause_result_second.get('error'))
             self.test_results.append({
                 "test": "Error Pause Already Paused Offer",
                 "status": "FAIL",
@@ -964,12 +751,13 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
+    @register_test("error_reactivate_inactive_offer", "offers", "Error Reactivate Inactive Offer", tags=("grpc", "write", "negative"), exclusive=("offers-global",))
     def test_error_reactivate_inactive_offer(self) -> bool:
-        print(f"\n🧪 Тестируем ошибку при попытке активировать неактивный оффер")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем ошибку при попытке активировать неактивный оффер")
+        log.info("=" * 50)
         
         # Этап 1: Отменяем все существующие офферы
-        print("🔍 Этап 1: Отмена всех существующих офферов...")
+        log.info("🔍 Этап 1: Отмена всех существующих офферов...")
         is_success, cancelled_count, failed_cancellations = self._cancel_all_offers("Error Reactivate Inactive Offer")
         
         if not is_success:
@@ -981,24 +769,13 @@ class UpdateOfferTester(BaseOffersApiTester):
             return False
         
         # Этап 2: Создаем новый оффер
-        print("\n🆕 Этап 2: Создание нового оффера...")
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
+        log.info("\n🆕 Этап 2: Создание нового оффера...")
+        payload = payin_offer_payload()
         
         create_result = self.run_grpcurl("PublishNewOffer", payload)
         
         if not create_result["success"]:
-            print(f"❌ Не удалось создать новый оффер: {create_result['error']}")
+            log.error("❌ Не удалось создать новый оффер: %s", create_result['error'])
             self.test_results.append({
                 "test": "Создание нового оффера", 
                 "status": "FAIL", 
@@ -1008,10 +785,10 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         create_response = create_result["response"]
         offer_id = create_response["getOfferResponse"]["offer"]["id"]
-        print(f"✅ Новый оффер создан с ID: {offer_id}")
+        log.info("✅ Новый оффер создан с ID: %s", offer_id)
         
         # Этап 3: Создаем ордер
-        print("\n📦 Этап 3: Создание ордера...")
+        log.info("\n📦 Этап 3: Создание ордера...")
         payload = {
             "company_id": 1,
             "external_client_id": str(uuid.uuid4()),
@@ -1027,7 +804,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         order_result = self.run_grpcurl("CreateOrder", payload)
         
         if not order_result["success"]:
-            print(f"❌ Не удалось создать ордер: {order_result['error']}")
+            log.error("❌ Не удалось создать ордер: %s", order_result['error'])
             self.test_results.append({
                 "test": "Создание ордера", 
                 "status": "FAIL", 
@@ -1035,21 +812,21 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        print("✅ Ордер успешно создан")
+        log.info("✅ Ордер успешно создан")
         
         # Этап 4: Ждем для обработки
-        print("⏳ Этап 4: Ждем для обработки сервисом...")
+        log.info("⏳ Этап 4: Ждем для обработки сервисом...")
         self.awaiting_for_processing(order_result["response"]["createOrderResponse"]["order"]["orderId"])
-        print("✅ Время ожидания завершено")
+        log.info("✅ Время ожидания завершено")
         
         # Этап 5: Отключаем оффер и проверяем статус INACTIVE
-        print("\n🚫 Этап 5: Отключение оффера и проверка статуса INACTIVE...")
+        log.info("\n🚫 Этап 5: Отключение оффера и проверка статуса INACTIVE...")
         payload = {"offer_id": offer_id}
         
         cancel_result = self.run_grpcurl("CancelOffer", payload)
         
         if not cancel_result["success"]:
-            print(f"❌ Не удалось отключить оффер: {cancel_result['error']}")
+            log.error("❌ Не удалось отключить оффер: %s", cancel_result['error'])
             self.test_results.append({
                 "test": "Отключение оффера", 
                 "status": "FAIL", 
@@ -1057,13 +834,13 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        print("✅ Оффер успешно отключен")
+        log.info("✅ Оффер успешно отключен")
         
         # Проверяем статус в ответе от CancelOffer
         response = cancel_result["response"]
         
         if "getOfferResponse" not in response:
-            print("❌ Ответ не содержит getOfferResponse")
+            log.error("❌ Ответ не содержит getOfferResponse")
             self.test_results.append({
                 "test": "Структура ответа CancelOffer", 
                 "status": "FAIL", 
@@ -1075,7 +852,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         offer = get_offer_response.get("offer")
         
         if not offer:
-            print("❌ Ответ не содержит offer")
+            log.error("❌ Ответ не содержит offer")
             self.test_results.append({
                 "test": "Наличие offer в CancelOffer", 
                 "status": "FAIL", 
@@ -1085,7 +862,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         # Проверяем, что статус = INACTIVE
         if offer.get("status") != "OFFER_INACTIVE":
-            print(f"❌ Неожиданный статус оффера: {offer.get('status')}, ожидался OFFER_INACTIVE")
+            log.error("❌ Неожиданный статус оффера: %s, ожидался OFFER_INACTIVE", offer.get('status'))
             self.test_results.append({
                 "test": "Статус оффера после отключения", 
                 "status": "FAIL", 
@@ -1093,16 +870,16 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        print("✅ Статус оффера корректно установлен в INACTIVE")
+        log.info("✅ Статус оффера корректно установлен в INACTIVE")
         
         # Этап 6: Пытаемся реактивировать неактивный оффер (ожидаем ошибку)
-        print("\n🔄 Этап 6: Попытка реактивации неактивного оффера (ожидаем ошибку)...")
+        log.info("\n🔄 Этап 6: Попытка реактивации неактивного оффера (ожидаем ошибку)...")
         payload = {"offer_id": offer_id}
         
         reactivate_result = self.run_grpcurl("ReactivateOffer", payload)
         
         if reactivate_result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
                 "test": "Error Reactivate Inactive Offer",
                 "status": "FAIL",
@@ -1112,7 +889,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         error_msg = reactivate_result.get("error", "").lower()
         if "invalid offer status transition" in error_msg:
-            print("✅ Получена ожидаемая ошибка 'invalid offer status transition'")
+            log.info("✅ Получена ожидаемая ошибка 'invalid offer status transition'")
             self.test_results.append({
                 "test": "Error Reactivate Inactive Offer",
                 "status": "PASS",
@@ -1120,7 +897,7 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {reactivate_result.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", reactivate_result.get('error'))
             self.test_results.append({
                 "test": "Error Reactivate Inactive Offer",
                 "status": "FAIL",
@@ -1128,176 +905,13 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-    def test_error_pause_inactive_offer(self) -> bool:
-        print(f"\n🧪 Тестируем ошибку при попытке поставить неактивный оффер на паузу")
-        print("=" * 50)
-        
-        # Этап 1: Отменяем все существующие офферы
-        print("🔍 Этап 1: Отмена всех существующих офферов...")
-        is_success, cancelled_count, failed_cancellations = self._cancel_all_offers("Cancel Active Offer With Orders")
-        
-        if not is_success:
-            self.test_results.append({
-                "test": "Отмена существующих офферов",
-                "status": "FAIL",
-                "details": "Не удалось отменить существующие офферы"
-            })
-            return False
-        
-        # Этап 2: Создаем новый оффер
-        print("\n🆕 Этап 2: Создание нового оффера...")
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
-        
-        create_result = self.run_grpcurl("PublishNewOffer", payload)
-        
-        if not create_result["success"]:
-            print(f"❌ Не удалось создать новый оффер: {create_result['error']}")
-            self.test_results.append({
-                "test": "Создание нового оффера", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {create_result['error']}"
-            })
-            return False
-        
-        create_response = create_result["response"]
-        offer_id = create_response["getOfferResponse"]["offer"]["id"]
-        print(f"✅ Новый оффер создан с ID: {offer_id}")
-        
-        # Этап 3: Создаем ордер
-        print("\n📦 Этап 3: Создание ордера...")
-        payload = {
-            "company_id": 1,
-            "external_client_id": str(uuid.uuid4()),
-            "external_order_id": f"external_id_{uuid.uuid4().hex[:8]}",
-            "amount": 12000,
-            "callback_url": "http://example.com/callback",
-            "success_url": "http://example.com/success",
-            "fail_url": "http://example.com/fail",
-            "correlation_id": "random",
-            "payment_method_id": 2
-        }
-        
-        order_result = self.run_grpcurl("CreateOrder", payload)
-        
-        if not order_result["success"]:
-            print(f"❌ Не удалось создать ордер: {order_result['error']}")
-            self.test_results.append({
-                "test": "Создание ордера", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {order_result['error']}"
-            })
-            return False
-        
-        print("✅ Ордер успешно создан")
-        
-        # Этап 4: Ждем для обработки
-        print("⏳ Этап 4: Ждем для обработки сервисом...")
-        self.awaiting_for_processing(order_result["response"]["createOrderResponse"]["order"]["orderId"])
-        print("✅ Время ожидания завершено")
-        
-        # Этап 5: Отключаем оффер и проверяем статус INACTIVE
-        print("\n🚫 Этап 5: Отключение оффера и проверка статуса INACTIVE...")
-        payload = {"offer_id": offer_id}
-        
-        cancel_result = self.run_grpcurl("CancelOffer", payload)
-        
-        if not cancel_result["success"]:
-            print(f"❌ Не удалось отключить оффер: {cancel_result['error']}")
-            self.test_results.append({
-                "test": "Отключение оффера", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {cancel_result['error']}"
-            })
-            return False
-        
-        print("✅ Оффер успешно отключен")
-        
-        # Проверяем статус в ответе от CancelOffer
-        response = cancel_result["response"]
-        
-        if "getOfferResponse" not in response:
-            print("❌ Ответ не содержит getOfferResponse")
-            self.test_results.append({
-                "test": "Структура ответа CancelOffer", 
-                "status": "FAIL", 
-                "details": "Отсутствует getOfferResponse"
-            })
-            return False
-        
-        get_offer_response = response["getOfferResponse"]
-        offer = get_offer_response.get("offer")
-        
-        if not offer:
-            print("❌ Ответ не содержит offer")
-            self.test_results.append({
-                "test": "Наличие offer в CancelOffer", 
-                "status": "FAIL", 
-                "details": "Отсутствует offer в ответе"
-            })
-            return False
-        
-        # Проверяем, что статус = INACTIVE
-        if offer.get("status") != "OFFER_INACTIVE":
-            print(f"❌ Неожиданный статус оффера: {offer.get('status')}, ожидался OFFER_INACTIVE")
-            self.test_results.append({
-                "test": "Статус оффера после отключения", 
-                "status": "FAIL", 
-                "details": f"Статус: {offer.get('status')}, ожидался: OFFER_INACTIVE"
-            })
-            return False
-        
-        print("✅ Статус оффера корректно установлен в INACTIVE")
-        
-        # Этап 6: Пытаемся поставить неактивный оффер на паузу (ожидаем ошибку)
-        print("\n⏸️ Этап 6: Попытка постановки неактивного оффера на паузу (ожидаем ошибку)...")
-        payload = {"offer_id": offer_id}
-        
-        pause_result = self.run_grpcurl("PauseOffer", payload)
-        
-        if pause_result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
-            self.test_results.append({
-                "test": "Error Pause Inactive Offer",
-                "status": "FAIL",
-                "details": "Ожидалась ошибка, но запрос прошел успешно"
-            })
-            return False
-        
-        error_msg = pause_result.get("error", "").lower()
-        if "invalid offer status transition" in error_msg:
-            print("✅ Получена ожидаемая ошибка 'invalid offer status transition'")
-            self.test_results.append({
-                "test": "Error Pause Inactive Offer",
-                "status": "PASS",
-                "details": "Получена ожидаемая ошибка 'invalid offer status transition'"
-            })
-            return True
-        else:
-            print(f"❌ Неожиданная ошибка: {pause_result.get('error')}")
-            self.test_results.append({
-                "test": "Error Pause Inactive Offer",
-                "status": "FAIL",
-                "details": f"Неожиданная ошибка: {pause_result.get('error')}"
-            })
-            return False
-        
+    @register_test("error_cancel_inactive_offer", "offers", "Error Cancel Inactive Offer", tags=("grpc", "write", "negative"), exclusive=("offers-global",))
     def test_error_cancel_inactive_offer(self) -> bool:
-        print(f"\n🧪 Тестируем ошибку при попытке отменить неактивный оффер")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем ошибку при попытке отменить неактивный оффер")
+        log.info("=" * 50)
         
         # Этап 1: Отменяем все существующие офферы
-        print("🔍 Этап 1: Отмена всех существующих офферов...")
+        log.info("🔍 Этап 1: Отмена всех существующих офферов...")
         is_success, cancelled_count, failed_cancellations = self._cancel_all_offers("Cancel Active Offer With Orders")
         
         if not is_success:
@@ -1309,24 +923,13 @@ class UpdateOfferTester(BaseOffersApiTester):
             return False
         
         # Этап 2: Создаем новый оффер
-        print("\n🆕 Этап 2: Создание нового оффера...")
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
+        log.info("\n🆕 Этап 2: Создание нового оффера...")
+        payload = payin_offer_payload()
         
         create_result = self.run_grpcurl("PublishNewOffer", payload)
         
         if not create_result["success"]:
-            print(f"❌ Не удалось создать новый оффер: {create_result['error']}")
+            log.error("❌ Не удалось создать новый оффер: %s", create_result['error'])
             self.test_results.append({
                 "test": "Создание нового оффера", 
                 "status": "FAIL", 
@@ -1336,10 +939,10 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         create_response = create_result["response"]
         offer_id = create_response["getOfferResponse"]["offer"]["id"]
-        print(f"✅ Новый оффер создан с ID: {offer_id}")
+        log.info("✅ Новый оффер создан с ID: %s", offer_id)
         
         # Этап 3: Создаем ордер
-        print("\n📦 Этап 3: Создание ордера...")
+        log.info("\n📦 Этап 3: Создание ордера...")
         payload = {
             "company_id": 1,
             "external_client_id": str(uuid.uuid4()),
@@ -1355,7 +958,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         order_result = self.run_grpcurl("CreateOrder", payload)
         
         if not order_result["success"]:
-            print(f"❌ Не удалось создать ордер: {order_result['error']}")
+            log.error("❌ Не удалось создать ордер: %s", order_result['error'])
             self.test_results.append({
                 "test": "Создание ордера", 
                 "status": "FAIL", 
@@ -1363,21 +966,21 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        print("✅ Ордер успешно создан")
+        log.info("✅ Ордер успешно создан")
         
         # Этап 4: Ждем для обработки
-        print("⏳ Этап 4: Ждем для обработки сервисом...")
+        log.info("⏳ Этап 4: Ждем для обработки сервисом...")
         self.awaiting_for_processing(order_result["response"]["createOrderResponse"]["order"]["orderId"])
-        print("✅ Время ожидания завершено")
+        log.info("✅ Время ожидания завершено")
         
         # Этап 5: Отключаем оффер и проверяем статус INACTIVE
-        print("\n🚫 Этап 5: Отключение оффера и проверка статуса INACTIVE...")
+        log.info("\n🚫 Этап 5: Отключение оффера и проверка статуса INACTIVE...")
         payload = {"offer_id": offer_id}
         
         cancel_result = self.run_grpcurl("CancelOffer", payload)
         
         if not cancel_result["success"]:
-            print(f"❌ Не удалось отключить оффер: {cancel_result['error']}")
+            log.error("❌ Не удалось отключить оффер: %s", cancel_result['error'])
             self.test_results.append({
                 "test": "Отключение оффера", 
                 "status": "FAIL", 
@@ -1385,13 +988,13 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        print("✅ Оффер успешно отключен")
+        log.info("✅ Оффер успешно отключен")
         
         # Проверяем статус в ответе от CancelOffer
         response = cancel_result["response"]
         
         if "getOfferResponse" not in response:
-            print("❌ Ответ не содержит getOfferResponse")
+            log.error("❌ Ответ не содержит getOfferResponse")
             self.test_results.append({
                 "test": "Структура ответа CancelOffer", 
                 "status": "FAIL", 
@@ -1403,7 +1006,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         offer = get_offer_response.get("offer")
         
         if not offer:
-            print("❌ Ответ не содержит offer")
+            log.error("❌ Ответ не содержит offer")
             self.test_results.append({
                 "test": "Наличие offer в CancelOffer", 
                 "status": "FAIL", 
@@ -1413,7 +1016,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         # Проверяем, что статус = INACTIVE
         if offer.get("status") != "OFFER_INACTIVE":
-            print(f"❌ Неожиданный статус оффера: {offer.get('status')}, ожидался OFFER_INACTIVE")
+            log.error("❌ Неожиданный статус оффера: %s, ожидался OFFER_INACTIVE", offer.get('status'))
             self.test_results.append({
                 "test": "Статус оффера после отключения", 
                 "status": "FAIL", 
@@ -1421,16 +1024,16 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        print("✅ Статус оффера корректно установлен в INACTIVE")
+        log.info("✅ Статус оффера корректно установлен в INACTIVE")
         
         # Этап 6: Пытаемся отменить неактивный оффер еще раз (ожидаем ошибку)
-        print("\n🚫 Этап 6: Попытка повторной отмены неактивного оффера (ожидаем ошибку)...")
+        log.info("\n🚫 Этап 6: Попытка повторной отмены неактивного оффера (ожидаем ошибку)...")
         payload = {"offer_id": offer_id}
         
         cancel_again_result = self.run_grpcurl("CancelOffer", payload)
         
         if cancel_again_result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
                 "test": "Error Cancel Inactive Offer",
                 "status": "FAIL",
@@ -1440,7 +1043,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         error_msg = cancel_again_result.get("error", "").lower()
         if "invalid offer status transition" in error_msg:
-            print("✅ Получена ожидаемая ошибка 'invalid offer status transition'")
+            log.info("✅ Получена ожидаемая ошибка 'invalid offer status transition'")
             self.test_results.append({
                 "test": "Error Cancel Inactive Offer",
                 "status": "PASS",
@@ -1448,7 +1051,7 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {cancel_again_result.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", cancel_again_result.get('error'))
             self.test_results.append({
                 "test": "Error Cancel Inactive Offer",
                 "status": "FAIL",
@@ -1456,101 +1059,25 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
+    @register_test("error_cancel_canceled_offer", "offers", "Error Cancel Canceled Offer", tags=("grpc", "write", "negative", OFFER_FIXTURE + "OFFER_CANCELED"))
     def test_error_cancel_canceled_offer(self) -> bool:
-        print(f"\n🧪 Тестируем ошибку при попытке отменить уже отмененный оффер")
-        print("=" * 50)
-        
-        # Этап 1: Создаем новый оффер
-        print("🆕 Этап 1: Создание нового оффера...")
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
-        
-        create_result = self.run_grpcurl("PublishNewOffer", payload)
-        
-        if not create_result["success"]:
-            print(f"❌ Не удалось создать новый оффер: {create_result['error']}")
-            self.test_results.append({
-                "test": "Создание нового оффера", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {create_result['error']}"
-            })
-            return False
-        
-        create_response = create_result["response"]
-        offer_id = create_response["getOfferResponse"]["offer"]["id"]
-        print(f"✅ Новый оффер создан с ID: {offer_id}")
-        
-        # Этап 2: Отменяем оффер и проверяем статус CANCELED
-        print("\n🚫 Этап 2: Отмена оффера и проверка статуса CANCELED...")
-        payload = {"offer_id": offer_id}
-        
-        cancel_result = self.run_grpcurl("CancelOffer", payload)
-        
-        if not cancel_result["success"]:
-            print(f"❌ Не удалось отменить оффер: {cancel_result['error']}")
-            self.test_results.append({
-                "test": "Отмена оффера", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {cancel_result['error']}"
-            })
-            return False
-        
-        print("✅ Оффер успешно отменен")
-        
-        # Проверяем статус в ответе от CancelOffer
-        response = cancel_result["response"]
-        
-        if "getOfferResponse" not in response:
-            print("❌ Ответ не содержит getOfferResponse")
-            self.test_results.append({
-                "test": "Структура ответа CancelOffer", 
-                "status": "FAIL", 
-                "details": "Отсутствует getOfferResponse"
-            })
-            return False
-        
-        get_offer_response = response["getOfferResponse"]
-        offer = get_offer_response.get("offer")
+        log.info("\n🧪 Тестируем ошибку при попытке отменить уже отмененный оффер")
+        log.info("=" * 50)
         
-        if not offer:
-            print("❌ Ответ не содержит offer")
-            self.test_results.append({
-                "test": "Наличие offer в CancelOffer", 
-                "status": "FAIL", 
-                "details": "Отсутствует offer в ответе"
-            })
-            return False
-        
-        # Проверяем, что статус = CANCELED
-        if offer.get("status") != "OFFER_CANCELED":
-            print(f"❌ Неожиданный статус оффера: {offer.get('status')}, ожидался OFFER_CANCELED")
-            self.test_results.append({
-                "test": "Статус оффера после отмены", 
-                "status": "FAIL", 
-                "details": f"Статус: {offer.get('status')}, ожидался: OFFER_CANCELED"
-            })
+        # Этап 1: Берем из пула оффер в статусе CANCELED
+        log.info("🆕 Этап 1: Берем оффер CANCELED из пула...")
+        offer_id = self._acquire_offer("OFFER_CANCELED")
+        if offer_id is None:
             return False
         
-        print("✅ Статус оффера корректно установлен в CANCELED")
-        
-        # Этап 3: Пытаемся отменить уже отмененный оффер еще раз (ожидаем ошибку)
-        print("\n🚫 Этап 3: Попытка повторной отмены уже отмененного оффера (ожидаем ошибку)...")
+        # Этап 2: Пытаемся отменить уже отмененный оффер еще раз (ожидаем ошибку)
+        log.info("\n🚫 Этап 2: Попытка повторной отмены уже отмененного оффера (ожидаем ошибку)...")
         payload = {"offer_id": offer_id}
         
         cancel_again_result = self.run_grpcurl("CancelOffer", payload)
         
         if cancel_again_result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
                 "test": "Error Cancel Canceled Offer",
                 "status": "FAIL",
@@ -1560,7 +1087,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         error_msg = cancel_again_result.get("error", "").lower()
         if "invalid offer status transition" in error_msg:
-            print("✅ Получена ожидаемая ошибка 'invalid offer status transition'")
+            log.info("✅ Получена ожидаемая ошибка 'invalid offer status transition'")
             self.test_results.append({
                 "test": "Error Cancel Canceled Offer",
                 "status": "PASS",
@@ -1568,7 +1095,7 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {cancel_again_result.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", cancel_again_result.get('error'))
             self.test_results.append({
                 "test": "Error Cancel Canceled Offer",
                 "status": "FAIL",
@@ -1576,149 +1103,119 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
+    @register_test("error_reactivate_canceled_offer", "offers", "Error Reactivate Canceled Offer", tags=("grpc", "write", "negative", OFFER_FIXTURE + "OFFER_CANCELED"))
     def test_error_reactivate_canceled_offer(self) -> bool:
-        print(f"\n🧪 Тестируем ошибку при попытке активировать отмененный оффер")
-        print("=" * 50)
-        
-        # Этап 1: Создаем новый оффер
-        print("🆕 Этап 1: Создание нового оффера...")
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
-        
-        create_result = self.run_grpcurl("PublishNewOffer", payload)
+        log.info("\n🧪 Тестируем ошибку при попытке активировать отмененный оффер")
+        log.info("=" * 50)
         
-        if not create_result["success"]:
-            print(f"❌ Не удалось создать новый оффер: {create_result['error']}")
-            self.test_results.append({
-                "test": "Создание нового оффера", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {create_result['error']}"
-            })
+        # Этап 1: Берем из пула оффер в статусе CANCELED
+        log.info("🆕 Этап 1: Берем оффер CANCELED из пула...")
+        offer_id = self._acquire_offer("OFFER_CANCELED")
+        if offer_id is None:
             return False
         
-        create_response = create_result["response"]
-        offer_id = create_response["getOfferResponse"]["offer"]["id"]
-        print(f"✅ Новый оффер создан с ID: {offer_id}")
-        
-        # Этап 2: Отменяем оффер и проверяем статус CANCELED
-        print("\n🚫 Этап 2: Отмена оффера и проверка статуса CANCELED...")
+        # Этап 2: Пытаемся активировать отмененный оффер (ожидаем ошибку)
+        log.info("\n🔄 Этап 2: Попытка активации отмененного оффера (ожидаем ошибку)...")
         payload = {"offer_id": offer_id}
         
-        cancel_result = self.run_grpcurl("CancelOffer", payload)
+        reactivate_result = self.run_grpcurl("ReactivateOffer", payload)
         
-        if not cancel_result["success"]:
-            print(f"❌ Не удалось отменить оффер: {cancel_result['error']}")
+        if reactivate_result["success"]:
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
-                "test": "Отмена оффера", 
-                "status": "FAIL", 
-                "details": f"Ошибка: {cancel_result['error']}"
+                "test": "Error Reactivate Canceled Offer",
+                "status": "FAIL",
+                "details": "Ожидалась ошибка, но запрос прошел успешно"
             })
             return False
         
-        print("✅ Оффер успешно отменен")
-        
-        # Проверяем статус в ответе от CancelOffer
-        response = cancel_result["response"]
-        
-        if "getOfferResponse" not in response:
-            print("❌ Ответ не содержит getOfferResponse")
+        error_msg = reactivate_result.get("error", "").lower()
+        if "invalid offer status transition" in error_msg:
+            log.info("✅ Получена ожидаемая ошибка 'invalid offer status transition'")
             self.test_results.append({
-                "test": "Структура ответа CancelOffer", 
-                "status": "FAIL", 
-                "details": "Отсутствует getOfferResponse"
+                "test": "Error Reactivate Canceled Offer",
+                "status": "PASS",
+                "details": "Получена ожидаемая ошибка 'invalid offer status transition'"
             })
-            return False
-        
-        get_offer_response = response["getOfferResponse"]
-        offer = get_offer_response.get("offer")
-        
-        if not offer:
-            print("❌ Ответ не содержит offer")
+            return True
+        else:
+            log.error("❌ Неожиданная ошибка: %s", reactivate_result.get('error'))
             self.test_results.append({
-                "test": "Наличие offer в CancelOffer", 
-                "status": "FAIL", 
-                "details": "Отсутствует offer в ответе"
+                "test": "Error Reactivate Canceled Offer",
+                "status": "FAIL",
+                "details": f"Неожиданная ошибка: {reactivate_result.get('error')}"
             })
             return False
         
-        # Проверяем, что статус = CANCELED
-        if offer.get("status") != "OFFER_CANCELED":
-            print(f"❌ Неожиданный статус оффера: {offer.get('status')}, ожидался OFFER_CANCELED")
-            self.test_results.append({
-                "test": "Статус оффера после отмены", 
-                "status": "FAIL", 
-                "details": f"Статус: {offer.get('status')}, ожидался: OFFER_CANCELED"
-            })
-            return False
+    @register_test("error_pause_canceled_offer", "offers", "Error Pause Canceled Offer", tags=("grpc", "write", "negative", OFFER_FIXTURE + "OFFER_CANCELED"))
+    def test_error_pause_canceled_offer(self) -> bool:
+        log.info("\n🧪 Тестируем ошибку при попытке поставить на паузу отмененный оффер")
+        log.info("=" * 50)
         
-        print("✅ Статус оффера корректно установлен в CANCELED")
+        # Этап 1: Берем из пула оффер в статусе CANCELED
+        log.info("🆕 Этап 1: Берем оффер CANCELED из пула...")
+        offer_id = self._acquire_offer("OFFER_CANCELED")
+        if offer_id is None:
+            return False
         
-        # Этап 3: Пытаемся активировать отмененный оффер (ожидаем ошибку)
-        print("\n🔄 Этап 3: Попытка активации отмененного оффера (ожидаем ошибку)...")
+        # Этап 2: Пытаемся поставить на паузу отмененный оффер (ожидаем ошибку)
+        log.info("\n⏸️ Этап 2: Попытка постановки на паузу отмененного оффера (ожидаем ошибку)...")
         payload = {"offer_id": offer_id}
         
-        reactivate_result = self.run_grpcurl("ReactivateOffer", payload)
+        pause_result = self.run_grpcurl("PauseOffer", payload)
         
-        if reactivate_result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+        if pause_result["success"]:
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
-                "test": "Error Reactivate Canceled Offer",
+                "test": "Error Pause Canceled Offer",
                 "status": "FAIL",
                 "details": "Ожидалась ошибка, но запрос прошел успешно"
             })
             return False
         
-        error_msg = reactivate_result.get("error", "").lower()
+        error_msg = pause_result.get("error", "").lower()
         if "invalid offer status transition" in error_msg:
-            print("✅ Получена ожидаемая ошибка 'invalid offer status transition'")
+            log.info("✅ Получена ожидаемая ошибка 'invalid offer status transition'")
             self.test_results.append({
-                "test": "Error Reactivate Canceled Offer",
+                "test": "Error Pause Canceled Offer",
                 "status": "PASS",
                 "details": "Получена ожидаемая ошибка 'invalid offer status transition'"
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {reactivate_result.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", pause_result.get('error'))
             self.test_results.append({
-                "test": "Error Reactivate Canceled Offer",
+                "test": "Error Pause Canceled Offer",
                 "status": "FAIL",
-                "details": f"Неожиданная ошибка: {reactivate_result.get('error')}"
+                "details": f"Неожиданная ошибка: {pause_result.get('error')}"
             })
             return False
         
-    def test_error_pause_canceled_offer(self) -> bool:
-        print(f"\n🧪 Тестируем ошибку при попытке поставить на паузу отмененный оффер")
-        print("=" * 50)
+    @register_test("error_pause_inactive_offer", "offers", "Error Pause Inactive Offer", tags=("grpc", "write", "negative"), exclusive=("offers-global",))
+    def test_error_pause_inactive_offer(self) -> bool:
+        log.info("\n🧪 Тестируем ошибку при попытке поставить неактивный оффер на паузу")
+        log.info("=" * 50)
         
-        # Этап 1: Создаем новый оффер
-        print("🆕 Этап 1: Создание нового оффера...")
-        payload = {
-            "pay_in_offer": {
-                "allow_no_issuer_pools": True,
-                "allow_same_amount_orders": True,
-                "amount": "1000000",
-                "max_order_size": "1000000",
-                "min_order_size": "20000",
-                "name": f"offer_{uuid.uuid4().hex[:8]}",
-                "trader_id": "550e8400-e29b-41d4-a716-446655440001",
-                "trader_payment_details_id": "550e8400-e29b-41d4-a716-446655440021"
-            }
-        }
+        # Этап 1: Отменяем все существующие офферы
+        log.info("🔍 Этап 1: Отмена всех существующих офферов...")
+        is_success, cancelled_count, failed_cancellations = self._cancel_all_offers("Cancel Active Offer With Orders")
+        
+        if not is_success:
+            self.test_results.append({
+                "test": "Отмена существующих офферов",
+                "status": "FAIL",
+                "details": "Не удалось отменить существующие офферы"
+            })
+            return False
+        
+        # Этап 2: Создаем новый оффер
+        log.info("\n🆕 Этап 2: Создание нового оффера...")
+        payload = payin_offer_payload()
         
         create_result = self.run_grpcurl("PublishNewOffer", payload)
         
         if not create_result["success"]:
-            print(f"❌ Не удалось создать новый оффер: {create_result['error']}")
+            log.error("❌ Не удалось создать новый оффер: %s", create_result['error'])
             self.test_results.append({
                 "test": "Создание нового оффера", 
                 "status": "FAIL", 
@@ -1728,30 +1225,62 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         create_response = create_result["response"]
         offer_id = create_response["getOfferResponse"]["offer"]["id"]
-        print(f"✅ Новый оффер создан с ID: {offer_id}")
+        log.info("✅ Новый оффер создан с ID: %s", offer_id)
         
-        # Этап 2: Отменяем оффер и проверяем статус CANCELED
-        print("\n🚫 Этап 2: Отмена оффера и проверка статуса CANCELED...")
+        # Этап 3: Создаем ордер
+        log.info("\n📦 Этап 3: Создание ордера...")
+        payload = {
+            "company_id": 1,
+            "external_client_id": str(uuid.uuid4()),
+            "external_order_id": f"external_id_{uuid.uuid4().hex[:8]}",
+            "amount": 12000,
+            "callback_url": "http://example.com/callback",
+            "success_url": "http://example.com/success",
+            "fail_url": "http://example.com/fail",
+            "correlation_id": "random",
+            "payment_method_id": 2
+        }
+        
+        order_result = self.run_grpcurl("CreateOrder", payload)
+        
+        if not order_result["success"]:
+            log.error("❌ Не удалось создать ордер: %s", order_result['error'])
+            self.test_results.append({
+                "test": "Создание ордера", 
+                "status": "FAIL", 
+                "details": f"Ошибка: {order_result['error']}"
+            })
+            return False
+        
+        log.info("✅ Ордер успешно создан")
+        
+        # Этап 4: Ждем для обработки
+        log.info("⏳ Этап 4: Ждем для обработки сервисом...")
+        self.awaiting_for_processing(order_result["response"]["createOrderResponse"]["order"]["orderId"])
+        log.info("✅ Время ожидания завершено")
+        
+        # Этап 5: Отключаем оффер и проверяем статус INACTIVE
+        log.info("\n🚫 Этап 5: Отключение оффера и проверка статуса INACTIVE...")
         payload = {"offer_id": offer_id}
         
         cancel_result = self.run_grpcurl("CancelOffer", payload)
         
         if not cancel_result["success"]:
-            print(f"❌ Не удалось отменить оффер: {cancel_result['error']}")
+            log.error("❌ Не удалось отключить оффер: %s", cancel_result['error'])
             self.test_results.append({
-                "test": "Отмена оффера", 
+                "test": "Отключение оффера", 
                 "status": "FAIL", 
                 "details": f"Ошибка: {cancel_result['error']}"
             })
             return False
         
-        print("✅ Оффер успешно отменен")
+        log.info("✅ Оффер успешно отключен")
         
         # Проверяем статус в ответе от CancelOffer
         response = cancel_result["response"]
         
         if "getOfferResponse" not in response:
-            print("❌ Ответ не содержит getOfferResponse")
+            log.error("❌ Ответ не содержит getOfferResponse")
             self.test_results.append({
                 "test": "Структура ответа CancelOffer", 
                 "status": "FAIL", 
@@ -1763,7 +1292,7 @@ class UpdateOfferTester(BaseOffersApiTester):
         offer = get_offer_response.get("offer")
         
         if not offer:
-            print("❌ Ответ не содержит offer")
+            log.error("❌ Ответ не содержит offer")
             self.test_results.append({
                 "test": "Наличие offer в CancelOffer", 
                 "status": "FAIL", 
@@ -1771,28 +1300,28 @@ class UpdateOfferTester(BaseOffersApiTester):
             })
             return False
         
-        # Проверяем, что статус = CANCELED
-        if offer.get("status") != "OFFER_CANCELED":
-            print(f"❌ Неожиданный статус оффера: {offer.get('status')}, ожидался OFFER_CANCELED")
+        # Проверяем, что статус = INACTIVE
+        if offer.get("status") != "OFFER_INACTIVE":
+            log.error("❌ Неожиданный статус оффера: %s, ожидался OFFER_INACTIVE", offer.get('status'))
             self.test_results.append({
-                "test": "Статус оффера после отмены", 
+                "test": "Статус оффера после отключения", 
                 "status": "FAIL", 
-                "details": f"Статус: {offer.get('status')}, ожидался: OFFER_CANCELED"
+                "details": f"Статус: {offer.get('status')}, ожидался: OFFER_INACTIVE"
             })
             return False
         
-        print("✅ Статус оффера корректно установлен в CANCELED")
+        log.info("✅ Статус оффера корректно установлен в INACTIVE")
         
-        # Этап 3: Пытаемся поставить на паузу отмененный оффер (ожидаем ошибку)
-        print("\n⏸️ Этап 3: Попытка постановки на паузу отмененного оффера (ожидаем ошибку)...")
+        # Этап 6: Пытаемся поставить неактивный оффер на паузу (ожидаем ошибку)
+        log.info("\n⏸️ Этап 6: Попытка постановки неактивного оффера на паузу (ожидаем ошибку)...")
         payload = {"offer_id": offer_id}
         
         pause_result = self.run_grpcurl("PauseOffer", payload)
         
         if pause_result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
-                "test": "Error Pause Canceled Offer",
+                "test": "Error Pause Inactive Offer",
                 "status": "FAIL",
                 "details": "Ожидалась ошибка, но запрос прошел успешно"
             })
@@ -1800,17 +1329,17 @@ class UpdateOfferTester(BaseOffersApiTester):
         
         error_msg = pause_result.get("error", "").lower()
         if "invalid offer status transition" in error_msg:
-            print("✅ Получена ожидаемая ошибка 'invalid offer status transition'")
+            log.info("✅ Получена ожидаемая ошибка 'invalid offer status transition'")
             self.test_results.append({
-                "test": "Error Pause Canceled Offer",
+                "test": "Error Pause Inactive Offer",
                 "status": "PASS",
                 "details": "Получена ожидаемая ошибка 'invalid offer status transition'"
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {pause_result.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", pause_result.get('error'))
             self.test_results.append({
-                "test": "Error Pause Canceled Offer",
+                "test": "Error Pause Inactive Offer",
                 "status": "FAIL",
                 "details": f"Неожиданная ошибка: {pause_result.get('error')}"
             })
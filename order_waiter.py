@@ -0,0 +1,182 @@
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from config import DEFAULT_CONFIG
+from grpc_transport import status_code_name
+from async_transport import get_async_grpc_transport, run_in_session_loop
+from latency_histogram import LatencyHistogram
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
+
+
+@dataclass
+class BackoffPolicy:
+    """Интервалы опроса: быстрый старт, экспоненциальный рост до max_interval и случайный разброс ±jitter"""
+    initial: float = 0.05
+    multiplier: float = 2.0
+    max_interval: float = 1.0
+    jitter: float = 0.2
+
+    def delay(self, attempt: int) -> float:
+        interval = min(self.max_interval, self.initial * self.multiplier ** attempt)
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+@dataclass
+class WaitResult:
+    """Результат ожидания статуса одного заказа"""
+    order_id: str
+    reached: bool
+    status: Optional[str]
+    elapsed: float
+    polls: int = 0
+    error: Optional[str] = None
+
+
+def order_status(response: Dict[str, Any]) -> Optional[str]:
+    """Статус заказа из ответа GetOrderById ({"getOrderByIdResponse": {"order": ...}}) или сообщения watch-стрима"""
+    for value in (response, *response.values()):
+        if isinstance(value, dict):
+            order = value.get("order")
+            if isinstance(order, dict) and "status" in order:
+                return order["status"]
+    status = response.get("status")
+    return status if isinstance(status, str) else None
+
+
+# Время перехода заказов в ожидаемый статус за весь прогон, по статусам
+_time_to_state: Dict[str, LatencyHistogram] = {}
+_time_to_state_lock = threading.Lock()
+
+
+def record_time_to_state(status: str, seconds: float) -> None:
+    with _time_to_state_lock:
+        _time_to_state.setdefault(status, LatencyHistogram()).record(seconds)
+
+
+def print_time_to_state_stats() -> None:
+    with _time_to_state_lock:
+        for status, histogram in sorted(_time_to_state.items()):
+            print(f"⏳ Переход заказов в {status}: {histogram.count} раз, "
+                  f"p50 {histogram.percentile(50) * 1000:.0f} мс, "
+                  f"p99 {histogram.percentile(99) * 1000:.0f} мс, "
+                  f"max {histogram.max * 1000:.0f} мс")
+
+
+class OrderStatusWaiter:
+    """Ожидает перехода заказов в заданный статус.
+
+    Если сервер предоставляет server-streaming метод order_status_watch_method
+    (проверяется по дескрипторам, только для grpcio), изменения статуса
+    приходят по стриму. Иначе все ожидаемые заказы опрашиваются одним циклом:
+    на каждом шаге GetOrderById уходит параллельно по всем еще не дошедшим
+    заказам, а пауза между шагами растет по BackoffPolicy. Ошибка GetOrderById
+    завершает ожидание соответствующего заказа.
+    """
+
+    def __init__(self, tester, policy: Optional[BackoffPolicy] = None, watch_method: Optional[str] = None, verbose: bool = True):
+        self.tester = tester
+        self.policy = policy or BackoffPolicy()
+        self.watch_method = DEFAULT_CONFIG.order_status_watch_method if watch_method is None else watch_method
+        self.verbose = verbose
+
+    def wait(self, order_id: str, target_status: str, timeout: float = 10) -> WaitResult:
+        return self.wait_all([order_id], target_status, timeout)[order_id]
+
+    def wait_all(self, order_ids: Iterable[str], target_status: str, timeout: float = 10) -> Dict[str, WaitResult]:
+        # Канал и пулы event loop сессии переживают вызов и закрываются в close_session
+        return run_in_session_loop(self.wait_many(order_ids, target_status, timeout))
+
+    async def wait_many(self, order_ids: Iterable[str], target_status: str, timeout: float = 10) -> Dict[str, WaitResult]:
+        order_ids = list(dict.fromkeys(order_ids))
+        started = time.perf_counter()
+        deadline = started + timeout
+
+        transport = get_async_grpc_transport(self.tester.config.host, self.tester.config.port, self.tester.config.insecure, self.tester.config.backend)
+        if self.watch_method and transport.supports_server_streaming(self.watch_method):
+            results = await self._watch(transport, order_ids, target_status, started, deadline)
+        else:
+            results = await self._poll(order_ids, target_status, started, deadline)
+
+        for result in results.values():
+            if result.reached:
+                record_time_to_state(target_status, result.elapsed)
+        return results
+
+    def _report_status(self, order_id: str, previous: Optional[str], status: Optional[str]) -> None:
+        if self.verbose and status != previous:
+            log.info("📊 Текущий статус заказа %s: '%s'", order_id, status)
+
+    async def _poll(self, order_ids, target_status: str, started: float, deadline: float) -> Dict[str, WaitResult]:
+        results: Dict[str, WaitResult] = {}
+        last_status: Dict[str, Optional[str]] = {order_id: None for order_id in order_ids}
+        polls = {order_id: 0 for order_id in order_ids}
+        pending = list(order_ids)
+        attempt = 0
+
+        async def poll(order_id: str) -> None:
+            result = await self.tester.arun_grpc("GetOrderById", {"order_id": order_id})
+            polls[order_id] += 1
+            now = time.perf_counter()
+            if not result["success"]:
+                results[order_id] = WaitResult(order_id, False, last_status[order_id], now - started, polls[order_id], result["error"])
+                return
+            if "getOrderByIdResponse" not in result["response"]:
+                results[order_id] = WaitResult(order_id, False, last_status[order_id], now - started, polls[order_id],
+                                               "Неправильная структура ответа - отсутствует getOrderByIdResponse")
+                return
+
+            status = order_status(result["response"]) or "unknown"
+            self._report_status(order_id, last_status[order_id], status)
+            last_status[order_id] = status
+            if status == target_status:
+                results[order_id] = WaitResult(order_id, True, status, now - started, polls[order_id])
+
+        while pending:
+            await asyncio.gather(*(poll(order_id) for order_id in pending))
+            pending = [order_id for order_id in pending if order_id not in results]
+
+            remaining = deadline - time.perf_counter()
+            if not pending or remaining <= 0:
+                break
+            await asyncio.sleep(min(self.policy.delay(attempt), remaining))
+            attempt += 1
+
+        elapsed = time.perf_counter() - started
+        for order_id in pending:
+            results[order_id] = WaitResult(order_id, False, last_status[order_id], elapsed, polls[order_id])
+        return results
+
+    async def _watch(self, transport, order_ids, target_status: str, started: float, deadline: float) -> Dict[str, WaitResult]:
+        results: Dict[str, WaitResult] = {}
+
+        async def watch(order_id: str) -> None:
+            status = None
+            try:
+                async for message in transport.stream(self.watch_method, {"order_id": order_id}, timeout=max(0.0, deadline - time.perf_counter())):
+                    previous, status = status, order_status(message)
+                    self._report_status(order_id, previous, status)
+                    if status == target_status:
+                        results[order_id] = WaitResult(order_id, True, status, time.perf_counter() - started)
+                        return
+            except Exception as e:
+                code = getattr(e, "code", None)
+                if callable(code) and status_code_name(code()) == "DeadlineExceeded":
+                    results[order_id] = WaitResult(order_id, False, status, time.perf_counter() - started)
+                    return
+                # Стрим недоступен - дожидаемся этого заказа опросом
+                if self.verbose:
+                    log.warning("⚠️ %s для заказа %s завершился ошибкой, переходим на опрос: %s", self.watch_method, order_id, e)
+                results.update(await self._poll([order_id], target_status, started, deadline))
+                return
+            # Стрим закрыт сервером раньше перехода - проверяем опросом до дедлайна
+            results.update(await self._poll([order_id], target_status, started, deadline))
+
+        await asyncio.gather(*(watch(order_id) for order_id in order_ids))
+        return results
@@ -1,28 +1,39 @@
 import uuid
 from base_tester import BaseOrdersApiTester
+from suite_registry import register_test
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
+
 
 class CreateOrderTester(BaseOrdersApiTester):
     
-    def test_create_order_basic(self) -> bool:
-        print(f"\n🧪 Тестируем CreateOrder - базовый тест")
-        print("=" * 50)
-        
-        payload = {
+    def build_payin_order_payload(self, amount: int = 12000, payment_method_id: int = 2) -> dict:
+        """Payload PayIn CreateOrder со свежими external_client_id и external_order_id"""
+        return {
             "company_id": 1,
             "external_client_id": str(uuid.uuid4()),
             "external_order_id": f"external_id_{uuid.uuid4().hex[:8]}",
-            "amount": 12000,
+            "amount": amount,
             "callback_url": "http://example.com/callback",
             "success_url": "http://example.com/success",
             "fail_url": "http://example.com/fail",
             "correlation_id": "random",
-            "payment_method_id": 2
+            "payment_method_id": payment_method_id
         }
+    
+    @register_test("create_order_basic", "orders", "CreateOrder Basic", tags=("grpc", "write"))
+    def test_create_order_basic(self) -> bool:
+        log.info("\n🧪 Тестируем CreateOrder - базовый тест")
+        log.info("=" * 50)
+        
+        payload = self.build_payin_order_payload()
         
         result = self.run_grpcurl("CreateOrder", payload)
         
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -33,7 +44,7 @@ class CreateOrderTester(BaseOrdersApiTester):
         response = result["response"]
         
         if "createOrderResponse" not in response:
-            print("❌ Ответ не содержит createOrderResponse")
+            log.error("❌ Ответ не содержит createOrderResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -45,7 +56,7 @@ class CreateOrderTester(BaseOrdersApiTester):
         order = create_order_response.get("order")
         
         if not order:
-            print("❌ Ответ не содержит order")
+            log.error("❌ Ответ не содержит order")
             self.test_results.append({
                 "test": "Наличие order", 
                 "status": "FAIL", 
@@ -89,9 +100,10 @@ class CreateOrderTester(BaseOrdersApiTester):
         
         return tests_passed
 
+    @register_test("create_payout_order_basic", "orders", "CreatePayoutOrder Basic", tags=("grpc", "write"))
     def test_create_payout_order_basic(self) -> bool:
-        print(f"\n🧪 Тестируем payout CreateOrder - базовый тест")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем payout CreateOrder - базовый тест")
+        log.info("=" * 50)
         
         payload = {
             "company_id": 1,
@@ -115,7 +127,7 @@ class CreateOrderTester(BaseOrdersApiTester):
         result = self.run_grpcurl("CreateOrder", payload)
         
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -126,7 +138,7 @@ class CreateOrderTester(BaseOrdersApiTester):
         response = result["response"]
         
         if "createOrderResponse" not in response:
-            print("❌ Ответ не содержит createOrderResponse")
+            log.error("❌ Ответ не содержит createOrderResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -138,7 +150,7 @@ class CreateOrderTester(BaseOrdersApiTester):
         order = create_order_response.get("order")
         
         if not order:
-            print("❌ Ответ не содержит order")
+            log.error("❌ Ответ не содержит order")
             self.test_results.append({
                 "test": "Наличие order", 
                 "status": "FAIL", 
@@ -191,9 +203,10 @@ class CreateOrderTester(BaseOrdersApiTester):
         
         return tests_passed
 
+    @register_test("create_order_payin_min_amount_error", "orders", "CreateOrder PayIn Min Amount Error", tags=("grpc", "write", "negative"))
     def test_create_order_payin_min_amount_error(self) -> bool:
-        print(f"\n🧪 Тестируем CreateOrder - проверка ошибки при запросе с суммой меньше минимальной")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем CreateOrder - проверка ошибки при запросе с суммой меньше минимальной")
+        log.info("=" * 50)
         
         payload = {
             "company_id": 1,
@@ -210,7 +223,7 @@ class CreateOrderTester(BaseOrdersApiTester):
         result = self.run_grpcurl("CreateOrder", payload)
         
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -221,7 +234,7 @@ class CreateOrderTester(BaseOrdersApiTester):
         response = result["response"]
         
         if "createOrderResponse" not in response:
-            print("❌ Ответ не содержит createOrderResponse")
+            log.error("❌ Ответ не содержит createOrderResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -235,7 +248,7 @@ class CreateOrderTester(BaseOrdersApiTester):
         decline_description = create_order_response.get("declineDescription")
         
         if not decline_reason_code:
-            print("❌ Ответ не содержит declineReasonCode")
+            log.error("❌ Ответ не содержит declineReasonCode")
             self.test_results.append({
                 "test": "Наличие declineReasonCode", 
                 "status": "FAIL", 
@@ -244,7 +257,7 @@ class CreateOrderTester(BaseOrdersApiTester):
             return False
         
         if not decline_description:
-            print("❌ Ответ не содержит declineDescription")
+            log.error("❌ Ответ не содержит declineDescription")
             self.test_results.append({
                 "test": "Наличие declineDescription", 
                 "status": "FAIL", 
@@ -267,9 +280,10 @@ class CreateOrderTester(BaseOrdersApiTester):
         
         return tests_passed
 
+    @register_test("create_order_payin_max_amount_error", "orders", "CreateOrder PayIn Max Amount Error", tags=("grpc", "write", "negative"))
     def test_create_order_payin_max_amount_error(self) -> bool:
-        print(f"\n🧪 Тестируем CreateOrder - проверка ошибки при запросе с суммой больше максимальной")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем CreateOrder - проверка ошибки при запросе с суммой больше максимальной")
+        log.info("=" * 50)
         
         payload = {
             "company_id": 1,
@@ -286,7 +300,7 @@ class CreateOrderTester(BaseOrdersApiTester):
         result = self.run_grpcurl("CreateOrder", payload)
         
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -297,7 +311,7 @@ class CreateOrderTester(BaseOrdersApiTester):
         response = result["response"]
         
         if "createOrderResponse" not in response:
-            print("❌ Ответ не содержит createOrderResponse")
+            log.error("❌ Ответ не содержит createOrderResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -311,7 +325,7 @@ class CreateOrderTester(BaseOrdersApiTester):
         decline_description = create_order_response.get("declineDescription")
         
         if not decline_reason_code:
-            print("❌ Ответ не содержит declineReasonCode")
+            log.error("❌ Ответ не содержит declineReasonCode")
             self.test_results.append({
                 "test": "Наличие declineReasonCode", 
                 "status": "FAIL", 
@@ -320,7 +334,7 @@ class CreateOrderTester(BaseOrdersApiTester):
             return False
         
         if not decline_description:
-            print("❌ Ответ не содержит declineDescription")
+            log.error("❌ Ответ не содержит declineDescription")
             self.test_results.append({
                 "test": "Наличие declineDescription", 
                 "status": "FAIL", 
@@ -343,9 +357,10 @@ class CreateOrderTester(BaseOrdersApiTester):
         
         return tests_passed
 
+    @register_test("create_order_non_existing_company_error", "orders", "CreateOrder Non Existing Company Error", tags=("grpc", "write", "negative"))
     def test_create_order_non_existing_company_error(self) -> bool:
-        print(f"\n🧪 Тестируем CreateOrder - проверка ошибки при запросе с несуществующим company_id")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем CreateOrder - проверка ошибки при запросе с несуществующим company_id")
+        log.info("=" * 50)
         
         payload = {
             "company_id": 100,
@@ -362,9 +377,9 @@ class CreateOrderTester(BaseOrdersApiTester):
         result = self.run_grpcurl("CreateOrder", payload)
         
         if result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
-                "test": f"CreateOrder Non Existing Company Error",
+                "test": "CreateOrder Non Existing Company Error",
                 "status": "FAIL",
                 "details": "Ожидалась ошибка, но запрос прошел успешно"
             })
@@ -372,17 +387,17 @@ class CreateOrderTester(BaseOrdersApiTester):
         
         error_msg = result.get("error", "").lower()
         if "invalid company id" in error_msg:
-            print("✅ Получена ожидаемая ошибка")
+            log.info("✅ Получена ожидаемая ошибка")
             self.test_results.append({
-                "test": f"CreateOrder Non Existing Company Error",
+                "test": "CreateOrder Non Existing Company Error",
                 "status": "PASS",
                 "details": "Получена ожидаемая ошибка 'invalid company id'"
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {result.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", result.get('error'))
             self.test_results.append({
-                "test": f"CreateOrder Non Existing Company Error",
+                "test": "CreateOrder Non Existing Company Error",
                 "status": "FAIL",
                 "details": f"Неожиданная ошибка: {result.get('error')}"
             })
@@ -0,0 +1,150 @@
+import contextvars
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from config import DEFAULT_CONFIG
+
+
+class PageFetchError(Exception):
+    """Страница списка не получена: ошибка RPC или неожиданная структура ответа"""
+
+    def __init__(self, method: str, offset: int, error: str, result: Optional[Dict[str, Any]] = None):
+        super().__init__(f"{method} (offset {offset}): {error}")
+        self.method = method
+        self.offset = offset
+        self.error = error
+        self.result = result
+
+
+def page_payload(payload: Optional[Dict[str, Any]], offset: int, page_size: int) -> Dict[str, Any]:
+    request = dict(payload or {})
+    request["pagination"] = {
+        "limit": str(page_size),
+        "offset": str(offset)
+    }
+    return request
+
+
+def parse_page(method: str, offset: int, result: Dict[str, Any]) -> Tuple[List[Any], Optional[int]]:
+    """Элементы страницы и totalCount из ответа вида {"getOffersResponse": {"offers": [...], "totalCount": "N"}}"""
+    if not result["success"]:
+        raise PageFetchError(method, offset, result["error"], result)
+
+    response_key = f"{method[0].lower()}{method[1:]}Response"
+    page = result["response"].get(response_key)
+    if not isinstance(page, dict):
+        raise PageFetchError(method, offset, f"Неправильная структура ответа - отсутствует {response_key}", result)
+
+    items = next((value for value in page.values() if isinstance(value, list)), [])
+    total_count = page.get("totalCount")
+    return items, int(total_count) if total_count not in (None, "") else None
+
+
+class PageIterator:
+    """Ленивый обход списка RPC постранично (offset/limit).
+
+    Первая страница запрашивается синхронно; после нее известен totalCount,
+    и запросы остальных страниц расходятся параллельно. В полете одновременно
+    не больше concurrency страниц, а элементы отдаются строго по порядку,
+    поэтому следующие страницы загружаются, пока обрабатывается текущая, а
+    память не зависит от размера списка. Если сервер не вернул totalCount,
+    страницы запрашиваются с тем же опережением до первой неполной.
+    Ошибка любой страницы поднимается как PageFetchError.
+    """
+
+    def __init__(self, tester, method: str, payload: Optional[Dict[str, Any]] = None, page_size: int = 50, concurrency: Optional[int] = None):
+        self.tester = tester
+        self.method = method
+        self.payload = payload
+        self.page_size = page_size
+        self.concurrency = max(1, concurrency or DEFAULT_CONFIG.pagination_concurrency)
+        self.start_offset = int((payload or {}).get("pagination", {}).get("offset", 0))
+
+        self.total_count: Optional[int] = None
+        self.pages_fetched = 0
+        self.items_seen = 0
+
+    def _fetch(self, offset: int) -> Tuple[List[Any], Optional[int]]:
+        result = self.tester.run_grpcurl(self.method, page_payload(self.payload, offset, self.page_size), verbose=False)
+        return parse_page(self.method, offset, result)
+
+    def _offsets(self) -> Iterator[int]:
+        start = self.start_offset + self.page_size
+        if self.total_count is None:
+            return itertools.count(start, self.page_size)
+        return iter(range(start, self.total_count, self.page_size))
+
+    def _accept(self, items: List[Any]) -> List[Any]:
+        self.pages_fetched += 1
+        self.items_seen += len(items)
+        return items
+
+    def __iter__(self) -> Iterator[Any]:
+        items, self.total_count = self._fetch(self.start_offset)
+        yield from self._accept(items)
+        if len(items) < self.page_size:
+            return
+
+        offsets = self._offsets()
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=f"pages-{self.method}")
+        pending = deque()
+        try:
+            # Страницы грузятся в контексте вызывающего теста (тайминги RPC, см. rpc_timing)
+            for offset in itertools.islice(offsets, self.concurrency):
+                pending.append(executor.submit(contextvars.copy_context().run, self._fetch, offset))
+
+            while pending:
+                items, _ = pending.popleft().result()
+                # Сразу заказываем следующую страницу, чтобы она грузилась во время обработки текущей
+                if len(items) == self.page_size:
+                    for offset in itertools.islice(offsets, 1):
+                        pending.append(executor.submit(contextvars.copy_context().run, self._fetch, offset))
+                yield from self._accept(items)
+                if len(items) < self.page_size:
+                    return
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+
+class AsyncPageIterator(PageIterator):
+    """Асинхронный вариант PageIterator поверх arun_grpc (async for)"""
+
+    async def _afetch(self, offset: int) -> Tuple[List[Any], Optional[int]]:
+        result = await self.tester.arun_grpc(self.method, page_payload(self.payload, offset, self.page_size))
+        return parse_page(self.method, offset, result)
+
+    async def _aiterate(self) -> AsyncIterator[Any]:
+        # Event loop уже запущен, а синхронным тестам asyncio не нужен - импорт здесь
+        import asyncio
+
+        items, self.total_count = await self._afetch(self.start_offset)
+        for item in self._accept(items):
+            yield item
+        if len(items) < self.page_size:
+            return
+
+        offsets = self._offsets()
+        pending = deque()
+        try:
+            for offset in itertools.islice(offsets, self.concurrency):
+                pending.append(asyncio.ensure_future(self._afetch(offset)))
+
+            while pending:
+                items, _ = await pending.popleft()
+                if len(items) == self.page_size:
+                    for offset in itertools.islice(offsets, 1):
+                        pending.append(asyncio.ensure_future(self._afetch(offset)))
+                for item in self._accept(items):
+                    yield item
+                if len(items) < self.page_size:
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._aiterate()
@@ -0,0 +1,148 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import DEFAULT_CONFIG
+from pagination import PageFetchError
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class DictionarySpec:
+    """Справочник gwconfig: list RPC, поля, по которым строится индекс кодов, и RPC получения элемента по id"""
+    method: str
+    code_fields: Tuple[str, ...]
+    get_method: str
+
+
+REFERENCE_DICTIONARIES: Dict[str, DictionarySpec] = {
+    "currencies": DictionarySpec("GetCurrencies", ("code",), "GetCurrency"),
+    "regions": DictionarySpec("GetRegions", ("code", "title"), "GetRegion"),
+    "issuers": DictionarySpec("GetIssuers", ("issuerCode",), "GetIssuer"),
+    "payment_method_types": DictionarySpec("GetPaymentMethodTypes", ("paymentMethodTypeName",), "GetPaymentMethodType"),
+    "payment_methods": DictionarySpec("GetPaymentMethods", ("paymentMethodCode",), "GetPaymentMethod"),
+}
+
+# Какие справочники меняет мутирующий вызов: после него нужно invalidate
+INVALIDATED_BY: Dict[str, Tuple[str, ...]] = {
+    "CreatePaymentMethod": ("payment_methods",),
+}
+
+
+class ReferenceDictionary:
+    """Загруженный справочник с индексами по id и по коду"""
+
+    def __init__(self, name: str, items: List[Dict[str, Any]], code_fields: Tuple[str, ...]):
+        self.name = name
+        self.items = items
+        self.loaded_at = time.monotonic()
+        self._by_id = {str(item.get("id")): item for item in items if "id" in item}
+        self._by_code: Dict[str, Dict[str, Any]] = {}
+        for item in items:
+            code = next((item[field] for field in code_fields if item.get(field) not in (None, "")), None)
+            if code is not None:
+                self._by_code.setdefault(str(code), item)
+
+    def get(self, item_id: Any) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(str(item_id))
+
+    def get_by_code(self, code: str) -> Optional[Dict[str, Any]]:
+        return self._by_code.get(code)
+
+    @property
+    def ids(self) -> List[Any]:
+        return [item["id"] for item in self.items if "id" in item]
+
+    @property
+    def max_id(self) -> Optional[int]:
+        numeric = [int(item_id) for item_id in self.ids if str(item_id).isdigit()]
+        return max(numeric) if numeric else None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.items)
+
+
+class ReferenceDataCache:
+    """Кэш справочников gwconfig на сессию (процесс) или на reference_data_ttl секунд.
+
+    Справочник загружается целиком через iter_pages при первом обращении и
+    дальше отдается без RPC. Кэш разделен по адресу сервера и безопасен для
+    параллельного запуска тестов: одновременные обращения к незагруженному
+    справочнику ждут одну загрузку. После мутирующих вызовов (INVALIDATED_BY)
+    справочник нужно явно сбросить через invalidate.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = DEFAULT_CONFIG.reference_data_ttl if ttl_seconds is None else ttl_seconds
+        self._dictionaries: Dict[Tuple[str, int, str], ReferenceDictionary] = {}
+        self._locks: Dict[Tuple[str, int, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+
+    def _fresh(self, dictionary: Optional[ReferenceDictionary]) -> bool:
+        if dictionary is None:
+            return False
+        return self.ttl_seconds <= 0 or time.monotonic() - dictionary.loaded_at < self.ttl_seconds
+
+    def get(self, tester, name: str) -> ReferenceDictionary:
+        """Справочник по имени из REFERENCE_DICTIONARIES; ошибки загрузки - PageFetchError"""
+        spec = REFERENCE_DICTIONARIES[name]
+        key = (tester.config.host, tester.config.port, name)
+
+        dictionary = self._dictionaries.get(key)
+        if self._fresh(dictionary):
+            self.hits += 1
+            return dictionary
+
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            dictionary = self._dictionaries.get(key)
+            if self._fresh(dictionary):
+                self.hits += 1
+                return dictionary
+            dictionary = ReferenceDictionary(name, list(tester.iter_pages(spec.method, page_size=100)), spec.code_fields)
+            self._dictionaries[key] = dictionary
+            self.loads += 1
+            return dictionary
+
+    def invalidate(self, *names: str) -> None:
+        """Сбрасывает указанные справочники (без аргументов - все)"""
+        with self._lock:
+            for key in list(self._dictionaries):
+                if not names or key[2] in names:
+                    del self._dictionaries[key]
+
+    def invalidate_after(self, service_method: str) -> None:
+        names = INVALIDATED_BY.get(service_method)
+        if names:
+            self.invalidate(*names)
+
+
+REFERENCE_DATA = ReferenceDataCache()
+
+
+def preload_reference_ids(tester, names: Optional[Tuple[str, ...]] = None) -> Dict[str, List[Any]]:
+    """Загружает справочники до старта нагрузки и возвращает их id: генератор берет id для payload
+    без RPC за списками. Справочник, который не удалось загрузить, дает пустой список"""
+    ids: Dict[str, List[Any]] = {}
+    for name in names or tuple(REFERENCE_DICTIONARIES):
+        try:
+            ids[name] = REFERENCE_DATA.get(tester, name).ids
+        except PageFetchError as e:
+            log.warning("⚠️ Не удалось загрузить справочник %s: %s", name, e.error)
+            ids[name] = []
+    return ids
+
+
+def print_reference_data_stats() -> None:
+    if REFERENCE_DATA.loads:
+        print(f"📚 Справочники: загрузок {REFERENCE_DATA.loads}, обращений из кэша {REFERENCE_DATA.hits}")
@@ -0,0 +1,181 @@
+import json
+import os
+import re
+import shutil
+import socket
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+# Управляющие символы, недопустимые в XML 1.0 (встречаются в stderr grpcurl)
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+# xml.sax.saxutils тянет urllib.request - импортируется, только когда нужен JUnit отчет
+
+def _xml_text(value: Any) -> str:
+    from xml.sax.saxutils import escape
+    return escape(_XML_INVALID.sub("?", str(value)))
+
+
+def _xml_attr(value: Any) -> str:
+    from xml.sax.saxutils import quoteattr
+    return quoteattr(_XML_INVALID.sub("?", str(value)))
+
+
+class JsonlReporter:
+    """Потоковый отчет JSON Lines: строка на прогон, на каждый завершенный тест, на замер нагрузки и итог.
+
+    Записи тестов сбрасываются на диск сразу (файл можно читать через tail -f),
+    замеры нагрузки - буфером файла; в памяти ничего не накапливается.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8", buffering=1 << 16)
+
+    def _write(self, record: Dict[str, Any], flush: bool = True) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        if flush:
+            self._file.flush()
+
+    def start_run(self, info: Dict[str, Any]) -> None:
+        self._write({"type": "run", "started_at": _now(), **info})
+
+    def test_finished(self, record: Dict[str, Any]) -> None:
+        self._write({"type": "test", **record})
+
+    def sample(self, record: Dict[str, Any]) -> None:
+        self._write({"type": "sample", **record}, flush=False)
+
+    def finish(self, summary: Dict[str, Any]) -> None:
+        self._write({"type": "summary", "finished_at": _now(), **summary})
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class JUnitReporter:
+    """Отчет JUnit XML (Jenkins, GitLab): testcase на каждый тест, classname - категория.
+
+    Счетчики стоят в атрибутах <testsuite> перед тестами, поэтому тесты пишутся
+    по мере завершения во временный файл рядом, а при закрытии он дописывается
+    за заголовком в итоговый файл. Замеры нагрузки в JUnit не попадают.
+    """
+
+    def __init__(self, path: str, suite_name: str = "payment-gateway"):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.suite_name = suite_name
+        self._body_path = f"{path}.part"
+        self._body = open(self._body_path, "w", encoding="utf-8")
+        self._timestamp = _now()
+        self._properties: Dict[str, Any] = {}
+        self.tests = 0
+        self.failures = 0
+        self.time = 0.0
+
+    def start_run(self, info: Dict[str, Any]) -> None:
+        self._properties = info
+
+    def test_finished(self, record: Dict[str, Any]) -> None:
+        seconds = record.get("duration_ms", 0.0) / 1000
+        self.tests += 1
+        self.time += seconds
+
+        self._body.write(f'    <testcase classname={_xml_attr(record.get("category") or self.suite_name)} '
+                         f'name={_xml_attr(record["test"])} time="{seconds:.3f}">\n')
+        details = record.get("details") or []
+        if record["status"] != "PASS":
+            self.failures += 1
+            failed = [entry for entry in details if entry.get("status") == "FAIL"]
+            message = failed[0].get("details", "") if failed else "Тест провален"
+            text = "\n".join(f"{entry.get('test')}: {entry.get('details')}" for entry in failed)
+            self._body.write(f'      <failure message={_xml_attr(message)}>{_xml_text(text)}</failure>\n')
+        lines = [f"{entry.get('status')} {entry.get('test')}: {entry.get('details')}" for entry in details]
+        lines += [f"RPC {timing['method']}: {timing['total_ms']:.1f} мс" for timing in record.get("timings") or ()]
+        if lines:
+            self._body.write(f"      <system-out>{_xml_text(chr(10).join(lines))}</system-out>\n")
+        self._body.write("    </testcase>\n")
+        self._body.flush()
+
+    def sample(self, record: Dict[str, Any]) -> None:
+        pass
+
+    def finish(self, summary: Dict[str, Any]) -> None:
+        pass
+
+    def close(self) -> None:
+        self._body.close()
+        with open(self.path, "w", encoding="utf-8") as output:
+            output.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n')
+            output.write(f'  <testsuite name={_xml_attr(self.suite_name)} tests="{self.tests}" failures="{self.failures}" '
+                         f'errors="0" skipped="0" time="{self.time:.3f}" timestamp={_xml_attr(self._timestamp)} '
+                         f'hostname={_xml_attr(socket.gethostname())}>\n')
+            if self._properties:
+                output.write("    <properties>\n")
+                for name, value in self._properties.items():
+                    output.write(f"      <property name={_xml_attr(name)} value={_xml_attr(value)}/>\n")
+                output.write("    </properties>\n")
+            with open(self._body_path, encoding="utf-8") as body:
+                shutil.copyfileobj(body, output)
+            output.write("  </testsuite>\n</testsuites>\n")
+        os.remove(self._body_path)
+
+
+class ResultReporters:
+    """Набор отчетов раннера; вызовы потокобезопасны, без отчетов ничего не делает"""
+
+    def __init__(self, reporters: Optional[List[Any]] = None):
+        self.reporters = reporters or []
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.reporters)
+
+    def _emit(self, name: str, record: Dict[str, Any]) -> None:
+        with self._lock:
+            for reporter in self.reporters:
+                getattr(reporter, name)(record)
+
+    def start_run(self, info: Dict[str, Any]) -> None:
+        self._emit("start_run", info)
+
+    def test_finished(self, record: Dict[str, Any]) -> None:
+        self._emit("test_finished", record)
+
+    def sample(self, record: Dict[str, Any]) -> None:
+        self._emit("sample", record)
+
+    def finish(self, summary: Dict[str, Any]) -> None:
+        self._emit("finish", summary)
+
+    def close(self) -> None:
+        with self._lock:
+            for reporter in self.reporters:
+                reporter.close()
+            self.reporters = []
+
+
+def open_reporters(jsonl_path: Optional[str] = None, junit_path: Optional[str] = None) -> ResultReporters:
+    """Открывает отчеты, указанные в --jsonl/--junit (OSError, если файл не создать)"""
+    reporters = ResultReporters()
+    try:
+        if jsonl_path:
+            reporters.reporters.append(JsonlReporter(jsonl_path))
+        if junit_path:
+            reporters.reporters.append(JUnitReporter(junit_path))
+    except OSError:
+        reporters.close()
+        raise
+    return reporters
@@ -0,0 +1,315 @@
+import argparse
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import DEFAULT_CONFIG
+from latency_histogram import LatencyHistogram
+from rpc_timing import aggregate
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    git_revision TEXT NOT NULL,
+    target TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    command TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS test_runs (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_id TEXT NOT NULL,
+    test TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration_ms REAL NOT NULL
+);
+-- Задержки RPC по методам: test_id - внутри теста, NULL - по всему прогону
+CREATE TABLE IF NOT EXISTS rpc_latencies (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_id TEXT,
+    method TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    mean_ms REAL NOT NULL,
+    p50_ms REAL NOT NULL,
+    p90_ms REAL NOT NULL,
+    p99_ms REAL NOT NULL,
+    max_ms REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_target ON runs(target, backend, id);
+CREATE INDEX IF NOT EXISTS test_runs_run ON test_runs(run_id);
+CREATE INDEX IF NOT EXISTS rpc_latencies_run ON rpc_latencies(run_id, test_id);
+"""
+
+# Разброс, ниже которого базовая линия считается шумом измерения (мс)
+MIN_SPREAD_MS = 0.5
+
+
+def git_revision() -> str:
+    """Короткий хеш HEAD репозитория с тестами; "-dirty", если есть незакоммиченные изменения"""
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], cwd=cwd, capture_output=True).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{revision}-dirty" if dirty else revision
+
+
+class ResultsHistory:
+    """История прогонов в SQLite: тесты со статусом и длительностью, задержки RPC по методам"""
+
+    def __init__(self, path: str = DEFAULT_CONFIG.results_history_path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def start_run(self, target: str, backend: str, command: str) -> int:
+        started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO runs (started_at, git_revision, target, backend, command) VALUES (?, ?, ?, ?, ?)",
+                (started_at, git_revision(), target, backend, command),
+            )
+        return cursor.lastrowid
+
+    def add_test(self, run_id: int, test_id: str, test: str, status: str, duration_ms: float, timings: Iterable[Dict[str, Any]] = ()) -> None:
+        """Записывает тест и задержки его вызовов (словари RpcTiming.as_dict()) по методам"""
+        timings = list(timings)
+        errors: Dict[str, int] = {}
+        for timing in timings:
+            if not timing["success"]:
+                errors[timing["method"]] = errors.get(timing["method"], 0) + 1
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO test_runs (run_id, test_id, test, status, duration_ms) VALUES (?, ?, ?, ?, ?)",
+                (run_id, test_id, test, status, duration_ms),
+            )
+            for method, histograms in aggregate(timings).items():
+                self._insert_latency(run_id, test_id, method, histograms["total"], errors.get(method, 0))
+
+    def add_run_latency(self, run_id: int, method: str, histogram: LatencyHistogram, errors: int = 0) -> None:
+        """Задержки метода по всему прогону (по ним compare ищет регрессии RPC)"""
+        with self._lock, self._connection:
+            self._insert_latency(run_id, None, method, histogram, errors)
+
+    def _insert_latency(self, run_id: int, test_id: Optional[str], method: str, histogram: LatencyHistogram, errors: int) -> None:
+        percentiles = histogram.percentiles_ms((50, 90, 99))
+        self._connection.execute(
+            "INSERT INTO rpc_latencies (run_id, test_id, method, calls, errors, mean_ms, p50_ms, p90_ms, p99_ms, max_ms) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (run_id, test_id, method, histogram.count, errors, histogram.mean * 1000,
+             percentiles["p50"], percentiles["p90"], percentiles["p99"], histogram.max * 1000),
+        )
+
+    def runs(self, target: Optional[str] = None, backend: Optional[str] = None, limit: int = 20) -> List[sqlite3.Row]:
+        query = "SELECT * FROM runs"
+        conditions, params = [], []
+        if target:
+            conditions.append("target = ?")
+            params.append(target)
+        if backend:
+            conditions.append("backend = ?")
+            params.append(backend)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id DESC LIMIT ?"
+        return self._connection.execute(query, (*params, limit)).fetchall()
+
+    def run(self, run_id: int) -> Optional[sqlite3.Row]:
+        return self._connection.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+
+    def test_durations(self, target: str, backend: str, up_to_run: int) -> Dict[Tuple[str, str], Dict[int, float]]:
+        """(test_id, test) -> run_id -> длительность прошедших тестов в прогонах до up_to_run включительно"""
+        rows = self._connection.execute(
+            "SELECT t.run_id, t.test_id, t.test, t.duration_ms FROM test_runs t JOIN runs r ON r.id = t.run_id "
+            "WHERE t.status = 'PASS' AND r.target = ? AND r.backend = ? AND r.id <= ?",
+            (target, backend, up_to_run),
+        ).fetchall()
+        result: Dict[Tuple[str, str], Dict[int, float]] = {}
+        for run_id, test_id, test, duration_ms in rows:
+            result.setdefault((test_id, test), {})[run_id] = duration_ms
+        return result
+
+    def run_latencies(self, target: str, backend: str, up_to_run: int) -> Dict[str, Dict[int, Tuple[float, float]]]:
+        """метод -> run_id -> (p50, p99) по всему прогону, в прогонах до up_to_run включительно"""
+        rows = self._connection.execute(
+            "SELECT l.run_id, l.method, l.p50_ms, l.p99_ms FROM rpc_latencies l JOIN runs r ON r.id = l.run_id "
+            "WHERE l.test_id IS NULL AND r.target = ? AND r.backend = ? AND r.id <= ?",
+            (target, backend, up_to_run),
+        ).fetchall()
+        result: Dict[str, Dict[int, Tuple[float, float]]] = {}
+        for run_id, method, p50, p99 in rows:
+            result.setdefault(method, {})[run_id] = (p50, p99)
+        return result
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def record_run(results: List[Dict[str, Any]], target: str, backend: str, command: str, path: Optional[str] = None) -> int:
+    """Записывает прогон раннера (записи с test_id, test, status, duration_ms, timings) и сводку RPC по методам"""
+    history = ResultsHistory(path or DEFAULT_CONFIG.results_history_path)
+    try:
+        run_id = history.start_run(target, backend, command)
+        all_timings = []
+        for result in results:
+            timings = result.get("timings", ())
+            history.add_test(run_id, result["test_id"], result["test"], result["status"], result["duration_ms"], timings)
+            all_timings.extend(timings)
+        for method, histograms in aggregate(all_timings).items():
+            errors = sum(1 for timing in all_timings if timing["method"] == method and not timing["success"])
+            history.add_run_latency(run_id, method, histograms["total"], errors)
+    finally:
+        history.close()
+    return run_id
+
+
+@dataclass
+class Regression:
+    """Метрика последнего прогона, вышедшая за порог относительно базовой линии"""
+    name: str
+    metric: str
+    value_ms: float
+    baseline_ms: float
+    score: float
+
+    def __str__(self) -> str:
+        increase = (self.value_ms / self.baseline_ms - 1) * 100 if self.baseline_ms else float("inf")
+        return (f"{self.name} {self.metric}: {self.value_ms:.1f} мс против медианы {self.baseline_ms:.1f} мс "
+                f"(+{increase:.0f}%, z={self.score:.1f})")
+
+
+def robust_score(value: float, baseline: List[float]) -> Tuple[float, float]:
+    """(медиана, устойчивый z) значения относительно базовой линии.
+
+    Разброс - медианное абсолютное отклонение, приведенное к σ нормального
+    распределения (1.4826·MAD): один выброс в истории не сдвигает порог.
+    """
+    median = statistics.median(baseline)
+    mad = statistics.median(abs(sample - median) for sample in baseline)
+    spread = max(1.4826 * mad, MIN_SPREAD_MS)
+    return median, (value - median) / spread
+
+
+def check_metric(name: str, metric: str, value: float, baseline: List[float], threshold: float, min_increase: float, min_samples: int) -> Optional[Regression]:
+    if len(baseline) < min_samples:
+        return None
+    median, score = robust_score(value, baseline)
+    if score > threshold and value > median * (1 + min_increase):
+        return Regression(name, metric, value, median, score)
+    return None
+
+
+def find_regressions(history: ResultsHistory, run: sqlite3.Row, baseline_ids: List[int], runs: int, threshold: float, min_increase: float, min_samples: int) -> Tuple[List[Regression], int, int]:
+    """Регрессии прогона run: длительности тестов и p50/p99 методов. Возвращает (регрессии, тестов, методов).
+
+    baseline_ids - предыдущие прогоны от новых к старым; для каждой метрики
+    берутся последние runs из них, где она есть (категории запускаются
+    по-разному, а нагрузка пишется в ту же историю).
+    """
+    regressions = []
+    run_id = run["id"]
+    durations = history.test_durations(run["target"], run["backend"], run_id)
+    tests_checked = 0
+    for (test_id, test), by_run in sorted(durations.items()):
+        if run_id not in by_run:
+            continue
+        tests_checked += 1
+        baseline = [by_run[other] for other in baseline_ids if other in by_run][:runs]
+        regression = check_metric(f"{test} [{test_id}]", "длительность", by_run[run_id], baseline, threshold, min_increase, min_samples)
+        if regression:
+            regressions.append(regression)
+
+    latencies = history.run_latencies(run["target"], run["backend"], run_id)
+    methods_checked = 0
+    for method, by_run in sorted(latencies.items()):
+        if run_id not in by_run:
+            continue
+        methods_checked += 1
+        for index, metric in enumerate(("p50", "p99")):
+            baseline = [by_run[other][index] for other in baseline_ids if other in by_run][:runs]
+            regression = check_metric(f"RPC {method}", metric, by_run[run_id][index], baseline, threshold, min_increase, min_samples)
+            if regression:
+                regressions.append(regression)
+    return regressions, tests_checked, methods_checked
+
+
+def compare(history: ResultsHistory, run_id: Optional[int], runs: int, threshold: float, min_increase: float, min_samples: int, target: Optional[str] = None) -> int:
+    if run_id is None:
+        latest = next(iter(history.runs(target, limit=1)), None)
+    else:
+        latest = history.run(run_id)
+    if latest is None:
+        print("❌ В истории нет подходящего прогона")
+        return 1
+    # Базовая линия - предыдущие прогоны на тот же адрес тем же транспортом
+    baseline_ids = [row["id"] for row in history.runs(latest["target"], latest["backend"], limit=sys.maxsize) if row["id"] < latest["id"]]
+
+    print(f"📈 Прогон #{latest['id']} ({latest['git_revision']}, {latest['started_at']}) на {latest['target']} ({latest['backend']}) "
+          f"против последних {runs} прогонов с теми же тестами и методами")
+    if len(baseline_ids) < min_samples:
+        print(f"⚠️  Для сравнения нужно хотя бы {min_samples} предыдущих прогонов")
+        return 0
+
+    regressions, tests_checked, methods_checked = find_regressions(history, latest, baseline_ids, runs, threshold, min_increase, min_samples)
+    for regression in regressions:
+        print(f"   🔺 {regression}")
+    if regressions:
+        print(f"❌ Регрессий: {len(regressions)} (проверено тестов {tests_checked}, методов {methods_checked}; порог z>{threshold:g} и +{min_increase * 100:.0f}%)")
+        return 1
+    print(f"✅ Регрессий не найдено (проверено тестов {tests_checked}, методов {methods_checked})")
+    return 0
+
+
+def list_runs(history: ResultsHistory, limit: int, target: Optional[str] = None) -> int:
+    for row in history.runs(target, limit=limit):
+        print(f"   #{row['id']} {row['started_at']} {row['git_revision']} {row['target']} ({row['backend']}): {row['command']}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="История прогонов тестов Payment Gateway и поиск регрессий производительности")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--history", default=DEFAULT_CONFIG.results_history_path, metavar="PATH", help=f"Файл истории (по умолчанию: {DEFAULT_CONFIG.results_history_path})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compare_parser = commands.add_parser("compare", parents=[common], help="Сравнить прогон с предыдущими и найти регрессии задержек")
+    compare_parser.add_argument("--run", type=int, help="ID прогона (по умолчанию: последний)")
+    compare_parser.add_argument("--target", help="Адрес сервера HOST:PORT для выбора последнего прогона")
+    compare_parser.add_argument("--runs", type=int, default=DEFAULT_CONFIG.regression_baseline_runs, help=f"Сколько предыдущих прогонов в базовой линии (по умолчанию: {DEFAULT_CONFIG.regression_baseline_runs})")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_CONFIG.regression_threshold, help=f"Порог устойчивого z-score (по умолчанию: {DEFAULT_CONFIG.regression_threshold:g})")
+    compare_parser.add_argument("--min-increase", type=float, default=DEFAULT_CONFIG.regression_min_increase, help=f"Минимальный относительный рост (по умолчанию: {DEFAULT_CONFIG.regression_min_increase:g})")
+    compare_parser.add_argument("--min-samples", type=int, default=3, help="Минимум прогонов с метрикой в базовой линии (по умолчанию: 3)")
+
+    runs_parser = commands.add_parser("runs", parents=[common], help="Показать последние прогоны")
+    runs_parser.add_argument("--target", help="Только прогоны на HOST:PORT")
+    runs_parser.add_argument("--limit", type=int, default=20, help="Сколько прогонов показать (по умолчанию: 20)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.history):
+        print(f"❌ Файл истории не найден: {args.history}")
+        return 1
+    history = ResultsHistory(args.history)
+    try:
+        if args.command == "compare":
+            return compare(history, args.run, args.runs, args.threshold, args.min_increase, args.min_samples, args.target)
+        return list_runs(history, args.limit, args.target)
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
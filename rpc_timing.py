@@ -0,0 +1,203 @@
+import contextvars
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from latency_histogram import LatencyHistogram
+
+
+# Фазы вызова транспорта в порядке выполнения. Транспорт отмечает только те фазы,
+# которые может измерить: grpcurl и curl - запуск процесса (acquire) и весь ответ,
+# grpcio - дескриптор/канал (acquire), подготовку запроса (send) и сам вызов,
+# HTTP пул - все фазы. Время вне отмеченных фаз (кассета, прокси сбоев, печать) идет в "other"
+PHASES = ("acquire", "connect", "send", "ttfb", "response", "decode", "other")
+# Фазы, которые тратит сама обвязка, а не шлюз и сеть
+HARNESS_PHASES = ("acquire", "decode", "other")
+
+
+@dataclass
+class RpcTiming:
+    """Разбивка одного вызова транспорта по фазам, в секундах"""
+
+    method: str
+    transport: str
+    phases: Dict[str, float] = field(default_factory=dict)
+    total: float = 0.0
+    success: bool = True
+    started: float = field(default_factory=time.perf_counter, repr=False)
+    _checkpoint: float = field(default=0.0, repr=False)
+
+    def __post_init__(self):
+        self._checkpoint = self.started
+
+    def mark(self, phase: str) -> None:
+        """Закрывает фазу: время с предыдущей отметки добавляется к phase (повторы суммируются)"""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._checkpoint
+        self._checkpoint = now
+
+    def finish(self, success: bool) -> None:
+        self.mark("other")
+        self.total = self._checkpoint - self.started
+        self.success = success
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "transport": self.transport,
+            "success": self.success,
+            "total_ms": round(self.total * 1000, 3),
+            "phases_ms": {phase: round(self.phases[phase] * 1000, 3) for phase in PHASES if phase in self.phases},
+        }
+
+
+class TestScope:
+    """Один тест: все его вызовы (calls), еще не привязанные к записи вызовы (pending) и записи test_results (results)"""
+
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+        self.pending: List[Dict[str, Any]] = []
+        self.results: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, timing: Dict[str, Any]) -> None:
+        with self._lock:
+            self.calls.append(timing)
+            self.pending.append(timing)
+
+    def add_result(self, entry: Dict[str, Any]) -> None:
+        """Привязывает к записи вызовы, сделанные после предыдущей"""
+        with self._lock:
+            if self.pending:
+                entry.setdefault("timings", []).extend(self.pending)
+                self.pending = []
+            self.results.append(entry)
+
+
+# Текущий вызов (для отметок из глубины транспорта) и текущий тест
+_active: contextvars.ContextVar[Optional[RpcTiming]] = contextvars.ContextVar("rpc_timing_active", default=None)
+_scope: contextvars.ContextVar[Optional[TestScope]] = contextvars.ContextVar("rpc_timing_scope", default=None)
+
+# Сводка по всем вызовам процесса: метод -> фаза -> гистограмма ("total" - весь вызов)
+_stats: Dict[str, Dict[str, LatencyHistogram]] = {}
+_stats_lock = threading.Lock()
+
+
+def mark(phase: str) -> None:
+    """Отметка фазы текущего вызова; вне track() ничего не делает"""
+    timing = _active.get()
+    if timing is not None:
+        timing.mark(phase)
+
+
+def run_process(cmd: List[str], timeout: float) -> subprocess.CompletedProcess:
+    """subprocess.run(capture_output=True, text=True) с отметками запуска процесса (acquire) и его ответа (response)"""
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    mark("acquire")
+    with process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+    mark("response")
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+@contextmanager
+def track(method: str, transport: str) -> Iterator[RpcTiming]:
+    """Измеряет вызов транспорта внутри блока и отдает его тест-кейсу и общей сводке"""
+    timing = RpcTiming(method, transport)
+    token = _active.set(timing)
+    success = False
+    try:
+        yield timing
+        success = True
+    finally:
+        _active.reset(token)
+        timing.finish(success and timing.success)
+        _record(timing)
+
+
+def _record(timing: RpcTiming) -> None:
+    with _stats_lock:
+        histograms = _stats.setdefault(timing.method, {})
+        histograms.setdefault("total", LatencyHistogram()).record(timing.total)
+        for phase, seconds in timing.phases.items():
+            histograms.setdefault(phase, LatencyHistogram()).record(seconds)
+
+    scope = _scope.get()
+    if scope is not None:
+        scope.add(timing.as_dict())
+
+
+@contextmanager
+def test_scope() -> Iterator[TestScope]:
+    """Вызовы внутри блока привязываются к записям test_results этого теста.
+
+    Контекст наследуют asyncio задачи и потоки, запущенные через
+    contextvars.copy_context (постраничная загрузка), поэтому параллельные
+    тесты одного тестера не смешивают тайминги. Вложенный блок (раннер ->
+    TesterPool.run) продолжает тот же тест.
+    """
+    scope = _scope.get()
+    if scope is not None:
+        yield scope
+        return
+    scope = TestScope()
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+class TestResults(list):
+    """test_results тестера: запись забирает тайминги вызовов, сделанных в тесте после предыдущей записи,
+    и попадает в записи текущего теста (для отчетов)"""
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        scope = _scope.get()
+        if scope is not None:
+            scope.add_result(entry)
+        super().append(entry)
+
+
+def aggregate(timings: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, LatencyHistogram]]:
+    """Гистограммы по методам и фазам из словарей RpcTiming.as_dict()"""
+    result: Dict[str, Dict[str, LatencyHistogram]] = {}
+    for timing in timings:
+        histograms = result.setdefault(timing["method"], {})
+        histograms.setdefault("total", LatencyHistogram()).record(timing["total_ms"] / 1000)
+        for phase, ms in timing["phases_ms"].items():
+            histograms.setdefault(phase, LatencyHistogram()).record(ms / 1000)
+    return result
+
+
+def print_timing_table(stats: Dict[str, Dict[str, LatencyHistogram]], indent: str = "   ") -> None:
+    """Печатает по строке на метод: перцентили всего вызова и среднее по фазам"""
+    for method, histograms in sorted(stats.items()):
+        total = histograms["total"]
+        percentiles = total.percentiles_ms((50, 99))
+        phases = " / ".join(f"{phase} {histograms[phase].mean * 1000:.1f}" for phase in PHASES if phase in histograms)
+        # Среднее по фазе считается по вызовам, где она была, поэтому долю обвязки считаем по суммам
+        harness_us = sum(histograms[phase].total_us for phase in HARNESS_PHASES if phase in histograms)
+        harness_share = harness_us / total.total_us * 100 if total.total_us else 0.0
+        print(f"{indent}{method}: {total.count} вызовов, p50 {percentiles['p50']:.1f} мс, p99 {percentiles['p99']:.1f} мс, "
+              f"обвязка {harness_share:.0f}% (среднее, мс: {phases})")
+
+
+def rpc_timing_stats() -> Dict[str, Dict[str, LatencyHistogram]]:
+    with _stats_lock:
+        return {method: dict(histograms) for method, histograms in _stats.items()}
+
+
+def print_rpc_timing_stats() -> None:
+    stats = rpc_timing_stats()
+    if stats:
+        print("⏱️  Время RPC по методам (обвязка - acquire, decode и other):")
+        print_timing_table(stats)
@@ -0,0 +1,48 @@
+import sys
+from typing import Callable, Iterator, Tuple
+
+
+# Сводки, которые раннеры печатают в конце прогона (в этом порядке), и общие ресурсы процесса.
+# Модули импортируются раннером и тестерами по мере надобности: не загруженный за прогон модуль
+# ничего не накопил и не открыл, и импортировать его ради пустой сводки незачем
+SESSION_STATS: Tuple[Tuple[str, str], ...] = (
+    ("rpc_timing", "print_rpc_timing_stats"),
+    ("http_transport", "print_http_pool_stats"),
+    ("order_waiter", "print_time_to_state_stats"),
+    ("reference_data", "print_reference_data_stats"),
+    ("trader_pool", "print_trader_pool_stats"),
+    ("offer_pool", "print_offer_pool_stats"),
+    ("cassette", "print_cassette_stats"),
+    ("stub_gateway", "print_stub_gateway_stats"),
+    ("fault_proxy", "print_fault_proxy_stats"),
+)
+
+SESSION_RESOURCES: Tuple[Tuple[str, str], ...] = (
+    ("trader_pool", "close_trader_pools"),
+    ("offer_pool", "close_offer_pools"),
+    ("async_transport", "close_session_loop"),
+    ("grpc_transport", "close_grpc_transports"),
+    ("http_transport", "close_http_transports"),
+    ("cassette", "close_cassette"),
+    ("stub_gateway", "stop_stub_gateway"),
+    ("fault_proxy", "stop_fault_proxies"),
+)
+
+
+def _loaded(hooks: Tuple[Tuple[str, str], ...]) -> Iterator[Callable[[], None]]:
+    for module_name, function in hooks:
+        module = sys.modules.get(module_name)
+        if module is not None:
+            yield getattr(module, function)
+
+
+def print_session_stats() -> None:
+    """Печатает сводки модулей, загруженных за прогон"""
+    for print_stats in _loaded(SESSION_STATS):
+        print_stats()
+
+
+def close_session() -> None:
+    """Закрывает пулы (невыданные офферы отменяются), транспорты, кассету, стаб и прокси сбоев, если они использовались"""
+    for close in _loaded(SESSION_RESOURCES):
+        close()
@@ -0,0 +1,592 @@
+import argparse
+import asyncio
+import os
+import random
+import signal
+import statistics
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config import DEFAULT_CONFIG
+from base_tester import GrpcTestConfig
+from grpc_transport import BACKEND_AUTO, BACKEND_GRPCIO, BACKEND_GRPCURL, BACKEND_STUB, resolve_backend, grpcio_available, result_status
+from async_transport import close_async_transports
+from latency_histogram import LatencyHistogram
+from load_generator import LoadStats, OpenLoopScheduler
+from offer_lifecycle_benchmark import offer_from_result
+from offer_pool import payin_offer_payload
+from orders_api_tests import CreateOrderTester
+from reference_data import REFERENCE_DICTIONARIES, preload_reference_ids
+from results_history import ResultsHistory, check_metric
+from result_reporters import open_reporters
+from session_stats import close_session, print_session_stats
+from harness_log import add_logging_arguments, configure_logging, get_logger
+
+
+log = get_logger(__name__)
+
+
+@dataclass
+class SoakOperation:
+    """Операция смеси soak-прогона: один или несколько RPC, возвращает итоговый статус (см. result_status)"""
+    name: str
+    description: str
+    run: Callable[["SoakRunner"], Awaitable[str]]
+
+
+async def _create_order(soak: "SoakRunner") -> str:
+    return result_status(await soak.call("CreateOrder", soak.tester.build_payin_order_payload()))
+
+
+async def _offer_churn(soak: "SoakRunner") -> str:
+    result = await soak.call("PublishNewOffer", payin_offer_payload())
+    offer = offer_from_result(result)
+    if offer is None:
+        return result_status(result) if not result["success"] else "NoOffer"
+    # Отменяем сразу, чтобы за часы прогона не копились активные офферы тестового трейдера
+    return result_status(await soak.call("CancelOffer", {"offer_id": offer["id"]}))
+
+
+async def _gwconfig_read(soak: "SoakRunner") -> str:
+    name = random.choice(list(REFERENCE_DICTIONARIES))
+    dictionary = REFERENCE_DICTIONARIES[name]
+    ids = soak.reference_ids.get(name)
+    # Половина чтений - элемент по id из кэша справочников (загружен до старта), половина - список целиком
+    if ids and random.random() < 0.5:
+        return result_status(await soak.call(dictionary.get_method, {"id": random.choice(ids)}))
+    return result_status(await soak.call(dictionary.method, {}))
+
+
+def _list_read(method: str) -> Callable[["SoakRunner"], Awaitable[str]]:
+    async def read(soak: "SoakRunner") -> str:
+        return result_status(await soak.call(method, {}))
+    return read
+
+
+SOAK_OPERATIONS: Dict[str, SoakOperation] = {operation.name: operation for operation in [
+    SoakOperation("create-order", "PayIn CreateOrder со свежими external_*_id", _create_order),
+    SoakOperation("offer-churn", "PublishNewOffer и сразу CancelOffer", _offer_churn),
+    SoakOperation("get-offers", "GetOffers без фильтров", _list_read("GetOffers")),
+    SoakOperation("get-traders", "GetTraders без фильтров", _list_read("GetTraders")),
+    SoakOperation("gwconfig", "Справочник gwconfig целиком или элемент по известному id (GetCurrencies, GetCurrency, ...)", _gwconfig_read),
+]}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """'create-order=2,get-offers=3' -> веса операций; операция без веса получает 1"""
+    mix: Dict[str, float] = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, weight = item.partition("=")
+        if name not in SOAK_OPERATIONS:
+            raise ValueError(f"Неизвестная операция смеси: {name} (доступны: {', '.join(SOAK_OPERATIONS)})")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Некорректный вес операции {name}: {weight}") from None
+        if mix[name] < 0:
+            raise ValueError(f"Вес операции {name} не может быть отрицательным")
+    if not any(mix.values()):
+        raise ValueError("В смеси нет ни одной операции с положительным весом")
+    return mix
+
+
+def parse_duration(value: str) -> float:
+    """Длительность в секундах: 90, 90s, 30m, 4h"""
+    units = {"s": 1, "m": 60, "h": 3600}
+    try:
+        if value and value[-1] in units:
+            seconds = float(value[:-1]) * units[value[-1]]
+        else:
+            seconds = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ожидается число секунд или 30m, 4h: {value}") from None
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError("длительность должна быть положительной")
+    return seconds
+
+
+def process_rss() -> Optional[int]:
+    """Текущий RSS процесса в байтах; без /proc (macOS) - пиковый RSS, который тоже растет при утечке"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def open_fds() -> Optional[int]:
+    """Число открытых файловых дескрипторов процесса (сокеты, пайпы grpcurl, файлы отчетов)"""
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+def _clock(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+class SoakWindow:
+    """Вызовы за одно окно замеров: гистограмма и статусы по каждому RPC методу"""
+
+    def __init__(self):
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.statuses: Dict[str, Counter] = {}
+
+    def record(self, method: str, status: str, seconds: float) -> None:
+        self.latency.setdefault(method, LatencyHistogram()).record(seconds)
+        self.statuses.setdefault(method, Counter())[status] += 1
+
+
+@dataclass
+class SoakSample:
+    """Замер за окно: задержки и ошибки по методам и в целом, ресурсы процесса обвязки"""
+    index: int
+    offset: float
+    window: float
+    calls: int
+    errors: int
+    p50_ms: float
+    p99_ms: float
+    # Метод -> calls, errors, p50_ms, p99_ms
+    methods: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    rss_bytes: Optional[int] = None
+    fds: Optional[int] = None
+    cpu_percent: float = 0.0
+    # Насколько позже запланированного проснулся замер: занятый event loop обвязки, а не шлюз
+    loop_lag_ms: float = 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors * 100 / self.calls if self.calls else 0.0
+
+    def metrics(self, min_calls: int) -> Dict[Tuple[str, str], float]:
+        """(имя, метрика) -> значение для поиска дрейфа; методы с малым числом вызовов в окне пропускаются"""
+        values: Dict[Tuple[str, str], float] = {}
+        if self.calls >= min_calls:
+            values.update({("все", "p50"): self.p50_ms, ("все", "p99"): self.p99_ms, ("все", "ошибки"): self.error_rate})
+        for method, stats in self.methods.items():
+            if stats["calls"] >= min_calls:
+                values[(method, "p50")] = stats["p50_ms"]
+                values[(method, "p99")] = stats["p99_ms"]
+                values[(method, "ошибки")] = stats["errors"] * 100 / stats["calls"]
+        if self.rss_bytes is not None:
+            values[("обвязка", "RSS")] = self.rss_bytes / 1024 / 1024
+        if self.fds is not None:
+            values[("обвязка", "FD")] = float(self.fds)
+        return values
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "window": self.index,
+            "offset_s": round(self.offset, 1),
+            "calls": self.calls,
+            "errors": self.errors,
+            "p50_ms": round(self.p50_ms, 3),
+            "p99_ms": round(self.p99_ms, 3),
+            "methods": self.methods,
+            "rss_bytes": self.rss_bytes,
+            "fds": self.fds,
+            "cpu_percent": round(self.cpu_percent, 1),
+            "loop_lag_ms": round(self.loop_lag_ms, 3),
+        }
+
+
+class DriftDetector:
+    """Ищет рост задержек, ошибок и ресурсов обвязки относительно начала прогона.
+
+    Базовая линия - окна сразу после разогрева; с ней сравнивается медиана
+    последних recent_windows окон, поэтому одиночный всплеск тревоги не
+    поднимает, а медленная деградация, заметная только через часы, поднимает.
+    Задержки проверяются как в results_history (устойчивый z и минимальный
+    рост), доля ошибок и FD - по абсолютному росту, RSS - по относительному.
+    """
+
+    def __init__(self, warmup_windows: int = DEFAULT_CONFIG.soak_warmup_windows, baseline_windows: int = DEFAULT_CONFIG.soak_baseline_windows,
+                 recent_windows: int = DEFAULT_CONFIG.soak_recent_windows, threshold: float = DEFAULT_CONFIG.soak_drift_threshold,
+                 min_increase: float = DEFAULT_CONFIG.soak_drift_min_increase, min_calls: int = DEFAULT_CONFIG.soak_min_calls,
+                 error_rate_drift: float = DEFAULT_CONFIG.soak_error_rate_drift, rss_drift: float = DEFAULT_CONFIG.soak_rss_drift,
+                 fd_drift: int = DEFAULT_CONFIG.soak_fd_drift):
+        self.warmup_windows = warmup_windows
+        self.baseline_windows = baseline_windows
+        self.recent_windows = recent_windows
+        self.threshold = threshold
+        self.min_increase = min_increase
+        self.min_calls = min_calls
+        self.error_rate_drift = error_rate_drift
+        self.rss_drift = rss_drift
+        self.fd_drift = fd_drift
+
+    @property
+    def windows_needed(self) -> int:
+        return self.warmup_windows + self.baseline_windows + self.recent_windows
+
+    def baseline(self, samples: List[SoakSample]) -> Dict[Tuple[str, str], List[float]]:
+        series: Dict[Tuple[str, str], List[float]] = {}
+        for sample in samples[self.warmup_windows:self.warmup_windows + self.baseline_windows]:
+            for key, value in sample.metrics(self.min_calls).items():
+                series.setdefault(key, []).append(value)
+        return series
+
+    def recent(self, samples: List[SoakSample]) -> Dict[Tuple[str, str], float]:
+        series: Dict[Tuple[str, str], List[float]] = {}
+        for sample in samples[-self.recent_windows:]:
+            for key, value in sample.metrics(self.min_calls).items():
+                series.setdefault(key, []).append(value)
+        # Метрика должна быть хотя бы в половине окон, иначе медиана - случайность
+        return {key: statistics.median(values) for key, values in series.items() if len(values) * 2 >= self.recent_windows}
+
+    def check(self, samples: List[SoakSample]) -> Dict[Tuple[str, str], str]:
+        """(имя, метрика) -> описание дрейфа для метрик, которые сейчас выше базовой линии"""
+        if len(samples) < self.windows_needed:
+            return {}
+        baseline = self.baseline(samples)
+        drifts: Dict[Tuple[str, str], str] = {}
+        for key, value in self.recent(samples).items():
+            history = baseline.get(key, [])
+            if len(history) * 2 < self.baseline_windows:
+                continue
+            name, metric = key
+            median = statistics.median(history)
+            if metric in ("p50", "p99"):
+                regression = check_metric(name, metric, value, history, self.threshold, self.min_increase, 1)
+                if regression:
+                    drifts[key] = str(regression)
+            elif metric == "ошибки" and value > median + self.error_rate_drift * 100:
+                drifts[key] = f"{name} ошибки: {value:.2f}% против {median:.2f}% в начале прогона"
+            elif metric == "RSS" and value > median * (1 + self.rss_drift):
+                drifts[key] = f"RSS обвязки: {value:.1f} МБ против {median:.1f} МБ в начале прогона (+{(value / median - 1) * 100:.0f}%)"
+            elif metric == "FD" and value > median + self.fd_drift:
+                drifts[key] = f"Открытых FD обвязки: {value:.0f} против {median:.0f} в начале прогона"
+        return drifts
+
+
+def trend_per_hour(points: List[Tuple[float, float]]) -> float:
+    """Наклон прямой наименьших квадратов по (секунды, значение), в единицах значения за час"""
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if not variance:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance * 3600
+
+
+class SoakRunner:
+    """Часами гоняет взвешенную смесь операций с постоянной частотой и раз в окно снимает замер.
+
+    Запросы идут открытым циклом (OpenLoopScheduler), операция каждого
+    запроса выбирается случайно по весам. Замер окна - перцентили и доля
+    ошибок по RPC методам, RSS, открытые FD и загрузка CPU процесса обвязки;
+    после каждого замера DriftDetector сравнивает последние окна с началом
+    прогона и печатает тревогу, когда метрика уходит вверх, и отбой, когда
+    возвращается.
+    """
+
+    def __init__(self, tester: CreateOrderTester, mix: Dict[str, float], interval: float, detector: DriftDetector,
+                 on_sample: Optional[Callable[[SoakSample], None]] = None):
+        self.tester = tester
+        self.operations = [SOAK_OPERATIONS[name] for name, weight in mix.items() if weight > 0]
+        self.weights = [weight for weight in mix.values() if weight > 0]
+        self.interval = interval
+        self.detector = detector
+        self.on_sample = on_sample
+        self.window = SoakWindow()
+        self.samples: List[SoakSample] = []
+        # Итог за весь прогон по методам (для отчета и истории)
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.statuses: Dict[str, Counter] = {}
+        self.active_drifts: Dict[Tuple[str, str], str] = {}
+        # Первое описание каждого дрейфа за прогон
+        self.drifts: Dict[Tuple[str, str], str] = {}
+        self.stop_requested = False
+        # id справочников для операции gwconfig (preload_reference_ids до старта)
+        self.reference_ids: Dict[str, List[Any]] = {}
+
+    async def call(self, method: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        result = await self.tester.arun_grpc(method, payload)
+        seconds = time.perf_counter() - started
+        status = result_status(result)
+        self.window.record(method, status, seconds)
+        self.latency.setdefault(method, LatencyHistogram()).record(seconds)
+        self.statuses.setdefault(method, Counter())[status] += 1
+        return result
+
+    async def send(self) -> str:
+        operation = random.choices(self.operations, self.weights)[0]
+        return await operation.run(self)
+
+    def take_sample(self, offset: float, window: float, cpu_seconds: float, loop_lag: float) -> SoakSample:
+        current, self.window = self.window, SoakWindow()
+        overall = LatencyHistogram()
+        methods: Dict[str, Dict[str, float]] = {}
+        for method, histogram in sorted(current.latency.items()):
+            overall.merge(histogram)
+            statuses = current.statuses[method]
+            methods[method] = {
+                "calls": histogram.count,
+                "errors": histogram.count - statuses.get("OK", 0),
+                "p50_ms": histogram.percentile_us(50) / 1000,
+                "p99_ms": histogram.percentile_us(99) / 1000,
+            }
+        sample = SoakSample(
+            index=len(self.samples) + 1,
+            offset=offset,
+            window=window,
+            calls=overall.count,
+            errors=sum(int(stats["errors"]) for stats in methods.values()),
+            p50_ms=overall.percentile_us(50) / 1000,
+            p99_ms=overall.percentile_us(99) / 1000,
+            methods=methods,
+            rss_bytes=process_rss(),
+            fds=open_fds(),
+            cpu_percent=cpu_seconds * 100 / window if window else 0.0,
+            loop_lag_ms=loop_lag * 1000,
+        )
+        self.samples.append(sample)
+        return sample
+
+    def report_sample(self, sample: SoakSample) -> None:
+        resources = []
+        if sample.rss_bytes is not None:
+            resources.append(f"RSS {sample.rss_bytes / 1024 / 1024:.1f} МБ")
+        if sample.fds is not None:
+            resources.append(f"FD {sample.fds}")
+        resources.append(f"CPU {sample.cpu_percent:.0f}%")
+        resources.append(f"лаг цикла {sample.loop_lag_ms:.1f} мс")
+        print(f"📊 [{_clock(sample.offset)}] {sample.calls} вызовов ({sample.calls / sample.window:.1f}/с), "
+              f"ошибок {sample.error_rate:.2f}%, p50 {sample.p50_ms:.1f} мс, p99 {sample.p99_ms:.1f} мс | {', '.join(resources)}")
+        for method, stats in sample.methods.items():
+            log.debug("   %s: %d вызовов, ошибок %d, p50 %.1f мс, p99 %.1f мс", method, stats["calls"], stats["errors"], stats["p50_ms"], stats["p99_ms"])
+
+        drifts = self.detector.check(self.samples)
+        for key, description in drifts.items():
+            if key not in self.active_drifts:
+                print(f"🚨 Дрейф: {description}")
+                self.drifts.setdefault(key, description)
+        for key in self.active_drifts.keys() - drifts.keys():
+            name, metric = key
+            print(f"✅ {name} {metric} вернулся к базовой линии")
+        self.active_drifts = drifts
+
+    async def _sample_windows(self, started: float, done: asyncio.Event) -> None:
+        loop_started, cpu_started = started, time.process_time()
+        while not done.is_set():
+            planned = loop_started + self.interval
+            try:
+                await asyncio.wait_for(done.wait(), max(planned - time.perf_counter(), 0))
+            except asyncio.TimeoutError:
+                pass
+            now, cpu = time.perf_counter(), time.process_time()
+            window = now - loop_started
+            # Последнее неполное окно короче половины интервала не показательно - в замеры не попадает
+            if done.is_set() and (window < self.interval / 2 or not self.window.latency):
+                break
+            sample = self.take_sample(now - started, window, cpu - cpu_started, max(now - planned, 0) if not done.is_set() else 0.0)
+            self.report_sample(sample)
+            if self.on_sample:
+                self.on_sample(sample)
+            loop_started, cpu_started = now, cpu
+
+    async def run(self, rps: float, duration: float, max_in_flight: int) -> LoadStats:
+        loop = asyncio.get_running_loop()
+        try:
+            # Ctrl+C завершает прогон штатно: отправленные запросы дожидаются, отчет печатается
+            loop.add_signal_handler(signal.SIGINT, self.request_stop)
+        except (NotImplementedError, RuntimeError):
+            pass
+        done = asyncio.Event()
+        sampler = asyncio.create_task(self._sample_windows(time.perf_counter(), done))
+        try:
+            return await OpenLoopScheduler(rps, duration, max_in_flight, should_stop=lambda: self.stop_requested).run(self.send)
+        finally:
+            done.set()
+            await sampler
+            try:
+                loop.remove_signal_handler(signal.SIGINT)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+    def request_stop(self) -> None:
+        if not self.stop_requested:
+            print("\n⏹️  Остановка: дожидаемся отправленных запросов...")
+        self.stop_requested = True
+
+    def print_report(self, stats: LoadStats, title: str) -> None:
+        print()
+        print("=" * 80)
+        print(f"📈 РЕЗУЛЬТАТЫ SOAK-ПРОГОНА: {title}")
+        print("=" * 80)
+        print(f"⏱️  Длительность: {_clock(stats.elapsed)} ({len(self.samples)} окон по {self.interval:g} с)")
+        print(f"📥 Операций: {stats.completed}, с ошибкой: {stats.errors} ({stats.errors * 100 / stats.completed if stats.completed else 0:.2f}%)")
+        print()
+        print(f"   {'Метод':<24}{'вызовов':>9}{'ошибок':>8}{'p50 мс':>10}{'p99 мс':>10}{'max мс':>10}")
+        for method, histogram in sorted(self.latency.items()):
+            errors = histogram.count - self.statuses[method].get("OK", 0)
+            print(f"   {method:<24}{histogram.count:>9}{errors:>8}"
+                  f"{histogram.percentile(50) * 1000:>10.1f}{histogram.percentile(99) * 1000:>10.1f}{histogram.max * 1000:>10.1f}")
+        for method, statuses in sorted(self.statuses.items()):
+            for status, count in statuses.most_common():
+                if status != "OK":
+                    print(f"   • {method}: {status} - {count}")
+
+        measured = self.samples[self.detector.warmup_windows:]
+        if len(measured) >= 2:
+            print()
+            print("📉 Тренд после разогрева (наклон за час):")
+            first, last = measured[0], measured[-1]
+            for label, unit, value in (
+                ("p50", "мс", lambda sample: sample.p50_ms),
+                ("p99", "мс", lambda sample: sample.p99_ms),
+                ("ошибки", "п.п.", lambda sample: sample.error_rate),
+                ("RSS", "МБ", lambda sample: sample.rss_bytes / 1024 / 1024 if sample.rss_bytes is not None else None),
+                ("FD", "", lambda sample: sample.fds),
+            ):
+                points = [(sample.offset, value(sample)) for sample in measured if value(sample) is not None]
+                if len(points) >= 2:
+                    print(f"   {label:<8} {value(first) or 0:>10.1f} → {value(last) or 0:<10.1f} {trend_per_hour(points):+.2f} {unit}/ч".rstrip())
+
+        print()
+        if len(self.samples) < self.detector.windows_needed:
+            print(f"ℹ️  Окон меньше {self.detector.windows_needed} (разогрев + базовая линия + последние) - дрейф не проверялся")
+        elif self.drifts:
+            print(f"🚨 Дрейф за прогон ({len(self.drifts)}):")
+            for description in self.drifts.values():
+                print(f"   • {description}")
+        else:
+            print("✅ Дрейфа задержек, ошибок и ресурсов не обнаружено")
+        print("=" * 80)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Soak-прогон: часами гоняет смесь операций и ищет медленный рост задержек, ошибок и ресурсов")
+    parser.add_argument("--mix", default=DEFAULT_CONFIG.soak_mix, help=f"Операции и веса через запятую (по умолчанию: {DEFAULT_CONFIG.soak_mix}; доступны: {', '.join(SOAK_OPERATIONS)})")
+    parser.add_argument("--rps", type=float, default=10, help="Операций в секунду (по умолчанию: 10)")
+    parser.add_argument("--duration", type=parse_duration, default=4 * 3600, help="Длительность: секунды или 30m, 4h (по умолчанию: 4h; Ctrl+C - досрочно)")
+    parser.add_argument("--interval", type=parse_duration, default=DEFAULT_CONFIG.soak_sample_interval, help=f"Окно замеров (по умолчанию: {DEFAULT_CONFIG.soak_sample_interval:g} с)")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Максимум одновременных операций (по умолчанию: 1000)")
+    parser.add_argument("--baseline-windows", type=int, default=DEFAULT_CONFIG.soak_baseline_windows, help=f"Окон базовой линии после разогрева (по умолчанию: {DEFAULT_CONFIG.soak_baseline_windows})")
+    parser.add_argument("--recent-windows", type=int, default=DEFAULT_CONFIG.soak_recent_windows, help=f"Последних окон, сравниваемых с базовой линией (по умолчанию: {DEFAULT_CONFIG.soak_recent_windows})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_CONFIG.soak_drift_threshold, help=f"Порог устойчивого z-score задержки (по умолчанию: {DEFAULT_CONFIG.soak_drift_threshold:g})")
+    parser.add_argument("--host", default=DEFAULT_CONFIG.grpc_host, help=f"Хост сервера (по умолчанию: {DEFAULT_CONFIG.grpc_host})")
+    parser.add_argument("--port", type=int, default=DEFAULT_CONFIG.grpc_port, help=f"Порт сервера (по умолчанию: {DEFAULT_CONFIG.grpc_port})")
+    parser.add_argument("--backend", choices=[BACKEND_AUTO, BACKEND_GRPCIO, BACKEND_GRPCURL, BACKEND_STUB], default=DEFAULT_CONFIG.grpc_backend, help=f"gRPC транспорт (по умолчанию: {DEFAULT_CONFIG.grpc_backend})")
+    parser.add_argument("--stub", action="store_true", help="Soak на локальном стабе шлюза, без сети (проверка обвязки; RSS и CPU включают стаб)")
+    parser.add_argument("--stub-fault", action="append", default=[], metavar="[МЕТОД:]ПАРАМЕТРЫ", help="Задержка и ошибки стаба, например GetOffers:latency_ms=20,error_rate=0.01")
+    parser.add_argument("--fault-proxy", action="store_true", default=DEFAULT_CONFIG.fault_proxy_enabled, help="Пустить нагрузку через локальный прокси сбоев")
+    parser.add_argument("--fault", action="append", default=[], metavar="[МЕТОД:]ПРАВИЛО", help="Правило прокси сбоев (включает --fault-proxy), например *:latency=normal/50/10")
+    parser.add_argument("--history", default=DEFAULT_CONFIG.results_history_path, metavar="PATH", help=f"Файл истории прогонов (по умолчанию: {DEFAULT_CONFIG.results_history_path})")
+    parser.add_argument("--no-history", dest="save_history", action="store_false", default=DEFAULT_CONFIG.results_history_enabled, help="Не записывать прогон в историю")
+    parser.add_argument("--jsonl", metavar="PATH", help="Писать замер каждого окна в JSON Lines по ходу прогона")
+    parser.add_argument("--junit", metavar="PATH", help="Записать итог как тест JUnit XML (провал при дрейфе)")
+    add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_logging(args.log_level, args.log_format)
+
+    if args.rps <= 0 or args.max_in_flight <= 0 or args.baseline_windows <= 0 or args.recent_windows <= 0:
+        print("❌ --rps, --max-in-flight, --baseline-windows и --recent-windows должны быть положительными")
+        return 1
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    backend = resolve_backend(BACKEND_STUB if args.stub else args.backend)
+    if args.stub:
+        from stub_gateway import start_stub_gateway
+        try:
+            start_stub_gateway(tuple(args.stub_fault))
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+    host, port = args.host, args.port
+    if args.fault_proxy or args.fault:
+        from fault_proxy import start_fault_proxies
+        try:
+            host, port = start_fault_proxies(args.host, args.port, args.fault)
+        except (ValueError, OSError) as e:
+            print(f"❌ {e}")
+            return 1
+    if backend == BACKEND_GRPCIO and not grpcio_available():
+        print("❌ grpcio не найден. Установите grpcio, grpcio-reflection и protobuf или используйте --backend grpcurl")
+        return 1
+    config = GrpcTestConfig(host=host, port=port, insecure=DEFAULT_CONFIG.grpc_insecure, backend=backend)
+
+    try:
+        reporters = open_reporters(args.jsonl, args.junit)
+    except OSError as e:
+        print(f"❌ Не удалось открыть файл отчета: {e}")
+        return 1
+    label = f"{','.join(name for name, weight in mix.items() if weight > 0)} @ {args.rps:g} req/s"
+    reporters.start_run({"target": f"{args.host}:{args.port}", "backend": backend, "scenario": f"soak {label}"})
+
+    detector = DriftDetector(baseline_windows=args.baseline_windows, recent_windows=args.recent_windows, threshold=args.threshold)
+    soak = SoakRunner(CreateOrderTester(config), mix, args.interval, detector, (lambda sample: reporters.sample(sample.as_dict())) if reporters else None)
+
+    total_weight = sum(mix.values())
+    print(f"🔥 Soak-прогон на {config.host}:{config.port}, транспорт: {backend}")
+    for name, weight in mix.items():
+        if weight > 0:
+            print(f"   {weight * 100 / total_weight:5.1f}%  {name}: {SOAK_OPERATIONS[name].description}")
+    print(f"   {args.rps:g} операций/с в течение {_clock(args.duration)}, замер каждые {args.interval:g} с")
+    print(f"   Дрейф: {detector.warmup_windows} окон разогрева, базовая линия {detector.baseline_windows}, сравниваются последние {detector.recent_windows}")
+
+    if mix.get("gwconfig", 0) > 0:
+        soak.reference_ids = preload_reference_ids(soak.tester)
+
+    async def run() -> LoadStats:
+        try:
+            return await soak.run(args.rps, args.duration, args.max_in_flight)
+        finally:
+            await close_async_transports()
+
+    try:
+        stats = asyncio.run(run())
+        reporters.test_finished({
+            "test": f"soak {label}",
+            "test_id": "soak/mix",
+            "category": "soak",
+            "status": "FAIL" if soak.drifts else "PASS",
+            "duration_ms": stats.elapsed * 1000,
+            "details": [{"test": f"{name} {metric}", "status": "FAIL", "details": description} for (name, metric), description in soak.drifts.items()],
+        })
+        reporters.finish({"windows": len(soak.samples), "completed": stats.completed, "errors": stats.errors, "drifts": len(soak.drifts)})
+    finally:
+        reporters.close()
+    soak.print_report(stats, label)
+    if args.save_history:
+        # Задержка зависит от частоты и смеси, поэтому метод в истории - вместе с ними
+        history = ResultsHistory(args.history)
+        try:
+            history_backend = f"{backend}+fault-proxy" if (host, port) != (args.host, args.port) else backend
+            run_id = history.start_run(f"{args.host}:{args.port}", history_backend, f"soak {label}")
+            history.add_test(run_id, "soak/mix", f"soak {label}", "FAIL" if soak.drifts else "PASS", stats.elapsed * 1000)
+            for method, histogram in sorted(soak.latency.items()):
+                errors = histogram.count - soak.statuses[method].get("OK", 0)
+                history.add_run_latency(run_id, f"soak {method} @ {args.rps:g} req/s", histogram, errors)
+        finally:
+            history.close()
+        print(f"🗄️  Прогон #{run_id} записан в историю {args.history}")
+    print_session_stats()
+    close_session()
+    return 1 if soak.drifts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
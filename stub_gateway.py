@@ -0,0 +1,746 @@
+import argparse
+import asyncio
+import copy
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from config import DEFAULT_CONFIG
+from grpc_transport import BACKEND_STUB, format_grpc_error
+from rpc_timing import mark
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
+
+
+class StubRpcError(Exception):
+    """Ошибка RPC стаба: код в формате grpcurl (NotFound, InvalidArgument, ...) и сообщение сервера"""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+@dataclass
+class StubFaults:
+    """Внедряемые задержка и ошибки для метода стаба"""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_code: str = "Unavailable"
+
+
+def parse_fault_spec(spec: str) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Разбирает "Метод:latency_ms=50,error_rate=0.1" ("*" или без метода - для всех методов)"""
+    method, _, options = spec.rpartition(":")
+    faults: Dict[str, Any] = {}
+    for option in filter(None, options.split(",")):
+        name, sep, value = option.partition("=")
+        name = name.strip()
+        if not sep or name not in StubFaults.__dataclass_fields__:
+            raise ValueError(f"Некорректная настройка сбоев стаба: {option}")
+        faults[name] = value.strip() if name == "error_code" else float(value)
+    return (method.strip() if method.strip() not in ("", "*") else None), faults
+
+
+UUID_PATTERN = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE)
+
+CURRENCIES = (
+    (1, "USD", 2, True), (2, "EUR", 2, True), (3, "RUB", 2, True), (4, "UAH", 2, True),
+    (5, "AMD", 2, True), (6, "GEL", 2, True), (7, "AZN", 2, True), (8, "KGS", 2, True),
+    (9, "TJS", 2, True), (10, "KZT", 2, True), (11, "TRY", 2, True), (12, "BYN", 2, True),
+    (13, "UZS", 2, True), (14, "INR", 2, True), (15, "BTC", 8, False), (16, "USDT", 6, False),
+)
+
+REGIONS = ("UA", "AM", "GE", "AZ", "KG", "TJ", "KZ", "RU", "UZ", "TR", "BY", "IN")
+
+ISSUER_COUNT = 216
+NAMED_ISSUERS = {1: "Any issuer", 87: "Zolotaya Korona", 211: "Es-Bi-Ay Bank", 216: "VK Pay"}
+
+PAYMENT_METHOD_TYPES = ((1, "Credit Card"), (2, "Instant Payment"))
+
+# Шаблоны методов оплаты: направление, название, тип, логотип, код, описание, эмитенты
+PAYMENT_METHOD_TEMPLATES = {
+    "card_in": ("PAYIN", "Card Number", 1, 1, "CARD_{code}", "Card number payments in {code}", [1]),
+    "phone_in": ("PAYIN", "Phone Number", 2, 2, "PHONE_{code}", "Phone number payments in {code}", []),
+    "account_in": ("PAYIN", "Bank Account", 2, 3, "ACCOUNT_{code}", "Bank account payments in {code}", [1]),
+    "sbp_in": ("PAYIN", "SBP", 2, 5, "SBP_{code}", "Fast payments system payments in {code}", []),
+    "card_out": ("PAYOUT", "Card Number", 1, 1, "CARD_PAYOUT_{code}", "Card number payouts in {code}", [1]),
+    "phone_out": ("PAYOUT", "Phone Number", 2, 4, "PHONE_PAYOUT_{code}", "Phone number payouts in {code}", []),
+    "account_out": ("PAYOUT", "Bank Account", 2, 3, "ACCOUNT_PAYOUT_{code}", "Bank account payouts in {code}", [1]),
+    "sbp_out": ("PAYOUT", "SBP", 2, 5, "SBP_PAYOUT_{code}", "Fast payments system payouts in {code}", []),
+}
+
+# Методы оплаты по регионам в порядке id: регион, валюта, шаблоны
+PAYMENT_METHOD_CATALOG = (
+    (8, 3, ("card_in", "phone_in", "account_in", "sbp_in", "card_out", "phone_out", "account_out", "sbp_out")),
+    (1, 4, ("card_in", "phone_in", "card_out", "phone_out")),
+    (9, 13, ("card_in", "phone_in", "card_out", "phone_out")),
+    (12, 14, ("card_in", "phone_in", "card_out", "phone_out")),
+    (7, 10, ("card_in", "phone_in", "account_in", "card_out", "account_out", "phone_out")),
+)
+
+SEED_TRADER_COUNT = 8
+SEED_TRADER_ID = "550e8400-e29b-41d4-a716-4466554400{:02d}"
+# Активные офферы трейдера по умолчанию, чтобы тесты чтения не зависели от порядка запуска
+SEED_OFFER_COUNT = 4
+SEED_OFFER_ID = "550e8400-e29b-41d4-a716-4466554401{:02d}"
+SEED_PAYMENT_DETAILS_ID = "550e8400-e29b-41d4-a716-446655440021"
+
+COMPANY_IDS = frozenset({1})
+ORDER_MIN_AMOUNT = 100
+ORDER_MAX_AMOUNT = 50000
+
+# Допустимые переходы оффера: метод -> {текущий статус: новый статус}
+OFFER_TRANSITIONS: Dict[str, Dict[str, str]] = {
+    "PauseOffer": {"OFFER_ACTIVE": "OFFER_ON_HOLD"},
+    "ReactivateOffer": {"OFFER_ON_HOLD": "OFFER_ACTIVE"},
+    "CancelOffer": {"OFFER_ACTIVE": "OFFER_CANCELED", "OFFER_ON_HOLD": "OFFER_CANCELED"},
+}
+
+# Поля фильтров, имя которых не совпадает с полем ответа
+FILTER_FIELDS = {"trader_id": "id"}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _camel(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.capitalize() for part in rest)
+
+
+def _int(payload: Dict[str, Any], name: str, default: int = 0) -> int:
+    try:
+        return int(payload.get(name, default))
+    except (TypeError, ValueError):
+        raise StubRpcError("InvalidArgument", f"invalid value for {name}")
+
+
+class StubGateway:
+    """Локальный стаб Payment Gateway: gwconfig, трейдеры, офферы и заказы в памяти.
+
+    handle() принимает имя метода и JSON payload так же, как grpcurl, и
+    возвращает ответ в формате grpcurl -emit-defaults или поднимает
+    StubRpcError. Правила совпадают с тем, что проверяют тесты: сортировка
+    списков по умолчанию id DESC, переходы офферов из OFFER_TRANSITIONS,
+    отмена оффера с заказами переводит его в OFFER_INACTIVE. Заказ
+    привязывается к последнему активному офферу того же направления и через
+    stub_order_processing_ms переходит в PROCESSING.
+
+    faults_for() решает, какую задержку и ошибку внедрить в вызов; сами
+    паузы выдерживает транспорт, поэтому синхронные и асинхронные вызовы
+    не держат общую блокировку состояния.
+    """
+
+    def __init__(self, faults: Optional[StubFaults] = None, order_processing_ms: Optional[int] = None, seed: Optional[int] = None):
+        self._lock = threading.RLock()
+        self._random = random.Random(seed)
+        self.faults: Dict[Optional[str], StubFaults] = {None: faults or StubFaults(
+            DEFAULT_CONFIG.stub_latency_ms,
+            DEFAULT_CONFIG.stub_latency_jitter_ms,
+            DEFAULT_CONFIG.stub_error_rate,
+            DEFAULT_CONFIG.stub_error_code,
+        )}
+        self.order_processing = (DEFAULT_CONFIG.stub_order_processing_ms if order_processing_ms is None else order_processing_ms) / 1000
+        self.calls = 0
+        self.injected_errors = 0
+
+        self.currencies = {id_: {"id": id_, "code": code, "currencyDecimalAccuracy": accuracy, "isAccountCurrency": account}
+                           for id_, code, accuracy, account in CURRENCIES}
+        self.regions = {id_: {"id": id_, "title": title} for id_, title in enumerate(REGIONS, start=1)}
+        self.issuers = {id_: {"id": id_, "issuerName": NAMED_ISSUERS.get(id_, f"Bank {id_}"), "issuerType": "bank", "issuerCode": ""}
+                        for id_ in range(1, ISSUER_COUNT + 1)}
+        self.payment_method_types = {id_: {"id": id_, "paymentMethodTypeName": name, "validationRules": "{}"}
+                                     for id_, name in PAYMENT_METHOD_TYPES}
+        self.payment_methods: Dict[int, Dict[str, Any]] = {}
+        for region_id, currency_id, templates in PAYMENT_METHOD_CATALOG:
+            code = self.currencies[currency_id]["code"]
+            for template in templates:
+                direction, name, type_id, logo_id, method_code, description, issuer_ids = PAYMENT_METHOD_TEMPLATES[template]
+                id_ = len(self.payment_methods) + 1
+                self.payment_methods[id_] = {
+                    "id": id_, "isActive": True, "direction": direction, "name": name,
+                    "regionId": region_id, "currencyId": currency_id, "paymentMethodTypeId": type_id,
+                    "description": description.format(code=code), "paymentMethodLogoId": logo_id,
+                    "paymentMethodCode": method_code.format(code=code), "issuerIds": list(issuer_ids),
+                }
+
+        self.traders: Dict[str, Dict[str, Any]] = {}
+        for number in range(1, SEED_TRADER_COUNT + 1):
+            created = _now()
+            self.traders[SEED_TRADER_ID.format(number)] = {
+                "id": SEED_TRADER_ID.format(number),
+                "email": f"trader{number}@test.com",
+                "traderStatus": "TRADER_STATUS_ENABLED" if number % 4 else "TRADER_STATUS_DISABLED",
+                "hasActiveSessions": False,
+                "commissionPayin": 3,
+                "commissionPayout": 2.5,
+                "currencyId": 3,
+                "regionId": 8,
+                "paymentMethodTypeId": 1 if number % 3 else 2,
+                "createdAt": created,
+                "updatedAt": created,
+            }
+
+        self.offers: Dict[str, Dict[str, Any]] = {}
+        for number in range(1, SEED_OFFER_COUNT + 1):
+            direction = "pay_in_offer" if number % 2 else "pay_out_offer"
+            self._publish_new_offer({direction: {
+                "name": f"Seed offer {number}",
+                "amount": "100000",
+                "min_order_size": "100",
+                "max_order_size": "50000",
+                "payment_method_type_id": 2,
+                "trader_id": SEED_TRADER_ID.format(1),
+                "trader_payment_details_id": SEED_PAYMENT_DETAILS_ID,
+            }}, offer_id=SEED_OFFER_ID.format(number))
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        # Заказ -> (оффер, момент перехода в PROCESSING)
+        self._order_offers: Dict[str, Tuple[str, float]] = {}
+
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "GetCurrency": self._get_currency,
+            "GetCurrencies": self._get_currencies,
+            "GetRegion": self._get_region,
+            "GetRegions": self._get_regions,
+            "GetIssuer": self._get_issuer,
+            "GetIssuers": self._get_issuers,
+            "GetPaymentMethodType": self._get_payment_method_type,
+            "GetPaymentMethodTypes": self._get_payment_method_types,
+            "GetPaymentMethod": self._get_payment_method,
+            "GetPaymentMethods": self._get_payment_methods,
+            "CreatePaymentMethod": self._create_payment_method,
+            "GetTrader": self._get_trader,
+            "GetTraders": self._get_traders,
+            "RegisterTrader": self._register_trader,
+            "PublishNewOffer": self._publish_new_offer,
+            "GetOffer": self._get_offer,
+            "GetOffers": self._get_offers,
+            "PauseOffer": partial(self._change_offer_status, "PauseOffer"),
+            "ReactivateOffer": partial(self._change_offer_status, "ReactivateOffer"),
+            "CancelOffer": partial(self._change_offer_status, "CancelOffer"),
+            "CreateOrder": self._create_order,
+            "GetOrderById": self._get_order_by_id,
+        }
+
+    # Внедрение сбоев
+
+    def set_faults(self, method: Optional[str] = None, **faults) -> None:
+        """Задает задержку и ошибки для метода (None - для всех методов без своей настройки)"""
+        with self._lock:
+            self.faults[method] = replace(self.faults.get(method) or self.faults[None], **faults)
+
+    def faults_for(self, method: str) -> Tuple[float, Optional[StubRpcError]]:
+        """Задержка в секундах и ошибка (или None), которые нужно внедрить в вызов"""
+        with self._lock:
+            faults = self.faults.get(method) or self.faults[None]
+            self.calls += 1
+            delay = max(0.0, faults.latency_ms + self._random.uniform(-faults.jitter_ms, faults.jitter_ms)) / 1000
+            if faults.error_rate and self._random.random() < faults.error_rate:
+                self.injected_errors += 1
+                return delay, StubRpcError(faults.error_code, f"stub: injected {faults.error_code} for {method}")
+        return delay, None
+
+    # Обработка вызовов
+
+    def handle(self, method: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        # grpcurl принимает и полное имя (package.Service/Method), и короткое
+        method = method.rsplit("/", 1)[-1].rsplit(".", 1)[-1]
+        handler = self._handlers.get(method)
+        if handler is None:
+            raise StubRpcError("Unimplemented", f"unknown method {method}")
+        with self._lock:
+            # Ответ не должен разделять словари с состоянием стаба
+            return copy.deepcopy(handler(payload or {}))
+
+    @staticmethod
+    def _list(items: List[Dict[str, Any]], payload: Dict[str, Any], filter_fields: Tuple[str, ...] = ()) -> Tuple[List[Dict[str, Any]], str]:
+        """Фильтр, сортировка и пагинация списка. Без order - в обратном порядке добавления (id DESC)"""
+        filters = payload.get("filter") or {}
+        for name in filter_fields:
+            if name in filters:
+                field = FILTER_FIELDS.get(name, _camel(name))
+                items = [item for item in items if item.get(field) == filters[name]]
+
+        order = payload.get("order")
+        if order:
+            field = _camel(order.get("order_by") or "id")
+
+            def key(item):
+                value = item.get(field)
+                return value.lower() if isinstance(value, str) else value
+
+            items = sorted(items, key=key, reverse=bool(order.get("order_desc")))
+        else:
+            items = list(reversed(items))
+
+        total = len(items)
+        pagination = payload.get("pagination") or {}
+        offset = max(0, int(pagination.get("offset") or 0))
+        limit = int(pagination.get("limit") or 0)
+        page = items[offset:offset + limit] if limit > 0 else items[offset:]
+        return [{key: value for key, value in item.items() if not key.startswith("_")} for item in page], str(total)
+
+    @staticmethod
+    def _get(table: Dict[Any, Dict[str, Any]], key: Any, entity: str) -> Dict[str, Any]:
+        item = table.get(key)
+        if item is None:
+            raise StubRpcError("NotFound", f"{entity} not found")
+        return item
+
+    def _get_currency(self, payload):
+        return {"getCurrencyResponse": {"currency": self._get(self.currencies, _int(payload, "id"), "currency")}}
+
+    def _get_currencies(self, payload):
+        currencies, total = self._list(list(self.currencies.values()), payload)
+        return {"getCurrenciesResponse": {"currencies": currencies, "totalCount": total}}
+
+    def _get_region(self, payload):
+        return {"getRegionResponse": {"region": self._get(self.regions, _int(payload, "id"), "region")}}
+
+    def _get_regions(self, payload):
+        regions, total = self._list(list(self.regions.values()), payload)
+        return {"getRegionsResponse": {"regions": regions, "totalCount": total}}
+
+    def _get_issuer(self, payload):
+        return {"getIssuerResponse": {"issuer": self._get(self.issuers, _int(payload, "id"), "issuer")}}
+
+    def _get_issuers(self, payload):
+        issuers, total = self._list(list(self.issuers.values()), payload)
+        return {"getIssuersResponse": {"issuers": issuers, "totalCount": total}}
+
+    def _get_payment_method_type(self, payload):
+        payment_method_type = self._get(self.payment_method_types, _int(payload, "id"), "payment method type")
+        return {"getPaymentMethodTypeResponse": {"paymentMethodType": payment_method_type}}
+
+    def _get_payment_method_types(self, payload):
+        payment_method_types, total = self._list(list(self.payment_method_types.values()), payload)
+        return {"getPaymentMethodTypesResponse": {"paymentMethodTypes": payment_method_types, "totalCount": total}}
+
+    def _get_payment_method(self, payload):
+        return {"getPaymentMethodResponse": {"paymentMethod": self._get(self.payment_methods, _int(payload, "id"), "payment method")}}
+
+    def _get_payment_methods(self, payload):
+        payment_methods, total = self._list(
+            list(self.payment_methods.values()), payload,
+            ("currency_id", "direction", "is_active", "payment_method_type_id", "region_id"),
+        )
+        return {"getPaymentMethodsResponse": {"paymentMethods": payment_methods, "totalCount": total}}
+
+    def _create_payment_method(self, payload):
+        id_ = max(self.payment_methods) + 1
+        self.payment_methods[id_] = {
+            "id": id_,
+            "isActive": bool(payload.get("is_active", False)),
+            "direction": payload.get("direction", "PAYIN"),
+            "name": payload.get("name", ""),
+            "regionId": _int(payload, "region_id"),
+            "currencyId": _int(payload, "currency_id"),
+            "paymentMethodTypeId": _int(payload, "payment_method_type_id"),
+            "description": payload.get("description", ""),
+            "paymentMethodLogoId": _int(payload, "payment_method_logo_id"),
+            "paymentMethodCode": payload.get("payment_method_code", ""),
+            "issuerIds": [int(issuer_id) for issuer_id in payload.get("issuer_ids", [])],
+        }
+        return {"createPaymentMethodResponse": {"paymentMethod": self.payment_methods[id_]}}
+
+    # Трейдеры
+
+    def _trader(self, trader_id: Any) -> Dict[str, Any]:
+        if not isinstance(trader_id, str) or not UUID_PATTERN.match(trader_id):
+            raise StubRpcError("InvalidArgument", "trader id is not valid")
+        return self._get(self.traders, trader_id.lower(), "trader")
+
+    def _get_trader(self, payload):
+        return {"getTraderResponse": {"trader": self._trader(payload.get("trader_id"))}}
+
+    def _get_traders(self, payload):
+        traders, total = self._list(
+            list(self.traders.values()), payload,
+            ("currency_id", "email", "trader_status", "has_active_sessions", "trader_id", "payment_method_type_id"),
+        )
+        return {"getTradersResponse": {"traders": traders, "totalCount": total}}
+
+    def _register_trader(self, payload):
+        status = payload.get("trader_status", "TRADER_STATUS_ENABLED")
+        if status not in ("TRADER_STATUS_ENABLED", "TRADER_STATUS_DISABLED"):
+            raise StubRpcError("InvalidArgument", "register trader can only set status to ENABLED or DISABLED")
+        trader = self._trader(payload.get("trader_id"))
+        trader.update({
+            "traderStatus": status,
+            "commissionPayin": payload.get("commission_payin", 0),
+            "commissionPayout": payload.get("commission_payout", 0),
+            "currencyId": _int(payload, "currency_id"),
+            "regionId": _int(payload, "region_id"),
+            "updatedAt": _now(),
+        })
+        return {"registerTraderResponse": {"trader": trader}}
+
+    def create_trader(self, user_id: Any, email: Any) -> Dict[str, Any]:
+        """POST /traders/createTrader. ValueError с текстом ошибки сервиса, если трейдер не создан"""
+        with self._lock:
+            if not isinstance(user_id, str) or not UUID_PATTERN.match(user_id):
+                raise ValueError("user_id must be a valid UUID")
+            email = email if isinstance(email, str) else ""
+            if len(email) < 1:
+                raise ValueError("email must be at least 1 character long")
+            if len(email) > 255:
+                raise ValueError("email must be at most 255 characters long")
+            if user_id.lower() in self.traders:
+                raise ValueError(f"trader already exists: user_id {user_id}")
+            if any(trader["email"] == email for trader in self.traders.values()):
+                raise ValueError(f"email already exists: email {email}")
+
+            created = _now()
+            self.traders[user_id.lower()] = {
+                "id": user_id.lower(),
+                "email": email,
+                "traderStatus": "TRADER_STATUS_UNSPECIFIED",
+                "hasActiveSessions": False,
+                "commissionPayin": 0,
+                "commissionPayout": 0,
+                "currencyId": 0,
+                "regionId": 0,
+                "createdAt": created,
+                "updatedAt": created,
+            }
+        return {"status": "created", "trader_id": user_id}
+
+    # Офферы
+
+    def _publish_new_offer(self, payload, offer_id: Optional[str] = None):
+        direction = "PAYOUT" if "pay_out_offer" in payload else "PAYIN"
+        request = payload.get("pay_out_offer") or payload.get("pay_in_offer") or {}
+        trader = self._trader(request.get("trader_id"))
+        offer = {
+            "id": offer_id or str(uuid.uuid4()),
+            "name": request.get("name", ""),
+            "directionType": direction,
+            "traderPaymentDetailsId": request.get("trader_payment_details_id", ""),
+            "currencyId": str(trader["currencyId"]),
+            "paymentMethodTypeId": str(request.get("payment_method_type_id", 2)),
+            "traderId": trader["id"],
+            "traderAccountId": str(uuid.uuid5(uuid.NAMESPACE_URL, f"trader-account/{trader['id']}")),
+            "maxOrderSize": str(request.get("max_order_size", "0")),
+            "minOrderSize": str(request.get("min_order_size", "0")),
+            "offerAmount": str(request.get("amount", "0")),
+            "ordersOnHold": "",
+            "allowSameAmountOrders": bool(request.get("allow_same_amount_orders", False)),
+            "orderLastProcessingTs": None,
+            "offerCommission": trader["commissionPayout"] if direction == "PAYOUT" else trader["commissionPayin"],
+            "offerCommissionScore": 97,
+            "regionId": trader["regionId"],
+            "issuerId": _int(request, "issuer_id"),
+            "allowAnyBank": True,
+            "status": "OFFER_ACTIVE",
+            "_orders": 0,
+        }
+        self.offers[offer["id"]] = offer
+        return self._offer_response(offer)
+
+    @staticmethod
+    def _offer_response(offer: Dict[str, Any]) -> Dict[str, Any]:
+        return {"getOfferResponse": {"offer": {key: value for key, value in offer.items() if not key.startswith("_")}}}
+
+    def _get_offer(self, payload):
+        return self._offer_response(self._get(self.offers, payload.get("offer_id"), "offer"))
+
+    def _get_offers(self, payload):
+        offers, total = self._list(list(self.offers.values()), payload, ("trader_id", "status"))
+        return {"getOffersResponse": {"offers": offers, "totalCount": total}}
+
+    def _change_offer_status(self, method: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        offer = self._get(self.offers, payload.get("offer_id"), "offer")
+        status = OFFER_TRANSITIONS[method].get(offer["status"])
+        if status is None:
+            raise StubRpcError("FailedPrecondition", "invalid offer status transition")
+        if status == "OFFER_CANCELED" and offer["_orders"]:
+            # Оффер, по которому уже были заказы, не отменяется, а отключается
+            status = "OFFER_INACTIVE"
+        offer["status"] = status
+        return self._offer_response(offer)
+
+    # Заказы
+
+    def _create_order(self, payload):
+        if _int(payload, "company_id") not in COMPANY_IDS:
+            raise StubRpcError("InvalidArgument", "invalid company id")
+        payment_method = self._get(self.payment_methods, _int(payload, "payment_method_id"), "payment method")
+        details = payload.get("payment_details") or {}
+        amount = _int(payload, "amount")
+        order = {
+            "orderId": str(uuid.uuid4()),
+            "amount": str(amount),
+            "status": "PENDING",
+            "createdAt": _now(),
+            "externalOrderId": payload.get("external_order_id", ""),
+            "externalClientId": payload.get("external_client_id", ""),
+            "paymentDetails": {
+                "paymentDetailsValue": details.get("payment_details_value", ""),
+                "paymentDetailsAuxiliaryData": details.get("payment_details_auxiliary_data", ""),
+                "paymentDetailsOwnerName": details.get("payment_details_owner_name", ""),
+                "paymentDirection": payment_method["direction"],
+                "currencyId": payment_method["currencyId"],
+                "paymentMethodId": payment_method["id"],
+                "issuerId": details.get("issuer_id", 0),
+                "issuerName": details.get("issuer_name", ""),
+                "issuerType": "bank",
+            },
+        }
+        response: Dict[str, Any] = {"order": order}
+
+        if not ORDER_MIN_AMOUNT <= amount <= ORDER_MAX_AMOUNT:
+            order["status"] = "DECLINED"
+            order["declineCancelCode"] = "INVALID_AMOUNT"
+            response.update({"declineReasonCode": "INVALID_AMOUNT", "declineDescription": "Invalid order amount"})
+        else:
+            # Последний опубликованный активный оффер того же направления
+            offer = next((offer for offer in reversed(self.offers.values())
+                          if offer["status"] == "OFFER_ACTIVE" and offer["directionType"] == payment_method["direction"]), None)
+            if offer is not None:
+                offer["_orders"] += 1
+                self._order_offers[order["orderId"]] = (offer["id"], time.monotonic() + self.order_processing)
+
+        self.orders[order["orderId"]] = order
+        return {"createOrderResponse": response}
+
+    def _get_order_by_id(self, payload):
+        order_id = payload.get("order_id")
+        order = self._get(self.orders, order_id, "order")
+        matched = self._order_offers.get(order_id)
+        if order["status"] == "PENDING" and matched and time.monotonic() >= matched[1]:
+            order["status"] = "PROCESSING"
+        return {"getOrderByIdResponse": {"order": order}}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "injected_errors": self.injected_errors,
+                "traders": len(self.traders),
+                "offers": len(self.offers),
+                "orders": len(self.orders),
+            }
+
+
+def _call_result(gateway: StubGateway, service_method: str, payload: Dict[str, Any], error: Optional[StubRpcError], verbose: bool) -> Dict[str, Any]:
+    if error is None:
+        try:
+            response = gateway.handle(service_method, payload)
+        except StubRpcError as e:
+            error = e
+    mark("response")
+
+    if error is not None:
+        text = format_grpc_error(error.code, error.message)
+        if verbose:
+            log.error("❌ Ошибка выполнения gRPC вызова:\n   STDERR: %s", text)
+        return {
+            "success": False,
+            "error": text,
+            "stdout": ""
+        }
+
+    raw_stdout = json.dumps(response, indent=2, ensure_ascii=False)
+    mark("decode")
+    return {
+        "success": True,
+        "response": response,
+        "raw_stdout": raw_stdout
+    }
+
+
+class StubGrpcTransport:
+    """gRPC транспорт без сети: вызовы обрабатывает StubGateway в этом же процессе"""
+
+    name = BACKEND_STUB
+
+    def __init__(self, host: str, port: int, insecure: bool, gateway: Optional[StubGateway] = None):
+        self.host = host
+        self.port = port
+        self.gateway = gateway or get_stub_gateway()
+
+    def call(self, service_method: str, payload: Dict[str, Any], verbose: bool = True) -> Dict[str, Any]:
+        if verbose:
+            log.debug("🚀 Выполняем gRPC вызов: %s -> локальный стаб (%s)", service_method, self.name)
+        delay, error = self.gateway.faults_for(service_method)
+        if delay:
+            time.sleep(delay)
+        return _call_result(self.gateway, service_method, payload, error, verbose)
+
+    def supports_server_streaming(self, service_method: str) -> bool:
+        return False
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncStubGrpcTransport(StubGrpcTransport):
+    """Асинхронный вариант StubGrpcTransport: задержка выдерживается в event loop, без потоков"""
+
+    async def call(self, service_method: str, payload: Dict[str, Any], verbose: bool = True) -> Dict[str, Any]:
+        delay, error = self.gateway.faults_for(service_method)
+        if delay:
+            await asyncio.sleep(delay)
+        return _call_result(self.gateway, service_method, payload, error, verbose)
+
+    async def close(self) -> None:
+        pass
+
+
+class _StubHttpHandler(BaseHTTPRequestHandler):
+    """REST часть стаба: POST /api/traders/createTrader"""
+
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело уходят отдельными записями: без TCP_NODELAY тело ждет delayed ACK клиента (~40 мс)
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        # Тесты собирают URL из base_url с завершающим слешем: /api//traders/createTrader
+        path = re.sub(r"/+", "/", urlsplit(self.path).path).rstrip("/")
+        if path != "/api/traders/createTrader":
+            self._send(404, "404 page not found")
+            return
+
+        gateway: StubGateway = self.server.gateway
+        delay, error = gateway.faults_for("createTrader")
+        if delay:
+            time.sleep(delay)
+        if error is not None:
+            self._send(503, error.message)
+            return
+
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            self._send(400, "invalid request body")
+            return
+        try:
+            self._send(200, json.dumps(gateway.create_trader(payload.get("user_id"), payload.get("email"))), "application/json")
+        except ValueError as e:
+            self._send(400, str(e))
+
+    def _send(self, status: int, text: str, content_type: str = "text/plain; charset=utf-8") -> None:
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class StubHttpServer:
+    """HTTP сервер стаба в фоновом потоке; port=0 - свободный порт"""
+
+    def __init__(self, gateway: StubGateway, host: str = "127.0.0.1", port: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), _StubHttpHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.gateway = gateway
+        self.host, self.port = self.httpd.server_address[:2]
+        # Короткий интервал опроса: shutdown() ждет его окончания, а стаб останавливается в конце каждого запуска CLI
+        self._thread = threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, name="stub-http", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+_gateway: Optional[StubGateway] = None
+_server: Optional[StubHttpServer] = None
+_gateway_lock = threading.Lock()
+
+
+def get_stub_gateway() -> StubGateway:
+    """Общий для процесса стаб (создается при первом обращении)"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = StubGateway()
+        return _gateway
+
+
+def start_stub_gateway(fault_specs: Tuple[str, ...] = (), http_port: int = 0) -> StubGateway:
+    """Поднимает REST часть стаба и направляет на нее HTTP конфигурацию. ValueError при неверном fault_specs"""
+    global _server
+    gateway = get_stub_gateway()
+    for spec in fault_specs:
+        method, faults = parse_fault_spec(spec)
+        gateway.set_faults(method, **faults)
+
+    with _gateway_lock:
+        if _server is None:
+            _server = StubHttpServer(gateway, port=http_port)
+            _server.start()
+        DEFAULT_CONFIG.http_host = _server.host
+        DEFAULT_CONFIG.http_port = _server.port
+    return gateway
+
+
+def print_stub_gateway_stats() -> None:
+    if _gateway is None:
+        return
+    stats = _gateway.stats()
+    print(f"🧸 Локальный стаб: {stats['calls']} вызовов, внедрено ошибок {stats['injected_errors']}, "
+          f"трейдеров {stats['traders']}, офферов {stats['offers']}, заказов {stats['orders']}")
+
+
+def stop_stub_gateway() -> None:
+    global _gateway, _server
+    with _gateway_lock:
+        if _server is not None:
+            _server.stop()
+            _server = None
+        _gateway = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="REST часть локального стаба Payment Gateway (gRPC часть работает в процессе тестов: --backend stub)")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес HTTP сервера (по умолчанию: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_CONFIG.http_port, help=f"Порт HTTP сервера (по умолчанию: {DEFAULT_CONFIG.http_port})")
+    parser.add_argument("--stub-fault", action="append", default=[], metavar="[МЕТОД:]ПАРАМЕТРЫ", help="Задержка и ошибки, например createTrader:latency_ms=50,error_rate=0.1")
+    args = parser.parse_args(argv)
+
+    gateway = get_stub_gateway()
+    try:
+        for spec in args.stub_fault:
+            method, faults = parse_fault_spec(spec)
+            gateway.set_faults(method, **faults)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    server = StubHttpServer(gateway, args.host, args.port)
+    print(f"🧸 Стаб REST API слушает http://{server.host}:{server.port}/api/ (Ctrl+C - остановка)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print_stub_gateway_stats()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
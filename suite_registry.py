@@ -0,0 +1,215 @@
+import importlib
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from rpc_timing import test_scope
+
+
+@dataclass
+class Category:
+    """Категория тестов: имя для CLI, заголовки для вывода и пакет с тестерами"""
+    name: str
+    title: str
+    banner: str
+    description: str
+    package: str
+    # Группы ресурсов, которые все тесты категории занимают совместно (см. --workers)
+    shared_groups: Tuple[str, ...] = ()
+
+
+@dataclass
+class TestSpec:
+    """Зарегистрированный запуск тестового метода"""
+    test_id: str
+    category: str
+    name: str
+    method: str
+    tester_class: Optional[type] = None
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    tags: Tuple[str, ...] = ()
+    # Параметры, которые можно переопределить аргументами CLI (--currency-id и т.п.)
+    cli_overrides: Tuple[str, ...] = ()
+    # Группы ресурсов для параллельного запуска: exclusive - тест не пересекается
+    # ни с одним тестом той же группы, shared - может идти параллельно с другими shared
+    exclusive: Tuple[str, ...] = ()
+    shared: Tuple[str, ...] = ()
+
+    def isolation_groups(self) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Возвращает (exclusive, shared) с учетом групп категории"""
+        shared = tuple(dict.fromkeys(self.shared + CATEGORIES[self.category].shared_groups))
+        return self.exclusive, tuple(group for group in shared if group not in self.exclusive)
+
+    def bind(self, tester) -> Callable[..., bool]:
+        return getattr(tester, self.method)
+
+
+# Порядок категорий задает порядок запуска для "all"
+CATEGORIES: Dict[str, Category] = {category.name: category for category in [
+    Category("currencies", "Валюты (💰)", "💰 Запуск тестов валют:", "Тесты валют (💰)", "gwconfig_tests"),
+    Category("regions", "Регионы (🌍)", "🌍 Запуск тестов регионов:", "Тесты регионов (🌍)", "gwconfig_tests"),
+    Category("issuers", "Эмитенты (🏦)", "🏦 Запуск тестов эмитентов:", "Тесты эмитентов (🏦)", "gwconfig_tests"),
+    Category("payment-types", "Типы методов платежей (💳)", "💳 Запуск тестов типов методов платежей:", "Тесты типов методов платежей (💳)", "gwconfig_tests"),
+    Category("payment-methods", "Методы платежей (💸)", "💸 Запуск тестов методов платежей:", "Тесты методов платежей (💸)", "gwconfig_tests", ("payment-methods",)),
+    Category("orders", "Orders API (📦)", "📦 Запуск тестов Orders API:", "Тесты Orders API (📦)", "orders_api_tests", ("offers-global",)),
+    Category("offers", "Offers API (📦)", "📦 Запуск тестов Offers API:", "Тесты Offers API (📦)", "offers_api_tests", ("offers-global",)),
+    Category("traders", "Traders API (🧑‍💼)", "🧑‍💼 Запуск тестов Traders API:", "Тесты Traders API (🧑‍💼)", "traders_api_tests"),
+    Category("create-traders", "Создание трейдеров (📝)", "📝 Запуск тестов создания трейдеров (HTTP REST API):", "Тесты создания трейдеров (📝)", "traders_api_tests", ("traders-global",)),
+    Category("register-traders", "Регистрация трейдеров (🔗)", "🔗 Запуск тестов регистрации трейдеров (HTTP + gRPC):", "Тесты регистрации трейдеров (🔗)", "traders_api_tests", ("traders-global",)),
+]}
+
+# Тег теста, который берет трейдера из trader_pool: по числу таких тестов пул заполняется заранее
+TRADER_FIXTURE = "trader-fixture"
+# Тег теста, который берет оффер из offer_pool: OFFER_FIXTURE + статус, например "offer-fixture:OFFER_ON_HOLD".
+# По числу таких тестов пул готовит офферы каждого статуса заранее
+OFFER_FIXTURE = "offer-fixture:"
+# Группа ресурсов тестов офферов: тест, исключающий ее, не пересекается с фоновой подготовкой офферов
+OFFERS_GROUP = "offers-global"
+
+_tests: List[TestSpec] = []
+_loaded_packages: Set[str] = set()
+_index: Optional[Dict[str, str]] = None
+
+# Регистрация в исходниках тестеров: @register_test("ID", "категория", ...)
+_REGISTER_TEST = re.compile(r'@register_test\(\s*"([^"]+)",\s*"([^"]+)"')
+_PACKAGE_IMPORT = re.compile(r"^from \.(\w+) import", re.MULTILINE)
+
+
+def register_test(test_id: str, category: str, name: str, tags: Tuple[str, ...] = (), cli_overrides: Tuple[str, ...] = (),
+                  exclusive: Tuple[str, ...] = (), shared: Tuple[str, ...] = (), **kwargs) -> Callable:
+    """Декоратор метода тестера: регистрирует запуск теста под ID и категорией.
+
+    Один метод можно зарегистрировать несколько раз с разными аргументами
+    (например, GetCurrency для ID=1 и ID=15). Класс тестера подставляется
+    при создании подкласса BaseGrpcTester, см. register_tester_class.
+    """
+    if category not in CATEGORIES:
+        raise ValueError(f"Неизвестная категория тестов: {category}")
+
+    def decorator(func: Callable) -> Callable:
+        specs = func.__dict__.setdefault("_test_specs", [])
+        # Декораторы применяются снизу вверх - вставляем в начало, чтобы сохранить порядок записи
+        specs.insert(0, TestSpec(test_id, category, name, func.__name__, None, dict(kwargs), tuple(tags), tuple(cli_overrides), tuple(exclusive), tuple(shared)))
+        return func
+
+    return decorator
+
+
+def register_tester_class(tester_class: type) -> None:
+    """Регистрирует тесты, объявленные декоратором register_test в классе тестера"""
+    for attribute in tester_class.__dict__.values():
+        for spec in getattr(attribute, "_test_specs", ()):
+            if any(existing.test_id == spec.test_id and existing.name == spec.name for existing in _tests):
+                raise ValueError(f"Тест {spec.test_id} ({spec.name}) уже зарегистрирован")
+            spec.tester_class = tester_class
+            _tests.append(spec)
+
+
+def load_tests(package: Optional[str] = None) -> None:
+    """Импортирует пакет с тестерами (по умолчанию - все пакеты), чтобы зарегистрировать их тесты"""
+    packages = [package] if package else dict.fromkeys(category.package for category in CATEGORIES.values())
+    for name in packages:
+        if name not in _loaded_packages:
+            importlib.import_module(name)
+            _loaded_packages.add(name)
+
+
+def test_index() -> Dict[str, str]:
+    """ID теста -> категория по исходникам пакетов, без их импорта (импорт всех тестеров - основная
+    часть запуска CLI). Порядок - как у all_test_ids: категории, затем порядок модулей в __init__ пакета"""
+    global _index
+    if _index is None:
+        root = os.path.dirname(os.path.abspath(__file__))
+        found: Dict[str, str] = {}
+        for package in dict.fromkeys(category.package for category in CATEGORIES.values()):
+            with open(os.path.join(root, package, "__init__.py"), encoding="utf-8") as init:
+                modules = _PACKAGE_IMPORT.findall(init.read())
+            for module in modules:
+                with open(os.path.join(root, package, f"{module}.py"), encoding="utf-8") as source:
+                    for test_id, category in _REGISTER_TEST.findall(source.read()):
+                        found.setdefault(test_id, category)
+        order = {category: position for position, category in enumerate(CATEGORIES)}
+        _index = dict(sorted(found.items(), key=lambda item: order[item[1]]))
+    return _index
+
+
+def all_tests() -> List[TestSpec]:
+    """Все тесты в порядке категорий, а внутри категории - в порядке регистрации"""
+    load_tests()
+    return [spec for category in CATEGORIES for spec in _tests if spec.category == category]
+
+
+def tests_for_category(category: str) -> List[TestSpec]:
+    load_tests(CATEGORIES[category].package)
+    return [spec for spec in _tests if spec.category == category]
+
+
+def tests_by_id(test_id: str) -> List[TestSpec]:
+    """Все варианты теста; импортируется только пакет, которому тест принадлежит"""
+    category = test_index().get(test_id)
+    load_tests(CATEGORIES[category].package if category else None)
+    return [spec for spec in _tests if spec.test_id == test_id]
+
+
+def all_test_ids() -> List[str]:
+    """Уникальные ID тестов в порядке запуска (без импорта тестеров)"""
+    return list(test_index())
+
+
+def plan_fixtures(specs: List[TestSpec]) -> None:
+    """Сообщает пулам фикстур, сколько их возьмут выбранные тесты (пулы импортируются, только если нужны)"""
+    traders = sum(TRADER_FIXTURE in spec.tags for spec in specs)
+    if traders:
+        from trader_pool import plan_trader_fixtures
+        plan_trader_fixtures(traders)
+
+    offers = Counter(tag[len(OFFER_FIXTURE):] for spec in specs for tag in spec.tags if tag.startswith(OFFER_FIXTURE))
+    if offers:
+        from offer_pool import plan_offer_fixtures
+        plan_offer_fixtures(dict(offers))
+
+
+def _offer_prefetch_paused(spec: TestSpec):
+    """Тест, исключающий группу офферов, отменяет все активные офферы: на время теста фоновая подготовка
+    офферов приостанавливается. Пока offer_pool не импортирован, фоновой подготовки нет"""
+    offer_pool = sys.modules.get("offer_pool")
+    if offer_pool is None or OFFERS_GROUP not in spec.exclusive:
+        return nullcontext()
+    return offer_pool.prefetch_paused()
+
+
+class TesterPool:
+    """Лениво создает тестеры и переиспользует их в пределах категории"""
+
+    def __init__(self, config):
+        self.config = config
+        self._testers: Dict[Tuple[str, type], Any] = {}
+        # Воркеры планировщика (--workers) запрашивают тестеры параллельно
+        self._lock = threading.Lock()
+
+    def tester_for(self, spec: TestSpec):
+        key = (spec.category, spec.tester_class)
+        with self._lock:
+            tester = self._testers.get(key)
+            if tester is None:
+                tester = spec.tester_class(self.config)
+                self._testers[key] = tester
+        return tester
+
+    @property
+    def testers(self) -> List[Any]:
+        with self._lock:
+            return list(self._testers.values())
+
+    def run(self, spec: TestSpec, overrides: Optional[Dict[str, Any]] = None) -> bool:
+        kwargs = dict(spec.kwargs)
+        if overrides:
+            kwargs.update({name: value for name, value in overrides.items() if name in spec.cli_overrides})
+        # Тайминги вызовов теста попадают в его записи test_results
+        with test_scope(), _offer_prefetch_paused(spec):
+            return bool(spec.bind(self.tester_for(spec))(**kwargs))
@@ -0,0 +1,315 @@
+import argparse
+import sys
+import time
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import DEFAULT_CONFIG
+from base_tester import GrpcTestConfig
+from grpc_transport import BACKEND_AUTO, BACKEND_GRPCIO, BACKEND_GRPCURL, BACKEND_STUB, resolve_backend, grpcio_available, grpcurl_available
+from rpc_timing import TestScope, test_scope
+from result_reporters import ResultReporters, open_reporters
+from http_transport import HTTP_BACKEND_CURL, HTTP_BACKEND_POOL
+from cassette import CASSETTE_RECORD, CASSETTE_REPLAY, CassetteError, use_cassette
+from suite_registry import CATEGORIES, TestSpec, TesterPool, plan_fixtures, tests_by_id, tests_for_category
+from suite_scheduler import ParallelScheduler
+from session_stats import close_session, print_session_stats
+from harness_log import add_logging_arguments, configure_logging
+
+
+def show_help(prog: str = "./run_tests.sh") -> None:
+    print("🚀 Запуск gRPC тестов Payment")
+    print("===============================================")
+    print()
+    print(f"Использование: {prog} [КАТЕГОРИЯ|ID_ТЕСТА ...]")
+    print()
+    print("Доступные категории:")
+    for name, category in CATEGORIES.items():
+        print(f"  {name:<16} - {category.description}")
+    print(f"  {'all':<16} - Все тесты (по умолчанию)")
+    print()
+    print("Вместо категории можно указать ID теста (как в grpc_tester_modular.py --test).")
+    print()
+    print("Примеры:")
+    print(f"  {prog}                    # Запуск всех тестов")
+    print(f"  {prog} all                # Запуск всех тестов")
+    print(f"  {prog} currencies         # Только тесты валют")
+    print(f"  {prog} traders            # Только тесты трейдеров")
+    print(f"  {prog} currency region    # Отдельные тесты по ID")
+    print(f"  {prog} currencies --record  # Записать вызовы в кассету")
+    print(f"  {prog} currencies --replay  # Прогнать по кассете без сервера")
+    print(f"  {prog} offers --stub        # Прогнать на локальном стабе шлюза")
+    print(f"  {prog} all --stub --stub-fault CreateOrder:latency_ms=50,error_rate=0.05")
+    print(f"  {prog} offers --fault '*:latency=normal/50/10' --fault CancelOffer:unavailable_rate=0.2")
+    print(f"  {prog} offers --quiet       # Без вывода шагов тестов, только итоги")
+    print(f"  {prog} compare             # Регрессии задержек последнего прогона против истории")
+    print(f"  {prog} soak --duration 4h  # Смесь операций часами, тревога при росте задержек, ошибок, RSS и FD")
+    print()
+
+
+class SuiteRunner:
+    """Выполняет набор тестов в одном процессе с общими транспортами"""
+
+    def __init__(self, config: GrpcTestConfig, workers: int = 1, reporters: Optional[ResultReporters] = None):
+        self.config = config
+        self.workers = workers
+        self.testers = TesterPool(config)
+        self.reporters = reporters or ResultReporters()
+        self.results: List[Dict[str, Any]] = []
+        # Длительность, вызовы RPC и записи test_results теста (по id спецификации) до записи результата
+        self._measurements: Dict[int, Tuple[float, TestScope]] = {}
+
+    def run_test(self, spec: TestSpec) -> bool:
+        print(f"🧪 Запуск: {spec.name}")
+        print("----------------------------------------")
+
+        started = time.perf_counter()
+        with test_scope() as scope:
+            try:
+                passed = self.testers.run(spec)
+            except Exception as e:
+                traceback.print_exc()
+                print(f"❌ Непредвиденная ошибка в тесте: {e}")
+                passed = False
+        self._measurements[id(spec)] = ((time.perf_counter() - started) * 1000, scope)
+
+        if passed:
+            print(f"✅ {spec.name} - УСПЕШНО")
+            print()
+        else:
+            print(f"❌ {spec.name} - ПРОВАЛЕНО")
+        return passed
+
+    def _record(self, spec: TestSpec, passed: bool) -> bool:
+        duration_ms, scope = self._measurements.pop(id(spec), (0.0, TestScope()))
+        result = {
+            "test": spec.name,
+            "test_id": spec.test_id,
+            "status": "PASS" if passed else "FAIL",
+            "duration_ms": duration_ms,
+            "timings": scope.calls,
+        }
+        self.results.append(result)
+        if self.reporters:
+            # Вызовы уже есть в timings теста - в записях test_results они не повторяются
+            details = [{key: value for key, value in entry.items() if key != "timings"} for entry in scope.results]
+            self.reporters.test_finished({**result, "category": spec.category, "details": details})
+        return passed
+
+    def run_group(self, title: str, sections: List[Tuple[Optional[str], List[TestSpec]]]) -> bool:
+        """Выполняет группу тестов и печатает сводку по ней"""
+        first_result = len(self.results)
+        success = True
+
+        if self.workers > 1:
+            # Баннер секции печатается перед выводом ее первого теста
+            banners = {}
+            for banner, tests in sections:
+                if tests:
+                    banners[id(tests[0])] = banner
+            tests = [spec for _, section_tests in sections for spec in section_tests]
+
+            for spec, output, passed in ParallelScheduler(self.workers).run(tests, self.run_test):
+                banner = banners.get(id(spec))
+                if banner:
+                    print(banner)
+                    print()
+                sys.stdout.write(output)
+                success &= self._record(spec, passed)
+            print()
+        else:
+            for banner, tests in sections:
+                if banner:
+                    print(banner)
+                    print()
+                for spec in tests:
+                    success &= self._record(spec, self.run_test(spec))
+                print()
+
+        show_category_summary(title, self.results[first_result:])
+        return success
+
+
+def show_category_summary(category_name: str, results: List[Dict[str, Any]]) -> None:
+    total = len(results)
+    if total <= 1:
+        return
+
+    passed = sum(1 for result in results if result["status"] == "PASS")
+    failed = total - passed
+
+    print()
+    print("=" * 80)
+    print(f"🎯 СВОДКА ПО КАТЕГОРИИ: {category_name}")
+    print("=" * 80)
+    print(f"📊 Всего тестов: {total}")
+    print(f"✅ Прошло: {passed}")
+    print(f"❌ Провалено: {failed}")
+    print(f"🎯 Процент успеха: {passed * 100 // total}%")
+    print()
+    print("📋 Детальные результаты:")
+    for result in results:
+        status_icon = "✅" if result["status"] == "PASS" else "❌"
+        print(f"   {status_icon} {result['test']} - {result['status']}")
+    print("=" * 80)
+
+
+def resolve_targets(targets: List[str]) -> List[Tuple[str, List[Tuple[Optional[str], List[TestSpec]]]]]:
+    """Преобразует категории и ID тестов в группы для запуска"""
+    groups = []
+    selected_tests: List[TestSpec] = []
+    for target in targets:
+        if target == "all":
+            groups.append(("ВСЕ ТЕСТЫ", [(category.banner, tests_for_category(name)) for name, category in CATEGORIES.items()]))
+        elif target in CATEGORIES:
+            category = CATEGORIES[target]
+            groups.append((category.title, [(category.banner, tests_for_category(target))]))
+        elif tests_by_id(target):
+            selected_tests.extend(tests_by_id(target))
+        else:
+            raise KeyError(target)
+
+    if selected_tests:
+        groups.append(("Выбранные тесты", [(None, selected_tests)]))
+    return groups
+
+
+def check_dependencies(backend: str) -> bool:
+    if backend == BACKEND_STUB:
+        return True
+    if backend == BACKEND_GRPCURL:
+        if not grpcurl_available():
+            print("❌ grpcurl не найден. Установите его или установите grpcio и grpcio-reflection")
+            return False
+    elif not grpcio_available():
+        print("❌ grpcio не найден. Установите grpcio, grpcio-reflection и protobuf или используйте --backend grpcurl")
+        return False
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Запуск наборов gRPC тестов Payment Gateway в одном процессе", add_help=False)
+    parser.add_argument("targets", nargs="*", default=["all"], help="Категории или ID тестов (по умолчанию: all)")
+    parser.add_argument("-h", "--help", action="store_true", help="Показать справку")
+    parser.add_argument("--host", default=DEFAULT_CONFIG.grpc_host, help=f"Хост сервера (по умолчанию: {DEFAULT_CONFIG.grpc_host})")
+    parser.add_argument("--port", type=int, default=DEFAULT_CONFIG.grpc_port, help=f"Порт сервера (по умолчанию: {DEFAULT_CONFIG.grpc_port})")
+    parser.add_argument("--backend", choices=[BACKEND_AUTO, BACKEND_GRPCIO, BACKEND_GRPCURL, BACKEND_STUB], default=DEFAULT_CONFIG.grpc_backend, help=f"gRPC транспорт (по умолчанию: {DEFAULT_CONFIG.grpc_backend})")
+    parser.add_argument("--http-backend", choices=[HTTP_BACKEND_POOL, HTTP_BACKEND_CURL], default=DEFAULT_CONFIG.http_backend, help=f"HTTP транспорт (по умолчанию: {DEFAULT_CONFIG.http_backend})")
+    parser.add_argument("--workers", type=int, default=1, help="Число потоков для параллельного запуска тестов (по умолчанию: 1)")
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", nargs="?", const=DEFAULT_CONFIG.cassette_path, metavar="PATH", help=f"Записать все вызовы в кассету (по умолчанию: {DEFAULT_CONFIG.cassette_path})")
+    cassette.add_argument("--replay", nargs="?", const=DEFAULT_CONFIG.cassette_path, metavar="PATH", help="Отвечать на вызовы из кассеты, без сети (только с --workers 1)")
+    parser.add_argument("--stub", action="store_true", help="Запустить тесты на локальном стабе шлюза (gRPC в процессе, REST на свободном порту)")
+    parser.add_argument("--stub-fault", action="append", default=[], metavar="[МЕТОД:]ПАРАМЕТРЫ", help="Задержка и ошибки стаба, например CreateOrder:latency_ms=50,jitter_ms=10,error_rate=0.1,error_code=Internal")
+    parser.add_argument("--fault-proxy", action="store_true", default=DEFAULT_CONFIG.fault_proxy_enabled, help="Пустить gRPC и HTTP через локальный прокси сбоев (правило по умолчанию - fault_proxy_* в config.py)")
+    parser.add_argument("--fault", action="append", default=[], metavar="[МЕТОД:]ПРАВИЛО", help="Правило прокси сбоев (включает --fault-proxy), например CreateOrder:latency=exp/30,reset_rate=0.01,unavailable_rate=0.05,bandwidth_kbps=256")
+    parser.add_argument("--history", default=DEFAULT_CONFIG.results_history_path, metavar="PATH", help=f"Файл истории прогонов для compare (по умолчанию: {DEFAULT_CONFIG.results_history_path})")
+    parser.add_argument("--no-history", dest="save_history", action="store_false", default=DEFAULT_CONFIG.results_history_enabled, help="Не записывать прогон в историю")
+    parser.add_argument("--jsonl", metavar="PATH", help="Писать результаты тестов в JSON Lines по мере завершения")
+    parser.add_argument("--junit", metavar="PATH", help="Записать отчет JUnit XML (для CI)")
+    add_logging_arguments(parser)
+    parser.add_argument("--prog", default="./run_tests.sh", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    configure_logging(args.log_level, args.log_format)
+
+    if args.help or args.targets[:1] == ["help"]:
+        show_help(args.prog)
+        return 0
+
+    # Кассета отвечает на одинаковые запросы в порядке записи; параллельные тесты перемешивают этот порядок
+    if args.replay and args.workers > 1:
+        print("❌ --replay нельзя сочетать с --workers больше 1: ответы из кассеты сопоставляются в порядке записи, "
+              "параллельные тесты его перемешивают. Воспроизводите кассету с --workers 1")
+        return 1
+
+    try:
+        groups = resolve_targets(args.targets)
+    except KeyError as e:
+        print(f"❌ Неизвестная категория: {e.args[0]}")
+        print()
+        show_help(args.prog)
+        return 1
+
+    DEFAULT_CONFIG.http_backend = args.http_backend
+    backend = resolve_backend(BACKEND_STUB if args.stub else args.backend)
+
+    # Стаб, прокси сбоев и история импортируются, только если нужны: запуск одного теста должен быть быстрым
+    if args.stub:
+        from stub_gateway import start_stub_gateway
+        try:
+            start_stub_gateway(tuple(args.stub_fault))
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+
+    host, port = args.host, args.port
+    if args.fault_proxy or args.fault:
+        from fault_proxy import start_fault_proxies
+        try:
+            host, port = start_fault_proxies(args.host, args.port, args.fault)
+        except (ValueError, OSError) as e:
+            print(f"❌ {e}")
+            return 1
+
+    print("🚀 Запуск gRPC тестов Payment Gateway")
+    print("===============================================")
+    print(f"📂 Категория: {' '.join(args.targets)}")
+    print("⚙️  Конфигурация: используется config.py")
+    print(f"🌐 gRPC хост: {args.host}")
+    print(f"🔌 gRPC порт: {args.port}")
+    print(f"🌍 HTTP хост: {DEFAULT_CONFIG.http_host}")
+    print(f"🔌 HTTP порт: {DEFAULT_CONFIG.http_port}")
+    print(f"🚚 Транспорт: gRPC {backend}, HTTP {args.http_backend}")
+    if args.workers > 1:
+        print(f"⚡ Параллельный запуск: {args.workers} потоков")
+    if (host, port) != (args.host, args.port):
+        print(f"🌩️  Прокси сбоев: gRPC {host}:{port}, HTTP {DEFAULT_CONFIG.http_host}:{DEFAULT_CONFIG.http_port}")
+
+    if args.record or args.replay:
+        try:
+            cassette = use_cassette(args.record or args.replay, CASSETTE_RECORD if args.record else CASSETTE_REPLAY)
+        except CassetteError as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"📼 Кассета: {'запись в' if args.record else 'воспроизведение из'} {cassette.path}")
+    print()
+
+    # При воспроизведении из кассеты grpcurl и grpcio не нужны
+    if not args.replay and not check_dependencies(backend):
+        return 1
+
+    print("✅ Все зависимости найдены")
+    print()
+
+    try:
+        reporters = open_reporters(args.jsonl, args.junit)
+    except OSError as e:
+        print(f"❌ Не удалось открыть файл отчета: {e}")
+        return 1
+    reporters.start_run({"target": f"{args.host}:{args.port}", "backend": backend, "targets": " ".join(args.targets)})
+
+    plan_fixtures([spec for _, sections in groups for _, specs in sections for spec in specs])
+    runner = SuiteRunner(GrpcTestConfig(host=host, port=port, insecure=DEFAULT_CONFIG.grpc_insecure, backend=backend), workers=max(1, args.workers), reporters=reporters)
+    success = True
+    try:
+        for title, sections in groups:
+            success &= runner.run_group(title, sections)
+        passed = sum(1 for result in runner.results if result["status"] == "PASS")
+        reporters.finish({"total": len(runner.results), "passed": passed, "failed": len(runner.results) - passed})
+        # Задержки из кассеты ничего не говорят о сервере; прогоны через прокси сбоев - отдельная базовая линия
+        if args.save_history and not args.replay:
+            from results_history import record_run
+            history_backend = f"{backend}+fault-proxy" if (host, port) != (args.host, args.port) else backend
+            run_id = record_run(runner.results, f"{args.host}:{args.port}", history_backend, " ".join(args.targets), args.history)
+            print(f"🗄️  Прогон #{run_id} записан в историю {args.history}")
+        print_session_stats()
+    finally:
+        reporters.close()
+        close_session()
+
+    print(f"🎉 Тесты категории '{' '.join(args.targets)}' завершены!")
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
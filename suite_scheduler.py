@@ -0,0 +1,128 @@
+import io
+import sys
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from suite_registry import TestSpec
+
+
+class ResourceGroups:
+    """Учет занятых групп ресурсов: exclusive исключает любые пересечения, shared - только с exclusive"""
+
+    def __init__(self):
+        self._exclusive: Dict[str, int] = {}
+        self._shared: Dict[str, int] = {}
+
+    def can_acquire(self, spec: TestSpec) -> bool:
+        exclusive, shared = spec.isolation_groups()
+        for group in exclusive:
+            if self._exclusive.get(group) or self._shared.get(group):
+                return False
+        return not any(self._exclusive.get(group) for group in shared)
+
+    def acquire(self, spec: TestSpec) -> None:
+        exclusive, shared = spec.isolation_groups()
+        for group in exclusive:
+            self._exclusive[group] = self._exclusive.get(group, 0) + 1
+        for group in shared:
+            self._shared[group] = self._shared.get(group, 0) + 1
+
+    def release(self, spec: TestSpec) -> None:
+        exclusive, shared = spec.isolation_groups()
+        for group in exclusive:
+            self._exclusive[group] -= 1
+        for group in shared:
+            self._shared[group] -= 1
+
+
+class ThreadLocalStdout(io.TextIOBase):
+    """Подменяет sys.stdout: вывод потоков с активным буфером пишется в буфер, остальной - как обычно"""
+
+    def __init__(self, target):
+        self.target = target
+        self._local = threading.local()
+
+    def start_capture(self) -> None:
+        self._local.buffer = io.StringIO()
+
+    def stop_capture(self) -> str:
+        buffer = self._local.buffer
+        self._local.buffer = None
+        return buffer.getvalue()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is not None:
+            return buffer.write(text)
+        return self.target.write(text)
+
+    def flush(self) -> None:
+        self.target.flush()
+
+
+class ParallelScheduler:
+    """Выполняет тесты на пуле потоков с учетом групп изоляции.
+
+    Тест запускается, как только освобождается поток и его группы совместимы
+    с уже выполняющимися тестами; среди готовых к запуску выбирается самый
+    ранний по порядку. Результаты (вывод теста и статус) отдаются строго в
+    исходном порядке, поэтому итоговая сводка детерминирована.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+
+    def run(self, tests: List[TestSpec], execute: Callable[[TestSpec], bool]) -> Iterator[Tuple[TestSpec, str, bool]]:
+        stdout = ThreadLocalStdout(sys.stdout)
+        groups = ResourceGroups()
+        condition = threading.Condition()
+        pending = list(range(len(tests)))
+        results: List[Optional[Tuple[str, bool]]] = [None] * len(tests)
+
+        def next_runnable() -> Optional[int]:
+            for position, index in enumerate(pending):
+                if groups.can_acquire(tests[index]):
+                    return pending.pop(position)
+            return None
+
+        def worker() -> None:
+            while True:
+                with condition:
+                    index = next_runnable()
+                    while index is None and pending:
+                        condition.wait()
+                        index = next_runnable()
+                    if index is None:
+                        return
+                    groups.acquire(tests[index])
+
+                stdout.start_capture()
+                try:
+                    passed = execute(tests[index])
+                except BaseException as e:
+                    print(f"❌ Непредвиденная ошибка в тесте: {e}")
+                    passed = False
+                finally:
+                    output = stdout.stop_capture()
+
+                with condition:
+                    groups.release(tests[index])
+                    results[index] = (output, passed)
+                    condition.notify_all()
+
+        original_stdout = sys.stdout
+        sys.stdout = stdout
+        threads = [threading.Thread(target=worker, name=f"suite-worker-{n}", daemon=True) for n in range(self.workers)]
+        try:
+            for thread in threads:
+                thread.start()
+
+            for index, spec in enumerate(tests):
+                with condition:
+                    while results[index] is None:
+                        condition.wait()
+                    output, passed = results[index]
+                    results[index] = ("", passed)
+                yield spec, output, passed
+        finally:
+            sys.stdout = original_stdout
@@ -0,0 +1,220 @@
+import random
+import string
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import DEFAULT_CONFIG
+
+
+@dataclass
+class TraderFixture:
+    """Трейдер, заранее созданный через HTTP /traders/createTrader"""
+    user_id: str
+    email: str
+    result: Dict[str, Any]
+    created_at: float
+
+
+def random_trader_email() -> str:
+    """Случайный email в формате [random_8_symbols]@test.com"""
+    random_part = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+    return f"{random_part}@test.com"
+
+
+class TraderFixturePool:
+    """Пул заранее созданных трейдеров для тестов и нагрузки на RegisterTrader.
+
+    fill() создает трейдеров параллельно (concurrency HTTP запросов через
+    общий пул соединений). После start() фоновый поток дозаполняет пул,
+    как только число свободных трейдеров опускается ниже low_watermark, но
+    не больше, чем еще понадобится: demand - сколько трейдеров возьмут
+    выбранные тесты (None - неизвестно, заранее ничего не создается).
+    acquire() выдает трейдера и запоминает, кем он использован; если пул
+    пуст и никто его не заполняет, трейдер создается в вызывающем потоке.
+    """
+
+    def __init__(self, tester, size: Optional[int] = None, low_watermark: Optional[int] = None, concurrency: Optional[int] = None,
+                 demand: Optional[int] = None):
+        self.tester = tester
+        self.url = f"{tester.http_config.base_url}/traders/createTrader"
+        self.size = DEFAULT_CONFIG.trader_pool_size if size is None else size
+        self.low_watermark = DEFAULT_CONFIG.trader_pool_low_watermark if low_watermark is None else low_watermark
+        self.concurrency = max(1, DEFAULT_CONFIG.trader_pool_concurrency if concurrency is None else concurrency)
+
+        self._available = deque()
+        self._condition = threading.Condition()
+        self._refiller: Optional[threading.Thread] = None
+        self._closed = False
+        self.demand = demand
+        # Трейдеры, которые сейчас создает fill()
+        self._pending = 0
+
+        self.consumed: List[Tuple[TraderFixture, str]] = []
+        self.created = 0
+        self.failed = 0
+        self.last_error: Optional[str] = None
+
+    def _create(self) -> Optional[TraderFixture]:
+        # После close() транспорты и кассета уже закрываются - новых трейдеров не создаем
+        if self._closed:
+            return None
+        user_id = str(uuid.uuid4())
+        email = random_trader_email()
+        result = self.tester.run_curl("POST", self.url, {"user_id": user_id, "email": email}, verbose=False)
+        with self._condition:
+            if not result["success"]:
+                self.failed += 1
+                self.last_error = result["error"]
+                return None
+            self.created += 1
+        return TraderFixture(user_id, email, result, time.time())
+
+    def _wanted(self) -> int:
+        """Сколько трейдеров дозаполнить сейчас (вызывается под _condition)"""
+        if self.demand is None or self._closed:
+            return 0
+        return max(0, min(self.size, self.demand) - len(self._available) - self._pending)
+
+    def fill(self, count: Optional[int] = None) -> int:
+        """Создает count трейдеров (по умолчанию - сколько еще понадобится, не больше size) параллельно.
+        Возвращает число созданных"""
+        with self._condition:
+            if count is None:
+                count = self._wanted()
+            if count <= 0 or self._closed:
+                return 0
+            self._pending += count
+
+        added = done = 0
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, count), thread_name_prefix="trader-pool") as executor:
+                for fixture in executor.map(lambda _: self._create(), range(count)):
+                    with self._condition:
+                        done += 1
+                        self._pending -= 1
+                        if fixture is not None:
+                            self._available.append(fixture)
+                            added += 1
+                        self._condition.notify_all()
+        finally:
+            with self._condition:
+                self._pending -= count - done
+                self._condition.notify_all()
+        return added
+
+    def start(self) -> "TraderFixturePool":
+        """Запускает фоновое дозаполнение пула"""
+        with self._condition:
+            if self._refiller is None:
+                self._refiller = threading.Thread(target=self._refill_loop, name="trader-pool-refill", daemon=True)
+                self._refiller.start()
+        return self
+
+    def _refill_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and (len(self._available) >= self.low_watermark or not self._wanted()):
+                    self._condition.wait()
+                if self._closed:
+                    return
+            # Если сервер не создает трейдеров, не крутим цикл вхолостую
+            if not self.fill():
+                with self._condition:
+                    self._condition.wait(1)
+
+    def acquire(self, consumer: str = "", block: bool = True) -> Optional[TraderFixture]:
+        """Выдает свободного трейдера; None, если создать трейдера не удалось. С block=False не ждет
+        и не создает трейдера (HTTP вызов в вызывающем потоке): пустой пул сразу дает None"""
+        with self._condition:
+            if self.demand:
+                self.demand -= 1
+            # Трейдер уже создается в фоне - ждем его, а не создаем лишнего
+            while block and not self._available and self._pending and not self._closed:
+                self._condition.wait()
+            fixture = self._available.popleft() if self._available else None
+            if len(self._available) < self.low_watermark:
+                self._condition.notify_all()
+        if fixture is None and block:
+            fixture = self._create()
+        if fixture is not None:
+            with self._condition:
+                self.consumed.append((fixture, consumer))
+        return fixture
+
+    @property
+    def available(self) -> int:
+        with self._condition:
+            return len(self._available)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "available": len(self._available),
+                "consumed": len(self.consumed),
+                "created": self.created,
+                "failed": self.failed,
+            }
+
+    def close(self) -> None:
+        """Останавливает дозаполнение и дожидается фонового потока (уже начатые createTrader завершаются)"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            refiller = self._refiller
+        if refiller is not None and refiller is not threading.current_thread():
+            refiller.join()
+
+
+_pools: Dict[str, TraderFixturePool] = {}
+_pools_lock = threading.Lock()
+# Сколько трейдеров возьмут выбранные тесты (см. plan_trader_fixtures); None - неизвестно
+_planned_demand: Optional[int] = None
+
+
+def plan_trader_fixtures(count: int) -> None:
+    """Раннер сообщает, сколько трейдеров понадобится: пул заполняется заранее, но не больше этого"""
+    global _planned_demand
+    with _pools_lock:
+        _planned_demand = count
+        for pool in _pools.values():
+            with pool._condition:
+                pool.demand = count
+                pool._condition.notify_all()
+
+
+def get_trader_pool(tester) -> TraderFixturePool:
+    """Общий для HTTP адреса пул трейдеров. Если раннер запланировал трейдеров, при первом обращении
+    запускается фоновое заполнение; иначе трейдеры создаются по одному при выдаче"""
+    key = tester.http_config.base_url
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = TraderFixturePool(tester, demand=_planned_demand)
+            if _planned_demand:
+                pool.start()
+            _pools[key] = pool
+    return pool
+
+
+def print_trader_pool_stats() -> None:
+    for base_url, pool in list(_pools.items()):
+        stats = pool.stats()
+        if stats["consumed"]:
+            print(f"👥 Пул трейдеров {base_url}: создано {stats['created']}, использовано {stats['consumed']}, "
+                  f"свободно {stats['available']}, ошибок создания {stats['failed']}")
+
+
+def close_trader_pools() -> None:
+    """Останавливает пулы до закрытия транспортов и кассеты (см. session_stats.SESSION_RESOURCES)"""
+    global _planned_demand
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+        _planned_demand = None
+    for pool in pools:
+        pool.close()
@@ -2,6 +2,11 @@ import uuid
 import random
 import string
 from base_tester import BaseGrpcTester, GrpcTestConfig
+from suite_registry import register_test
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
 
 
 class CreateTraderTester(BaseGrpcTester):
@@ -16,10 +21,11 @@ class CreateTraderTester(BaseGrpcTester):
         random_part = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
         return f"{random_part}@test.com"
     
+    @register_test("create_trader_default", "create-traders", "Create Trader Default", tags=("http", "write"))
     def test_create_trader_default(self) -> bool:
         """Тест создания трейдера с валидными данными"""
-        print(f"\n🧪 Тестируем создание трейдера")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем создание трейдера")
+        log.info("=" * 50)
         
         tests_passed = True
         
@@ -27,9 +33,9 @@ class CreateTraderTester(BaseGrpcTester):
         user_id = str(uuid.uuid4())
         email = self.generate_random_email()
         
-        print(f"📧 Генерируем трейдера:")
-        print(f"   user_id: {user_id}")
-        print(f"   email: {email}")
+        log.info("📧 Генерируем трейдера:")
+        log.info("   user_id: %s", user_id)
+        log.info("   email: %s", email)
         
         # Подготавливаем payload
         payload = {
@@ -43,8 +49,8 @@ class CreateTraderTester(BaseGrpcTester):
         
         if result["success"]:
             response = result["response"]
-            print(f"✅ Запрос выполнен успешно")
-            print(f"📋 Ответ: {response}")
+            log.info("✅ Запрос выполнен успешно")
+            log.info("📋 Ответ: %s", response)
             
             # Проверяем структуру ответа
             tests_passed &= self.assert_has_property(response, "status", "Ответ содержит поле 'status'")
@@ -62,9 +68,9 @@ class CreateTraderTester(BaseGrpcTester):
                 # Дополнительно можем проверить, что вернулся тот же UUID, что мы отправили
                 tests_passed &= self.assert_equal(trader_id, user_id, "trader_id соответствует отправленному user_id")
         else:
-            print(f"❌ Ошибка выполнения запроса: {result['error']}")
+            log.error("❌ Ошибка выполнения запроса: %s", result['error'])
             if 'raw_stdout' in result:
-                print(f"📋 Сырой ответ: {result['raw_stdout']}")
+                log.info("📋 Сырой ответ: %s", result['raw_stdout'])
             tests_passed = False
         
         self.test_results.append({
@@ -75,10 +81,11 @@ class CreateTraderTester(BaseGrpcTester):
         
         return tests_passed
     
+    @register_test("create_trader_duplicate_uuid", "create-traders", "Create Trader Duplicate UUID", tags=("http", "write"))
     def test_create_trader_duplicate_uuid(self) -> bool:
         """Тест создания двух трейдеров с одинаковым UUID, но разными email"""
-        print(f"\n🧪 Тестируем создание трейдеров с дублирующимся UUID")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем создание трейдеров с дублирующимся UUID")
+        log.info("=" * 50)
         
         tests_passed = True
         
@@ -87,9 +94,9 @@ class CreateTraderTester(BaseGrpcTester):
         email1 = self.generate_random_email()
         email2 = self.generate_random_email()
         
-        print(f"📧 Создаем первого трейдера:")
-        print(f"   user_id: {user_id}")
-        print(f"   email: {email1}")
+        log.info("📧 Создаем первого трейдера:")
+        log.info("   user_id: %s", user_id)
+        log.info("   email: %s", email1)
         
         # Создаем первого трейдера
         payload1 = {
@@ -102,12 +109,12 @@ class CreateTraderTester(BaseGrpcTester):
         
         if result1["success"]:
             response1 = result1["response"]
-            print(f"✅ Первый трейдер создан успешно: {response1}")
+            log.info("✅ Первый трейдер создан успешно: %s", response1)
             
             # Теперь пытаемся создать второго трейдера с тем же UUID
-            print(f"\n📧 Создаем второго трейдера с тем же UUID:")
-            print(f"   user_id: {user_id}")
-            print(f"   email: {email2}")
+            log.info("\n📧 Создаем второго трейдера с тем же UUID:")
+            log.info("   user_id: %s", user_id)
+            log.info("   email: %s", email2)
             
             payload2 = {
                 "user_id": user_id,
@@ -118,7 +125,7 @@ class CreateTraderTester(BaseGrpcTester):
             
             if result2["success"]:
                 response2 = result2["response"]
-                print(f"❌ Неожиданно: второй трейдер создан с дублирующимся UUID: {response2}")
+                log.error("❌ Неожиданно: второй трейдер создан с дублирующимся UUID: %s", response2)
                 tests_passed = False
             else:
                 # Ожидаем ошибку с текстом "trader already exists: user_id [uuid]"
@@ -126,13 +133,13 @@ class CreateTraderTester(BaseGrpcTester):
                 expected_error = f"trader already exists: user_id {user_id}"
                 
                 if expected_error in error_message:
-                    print(f"✅ Получена ожидаемая ошибка: {error_message}")
+                    log.info("✅ Получена ожидаемая ошибка: %s", error_message)
                 else:
-                    print(f"❌ Получена неожиданная ошибка: {error_message}")
-                    print(f"   Ожидалось: {expected_error}")
+                    log.error("❌ Получена неожиданная ошибка: %s", error_message)
+                    log.error("   Ожидалось: %s", expected_error)
                     tests_passed = False
         else:
-            print(f"❌ Ошибка создания первого трейдера: {result1['error']}")
+            log.error("❌ Ошибка создания первого трейдера: %s", result1['error'])
             tests_passed = False
         
         self.test_results.append({
@@ -143,10 +150,11 @@ class CreateTraderTester(BaseGrpcTester):
         
         return tests_passed
     
+    @register_test("create_trader_duplicate_email", "create-traders", "Create Trader Duplicate Email", tags=("http", "write"))
     def test_create_trader_duplicate_email(self) -> bool:
         """Тест создания двух трейдеров с одинаковым email, но разными UUID"""
-        print(f"\n🧪 Тестируем создание трейдеров с дублирующимся email")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем создание трейдеров с дублирующимся email")
+        log.info("=" * 50)
         
         tests_passed = True
         
@@ -155,9 +163,9 @@ class CreateTraderTester(BaseGrpcTester):
         user_id2 = str(uuid.uuid4())
         email = self.generate_random_email()
         
-        print(f"📧 Создаем первого трейдера:")
-        print(f"   user_id: {user_id1}")
-        print(f"   email: {email}")
+        log.info("📧 Создаем первого трейдера:")
+        log.info("   user_id: %s", user_id1)
+        log.info("   email: %s", email)
         
         # Создаем первого трейдера
         payload1 = {
@@ -170,12 +178,12 @@ class CreateTraderTester(BaseGrpcTester):
         
         if result1["success"]:
             response1 = result1["response"]
-            print(f"✅ Первый трейдер создан успешно: {response1}")
+            log.info("✅ Первый трейдер создан успешно: %s", response1)
             
             # Теперь пытаемся создать второго трейдера с тем же email
-            print(f"\n📧 Создаем второго трейдера с тем же email:")
-            print(f"   user_id: {user_id2}")
-            print(f"   email: {email}")
+            log.info("\n📧 Создаем второго трейдера с тем же email:")
+            log.info("   user_id: %s", user_id2)
+            log.info("   email: %s", email)
             
             payload2 = {
                 "user_id": user_id2,
@@ -186,7 +194,7 @@ class CreateTraderTester(BaseGrpcTester):
             
             if result2["success"]:
                 response2 = result2["response"]
-                print(f"❌ Неожиданно: второй трейдер создан с дублирующимся email: {response2}")
+                log.error("❌ Неожиданно: второй трейдер создан с дублирующимся email: %s", response2)
                 tests_passed = False
             else:
                 # Ожидаем ошибку с текстом "email already exists: email [email]"
@@ -194,13 +202,13 @@ class CreateTraderTester(BaseGrpcTester):
                 expected_error = f"email already exists: email {email}"
                 
                 if expected_error in error_message:
-                    print(f"✅ Получена ожидаемая ошибка: {error_message}")
+                    log.info("✅ Получена ожидаемая ошибка: %s", error_message)
                 else:
-                    print(f"❌ Получена неожиданная ошибка: {error_message}")
-                    print(f"   Ожидалось: {expected_error}")
+                    log.error("❌ Получена неожиданная ошибка: %s", error_message)
+                    log.error("   Ожидалось: %s", expected_error)
                     tests_passed = False
         else:
-            print(f"❌ Ошибка создания первого трейдера: {result1['error']}")
+            log.error("❌ Ошибка создания первого трейдера: %s", result1['error'])
             tests_passed = False
         
         self.test_results.append({
@@ -211,19 +219,20 @@ class CreateTraderTester(BaseGrpcTester):
         
         return tests_passed
     
+    @register_test("create_trader_invalid_uuid", "create-traders", "Create Trader Invalid UUID", tags=("http", "write"))
     def test_create_trader_invalid_uuid(self) -> bool:
         """Тест создания трейдера с невалидным UUID"""
-        print(f"\n🧪 Тестируем создание трейдера с невалидным UUID")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем создание трейдера с невалидным UUID")
+        log.info("=" * 50)
         
         tests_passed = True
         
         invalid_user_id = "7d9c2e4d-2a6f"  # Невалидный UUID (неполный)
         email = self.generate_random_email()
         
-        print(f"📧 Пытаемся создать трейдера с невалидным UUID:")
-        print(f"   user_id: {invalid_user_id}")
-        print(f"   email: {email}")
+        log.info("📧 Пытаемся создать трейдера с невалидным UUID:")
+        log.info("   user_id: %s", invalid_user_id)
+        log.info("   email: %s", email)
         
         payload = {
             "user_id": invalid_user_id,
@@ -235,7 +244,7 @@ class CreateTraderTester(BaseGrpcTester):
         
         if result["success"]:
             response = result["response"]
-            print(f"❌ Неожиданно: трейдер создан с невалидным UUID: {response}")
+            log.error("❌ Неожиданно: трейдер создан с невалидным UUID: %s", response)
             tests_passed = False
         else:
             # Ожидаем ошибку с текстом "user_id must be a valid UUID"
@@ -243,10 +252,10 @@ class CreateTraderTester(BaseGrpcTester):
             expected_error = "user_id must be a valid UUID"
             
             if expected_error in error_message:
-                print(f"✅ Получена ожидаемая ошибка: {error_message}")
+                log.info("✅ Получена ожидаемая ошибка: %s", error_message)
             else:
-                print(f"❌ Получена неожиданная ошибка: {error_message}")
-                print(f"   Ожидалось: {expected_error}")
+                log.error("❌ Получена неожиданная ошибка: %s", error_message)
+                log.error("   Ожидалось: %s", expected_error)
                 tests_passed = False
         
         self.test_results.append({
@@ -257,19 +266,20 @@ class CreateTraderTester(BaseGrpcTester):
         
         return tests_passed
     
+    @register_test("create_trader_empty_email", "create-traders", "Create Trader Empty Email", tags=("http", "write"))
     def test_create_trader_empty_email(self) -> bool:
         """Тест создания трейдера с пустым email"""
-        print(f"\n🧪 Тестируем создание трейдера с пустым email")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем создание трейдера с пустым email")
+        log.info("=" * 50)
         
         tests_passed = True
         
         user_id = str(uuid.uuid4())
         empty_email = ""  # Пустая строка
         
-        print(f"📧 Пытаемся создать трейдера с пустым email:")
-        print(f"   user_id: {user_id}")
-        print(f"   email: '{empty_email}'")
+        log.info("📧 Пытаемся создать трейдера с пустым email:")
+        log.info("   user_id: %s", user_id)
+        log.info("   email: '%s'", empty_email)
         
         payload = {
             "user_id": user_id,
@@ -281,7 +291,7 @@ class CreateTraderTester(BaseGrpcTester):
         
         if result["success"]:
             response = result["response"]
-            print(f"❌ Неожиданно: трейдер создан с пустым email: {response}")
+            log.error("❌ Неожиданно: трейдер создан с пустым email: %s", response)
             tests_passed = False
         else:
             # Ожидаем ошибку с текстом "email must be at least 1 character long"
@@ -289,10 +299,10 @@ class CreateTraderTester(BaseGrpcTester):
             expected_error = "email must be at least 1 character long"
             
             if expected_error in error_message:
-                print(f"✅ Получена ожидаемая ошибка: {error_message}")
+                log.info("✅ Получена ожидаемая ошибка: %s", error_message)
             else:
-                print(f"❌ Получена неожиданная ошибка: {error_message}")
-                print(f"   Ожидалось: {expected_error}")
+                log.error("❌ Получена неожиданная ошибка: %s", error_message)
+                log.error("   Ожидалось: %s", expected_error)
                 tests_passed = False
         
         self.test_results.append({
@@ -303,10 +313,11 @@ class CreateTraderTester(BaseGrpcTester):
         
         return tests_passed
     
+    @register_test("create_trader_long_email", "create-traders", "Create Trader Long Email", tags=("http", "write"))
     def test_create_trader_long_email(self) -> bool:
         """Тест создания трейдера с слишком длинным email (256 символов)"""
-        print(f"\n🧪 Тестируем создание трейдера с слишком длинным email")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем создание трейдера с слишком длинным email")
+        log.info("=" * 50)
         
         tests_passed = True
         
@@ -315,9 +326,9 @@ class CreateTraderTester(BaseGrpcTester):
         long_prefix = 'a' * 247  # 247 символов
         long_email = f"{long_prefix}@test.com"  # 247 + 9 = 256 символов
         
-        print(f"📧 Пытаемся создать трейдера с длинным email:")
-        print(f"   user_id: {user_id}")
-        print(f"   email: {long_email[:50]}...{long_email[-10:]} (длина: {len(long_email)})")
+        log.info("📧 Пытаемся создать трейдера с длинным email:")
+        log.info("   user_id: %s", user_id)
+        log.info("   email: %s...%s (длина: %s)", long_email[:50], long_email[-10:], len(long_email))
         
         payload = {
             "user_id": user_id,
@@ -329,7 +340,7 @@ class CreateTraderTester(BaseGrpcTester):
         
         if result["success"]:
             response = result["response"]
-            print(f"❌ Неожиданно: трейдер создан с длинным email: {response}")
+            log.error("❌ Неожиданно: трейдер создан с длинным email: %s", response)
             tests_passed = False
         else:
             # Ожидаем ошибку с текстом "email must be at most 255 characters long"
@@ -337,10 +348,10 @@ class CreateTraderTester(BaseGrpcTester):
             expected_error = "email must be at most 255 characters long"
             
             if expected_error in error_message:
-                print(f"✅ Получена ожидаемая ошибка: {error_message}")
+                log.info("✅ Получена ожидаемая ошибка: %s", error_message)
             else:
-                print(f"❌ Получена неожиданная ошибка: {error_message}")
-                print(f"   Ожидалось: {expected_error}")
+                log.error("❌ Получена неожиданная ошибка: %s", error_message)
+                log.error("   Ожидалось: %s", expected_error)
                 tests_passed = False
         
         self.test_results.append({
@@ -1,10 +1,17 @@
 from base_tester import BaseGrpcTester
+from suite_registry import register_test
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
+
 
 class GetTraderTester(BaseGrpcTester):
     
+    @register_test("get_trader_default", "traders", "GetTrader Default", tags=("grpc", "read"))
     def test_get_trader_default(self) -> bool:
-        print(f"\n🧪 Тестируем GetTrader - базовый тест")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetTrader - базовый тест")
+        log.info("=" * 50)
         
         payload = {
             "trader_id": "550e8400-e29b-41d4-a716-446655440001"
@@ -13,7 +20,7 @@ class GetTraderTester(BaseGrpcTester):
         result = self.run_grpcurl("GetTrader", payload)
         
         if not result["success"]:
-            print(f"❌ gRPC запрос неуспешен: {result['error']}")
+            log.error("❌ gRPC запрос неуспешен: %s", result['error'])
             self.test_results.append({
                 "test": "gRPC запрос выполнен", 
                 "status": "FAIL", 
@@ -24,7 +31,7 @@ class GetTraderTester(BaseGrpcTester):
         response = result["response"]
         
         if "getTraderResponse" not in response:
-            print("❌ Ответ не содержит getTraderResponse")
+            log.error("❌ Ответ не содержит getTraderResponse")
             self.test_results.append({
                 "test": "Структура ответа", 
                 "status": "FAIL", 
@@ -36,7 +43,7 @@ class GetTraderTester(BaseGrpcTester):
         trader = get_trader_response.get("trader")
         
         if not trader:
-            print("❌ Ответ не содержит trader")
+            log.error("❌ Ответ не содержит trader")
             self.test_results.append({
                 "test": "Наличие trader", 
                 "status": "FAIL", 
@@ -86,16 +93,17 @@ class GetTraderTester(BaseGrpcTester):
         
         return tests_passed
 
+    @register_test("get_trader_not_found_error", "traders", "GetTrader Error", tags=("grpc", "read", "negative"))
     def test_get_trader_not_found_error(self, trader_id: str = "550e8400-e29b-41d4-a716-446655440999") -> bool:
-        print(f"\n🧪 Тестируем GetTrader с несуществующим ID = {trader_id}")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetTrader с несуществующим ID = %s", trader_id)
+        log.info("=" * 50)
         
         payload = {"trader_id": trader_id}
         
         result = self.run_grpcurl("GetTrader", payload)
         
         if result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
                 "test": f"GetTrader Error ID={trader_id}",
                 "status": "FAIL",
@@ -105,7 +113,7 @@ class GetTraderTester(BaseGrpcTester):
         
         error_msg = result.get("error", "").lower()
         if "trader not found" in error_msg:
-            print("✅ Получена ожидаемая ошибка")
+            log.info("✅ Получена ожидаемая ошибка")
             self.test_results.append({
                 "test": f"GetTrader Error ID={trader_id}",
                 "status": "PASS",
@@ -113,7 +121,7 @@ class GetTraderTester(BaseGrpcTester):
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {result.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", result.get('error'))
             self.test_results.append({
                 "test": f"GetTrader Error ID={trader_id}",
                 "status": "FAIL",
@@ -121,16 +129,17 @@ class GetTraderTester(BaseGrpcTester):
             })
             return False
 
+    @register_test("get_trader_id_invalid_error", "traders", "GetTrader ID Invalid Error", tags=("grpc", "read", "negative"))
     def test_get_trader_id_invalid_error(self, trader_id: str = "550e8400-e29b-41d4-a716") -> bool:
-        print(f"\n🧪 Тестируем GetTrader с невалидным ID = {trader_id}")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем GetTrader с невалидным ID = %s", trader_id)
+        log.info("=" * 50)
         
         payload = {"trader_id": trader_id}
         
         result = self.run_grpcurl("GetTrader", payload)
         
         if result["success"]:
-            print("❌ Ожидалась ошибка, но запрос прошел успешно")
+            log.error("❌ Ожидалась ошибка, но запрос прошел успешно")
             self.test_results.append({
                 "test": f"GetTrader Error ID={trader_id}",
                 "status": "FAIL",
@@ -140,7 +149,7 @@ class GetTraderTester(BaseGrpcTester):
         
         error_msg = result.get("error", "").lower()
         if "trader id is not valid" in error_msg:
-            print("✅ Получена ожидаемая ошибка")
+            log.info("✅ Получена ожидаемая ошибка")
             self.test_results.append({
                 "test": f"GetTrader Error ID={trader_id}",
                 "status": "PASS",
@@ -148,7 +157,7 @@ class GetTraderTester(BaseGrpcTester):
             })
             return True
         else:
-            print(f"❌ Неожиданная ошибка: {result.get('error')}")
+            log.error("❌ Неожиданная ошибка: %s", result.get('error'))
             self.test_results.append({
                 "test": f"GetTrader Error ID={trader_id}",
                 "status": "FAIL",
@@ -2,6 +2,12 @@ import uuid
 import random
 import string
 from base_tester import BaseGrpcTester, GrpcTestConfig
+from suite_registry import TRADER_FIXTURE, register_test
+from trader_pool import get_trader_pool
+from harness_log import get_logger
+
+
+log = get_logger(__name__)
 
 
 class RegisterTraderTester(BaseGrpcTester):
@@ -17,7 +23,24 @@ class RegisterTraderTester(BaseGrpcTester):
         return f"{random_part}@test.com"
     
     def create_trader_via_http(self, user_id: str = None, email: str = None) -> dict:
-        """Создает трейдера через HTTP API и возвращает результат"""
+        """Создает трейдера через HTTP API и возвращает результат.
+        Без явных user_id/email трейдер берется из заранее созданного пула"""
+        if user_id is None and email is None:
+            fixture = get_trader_pool(self).acquire(consumer=type(self).__name__)
+            if fixture is None:
+                return {
+                    "success": False,
+                    "user_id": None,
+                    "email": None,
+                    "result": {"success": False, "error": get_trader_pool(self).last_error}
+                }
+            return {
+                "success": True,
+                "user_id": fixture.user_id,
+                "email": fixture.email,
+                "result": fixture.result
+            }
+        
         if user_id is None:
             user_id = str(uuid.uuid4())
         if email is None:
@@ -38,18 +61,30 @@ class RegisterTraderTester(BaseGrpcTester):
             "result": result
         }
     
+    def build_register_payload(self, trader_id: str, trader_status: str = "TRADER_STATUS_ENABLED") -> dict:
+        """Payload RegisterTrader как в test_register_trader_enabled"""
+        return {
+            "commission_payin": 4.53,
+            "commission_payout": 2.21,
+            "currency_id": 3,
+            "region_id": 8,
+            "trader_id": trader_id,
+            "trader_status": trader_status
+        }
+    
+    @register_test("register_trader_enabled", "register-traders", "Register Trader Enabled", tags=("http", "grpc", "write", TRADER_FIXTURE))
     def test_register_trader_enabled(self) -> bool:
         """Тест регистрации трейдера со статусом ENABLED"""
-        print(f"\n🧪 Тестируем регистрацию трейдера со статусом ENABLED")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем регистрацию трейдера со статусом ENABLED")
+        log.info("=" * 50)
         
         tests_passed = True
         
-        print("📝 Шаг 1: Создаем трейдера через HTTP API")
+        log.info("📝 Шаг 1: Создаем трейдера через HTTP API")
         create_result = self.create_trader_via_http()
         
         if not create_result["success"]:
-            print(f"❌ Ошибка создания трейдера: {create_result['result']['error']}")
+            log.error("❌ Ошибка создания трейдера: %s", create_result['result']['error'])
             self.test_results.append({
                 "test": "Register Trader Default",
                 "status": "FAIL",
@@ -59,29 +94,22 @@ class RegisterTraderTester(BaseGrpcTester):
         
         trader_id = create_result["user_id"]
         trader_email = create_result["email"]
-        print(f"✅ Трейдер создан успешно:")
-        print(f"   trader_id: {trader_id}")
-        print(f"   email: {trader_email}")
+        log.info("✅ Трейдер создан успешно:")
+        log.info("   trader_id: %s", trader_id)
+        log.info("   email: %s", trader_email)
         
-        print(f"\n📝 Шаг 2: Регистрируем трейдера через gRPC API")
+        log.info("\n📝 Шаг 2: Регистрируем трейдера через gRPC API")
         
-        register_payload = {
-            "commission_payin": 4.53,
-            "commission_payout": 2.21,
-            "currency_id": 3,
-            "region_id": 8,
-            "trader_id": trader_id,
-            "trader_status": "TRADER_STATUS_ENABLED"
-        }
+        register_payload = self.build_register_payload(trader_id)
         
-        print(f"📊 Данные для регистрации: {register_payload}")
+        log.info("📊 Данные для регистрации: %s", register_payload)
         
         result = self.run_grpcurl("RegisterTrader", register_payload)
         
         if result["success"]:
             response = result["response"]
-            print(f"✅ Запрос выполнен успешно")
-            print(f"📋 Ответ: {response}")
+            log.info("✅ Запрос выполнен успешно")
+            log.info("📋 Ответ: %s", response)
             
             # Проверяем структуру ответа
             tests_passed &= self.assert_has_property(response, "registerTraderResponse", "Ответ содержит поле 'registerTraderResponse'")
@@ -120,9 +148,9 @@ class RegisterTraderTester(BaseGrpcTester):
                     updated_at = trader["updatedAt"]
                     tests_passed &= self.assert_not_empty(updated_at, "UpdatedAt не пустое")
         else:
-            print(f"❌ Ошибка выполнения запроса: {result['error']}")
+            log.error("❌ Ошибка выполнения запроса: %s", result['error'])
             if 'raw_stdout' in result:
-                print(f"📋 Сырой ответ: {result['raw_stdout']}")
+                log.info("📋 Сырой ответ: %s", result['raw_stdout'])
             tests_passed = False
         
         self.test_results.append({
@@ -133,19 +161,20 @@ class RegisterTraderTester(BaseGrpcTester):
         
         return tests_passed
     
+    @register_test("register_trader_disabled", "register-traders", "Register Trader Disabled", tags=("http", "grpc", "write", TRADER_FIXTURE))
     def test_register_trader_disabled(self) -> bool:
         """Тест регистрации трейдера со статусом DISABLED"""
-        print(f"\n🧪 Тестируем регистрацию трейдера со статусом DISABLED")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем регистрацию трейдера со статусом DISABLED")
+        log.info("=" * 50)
         
         tests_passed = True
         
         # Шаг 1: Создаем трейдера через HTTP API
-        print("📝 Шаг 1: Создаем трейдера через HTTP API")
+        log.info("📝 Шаг 1: Создаем трейдера через HTTP API")
         create_result = self.create_trader_via_http()
         
         if not create_result["success"]:
-            print(f"❌ Ошибка создания трейдера: {create_result['result']['error']}")
+            log.error("❌ Ошибка создания трейдера: %s", create_result['result']['error'])
             self.test_results.append({
                 "test": "Register Trader Disabled",
                 "status": "FAIL",
@@ -155,12 +184,12 @@ class RegisterTraderTester(BaseGrpcTester):
         
         trader_id = create_result["user_id"]
         trader_email = create_result["email"]
-        print(f"✅ Трейдер создан успешно:")
-        print(f"   trader_id: {trader_id}")
-        print(f"   email: {trader_email}")
+        log.info("✅ Трейдер создан успешно:")
+        log.info("   trader_id: %s", trader_id)
+        log.info("   email: %s", trader_email)
         
         # Шаг 2: Регистрируем трейдера через gRPC API со статусом DISABLED
-        print(f"\n📝 Шаг 2: Регистрируем трейдера через gRPC API со статусом DISABLED")
+        log.info("\n📝 Шаг 2: Регистрируем трейдера через gRPC API со статусом DISABLED")
         
         register_payload = {
             "commission_payin": 3.75,
@@ -171,14 +200,14 @@ class RegisterTraderTester(BaseGrpcTester):
             "trader_status": "TRADER_STATUS_DISABLED"
         }
         
-        print(f"📊 Данные для регистрации: {register_payload}")
+        log.info("📊 Данные для регистрации: %s", register_payload)
         
         result = self.run_grpcurl("RegisterTrader", register_payload)
         
         if result["success"]:
             response = result["response"]
-            print(f"✅ Запрос выполнен успешно")
-            print(f"📋 Ответ: {response}")
+            log.info("✅ Запрос выполнен успешно")
+            log.info("📋 Ответ: %s", response)
             
             # Проверяем структуру ответа
             tests_passed &= self.assert_has_property(response, "registerTraderResponse", "Ответ содержит поле 'registerTraderResponse'")
@@ -219,9 +248,9 @@ class RegisterTraderTester(BaseGrpcTester):
                     updated_at = trader["updatedAt"]
                     tests_passed &= self.assert_not_empty(updated_at, "UpdatedAt не пустое")
         else:
-            print(f"❌ Ошибка выполнения запроса: {result['error']}")
+            log.error("❌ Ошибка выполнения запроса: %s", result['error'])
             if 'raw_stdout' in result:
-                print(f"📋 Сырой ответ: {result['raw_stdout']}")
+                log.info("📋 Сырой ответ: %s", result['raw_stdout'])
             tests_passed = False
         
         self.test_results.append({
@@ -232,19 +261,20 @@ class RegisterTraderTester(BaseGrpcTester):
         
         return tests_passed
     
+    @register_test("register_trader_invalid_status", "register-traders", "Register Trader Invalid Status", tags=("http", "grpc", "write", TRADER_FIXTURE))
     def test_register_trader_invalid_status(self) -> bool:
         """Тест регистрации трейдера с неверными статусами"""
-        print(f"\n🧪 Тестируем регистрацию трейдера с неверными статусами")
-        print("=" * 50)
+        log.info("\n🧪 Тестируем регистрацию трейдера с неверными статусами")
+        log.info("=" * 50)
         
         tests_passed = True
         
         # Шаг 1: Создаем трейдера через HTTP API
-        print("📝 Шаг 1: Создаем трейдера через HTTP API")
+        log.info("📝 Шаг 1: Создаем трейдера через HTTP API")
         create_result = self.create_trader_via_http()
         
         if not create_result["success"]:
-            print(f"❌ Ошибка создания трейдера: {create_result['result']['error']}")
+            log.error("❌ Ошибка создания трейдера: %s", create_result['result']['error'])
             self.test_results.append({
                 "test": "Register Trader Invalid Status",
                 "status": "FAIL",
@@ -254,12 +284,12 @@ class RegisterTraderTester(BaseGrpcTester):
         
         trader_id = create_result["user_id"]
         trader_email = create_result["email"]
-        print(f"✅ Трейдер создан успешно:")
-        print(f"   trader_id: {trader_id}")
-        print(f"   email: {trader_email}")
+        log.info("✅ Трейдер создан успешно:")
+        log.info("   trader_id: %s", trader_id)
+        log.info("   email: %s", trader_email)
         
         # Шаг 2: Тестируем регистрацию с неверными статусами
-        print(f"\n📝 Шаг 2: Тестируем регистрацию с неверными статусами")
+        log.info("\n📝 Шаг 2: Тестируем регистрацию с неверными статусами")
         
         invalid_statuses = [
             "TRADER_STATUS_PAYOUT_OFF",
@@ -271,7 +301,7 @@ class RegisterTraderTester(BaseGrpcTester):
         expected_error_message = "register trader can only set status to ENABLED or DISABLED"
         
         for status in invalid_statuses:
-            print(f"\n🔍 Тестируем статус: {status}")
+            log.info("\n🔍 Тестируем статус: %s", status)
             
             register_payload = {
                 "commission_payin": 2.5,
@@ -282,24 +312,24 @@ class RegisterTraderTester(BaseGrpcTester):
                 "trader_status": status
             }
             
-            print(f"📊 Данные для регистрации: {register_payload}")
+            log.info("📊 Данные для регистрации: %s", register_payload)
             
             result = self.run_grpcurl("RegisterTrader", register_payload)
             
             if result["success"]:
                 response = result["response"]
-                print(f"❌ Неожиданно: запрос выполнен успешно для статуса {status}")
-                print(f"📋 Ответ: {response}")
+                log.error("❌ Неожиданно: запрос выполнен успешно для статуса %s", status)
+                log.info("📋 Ответ: %s", response)
                 tests_passed = False
             else:
                 # Ожидаем ошибку с определенным сообщением
                 error_message = result.get('raw_stdout', result.get('error', ''))
                 
                 if expected_error_message in error_message:
-                    print(f"✅ Получена ожидаемая ошибка для {status}: {error_message}")
+                    log.info("✅ Получена ожидаемая ошибка для %s: %s", status, error_message)
                 else:
-                    print(f"❌ Получена неожиданная ошибка для {status}: {error_message}")
-                    print(f"   Ожидалось: {expected_error_message}")
+                    log.error("❌ Получена неожиданная ошибка для %s: %s", status, error_message)
+                    log.error("   Ожидалось: %s", expected_error_message)
                     tests_passed = False
         
         self.test_results.append({